@@ -0,0 +1,291 @@
+# src/common/alerts.py
+
+import asyncio
+import os
+import threading
+import time
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import List, Dict, Any, Awaitable, Callable, Optional, Tuple
+
+from common.utils import logger, emit_alert, set_alert_aggregator, message_template
+
+# --- 알림 집계 (Alert Coalescing) ---
+# Processing and validation call send_alert once per bad record, so a batch with a
+# systemic data problem used to produce one log line (and in prod one Alertmanager call)
+# per record. With the aggregator running, send_alert only bumps a counter for the
+# alert's fingerprint (module, severity, rule). A background task dispatches the first
+# occurrence of a fingerprint right away and, at the end of each coalescing window,
+# one digest with the number of repeats. Dispatch goes through a bounded asyncio.Queue
+# drained at a limited rate; when the queue is full alerts are dropped and counted
+# rather than blocking the pipeline.
+ALERT_AGGREGATION_ENABLED = os.environ.get("ALERT_AGGREGATION_ENABLED", "true").lower() == "true"
+ALERT_COALESCE_WINDOW = float(os.environ.get("ALERT_COALESCE_WINDOW", "60.0")) # Seconds a fingerprint's repeats are folded into one digest
+ALERT_FLUSH_INTERVAL = float(os.environ.get("ALERT_FLUSH_INTERVAL", "1.0")) # Seconds between scans for closed windows
+ALERT_QUEUE_SIZE = int(os.environ.get("ALERT_QUEUE_SIZE", "1000")) # Pending dispatches before alerts are dropped
+ALERT_DISPATCH_RATE = float(os.environ.get("ALERT_DISPATCH_RATE", "5.0")) # Dispatch calls per second (token bucket refill)
+ALERT_DISPATCH_BURST = int(os.environ.get("ALERT_DISPATCH_BURST", "10")) # Dispatch calls allowed back to back
+ALERT_DISPATCH_BATCH_SIZE = int(os.environ.get("ALERT_DISPATCH_BATCH_SIZE", "50")) # Alerts sent per dispatch call
+ALERTMANAGER_URL = os.environ.get("ALERTMANAGER_URL", "") # e.g. http://alertmanager:9093 ; empty = log only
+
+
+def alert_rule(message: str, details: Optional[Dict[str, Any]] = None) -> str:
+    """
+    Rule part of the fingerprint: details['rule'] if given (cheapest, used on per-record paths),
+    else the message with its variable parts masked.
+    """
+    if details and details.get("rule"):
+        return str(details["rule"])
+    return message_template(message)
+
+
+@dataclass
+class AlertDigest:
+    """Counted occurrences of one fingerprint in the current window."""
+    severity: str
+    module: str
+    rule: str
+    message: str # First message of the window
+    details: Dict[str, Any] # Details of the first occurrence (sample)
+    first_seen: datetime
+    last_seen: datetime
+    window_started: float # time.monotonic() at window start
+    count: int = 1
+    dispatched_count: int = 0 # Occurrences of this window already covered by a dispatched alert
+    announced: bool = False # First occurrence dispatched
+
+
+@dataclass
+class DispatchedAlert:
+    severity: str
+    message: str
+    details: Dict[str, Any] = field(default_factory=dict)
+
+
+AlertSink = Callable[[List[DispatchedAlert]], Awaitable[None]]
+
+
+async def log_and_forward_alerts(alerts: List[DispatchedAlert]) -> None:
+    """Default sink: logs every alert and, with ALERTMANAGER_URL set, posts the batch to Alertmanager."""
+    for alert in alerts:
+        emit_alert(alert.severity, alert.message, alert.details)
+    if not ALERTMANAGER_URL:
+        return
+    from common.http_client import shared_http_client # Imported here: http_client is not needed for log-only use
+    target_url = f"{ALERTMANAGER_URL.rstrip('/')}/api/v2/alerts"
+    payload = [
+        {
+            "labels": {
+                "alertname": alert.details.get("rule") or alert.message[:100],
+                "severity": alert.severity.lower(),
+                "module": str(alert.details.get("module", "unknown")),
+            },
+            "annotations": {"summary": alert.message, "count": str(alert.details.get("count", 1))},
+            "startsAt": alert.details.get("first_seen") or datetime.utcnow().isoformat() + "Z",
+        }
+        for alert in alerts
+    ]
+    try:
+        async with shared_http_client(target_url) as client:
+            response = await client.post(target_url, json=payload, timeout=10.0)
+            response.raise_for_status()
+    except Exception as e:
+        logger.error(f"Failed to forward {len(alerts)} alerts to Alertmanager: {e}")
+
+
+class AlertAggregator:
+    """
+    Fingerprints alerts by (module, severity, rule) and dispatches coalesced digests.
+    accept() is thread-safe and returns False while the aggregator is not running,
+    so send_alert falls back to logging directly.
+    """
+
+    def __init__(
+        self,
+        window: float = ALERT_COALESCE_WINDOW,
+        flush_interval: float = ALERT_FLUSH_INTERVAL,
+        queue_size: int = ALERT_QUEUE_SIZE,
+        dispatch_rate: float = ALERT_DISPATCH_RATE,
+        dispatch_burst: int = ALERT_DISPATCH_BURST,
+        batch_size: int = ALERT_DISPATCH_BATCH_SIZE,
+        sink: AlertSink = log_and_forward_alerts,
+    ):
+        self.window = window
+        self.flush_interval = flush_interval
+        self.queue_size = queue_size
+        self.dispatch_rate = dispatch_rate
+        self.dispatch_burst = max(1, dispatch_burst)
+        self.batch_size = max(1, batch_size)
+        self.sink = sink
+        self._lock = threading.Lock()
+        self._digests: Dict[Tuple[str, str, str], AlertDigest] = {}
+        self._queue: Optional[asyncio.Queue] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._wakeup: Optional[asyncio.Event] = None
+        self._tasks: List[asyncio.Task] = []
+        self._running = False
+        self.accepted = 0
+        self.dispatched = 0
+        self.dropped = 0
+        self.sink_errors = 0
+
+    # --- Hot path ---
+    def accept(self, severity: str, message: str, details: Optional[Dict[str, Any]] = None) -> bool:
+        if not self._running:
+            return False
+        details = details if details is not None else {}
+        severity = severity.upper()
+        module = str(details.get("module", "unknown"))
+        rule = alert_rule(message, details)
+        fingerprint = (module, severity, rule)
+        now = datetime.utcnow()
+        with self._lock:
+            self.accepted += 1
+            digest = self._digests.get(fingerprint)
+            if digest is not None:
+                digest.count += 1
+                digest.last_seen = now
+                return True
+            self._digests[fingerprint] = AlertDigest(severity, module, rule, message, details, now, now, time.monotonic())
+        # New fingerprint: wake the flusher so the first occurrence goes out without waiting for the tick
+        try:
+            self._loop.call_soon_threadsafe(self._wakeup.set)
+        except RuntimeError: # Loop already closed during shutdown; the final flush covers it
+            pass
+        return True
+
+    # --- Background tasks ---
+    def _collect(self, final: bool = False) -> List[DispatchedAlert]:
+        """Takes the alerts due now: first occurrences of new fingerprints and digests of closed windows."""
+        due: List[DispatchedAlert] = []
+        now = time.monotonic()
+        with self._lock:
+            for fingerprint, digest in list(self._digests.items()):
+                if not digest.announced:
+                    details = dict(digest.details)
+                    if digest.count > 1:
+                        details["occurrences"] = digest.count
+                    due.append(DispatchedAlert(digest.severity, digest.message, details))
+                    digest.dispatched_count = digest.count
+                    digest.announced = True
+                if not final and now - digest.window_started < self.window:
+                    continue
+                repeats = digest.count - digest.dispatched_count
+                if repeats:
+                    due.append(DispatchedAlert(digest.severity, f"{digest.rule} (repeated {repeats} times in {self.window:.0f}s)", {
+                        "module": digest.module,
+                        "rule": digest.rule,
+                        "count": repeats,
+                        "first_seen": digest.first_seen.isoformat(),
+                        "last_seen": digest.last_seen.isoformat(),
+                        "sample": digest.details,
+                    }))
+                    # Storm still going: next window starts now, already announced
+                    digest.count = digest.dispatched_count = 0
+                    digest.window_started = now
+                    digest.first_seen = digest.last_seen
+                else:
+                    del self._digests[fingerprint]
+            if final:
+                self._digests.clear()
+        return due
+
+    def _enqueue(self, alerts: List[DispatchedAlert]) -> None:
+        for alert in alerts:
+            try:
+                self._queue.put_nowait(alert)
+            except asyncio.QueueFull:
+                self.dropped += 1
+
+    async def _flush_loop(self) -> None:
+        while True:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+            self._enqueue(self._collect())
+
+    async def _dispatch_loop(self) -> None:
+        tokens = float(self.dispatch_burst)
+        refilled_at = time.monotonic()
+        while True:
+            batch = [await self._queue.get()]
+            while len(batch) < self.batch_size and not self._queue.empty():
+                batch.append(self._queue.get_nowait())
+            # Token bucket: at most dispatch_rate sink calls per second after the initial burst
+            now = time.monotonic()
+            tokens = min(self.dispatch_burst, tokens + (now - refilled_at) * self.dispatch_rate)
+            refilled_at = now
+            if tokens < 1:
+                await asyncio.sleep((1 - tokens) / self.dispatch_rate)
+                tokens, refilled_at = 1.0, time.monotonic()
+            tokens -= 1
+            await self._send(batch)
+
+    async def _send(self, batch: List[DispatchedAlert]) -> None:
+        try:
+            await self.sink(batch)
+            self.dispatched += len(batch)
+        except Exception as e:
+            self.sink_errors += 1
+            logger.error(f"Alert sink failed for {len(batch)} alerts: {e}", exc_info=True)
+        finally:
+            for _ in batch:
+                self._queue.task_done()
+
+    # --- Lifecycle ---
+    async def start(self) -> None:
+        if self._running:
+            return
+        self._loop = asyncio.get_running_loop()
+        self._queue = asyncio.Queue(maxsize=self.queue_size)
+        self._wakeup = asyncio.Event()
+        self._tasks = [asyncio.create_task(self._flush_loop()), asyncio.create_task(self._dispatch_loop())]
+        self._running = True
+        set_alert_aggregator(self)
+
+    async def stop(self) -> None:
+        """Stops accepting, dispatches the remaining first occurrences and digests, then stops the tasks."""
+        if not self._running:
+            return
+        self._running = False
+        set_alert_aggregator(None)
+        self._tasks[0].cancel()
+        self._enqueue(self._collect(final=True))
+        try:
+            await asyncio.wait_for(self._queue.join(), timeout=max(5.0, self.flush_interval))
+        except asyncio.TimeoutError:
+            logger.warning(f"Alert dispatch did not drain before shutdown ({self._queue.qsize()} alerts left).")
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    def metrics(self) -> Dict[str, Any]:
+        return {
+            "running": self._running,
+            "fingerprints": len(self._digests),
+            "queued": self._queue.qsize() if self._queue is not None else 0,
+            "accepted": self.accepted,
+            "dispatched": self.dispatched,
+            "dropped": self.dropped,
+            "sink_errors": self.sink_errors,
+        }
+
+
+# Process-wide aggregator, started and stopped by stage_lifespan / http_client_lifespan
+alert_aggregator = AlertAggregator()
+
+
+async def start_alert_aggregation() -> None:
+    if ALERT_AGGREGATION_ENABLED:
+        await alert_aggregator.start()
+
+
+async def stop_alert_aggregation() -> None:
+    await alert_aggregator.stop()
+
+
+def get_alert_metrics() -> Dict[str, Any]:
+    return alert_aggregator.metrics()
@@ -0,0 +1,144 @@
+# src/common/bulk_db.py
+
+import os
+import uuid
+from datetime import datetime
+from typing import List, Dict, Any, Iterator, Sequence, Optional
+
+from sqlalchemy import select, update, insert, literal
+from sqlalchemy.orm import Session
+from sqlalchemy.sql.elements import ColumnElement
+
+from common.utils import logger, ProcessedSwapDataDB, ValidationResult, ReportRecord
+
+# --- 집합 기반 (Set-based) DB 연산 유틸리티 ---
+# Pipeline stages handle whole batches, so DB work should scale with the number of
+# distinct statuses / chunks rather than with the number of rows.
+# IN (...) lists are split into chunks to stay below driver bind-parameter limits
+# (SQLite allows 32766 variables per statement since 3.32).
+IN_CLAUSE_CHUNK_SIZE = int(os.environ.get("DB_IN_CLAUSE_CHUNK_SIZE", "5000"))
+
+
+def chunked(items: Sequence[Any], size: int = IN_CLAUSE_CHUNK_SIZE) -> Iterator[Sequence[Any]]:
+    """Yields consecutive slices of at most `size` items."""
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+def fetch_processed_ids_by_uti(db: Session, utis: Sequence[str]) -> Dict[str, str]:
+    """
+    Resolves processed_swap_data ids for a batch of UTIs with one IN (...) query per chunk.
+    Returns {uti: processed_data_id} for the UTIs that exist.
+    """
+    ids_by_uti: Dict[str, str] = {}
+    for uti_chunk in chunked(list(utis)):
+        rows = db.execute(
+            select(ProcessedSwapDataDB.unique_transaction_identifier, ProcessedSwapDataDB.id)
+            .where(ProcessedSwapDataDB.unique_transaction_identifier.in_(uti_chunk))
+        )
+        ids_by_uti.update({uti: record_id for uti, record_id in rows})
+    return ids_by_uti
+
+
+def bulk_upsert_processed_records(db: Session, records: List[Dict[str, Any]]) -> Dict[str, str]:
+    """
+    Stores processed_swap_data rows keyed by UTI: new UTIs with one executemany INSERT,
+    UTIs already stored (life-cycle events of a known trade) with one bulk UPDATE by primary key.
+    When a batch holds several events for one UTI the last one wins.
+    Returns {uti: processed_data_id} for every stored row; record dicts get the stored id.
+    """
+    latest_by_uti = {record["unique_transaction_identifier"]: record for record in records}
+    existing_ids = fetch_processed_ids_by_uti(db, list(latest_by_uti))
+    inserts: List[Dict[str, Any]] = []
+    updates: List[Dict[str, Any]] = []
+    for uti, record in latest_by_uti.items():
+        if uti in existing_ids:
+            record["id"] = existing_ids[uti]
+            updates.append(record)
+        else:
+            inserts.append(record)
+
+    if inserts:
+        db.execute(insert(ProcessedSwapDataDB.__table__), inserts)
+    if updates:
+        db.execute(update(ProcessedSwapDataDB), updates) # ORM bulk UPDATE by primary key (executemany)
+    logger.debug(f"Upserted processed records: {len(inserts)} inserted, {len(updates)} updated.")
+    return {uti: record["id"] for uti, record in latest_by_uti.items()}
+
+
+def bulk_update_validation_status(db: Session, status_by_uti: Dict[str, str]) -> int:
+    """
+    Applies validation_status with one UPDATE ... WHERE uti IN (...) per status value (and chunk).
+    Returns the number of rows updated.
+    """
+    utis_by_status: Dict[str, List[str]] = {}
+    for uti, status in status_by_uti.items():
+        utis_by_status.setdefault(status, []).append(uti)
+
+    updated_count = 0
+    for status, utis in utis_by_status.items():
+        for uti_chunk in chunked(utis):
+            result = db.execute(
+                update(ProcessedSwapDataDB)
+                .where(ProcessedSwapDataDB.unique_transaction_identifier.in_(uti_chunk))
+                .values(validation_status=status)
+                .execution_options(synchronize_session=False)
+            )
+            updated_count += result.rowcount
+    return updated_count
+
+
+def bulk_insert_validation_results(db: Session, results: List[Dict[str, Any]]) -> List[str]:
+    """
+    Inserts validation_results rows with a single executemany and returns their ids.
+    Each result dict carries the ValidationResult column values; ids are generated here if missing.
+    """
+    if not results:
+        return []
+    for result in results:
+        result.setdefault("id", str(uuid.uuid4()))
+    db.execute(insert(ValidationResult.__table__), results)
+    logger.debug(f"Bulk inserted {len(results)} validation results.")
+    return [result["id"] for result in results]
+
+
+def link_records_to_report(db: Session, report_id: str, criteria: ColumnElement, now: Optional[datetime] = None) -> int:
+    """
+    Records that processed_swap_data rows matching `criteria` are in report `report_id`:
+    one INSERT INTO report_records ... SELECT ... FROM processed_swap_data WHERE criteria and
+    one UPDATE processed_swap_data SET report_status, generated_report_id WHERE criteria.
+    No rows are loaded into Python. Returns the number of records linked.
+    """
+    now = now or datetime.utcnow()
+    linked = db.execute(
+        insert(ReportRecord).from_select(
+            ["report_id", "processed_record_id", "unique_transaction_identifier", "included_at"],
+            select(literal(report_id), ProcessedSwapDataDB.id, ProcessedSwapDataDB.unique_transaction_identifier, literal(now))
+            .where(criteria),
+        )
+    ).rowcount
+    db.execute(
+        update(ProcessedSwapDataDB)
+        .where(criteria)
+        .values(report_status="IncludedInReport", generated_report_id=report_id)
+        .execution_options(synchronize_session=False)
+    )
+    return linked
+
+
+def link_record_ids_to_report(db: Session, report_id: str, record_ids: Sequence[str], now: Optional[datetime] = None) -> int:
+    """link_records_to_report for a list of processed_swap_data ids (e.g. the rows written to a report file), per chunk."""
+    linked = 0
+    for id_chunk in chunked(list(record_ids)):
+        linked += link_records_to_report(db, report_id, ProcessedSwapDataDB.id.in_(id_chunk), now)
+    logger.debug(f"Linked {linked} processed records to report {report_id}.")
+    return linked
+
+
+def link_utis_to_report(db: Session, report_id: str, utis: Sequence[str], now: Optional[datetime] = None) -> int:
+    """link_records_to_report for a batch of UTIs, one INSERT ... SELECT and one UPDATE ... WHERE uti IN (...) per chunk."""
+    linked = 0
+    for uti_chunk in chunked(list(dict.fromkeys(utis))):
+        linked += link_records_to_report(db, report_id, ProcessedSwapDataDB.unique_transaction_identifier.in_(uti_chunk), now)
+    logger.debug(f"Linked {linked} processed records to report {report_id}.")
+    return linked
@@ -0,0 +1,211 @@
+# src/common/bulk_ingest.py
+
+import csv
+import io
+import json
+import uuid
+from operator import itemgetter
+from datetime import datetime
+from typing import List, Dict, Any, Tuple
+
+from sqlalchemy.orm import Session
+
+from common.utils import logger, RawIngestedData
+
+try:
+    import orjson # Optional: faster JSON encoding for raw_payload
+except ImportError:
+    orjson = None
+
+
+def _dumps_payload(payload: Dict[str, Any]) -> str:
+    """Serializes a raw payload to JSON text (orjson when available)."""
+    if orjson is not None:
+        return orjson.dumps(payload).decode("utf-8")
+    return json.dumps(payload)
+
+# --- 대량 적재 (Bulk Ingest) 경로 ---
+# End-of-day FEP pushes can carry 50k+ trades. Building one Pydantic model and one
+# ORM object per row dominates the cost, so the bulk path works on plain dicts,
+# generates primary keys on the client side (no RETURNING round trip needed) and
+# hands the whole batch to the driver in a single statement:
+#   - PostgreSQL: COPY raw_ingested_data FROM STDIN (psycopg2 / psycopg 3)
+#   - qmark drivers (SQLite for local dev): DBAPI executemany with pre-serialized values
+#   - Other dialects: SQLAlchemy Core executemany
+
+# Column order used for both COPY and executemany
+RAW_INGEST_COLUMNS = [
+    "id",
+    "trade_id",
+    "action",
+    "instrument_type",
+    "asset_class",
+    "effective_date",
+    "termination_date",
+    "notional_amount",
+    "notional_currency",
+    "party_a_lei",
+    "party_b_lei",
+    "price",
+    "price_currency",
+    "raw_payload",
+    "ingestion_timestamp",
+    "status",
+]
+
+# Fields required by the SwapData ingestion model
+REQUIRED_FIELDS = (
+    "trade_id",
+    "action",
+    "instrument_type",
+    "asset_class",
+    "effective_date",
+    "termination_date",
+    "notional_amount",
+    "notional_currency",
+    "party_a_lei",
+    "party_b_lei",
+)
+
+
+def build_raw_rows(data: List[Dict[str, Any]]) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+    """
+    Converts incoming raw swap dicts into rows for the raw_ingested_data table.
+    Performs the same required-field and numeric checks as the SwapData model,
+    without constructing a Pydantic object per row.
+    Returns (rows, rejected) where rejected entries carry the original data and errors.
+    """
+    rows: List[Dict[str, Any]] = []
+    rejected: List[Dict[str, Any]] = []
+    ingestion_timestamp = datetime.utcnow()
+    required_values = itemgetter(*REQUIRED_FIELDS)
+
+    for entry in data:
+        # Fast path: all required fields present and numbers already numeric
+        try:
+            has_missing = None in required_values(entry)
+        except KeyError:
+            has_missing = True
+        notional_amount = entry.get("notional_amount")
+        price = entry.get("price")
+
+        if has_missing or type(notional_amount) is not float or (price is not None and type(price) is not float):
+            errors = [f"Missing required field: {field}" for field in REQUIRED_FIELDS if entry.get(field) is None]
+            try:
+                if notional_amount is not None:
+                    notional_amount = float(notional_amount)
+            except (ValueError, TypeError):
+                errors.append(f"Invalid Notional Amount format: {notional_amount}")
+            try:
+                if price is not None:
+                    price = float(price)
+            except (ValueError, TypeError):
+                errors.append(f"Invalid Price format: {price}")
+
+            if errors:
+                rejected.append({"source_module": "data-ingestion", "data": entry, "errors": errors})
+                continue
+
+        rows.append({
+            "id": str(uuid.uuid4()),
+            "trade_id": entry["trade_id"],
+            "action": entry["action"],
+            "instrument_type": entry["instrument_type"],
+            "asset_class": entry["asset_class"],
+            "effective_date": entry["effective_date"],
+            "termination_date": entry["termination_date"],
+            "notional_amount": notional_amount,
+            "notional_currency": entry["notional_currency"],
+            "party_a_lei": entry["party_a_lei"],
+            "party_b_lei": entry["party_b_lei"],
+            "price": price,
+            "price_currency": entry.get("price_currency"),
+            "raw_payload": entry,
+            "ingestion_timestamp": ingestion_timestamp,
+            "status": "Ingested",
+        })
+
+    return rows, rejected
+
+
+def _copy_raw_rows(db: Session, rows: List[Dict[str, Any]]) -> None:
+    """
+    Streams rows into raw_ingested_data using PostgreSQL COPY inside the session's transaction.
+    Uses CSV with QUOTE_NONNUMERIC so that None becomes NULL and empty strings stay empty.
+    """
+    connection = db.connection()
+    dbapi_connection = connection.connection.dbapi_connection
+    driver = connection.dialect.driver
+    copy_sql = f"COPY {RawIngestedData.__tablename__} ({', '.join(RAW_INGEST_COLUMNS)}) FROM STDIN WITH (FORMAT csv)"
+
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, quoting=csv.QUOTE_NONNUMERIC)
+    for row in rows:
+        writer.writerow([
+            _dumps_payload(row[column]) if column == "raw_payload"
+            else row[column].isoformat() if column == "ingestion_timestamp"
+            else row[column]
+            for column in RAW_INGEST_COLUMNS
+        ])
+    buffer.seek(0)
+
+    cursor = dbapi_connection.cursor()
+    try:
+        if driver == "psycopg2":
+            cursor.copy_expert(copy_sql, buffer)
+        elif driver == "psycopg":
+            with cursor.copy(copy_sql) as copy:
+                copy.write(buffer.getvalue())
+        else:
+            raise NotImplementedError(f"COPY is not supported for PostgreSQL driver '{driver}'")
+    finally:
+        cursor.close()
+
+
+def _executemany_raw_rows(db: Session, rows: List[Dict[str, Any]]) -> None:
+    """
+    Sends rows straight to the DBAPI cursor.executemany (qmark drivers such as sqlite3).
+    JSON and timestamp values are converted once here instead of through per-row
+    SQLAlchemy type processors.
+    """
+    connection = db.connection()
+    table = RawIngestedData.__table__
+    timestamp_processor = table.c.ingestion_timestamp.type.bind_processor(connection.dialect)
+    insert_sql = (
+        f"INSERT INTO {table.name} ({', '.join(RAW_INGEST_COLUMNS)}) "
+        f"VALUES ({', '.join('?' for _ in RAW_INGEST_COLUMNS)})"
+    )
+
+    # raw_payload, ingestion_timestamp and status are the last three columns
+    leading_columns = itemgetter(*RAW_INGEST_COLUMNS[:-3])
+    timestamps: Dict[datetime, Any] = {}
+    params = []
+    for row in rows:
+        timestamp = row["ingestion_timestamp"]
+        if timestamp not in timestamps:
+            timestamps[timestamp] = timestamp_processor(timestamp) if timestamp_processor else timestamp
+        params.append(leading_columns(row) + (_dumps_payload(row["raw_payload"]), timestamps[timestamp], row["status"]))
+
+    connection.exec_driver_sql(insert_sql, params)
+
+
+def bulk_insert_raw_rows(db: Session, rows: List[Dict[str, Any]]) -> List[str]:
+    """
+    Writes prepared raw rows in one statement and returns their ids in input order.
+    The caller is responsible for committing the session.
+    """
+    if not rows:
+        return []
+
+    dialect = db.get_bind().dialect
+    if dialect.name == "postgresql" and dialect.driver in ("psycopg2", "psycopg"):
+        _copy_raw_rows(db, rows)
+        logger.info(f"Bulk inserted {len(rows)} raw rows via COPY ({dialect.driver}).")
+    elif dialect.paramstyle == "qmark":
+        _executemany_raw_rows(db, rows)
+        logger.info(f"Bulk inserted {len(rows)} raw rows via executemany ({dialect.name}).")
+    else:
+        db.execute(RawIngestedData.__table__.insert(), rows)
+        logger.info(f"Bulk inserted {len(rows)} raw rows via Core insert ({dialect.name}).")
+
+    return [row["id"] for row in rows]
@@ -0,0 +1,160 @@
+# src/common/error_groups.py
+
+import hashlib
+import os
+import uuid
+from collections import Counter
+from datetime import datetime
+from typing import List, Dict, Any, Optional, Sequence
+
+from sqlalchemy import select, insert, update, bindparam
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+
+from common.utils import logger, message_template, ErrorRecord, ErrorGroup
+from common.bulk_db import chunked
+from common.structured_logging import RecordLogSampler
+
+# --- 오류 그룹화 (Error Fingerprinting) ---
+# A systemic data problem makes processing/validation report the same rule failure for
+# tens of thousands of trades. Errors are fingerprinted by (source module, message
+# template) and counted in error_groups, so the Admin UI lists O(groups) rows; the
+# individual error_records rows are written with one executemany and carry group_id.
+# The first ERROR_GROUP_SAMPLE_SIZE errors of a group keep their full data payload.
+# Later ones whose payload points to a raw_ingested_data row (original_raw_data_id)
+# keep only the reference fields; retry reloads the source trade from the raw row.
+# Groups are upserted (INSERT ... ON CONFLICT DO UPDATE error_count + n), so concurrent
+# batches reporting the same new fingerprint do not collide on its primary key; the
+# upsert also locks the group rows until commit, so the samples read afterwards cannot
+# be overwritten by a concurrent batch.
+ERROR_GROUP_SAMPLE_SIZE = int(os.environ.get("ERROR_GROUP_SAMPLE_SIZE", "5")) # Errors per group listed as samples (full payload kept)
+ERROR_PAYLOAD_DEDUP = os.environ.get("ERROR_PAYLOAD_DEDUP", "true").lower() == "true" # false = store every full payload (old behaviour)
+
+# Payload fields kept for non-sample errors
+REFERENCE_PAYLOAD_FIELDS = ("id", "trade_id", "unique_transaction_identifier", "original_raw_data_id")
+
+record_log = RecordLogSampler(logger)
+
+# INSERT ... ON CONFLICT constructs per dialect
+_DIALECT_INSERTS = {"postgresql": postgresql.insert, "sqlite": sqlite.insert}
+
+
+def error_template(messages: Sequence[str]) -> str:
+    """Template of an error entry: its messages with the variable parts masked, in order."""
+    return " | ".join(message_template(str(message)) for message in messages) or "<no error message>"
+
+
+def error_fingerprint(source_module: str, template: str) -> str:
+    return hashlib.blake2b(f"{source_module}\x1f{template}".encode("utf-8"), digest_size=16).hexdigest()
+
+
+def reference_payload(data_payload: Dict[str, Any]) -> Dict[str, Any]:
+    return {name: data_payload[name] for name in REFERENCE_PAYLOAD_FIELDS if name in data_payload}
+
+
+def _upsert_groups(db: Session, groups: Sequence[Dict[str, Any]]) -> None:
+    """Inserts the groups, or adds their error_count and last_seen to the existing rows."""
+    dialect = db.get_bind().dialect.name
+    if dialect not in _DIALECT_INSERTS:
+        raise NotImplementedError(f"Error group upsert is not supported on '{dialect}'.")
+    table = ErrorGroup.__table__
+    statement = _DIALECT_INSERTS[dialect](table)
+    statement = statement.on_conflict_do_update(
+        index_elements=[table.c.id],
+        set_={"error_count": table.c.error_count + statement.excluded.error_count, "last_seen": statement.excluded.last_seen},
+    )
+    # Same lock order in every batch (by id), so concurrent batches cannot deadlock on each other's groups
+    db.execute(statement, sorted(groups, key=lambda group: group["id"]))
+
+
+def bulk_record_errors(db: Session, errors_data: Sequence[Any], now: Optional[datetime] = None) -> Dict[str, Any]:
+    """
+    Records a batch of reported errors: error_records rows in one executemany, plus one
+    upsert for the groups and one executemany update of their samples. Takes a sync
+    Session (use `await db.run_sync(...)`); the caller commits.
+    Entries that are not {"data", "errors", "source_module"} dicts are skipped and counted.
+    """
+    now = now or datetime.utcnow()
+    rows: List[Dict[str, Any]] = []
+    templates: Dict[str, str] = {}
+    invalid_entries = 0
+    for error_entry in errors_data:
+        if not isinstance(error_entry, dict) or not isinstance(error_entry.get("data", {}), dict):
+            invalid_entries += 1
+            continue
+        data_payload = error_entry.get("data") or {}
+        errors = error_entry.get("errors", [])
+        source_module = str(error_entry.get("source_module", "Unknown"))
+        error_messages = errors if isinstance(errors, list) else [str(errors)] # Ensure errors is a list of strings
+        trade_id = data_payload.get("unique_transaction_identifier", data_payload.get("trade_id", "N/A"))
+        record_log.debug("Error reported from %s for ID %s", source_module, trade_id)
+        template = error_template(error_messages)
+        group_id = error_fingerprint(source_module, template)
+        templates.setdefault(group_id, template)
+        rows.append({
+            "id": str(uuid.uuid4()),
+            "trade_id": trade_id,
+            "source_module": source_module,
+            "error_messages": error_messages,
+            "data_payload": data_payload,
+            "original_source_data_payload": data_payload.get("original_source_data"),
+            "timestamp": now,
+            "status": "Open",
+            "severity": "Error",
+            "assigned_to": None,
+            "group_id": group_id,
+        })
+
+    counts = Counter(row["group_id"] for row in rows)
+    if rows:
+        first_rows = {}
+        for row in rows:
+            first_rows.setdefault(row["group_id"], row)
+        _upsert_groups(db, [
+            {"id": group_id, "source_module": row["source_module"], "message_template": templates[group_id],
+             "error_count": counts[group_id], "first_seen": now, "last_seen": now,
+             "sample_error_ids": [], "sample_messages": row["error_messages"], "status": "Open"}
+            for group_id, row in first_rows.items()
+        ])
+
+    # State of the touched groups after the upsert (rows now locked by this transaction)
+    samples: Dict[str, List[str]] = {}
+    new_groups = 0
+    for id_chunk in chunked(list(counts)):
+        for group_id, sample_error_ids, error_count in db.execute(
+            select(ErrorGroup.id, ErrorGroup.sample_error_ids, ErrorGroup.error_count).where(ErrorGroup.id.in_(id_chunk))
+        ):
+            samples[group_id] = list(sample_error_ids or [])
+            new_groups += error_count == counts[group_id] # No errors before this batch
+
+    sampled = set()
+    slimmed = 0
+    for row in rows:
+        group_id = row["group_id"]
+        if len(samples[group_id]) < ERROR_GROUP_SAMPLE_SIZE:
+            samples[group_id].append(row["id"])
+            sampled.add(group_id)
+        elif ERROR_PAYLOAD_DEDUP and row["data_payload"].get("original_raw_data_id") and not row["original_source_data_payload"]:
+            row["data_payload"] = reference_payload(row["data_payload"])
+            slimmed += 1
+
+    if rows:
+        db.execute(insert(ErrorRecord.__table__), rows)
+    if sampled:
+        db.execute(
+            update(ErrorGroup.__table__)
+            .where(ErrorGroup.__table__.c.id == bindparam("group_id"))
+            .values(sample_error_ids=bindparam("samples")),
+            [{"group_id": group_id, "samples": samples[group_id]} for group_id in sorted(sampled)],
+        )
+
+    errors_by_module = Counter(row["source_module"] for row in rows)
+    logger.debug(f"Recorded {len(rows)} errors in {len(counts)} groups ({new_groups} new, {slimmed} payloads reduced to references).")
+    return {
+        "recorded": len(rows),
+        "invalid": invalid_entries,
+        "groups": len(counts),
+        "new_groups": new_groups,
+        "slimmed_payloads": slimmed,
+        "errors_by_module": dict(errors_by_module),
+    }
@@ -0,0 +1,51 @@
+# src/common/fanout.py
+
+import asyncio
+import os
+import time
+from typing import Any, Awaitable, Callable, Dict, Mapping, Optional
+
+from common.utils import logger
+
+# --- 동시 fan-out (대시보드 집계) ---
+# The Admin UI used to call the error, processed-data, report and submission list
+# endpoints one after another, so first paint waited for the sum of their latencies.
+# gather_sections starts every section at once (asyncio.gather) and bounds each by its
+# own timeout: the page waits for max(latency) capped at the timeout, and a slow or
+# failing module only blanks its own section instead of failing the whole page.
+DASHBOARD_SECTION_TIMEOUT = float(os.environ.get("DASHBOARD_SECTION_TIMEOUT", "3.0")) # Seconds before a section is reported as timed out
+
+
+async def _run_section(name: str, fetch: Callable[[], Awaitable[Any]], timeout: float) -> Dict[str, Any]:
+    start_time = time.perf_counter()
+    try:
+        data = await asyncio.wait_for(fetch(), timeout)
+        section = {"status": "ok", "data": data, "error": None}
+    except asyncio.TimeoutError:
+        logger.warning(f"Dashboard section '{name}' timed out after {timeout}s")
+        section = {"status": "timeout", "data": None, "error": f"Timed out after {timeout}s"}
+    except Exception as e:
+        logger.warning(f"Dashboard section '{name}' failed: {e}")
+        section = {"status": "error", "data": None, "error": str(e) or type(e).__name__}
+    section["elapsed_ms"] = round((time.perf_counter() - start_time) * 1000, 1)
+    return section
+
+
+async def gather_sections(
+    fetchers: Mapping[str, Callable[[], Awaitable[Any]]],
+    timeout: float = DASHBOARD_SECTION_TIMEOUT,
+    timeouts: Optional[Mapping[str, float]] = None,
+) -> Dict[str, Any]:
+    """
+    Runs every fetcher concurrently, each under its own timeout (`timeouts` overrides
+    per section). Never raises for a section: failures are reported in its entry as
+    {"status": "timeout" | "error", "data": None, "error": ...}.
+    Returns {"status": "ok" | "partial" | "unavailable", "sections": {name: entry}}.
+    """
+    timeouts = timeouts or {}
+    names = list(fetchers)
+    results = await asyncio.gather(*(_run_section(name, fetchers[name], timeouts.get(name, timeout)) for name in names))
+    sections = dict(zip(names, results))
+    succeeded = sum(1 for section in results if section["status"] == "ok")
+    status = "ok" if succeeded == len(results) else ("partial" if succeeded else "unavailable")
+    return {"status": status, "sections": sections}
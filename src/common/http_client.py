@@ -0,0 +1,170 @@
+# src/common/http_client.py
+
+import os
+import time
+from contextlib import asynccontextmanager
+from typing import Dict, Any, Optional, AsyncIterator
+
+import httpx
+
+from common.utils import logger
+from common.alerts import start_alert_aggregation, stop_alert_aggregation
+
+try:
+    import h2 # noqa: F401  Optional: required by httpx for HTTP/2
+    H2_AVAILABLE = True
+except ImportError:
+    H2_AVAILABLE = False
+
+# --- 공유 HTTP 클라이언트 (Connection Pool) 설정 ---
+# Every pipeline hop used to open a fresh httpx.AsyncClient per request, paying a
+# TCP (and in prod TLS) handshake per batch. Instead each process keeps one client
+# per target origin (scheme://host:port) with keep-alive connections, created
+# lazily and closed by the FastAPI lifespan (see http_client_lifespan).
+# HTTP/2 is negotiated via ALPN, so it only takes effect on https:// targets;
+# plain http:// in-cluster calls stay on pooled HTTP/1.1 keep-alive connections.
+HTTP_CLIENT_HTTP2 = os.environ.get("HTTP_CLIENT_HTTP2", "true").lower() == "true"
+HTTP_CLIENT_MAX_CONNECTIONS = int(os.environ.get("HTTP_CLIENT_MAX_CONNECTIONS", "100"))
+HTTP_CLIENT_MAX_KEEPALIVE = int(os.environ.get("HTTP_CLIENT_MAX_KEEPALIVE", "20"))
+HTTP_CLIENT_KEEPALIVE_EXPIRY = float(os.environ.get("HTTP_CLIENT_KEEPALIVE_EXPIRY", "30.0"))
+HTTP_CLIENT_CONNECT_TIMEOUT = float(os.environ.get("HTTP_CLIENT_CONNECT_TIMEOUT", "5.0"))
+HTTP_CLIENT_TIMEOUT = float(os.environ.get("HTTP_CLIENT_TIMEOUT", "30.0")) # Default read/write/pool timeout; call sites may override per request
+
+
+class _MetricsTransport(httpx.AsyncBaseTransport):
+    """Wraps the pooled transport and records request counts, errors, latency and in-flight requests."""
+
+    def __init__(self, transport: httpx.AsyncHTTPTransport):
+        self._transport = transport
+        self.requests = 0
+        self.errors = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.total_latency = 0.0
+        self.status_counts: Dict[str, int] = {}
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        self.requests += 1
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        start_time = time.perf_counter()
+        try:
+            response = await self._transport.handle_async_request(request)
+        except Exception:
+            self.errors += 1
+            raise
+        finally:
+            self.in_flight -= 1
+            self.total_latency += time.perf_counter() - start_time
+        status_class = f"{response.status_code // 100}xx"
+        self.status_counts[status_class] = self.status_counts.get(status_class, 0) + 1
+        return response
+
+    async def aclose(self) -> None:
+        await self._transport.aclose()
+
+    def pool_stats(self) -> Dict[str, int]:
+        """Connection counts from the underlying httpcore pool (best effort; internal API)."""
+        connections = getattr(getattr(self._transport, "_pool", None), "connections", None) or []
+        idle = sum(1 for connection in connections if connection.is_idle())
+        return {"connections": len(connections), "idle_connections": idle, "active_connections": len(connections) - idle}
+
+
+class HttpClientPool:
+    """
+    Process-wide registry of pooled httpx.AsyncClient instances, one per target origin.
+    Limits and timeouts come from the HTTP_CLIENT_* environment variables unless overridden.
+    """
+
+    def __init__(
+        self,
+        http2: bool = HTTP_CLIENT_HTTP2,
+        limits: Optional[httpx.Limits] = None,
+        timeout: Optional[httpx.Timeout] = None,
+    ):
+        if http2 and not H2_AVAILABLE:
+            logger.warning("HTTP/2 requested but the 'h2' package is not installed. Falling back to HTTP/1.1 keep-alive.")
+            http2 = False
+        self.http2 = http2
+        self.limits = limits or httpx.Limits(
+            max_connections=HTTP_CLIENT_MAX_CONNECTIONS,
+            max_keepalive_connections=HTTP_CLIENT_MAX_KEEPALIVE,
+            keepalive_expiry=HTTP_CLIENT_KEEPALIVE_EXPIRY,
+        )
+        self.timeout = timeout or httpx.Timeout(HTTP_CLIENT_TIMEOUT, connect=HTTP_CLIENT_CONNECT_TIMEOUT)
+        self._clients: Dict[str, httpx.AsyncClient] = {}
+        self._transports: Dict[str, _MetricsTransport] = {}
+
+    @staticmethod
+    def target_key(url: str) -> str:
+        """Origin (scheme://host:port) used to pick the connection pool for a URL."""
+        parsed = httpx.URL(url)
+        port = parsed.port or {"http": 80, "https": 443}.get(parsed.scheme)
+        return f"{parsed.scheme}://{parsed.host}:{port}"
+
+    def get_client(self, url: str) -> httpx.AsyncClient:
+        """Returns the pooled client for the target origin of `url`, creating it on first use."""
+        key = self.target_key(url)
+        client = self._clients.get(key)
+        if client is None or client.is_closed:
+            transport = _MetricsTransport(httpx.AsyncHTTPTransport(http2=self.http2, limits=self.limits))
+            client = httpx.AsyncClient(transport=transport, timeout=self.timeout)
+            self._clients[key] = client
+            self._transports[key] = transport
+            logger.info(f"Created pooled HTTP client for {key} (http2={self.http2}, max_connections={self.limits.max_connections}).")
+        return client
+
+    def metrics(self) -> Dict[str, Dict[str, Any]]:
+        """Per-target request and connection pool metrics."""
+        metrics = {}
+        for key, transport in self._transports.items():
+            metrics[key] = {
+                "requests": transport.requests,
+                "errors": transport.errors,
+                "in_flight": transport.in_flight,
+                "max_in_flight": transport.max_in_flight,
+                "avg_latency_ms": round(transport.total_latency / transport.requests * 1000, 3) if transport.requests else 0.0,
+                "status_counts": dict(transport.status_counts),
+                **transport.pool_stats(),
+            }
+        return metrics
+
+    async def aclose(self) -> None:
+        """Closes every pooled client (called on application shutdown)."""
+        for key, client in list(self._clients.items()):
+            await client.aclose()
+            logger.info(f"Closed pooled HTTP client for {key}.")
+        self._clients.clear()
+        self._transports.clear()
+
+
+# Process-wide default pool shared by all modules running in this process
+http_client_pool = HttpClientPool()
+
+
+def get_http_client(url: str) -> httpx.AsyncClient:
+    """Returns the shared pooled client for the target of `url`. Do not close it."""
+    return http_client_pool.get_client(url)
+
+
+@asynccontextmanager
+async def shared_http_client(url: str) -> AsyncIterator[httpx.AsyncClient]:
+    """
+    Drop-in replacement for `async with httpx.AsyncClient() as client:` that borrows the
+    pooled client for the target of `url` instead of opening (and closing) a new one.
+    """
+    yield http_client_pool.get_client(url)
+
+
+def get_http_pool_metrics() -> Dict[str, Dict[str, Any]]:
+    """Per-target metrics of the shared pool (for /health and monitoring)."""
+    return http_client_pool.metrics()
+
+
+@asynccontextmanager
+async def http_client_lifespan(app) -> AsyncIterator[None]:
+    """FastAPI lifespan handler: runs alert aggregation and closes the shared HTTP clients on shutdown. Use FastAPI(lifespan=http_client_lifespan)."""
+    await start_alert_aggregation()
+    yield
+    await stop_alert_aggregation()
+    await http_client_pool.aclose()
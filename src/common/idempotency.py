@@ -0,0 +1,154 @@
+# src/common/idempotency.py
+
+import hashlib
+import os
+import uuid
+from collections import OrderedDict
+from typing import List, Dict, Any, Iterable, Optional, Sequence, Set, Tuple
+
+from sqlalchemy import select, insert
+from sqlalchemy.orm import Session
+
+from common.utils import logger, IdempotencyKey
+from common.bulk_db import chunked
+
+# --- 멱등성 인덱스 (Idempotency Index) ---
+# FEP retransmits and /errors/{id}/retry resend trades that were already processed.
+# Each delivery is keyed by a hash of its trade content (not of transport fields such as
+# the raw row id), and processed keys are recorded in idempotency_keys under a unique
+# (scope, key) index in the same transaction as the stage's own writes.
+# An in-memory LRU in front of the table answers hot duplicates without a query; only
+# keys known to be committed are put in the LRU, so a rolled-back batch is never skipped.
+IDEMPOTENCY_LRU_SIZE = int(os.environ.get("IDEMPOTENCY_LRU_SIZE", "100000")) # Keys kept in memory per index
+
+# Source trade fields that identify a delivery (same set as the SwapData ingestion model)
+TRADE_KEY_FIELDS = (
+    "trade_id", "action", "instrument_type", "asset_class", "effective_date", "termination_date",
+    "notional_amount", "notional_currency", "party_a_lei", "party_b_lei", "price", "price_currency",
+)
+NUMERIC_KEY_FIELDS = frozenset(("notional_amount", "price"))
+
+
+def _key_value(name: str, value: Any) -> str:
+    if value is None:
+        return ""
+    if name in NUMERIC_KEY_FIELDS:
+        try:
+            return repr(float(value)) # 100, "100" and 100.0 are the same amount
+        except (ValueError, TypeError):
+            pass
+    return str(value).strip()
+
+
+def delivery_key(entry: Dict[str, Any]) -> str:
+    """Content hash of a source trade message; identical for every resend of the same message."""
+    canonical = "\x1f".join(_key_value(name, entry.get(name)) for name in TRADE_KEY_FIELDS)
+    return hashlib.blake2b(canonical.encode("utf-8"), digest_size=16).hexdigest()
+
+
+class IdempotencyIndex:
+    """
+    In-memory LRU of processed delivery keys backed by the idempotency_keys table.
+    DB methods take a sync Session (use `await db.run_sync(...)` from async code).
+    """
+
+    def __init__(self, scope: str, lru_size: int = IDEMPOTENCY_LRU_SIZE):
+        self.scope = scope
+        self.lru_size = max(0, lru_size)
+        self._lru: "OrderedDict[str, None]" = OrderedDict()
+        self.memory_hits = 0
+        self.db_hits = 0
+        self.misses = 0
+
+    def _touch(self, key: str) -> None:
+        if self.lru_size == 0:
+            return
+        self._lru[key] = None
+        self._lru.move_to_end(key)
+        while len(self._lru) > self.lru_size:
+            self._lru.popitem(last=False)
+
+    def remember(self, keys: Iterable[str]) -> None:
+        """Adds committed keys to the LRU. Call only after the transaction that recorded them commits."""
+        for key in keys:
+            self._touch(key)
+
+    def find_duplicates(self, db: Session, keys: Sequence[str]) -> Set[str]:
+        """
+        Returns the keys that were already processed: LRU first, then one IN (...) query
+        per chunk for the rest. Keys found in the table are added to the LRU.
+        """
+        duplicates: Set[str] = set()
+        unknown: List[str] = []
+        for key in dict.fromkeys(keys):
+            if key in self._lru:
+                self._lru.move_to_end(key)
+                duplicates.add(key)
+                self.memory_hits += 1
+            else:
+                unknown.append(key)
+
+        found_in_db = 0
+        for key_chunk in chunked(unknown):
+            rows = db.execute(
+                select(IdempotencyKey.idempotency_key)
+                .where(IdempotencyKey.scope == self.scope, IdempotencyKey.idempotency_key.in_(key_chunk))
+            )
+            for (key,) in rows:
+                duplicates.add(key)
+                self._touch(key)
+                found_in_db += 1
+        self.db_hits += found_in_db
+        self.misses += len(unknown) - found_in_db
+        return duplicates
+
+    def split_new(self, db: Session, entries: Sequence[Dict[str, Any]], replay: bool = False) -> Tuple[List[Tuple[Optional[str], Dict[str, Any]]], List[Dict[str, Any]]]:
+        """
+        Splits a batch into ([(key, entry)] to process, [duplicate entries]).
+        A key repeated inside the batch is processed once; later copies count as duplicates.
+        With replay=True (operator retries of errors, which resend the same payload) entries
+        whose key was already recorded are processed again, paired with key None so the
+        caller does not record the key a second time.
+        """
+        keyed = [(delivery_key(entry), entry) for entry in entries]
+        already_processed = self.find_duplicates(db, [key for key, _ in keyed])
+        new_entries: List[Tuple[Optional[str], Dict[str, Any]]] = []
+        duplicates: List[Dict[str, Any]] = []
+        batch_keys: Set[str] = set()
+        for key, entry in keyed:
+            if key in batch_keys or (key in already_processed and not replay):
+                duplicates.append(entry)
+                continue
+            batch_keys.add(key)
+            new_entries.append((None if key in already_processed else key, entry))
+        return new_entries, duplicates
+
+    def record(self, db: Session, rows: List[Dict[str, Any]]) -> None:
+        """
+        Inserts processed keys with one executemany. Each row carries idempotency_key and
+        optionally unique_transaction_identifier / record_id. A concurrent insert of the same
+        key violates the unique index and fails the caller's transaction (redelivery then dedups).
+        """
+        if not rows:
+            return
+        db.execute(insert(IdempotencyKey.__table__), [
+            {
+                "id": str(uuid.uuid4()),
+                "scope": self.scope,
+                "idempotency_key": row["idempotency_key"],
+                "unique_transaction_identifier": row.get("unique_transaction_identifier"),
+                "record_id": row.get("record_id"),
+            }
+            for row in rows
+        ])
+        logger.debug(f"Recorded {len(rows)} idempotency keys for scope '{self.scope}'.")
+
+    def metrics(self) -> Dict[str, Any]:
+        return {
+            "scope": self.scope,
+            "lru_size": len(self._lru),
+            "lru_capacity": self.lru_size,
+            "memory_hits": self.memory_hits,
+            "db_hits": self.db_hits,
+            "misses": self.misses,
+        }
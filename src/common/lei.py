@@ -0,0 +1,216 @@
+# src/common/lei.py
+
+import csv
+import hashlib
+import mmap
+import os
+import struct
+import threading
+from typing import List, Dict, Any, Iterable, Iterator, Optional, Sequence
+
+import numpy as np
+
+from common.utils import logger, validate_lei
+
+# --- LEI 검증 (ISO 17442 + GLEIF Golden Copy) ---
+# validate_lei (common/utils.py) checks the format and the MOD 97-10 check digits.
+# Existence is checked against a local copy of the GLEIF golden copy compiled into a
+# binary index: a Bloom filter followed by the LEIs as sorted fixed-width 20-byte
+# records. The file is memory-mapped read-only, so opening it costs a header read and
+# every worker process shares the same page-cache pages instead of loading its own
+# set of millions of strings. Lookups are vectorized over a batch: the Bloom filter
+# rejects most unknown LEIs without touching the sorted section, the rest are found
+# with one np.searchsorted (binary search) over the mapped records.
+# Use the batch functions (validate_leis / registered_leis) on per-record paths.
+GLEIF_INDEX_PATH = os.environ.get("GLEIF_INDEX_PATH", "") # Compiled index file; empty (and no golden copy) = existence check skipped
+GLEIF_GOLDEN_COPY_PATH = os.environ.get("GLEIF_GOLDEN_COPY_PATH", "") # Golden copy CSV; compiled to GLEIF_INDEX_PATH (default <csv>.leiidx) when missing or older
+GLEIF_BLOOM_BITS_PER_KEY = int(os.environ.get("GLEIF_BLOOM_BITS_PER_KEY", "10")) # ~1% false positives at 10 bits / 7 hashes
+
+LEI_LENGTH = 20
+INDEX_MAGIC = b"LEIIDX01"
+# magic, bloom hash count, reserved, bloom size in bytes, LEI count
+INDEX_HEADER = struct.Struct("<8sIIQQ")
+
+
+def validate_leis(leis: Sequence[Optional[str]]) -> List[bool]:
+    """Batch validate_lei (format + check digits): each distinct value is checked once."""
+    distinct = {lei: validate_lei(lei) for lei in set(leis) if isinstance(lei, str)}
+    return [distinct.get(lei, False) if isinstance(lei, str) else False for lei in leis]
+
+
+def _bloom_hash_count(bits_per_key: int) -> int:
+    return max(1, round(bits_per_key * 0.693)) # k = (m / n) ln 2 minimizes false positives
+
+
+def _bloom_positions(keys: Sequence[bytes], hash_count: int, bloom_bits: int) -> np.ndarray:
+    """(len(keys), hash_count) bit positions by double hashing one 128-bit blake2b digest per key."""
+    digests = b"".join(hashlib.blake2b(key, digest_size=16).digest() for key in keys)
+    halves = np.frombuffer(digests, dtype="<u8").reshape(-1, 2)
+    steps = np.arange(hash_count, dtype=np.uint64)
+    # uint64 arithmetic wraps around, identically at compile and lookup time
+    return (halves[:, :1] + steps * halves[:, 1:]) % np.uint64(bloom_bits)
+
+
+def read_golden_copy(source_path: str) -> Iterator[str]:
+    """
+    LEIs of a GLEIF golden copy file: a CSV with an 'LEI' column (the golden copy
+    concatenated format) or a plain list with one LEI per line.
+    """
+    with open(source_path, newline="", encoding="utf-8") as source:
+        first_line = source.readline()
+        source.seek(0)
+        if "LEI" in first_line and ("," in first_line or "\t" in first_line):
+            reader = csv.DictReader(source, dialect=csv.Sniffer().sniff(first_line, delimiters=",\t"))
+            column = next(name for name in reader.fieldnames if name.strip().strip('"') == "LEI")
+            for row in reader:
+                yield (row.get(column) or "").strip().upper()
+        else:
+            for line in source:
+                yield line.strip().upper()
+
+
+def compile_gleif_index(source_path: str, index_path: str, bits_per_key: int = GLEIF_BLOOM_BITS_PER_KEY) -> int:
+    """
+    Compiles a golden copy file into the binary index read by GleifIndex and returns the
+    number of LEIs. Written to a temporary file and renamed, so workers opening the index
+    concurrently never see a partial file.
+    """
+    leis = np.unique(np.array([lei for lei in read_golden_copy(source_path) if len(lei) == LEI_LENGTH], dtype=f"S{LEI_LENGTH}"))
+    hash_count = _bloom_hash_count(bits_per_key)
+    bloom_bytes = max(8, (len(leis) * bits_per_key + 7) // 8)
+    bloom = np.zeros(bloom_bytes, dtype=np.uint8)
+    if len(leis):
+        positions = _bloom_positions(leis.tolist(), hash_count, bloom_bytes * 8).ravel()
+        np.bitwise_or.at(bloom, (positions >> np.uint64(3)).astype(np.intp), np.left_shift(1, (positions & np.uint64(7)).astype(np.uint8)))
+
+    temporary_path = f"{index_path}.tmp-{os.getpid()}"
+    with open(temporary_path, "wb") as index_file:
+        index_file.write(INDEX_HEADER.pack(INDEX_MAGIC, hash_count, 0, bloom_bytes, len(leis)))
+        index_file.write(bloom.tobytes())
+        index_file.write(leis.tobytes())
+    os.replace(temporary_path, index_path)
+    logger.info(f"Compiled GLEIF index {index_path} with {len(leis)} LEIs from {source_path}.")
+    return len(leis)
+
+
+class GleifIndex:
+    """Read-only, memory-mapped LEI index built by compile_gleif_index."""
+
+    def __init__(self, index_path: str):
+        self.index_path = index_path
+        with open(index_path, "rb") as index_file:
+            self._mmap = mmap.mmap(index_file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, self.hash_count, _, bloom_bytes, count = INDEX_HEADER.unpack_from(self._mmap, 0)
+        if magic != INDEX_MAGIC:
+            self._mmap.close()
+            raise ValueError(f"{index_path} is not a compiled GLEIF index")
+        self.bloom_bits = bloom_bytes * 8
+        # Views over the mapping: nothing is copied into the process heap
+        self._bloom = np.frombuffer(self._mmap, dtype=np.uint8, count=bloom_bytes, offset=INDEX_HEADER.size)
+        self._leis = np.frombuffer(self._mmap, dtype=f"S{LEI_LENGTH}", count=count, offset=INDEX_HEADER.size + bloom_bytes)
+        self.lookups = 0
+        self.bloom_rejects = 0
+        self.hits = 0
+
+    def __len__(self) -> int:
+        return len(self._leis)
+
+    def contains_many(self, leis: Sequence[str]) -> np.ndarray:
+        """Boolean array: which of `leis` are in the golden copy."""
+        found = np.zeros(len(leis), dtype=bool)
+        if not len(leis) or not len(self._leis):
+            return found
+        keys = [lei.encode("ascii", "replace") if isinstance(lei, str) else b"" for lei in leis]
+        positions = _bloom_positions(keys, self.hash_count, self.bloom_bits)
+        bits = (self._bloom[(positions >> np.uint64(3)).astype(np.intp)] >> (positions & np.uint64(7)).astype(np.uint8)) & 1
+        candidates = np.flatnonzero(bits.all(axis=1))
+        if len(candidates):
+            wanted = np.array([keys[row] for row in candidates], dtype=f"S{LEI_LENGTH}")
+            slots = np.searchsorted(self._leis, wanted)
+            in_range = slots < len(self._leis)
+            found[candidates[in_range]] = self._leis[slots[in_range]] == wanted[in_range]
+        self.lookups += len(leis)
+        self.bloom_rejects += len(leis) - len(candidates)
+        self.hits += int(found.sum())
+        return found
+
+    def contains(self, lei: str) -> bool:
+        return bool(self.contains_many([lei])[0])
+
+    def close(self) -> None:
+        self._bloom = self._leis = None
+        self._mmap.close()
+
+    def metrics(self) -> Dict[str, Any]:
+        return {
+            "index_path": self.index_path,
+            "lei_count": len(self._leis),
+            "lookups": self.lookups,
+            "bloom_rejects": self.bloom_rejects,
+            "hits": self.hits,
+        }
+
+
+_gleif_index: Optional[GleifIndex] = None
+_gleif_index_loaded = False
+_gleif_index_lock = threading.Lock()
+
+
+def get_gleif_index() -> Optional[GleifIndex]:
+    """
+    Process-wide index, opened on first use: GLEIF_INDEX_PATH, compiled first from
+    GLEIF_GOLDEN_COPY_PATH when the index is missing or older than the golden copy.
+    None when neither is configured or the index cannot be opened.
+    """
+    global _gleif_index, _gleif_index_loaded
+    if _gleif_index_loaded:
+        return _gleif_index
+    with _gleif_index_lock:
+        if _gleif_index_loaded:
+            return _gleif_index
+        index_path = GLEIF_INDEX_PATH or (f"{GLEIF_GOLDEN_COPY_PATH}.leiidx" if GLEIF_GOLDEN_COPY_PATH else "")
+        try:
+            if GLEIF_GOLDEN_COPY_PATH and (not os.path.exists(index_path)
+                                           or os.path.getmtime(index_path) < os.path.getmtime(GLEIF_GOLDEN_COPY_PATH)):
+                compile_gleif_index(GLEIF_GOLDEN_COPY_PATH, index_path)
+            if index_path:
+                _gleif_index = GleifIndex(index_path)
+                logger.info(f"Opened GLEIF index {index_path} ({len(_gleif_index)} LEIs).")
+        except (OSError, ValueError) as e:
+            logger.error(f"GLEIF index {index_path} unavailable, LEI existence check disabled: {e}")
+            _gleif_index = None
+        _gleif_index_loaded = True
+    return _gleif_index
+
+
+def set_gleif_index(index: Optional[GleifIndex]) -> None:
+    """Replaces the process-wide index (tests, or after compiling a new golden copy)."""
+    global _gleif_index, _gleif_index_loaded
+    with _gleif_index_lock:
+        _gleif_index, _gleif_index_loaded = index, True
+
+
+def registered_leis(leis: Sequence[Optional[str]]) -> List[bool]:
+    """
+    Batch existence check against the golden copy. False only for well-formed LEIs that
+    are not in the index (malformed values are the format check's concern); all True
+    when no index is configured.
+    """
+    index = get_gleif_index()
+    if index is None:
+        return [True] * len(leis)
+    well_formed = validate_leis(leis)
+    candidates = [lei for lei, valid in zip(leis, well_formed) if valid]
+    found = iter(index.contains_many(candidates).tolist())
+    return [next(found) if valid else True for valid in well_formed]
+
+
+def get_lei_metrics() -> Optional[Dict[str, Any]]:
+    index = get_gleif_index()
+    return index.metrics() if index is not None else None
+
+
+if __name__ == "__main__":
+    # python -m common.lei <golden-copy.csv> <index-path>   (run from src/)
+    import sys
+    compile_gleif_index(sys.argv[1], sys.argv[2])
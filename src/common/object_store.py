@@ -0,0 +1,427 @@
+# src/common/object_store.py
+
+import asyncio
+import hashlib
+import json
+import mmap
+import os
+import shutil
+import time
+import uuid
+from abc import ABC, abstractmethod
+from dataclasses import dataclass, asdict
+from datetime import datetime
+from typing import List, Dict, Any, Optional, Tuple, Union, Iterable, AsyncIterable, AsyncIterator, Callable
+
+from common.utils import logger
+from common.report_source import ReportSource, REPORT_CHUNK_BYTES
+
+# --- 보고서 객체 저장소 (Report Object Store) ---
+# Shared by report-generation (writes) and report-submission (reads), replacing the
+# per-module in-memory SimulatedCloudStorage. Objects are never held in memory as a whole:
+# writers stream into a staging file (or a multipart upload) that is committed into the
+# store, readers get a ReportSource that streams the object in chunks.
+# The local backend is content-addressed:
+#   {root}/blobs/ab/abcdef...                     object content, named by its SHA-256 (identical reports stored once)
+#   {root}/refs/{bucket}/{object_name}.json       object name -> {"sha256", "size", "created_at"}
+#   {root}/uploads/{upload_id}/                   multipart upload parts
+#   {root}/tmp/                                   staging files
+# Every write goes to a temp file that is fsynced and renamed into place, so readers never
+# see a partial blob or ref. Blobs are immutable, which lets reads memory-map them.
+# Backends are pluggable: register e.g. an S3-compatible implementation under a new name
+# and select it with OBJECT_STORE_BACKEND.
+OBJECT_STORE_BACKEND = os.environ.get("OBJECT_STORE_BACKEND", "local") # local (files under OBJECT_STORE_ROOT)
+OBJECT_STORE_ROOT = os.environ.get("OBJECT_STORE_ROOT", "/tmp/swap-object-store") # Must be shared by report-generation and report-submission
+OBJECT_STORE_FSYNC = os.environ.get("OBJECT_STORE_FSYNC", "1") == "1" # fsync before rename (durability across power loss)
+OBJECT_STORE_GC_GRACE_SECONDS = float(os.environ.get("OBJECT_STORE_GC_GRACE_SECONDS", "3600")) # Unreferenced blobs younger than this are kept
+CLOUD_STORAGE_BUCKET_NAME = os.environ.get("CLOUD_STORAGE_BUCKET_NAME", "my-swap-reports-bucket")
+
+Chunks = Union[bytes, Iterable[bytes], AsyncIterable[bytes]]
+
+
+@dataclass
+class ObjectInfo:
+    object_name: str
+    bucket: str
+    size: int
+    sha256: str
+    created_at: str
+    deduplicated: bool = False # Content was already stored under another (or the same) name
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+class ObjectStore(ABC):
+    """Async object store interface (one bucket per instance)."""
+
+    scheme: str = "store"
+
+    def __init__(self, bucket_name: str = CLOUD_STORAGE_BUCKET_NAME):
+        self.bucket_name = bucket_name
+
+    def uri(self, object_name: str) -> str:
+        """Storage path recorded in generated_reports.report_storage_path."""
+        return f"{self.scheme}://{self.bucket_name}/{object_name}"
+
+    @abstractmethod
+    async def put_stream(self, chunks: Chunks, object_name: str) -> ObjectInfo:
+        """Stores the concatenated chunks as `object_name` (replacing any previous object)."""
+
+    @abstractmethod
+    async def put_file(self, path: str, object_name: str, move: bool = False) -> ObjectInfo:
+        """Stores a local file; with move=True the file is taken over (renamed) instead of copied when possible."""
+
+    @abstractmethod
+    def staging_path(self, suffix: str = "") -> str:
+        """Path for writing a file that will be committed with put_file(..., move=True)."""
+
+    @abstractmethod
+    async def open_source(self, object_name: str) -> ReportSource:
+        """Streamed reader of the object. Raises FileNotFoundError when missing."""
+
+    @abstractmethod
+    async def stat(self, object_name: str) -> Optional[ObjectInfo]:
+        """Object metadata, or None when missing."""
+
+    @abstractmethod
+    async def delete_object(self, object_name: str) -> bool:
+        """Deletes the object; returns False when it did not exist."""
+
+    @abstractmethod
+    async def create_multipart_upload(self, object_name: str) -> str:
+        """Starts a multipart upload and returns its id."""
+
+    @abstractmethod
+    async def upload_part(self, upload_id: str, part_number: int, chunks: Chunks) -> Dict[str, Any]:
+        """Stores one part (re-uploading a part number replaces it). Returns {"part_number", "size", "sha256"}."""
+
+    @abstractmethod
+    async def list_parts(self, upload_id: str) -> List[Dict[str, Any]]:
+        """Parts received so far, by part number (for resuming). Raises KeyError for unknown uploads."""
+
+    @abstractmethod
+    async def complete_multipart_upload(self, upload_id: str, part_numbers: Optional[List[int]] = None) -> ObjectInfo:
+        """Assembles the parts (all, or `part_numbers` in order) into the object."""
+
+    @abstractmethod
+    async def abort_multipart_upload(self, upload_id: str) -> None:
+        """Discards the upload and its parts."""
+
+    # --- SimulatedCloudStorage compatible interface ---
+
+    async def upload_file(self, file_content: bytes, object_name: str) -> Dict[str, Any]:
+        """Stores small in-memory content. Prefer put_stream / put_file for reports."""
+        info = await self.put_stream(file_content, object_name)
+        return {"object_name": object_name, "bucket": self.bucket_name, "size": info.size, "sha256": info.sha256}
+
+    async def download_file(self, object_name: str) -> Optional[bytes]:
+        """Reads the whole object into memory (None when missing). Prefer open_source for reports."""
+        try:
+            source = await self.open_source(object_name)
+        except FileNotFoundError:
+            logger.warning(f"Object '{object_name}' not found in bucket '{self.bucket_name}'.")
+            return None
+        return b"".join([chunk async for chunk in source.iter_chunks()])
+
+
+async def _iter_chunks(chunks: Chunks) -> AsyncIterator[bytes]:
+    if isinstance(chunks, (bytes, bytearray, memoryview)):
+        yield bytes(chunks)
+    elif hasattr(chunks, "__aiter__"):
+        async for chunk in chunks:
+            yield chunk
+    else:
+        for chunk in chunks:
+            yield chunk
+
+
+class MappedReportSource(ReportSource):
+    """Reads an immutable local blob through a read-only memory map (no read syscalls or thread hops per chunk)."""
+
+    def __init__(self, path: str, name: str, size: int):
+        self.path = path
+        self.name = name
+        self.size = size
+
+    async def iter_range(self, offset: int, length: int, chunk_size: int = REPORT_CHUNK_BYTES) -> AsyncIterator[bytes]:
+        end = min(offset + length, self.size)
+        if end <= offset:
+            return
+        with open(self.path, "rb") as blob_file, mmap.mmap(blob_file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            for start in range(offset, end, chunk_size):
+                yield mapped[start:min(start + chunk_size, end)] # One chunk copied at a time
+
+
+class LocalObjectStore(ObjectStore):
+    """Content-addressed object store on a local (or shared network) file system."""
+
+    scheme = "local"
+
+    def __init__(self, root: str = OBJECT_STORE_ROOT, bucket_name: str = CLOUD_STORAGE_BUCKET_NAME, fsync: bool = OBJECT_STORE_FSYNC):
+        super().__init__(bucket_name)
+        self.root = root
+        self.fsync = fsync
+        for directory in ("blobs", "refs", "uploads", "tmp"):
+            os.makedirs(os.path.join(root, directory), exist_ok=True)
+
+    # --- Paths ---
+
+    def _blob_path(self, sha256: str) -> str:
+        return os.path.join(self.root, "blobs", sha256[:2], sha256)
+
+    def _ref_path(self, object_name: str) -> str:
+        parts = object_name.split("/")
+        if not object_name or object_name.startswith("/") or any(part in ("", ".", "..") for part in parts):
+            raise ValueError(f"Invalid object name: {object_name!r}")
+        return os.path.join(self.root, "refs", self.bucket_name, *parts) + ".json"
+
+    def _upload_dir(self, upload_id: str) -> str:
+        if not upload_id or os.sep in upload_id or upload_id in (".", ".."):
+            raise KeyError(upload_id)
+        return os.path.join(self.root, "uploads", upload_id)
+
+    def staging_path(self, suffix: str = "") -> str:
+        return os.path.join(self.root, "tmp", f"{uuid.uuid4().hex}{suffix}")
+
+    # --- Blocking helpers (run in worker threads) ---
+
+    def _sync(self, handle) -> None:
+        if self.fsync:
+            handle.flush()
+            os.fsync(handle.fileno())
+
+    def _write_atomic(self, path: str, content: bytes) -> None:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        temp_path = self.staging_path()
+        with open(temp_path, "wb") as handle:
+            handle.write(content)
+            self._sync(handle)
+        os.replace(temp_path, path)
+
+    def _commit_blob(self, temp_path: str, sha256: str) -> bool:
+        """Moves a fully written (and synced) temp file to its blob path. Returns True when the content was already stored."""
+        blob_path = self._blob_path(sha256)
+        if os.path.exists(blob_path):
+            os.remove(temp_path)
+            os.utime(blob_path) # Keeps the blob out of a concurrent garbage collection's grace window
+            return True
+        os.makedirs(os.path.dirname(blob_path), exist_ok=True)
+        os.replace(temp_path, blob_path)
+        return False
+
+    def _write_ref(self, object_name: str, sha256: str, size: int, deduplicated: bool) -> ObjectInfo:
+        info = ObjectInfo(object_name, self.bucket_name, size, sha256, datetime.utcnow().isoformat(), deduplicated)
+        self._write_atomic(self._ref_path(object_name), json.dumps({"sha256": sha256, "size": size, "created_at": info.created_at}).encode())
+        return info
+
+    def _read_ref(self, object_name: str) -> Optional[Dict[str, Any]]:
+        try:
+            with open(self._ref_path(object_name), "rb") as handle:
+                return json.loads(handle.read())
+        except FileNotFoundError:
+            return None
+
+    def _hash_file(self, path: str) -> Tuple[str, int]:
+        digest = hashlib.sha256()
+        size = 0
+        with open(path, "rb") as handle:
+            while True:
+                chunk = handle.read(REPORT_CHUNK_BYTES)
+                if not chunk:
+                    break
+                digest.update(chunk)
+                size += len(chunk)
+        return digest.hexdigest(), size
+
+    def _put_file(self, path: str, object_name: str, move: bool) -> ObjectInfo:
+        self._ref_path(object_name) # Validates the name before any data is moved
+        sha256, size = self._hash_file(path)
+        if move:
+            temp_path = self.staging_path()
+            try:
+                os.replace(path, temp_path)
+            except OSError: # e.g. a different file system: copy instead
+                shutil.copyfile(path, temp_path)
+                os.remove(path)
+        else:
+            temp_path = self.staging_path()
+            shutil.copyfile(path, temp_path)
+        if self.fsync:
+            with open(temp_path, "rb+") as handle:
+                os.fsync(handle.fileno())
+        deduplicated = self._commit_blob(temp_path, sha256)
+        return self._write_ref(object_name, sha256, size, deduplicated)
+
+    # --- Writes ---
+
+    async def _write_stream(self, chunks: Chunks) -> Tuple[str, str, int]:
+        """Streams chunks into a new temp file; returns (temp_path, sha256, size)."""
+        temp_path = self.staging_path()
+        digest = hashlib.sha256()
+        size = 0
+        handle = await asyncio.to_thread(open, temp_path, "wb")
+        try:
+            async for chunk in _iter_chunks(chunks):
+                digest.update(chunk)
+                size += len(chunk)
+                await asyncio.to_thread(handle.write, chunk)
+            await asyncio.to_thread(self._sync, handle)
+        except BaseException:
+            handle.close()
+            os.remove(temp_path)
+            raise
+        await asyncio.to_thread(handle.close)
+        return temp_path, digest.hexdigest(), size
+
+    async def put_stream(self, chunks: Chunks, object_name: str) -> ObjectInfo:
+        self._ref_path(object_name)
+        temp_path, sha256, size = await self._write_stream(chunks)
+        deduplicated = await asyncio.to_thread(self._commit_blob, temp_path, sha256)
+        info = await asyncio.to_thread(self._write_ref, object_name, sha256, size, deduplicated)
+        logger.info(f"Stored object '{object_name}' in bucket '{self.bucket_name}' ({size} bytes{', deduplicated' if deduplicated else ''}).")
+        return info
+
+    async def put_file(self, path: str, object_name: str, move: bool = False) -> ObjectInfo:
+        info = await asyncio.to_thread(self._put_file, path, object_name, move)
+        logger.info(f"Stored object '{object_name}' in bucket '{self.bucket_name}' from {path} ({info.size} bytes{', deduplicated' if info.deduplicated else ''}).")
+        return info
+
+    # --- Reads ---
+
+    async def stat(self, object_name: str) -> Optional[ObjectInfo]:
+        ref = await asyncio.to_thread(self._read_ref, object_name)
+        if ref is None:
+            return None
+        return ObjectInfo(object_name, self.bucket_name, ref["size"], ref["sha256"], ref["created_at"])
+
+    async def open_source(self, object_name: str) -> ReportSource:
+        info = await self.stat(object_name)
+        if info is None:
+            raise FileNotFoundError(f"Object not found in bucket '{self.bucket_name}': {object_name}")
+        return MappedReportSource(self._blob_path(info.sha256), object_name, info.size)
+
+    async def delete_object(self, object_name: str) -> bool:
+        """Removes the name only; the blob is reclaimed by collect_garbage once no name refers to it."""
+        try:
+            await asyncio.to_thread(os.remove, self._ref_path(object_name))
+            return True
+        except FileNotFoundError:
+            return False
+
+    def collect_garbage(self, grace_seconds: float = OBJECT_STORE_GC_GRACE_SECONDS) -> int:
+        """Deletes blobs no ref (in any bucket) points to and staging files older than the grace period. Blocking."""
+        referenced = set()
+        for directory, _, filenames in os.walk(os.path.join(self.root, "refs")):
+            for filename in filenames:
+                if filename.endswith(".json"):
+                    with open(os.path.join(directory, filename), "rb") as handle:
+                        referenced.add(json.loads(handle.read())["sha256"])
+        cutoff = time.time() - grace_seconds
+        removed = 0
+        for directory in (os.path.join(self.root, "blobs"), os.path.join(self.root, "tmp")):
+            for parent, _, filenames in os.walk(directory):
+                for filename in filenames:
+                    path = os.path.join(parent, filename)
+                    if filename not in referenced and os.path.getmtime(path) < cutoff:
+                        os.remove(path)
+                        removed += 1
+        if removed:
+            logger.info(f"Object store garbage collection removed {removed} unreferenced files under {self.root}.")
+        return removed
+
+    # --- Multipart upload ---
+
+    async def create_multipart_upload(self, object_name: str) -> str:
+        self._ref_path(object_name)
+        upload_id = uuid.uuid4().hex
+        manifest = json.dumps({"object_name": object_name, "created_at": datetime.utcnow().isoformat()}).encode()
+        await asyncio.to_thread(self._write_atomic, os.path.join(self._upload_dir(upload_id), "manifest.json"), manifest)
+        return upload_id
+
+    def _read_manifest(self, upload_id: str) -> Dict[str, Any]:
+        try:
+            with open(os.path.join(self._upload_dir(upload_id), "manifest.json"), "rb") as handle:
+                return json.loads(handle.read())
+        except FileNotFoundError:
+            raise KeyError(upload_id)
+
+    async def upload_part(self, upload_id: str, part_number: int, chunks: Chunks) -> Dict[str, Any]:
+        await asyncio.to_thread(self._read_manifest, upload_id)
+        temp_path, sha256, size = await self._write_stream(chunks)
+        part = {"part_number": part_number, "size": size, "sha256": sha256}
+        part_path = os.path.join(self._upload_dir(upload_id), f"part-{part_number:05d}")
+        await asyncio.to_thread(os.replace, temp_path, part_path)
+        await asyncio.to_thread(self._write_atomic, part_path + ".json", json.dumps(part).encode())
+        return part
+
+    def _list_parts(self, upload_id: str) -> List[Dict[str, Any]]:
+        self._read_manifest(upload_id)
+        upload_dir = self._upload_dir(upload_id)
+        parts = []
+        for filename in sorted(os.listdir(upload_dir)):
+            if filename.startswith("part-") and filename.endswith(".json"):
+                with open(os.path.join(upload_dir, filename), "rb") as handle:
+                    parts.append(json.loads(handle.read()))
+        return parts
+
+    async def list_parts(self, upload_id: str) -> List[Dict[str, Any]]:
+        return await asyncio.to_thread(self._list_parts, upload_id)
+
+    def _complete(self, upload_id: str, part_numbers: Optional[List[int]]) -> ObjectInfo:
+        object_name = self._read_manifest(upload_id)["object_name"]
+        upload_dir = self._upload_dir(upload_id)
+        available = {part["part_number"]: part for part in self._list_parts(upload_id)}
+        numbers = part_numbers if part_numbers is not None else sorted(available)
+        missing = [number for number in numbers if number not in available]
+        if missing or not numbers:
+            raise ValueError(f"Multipart upload {upload_id} is missing parts: {missing or 'all'}")
+
+        temp_path = self.staging_path()
+        digest = hashlib.sha256()
+        size = 0
+        with open(temp_path, "wb") as target:
+            for number in numbers: # Parts are copied through a fixed buffer, never loaded whole
+                with open(os.path.join(upload_dir, f"part-{number:05d}"), "rb") as part_file:
+                    while True:
+                        chunk = part_file.read(REPORT_CHUNK_BYTES)
+                        if not chunk:
+                            break
+                        digest.update(chunk)
+                        size += len(chunk)
+                        target.write(chunk)
+            self._sync(target)
+        sha256 = digest.hexdigest()
+        deduplicated = self._commit_blob(temp_path, sha256)
+        info = self._write_ref(object_name, sha256, size, deduplicated)
+        shutil.rmtree(upload_dir, ignore_errors=True)
+        return info
+
+    async def complete_multipart_upload(self, upload_id: str, part_numbers: Optional[List[int]] = None) -> ObjectInfo:
+        info = await asyncio.to_thread(self._complete, upload_id, part_numbers)
+        logger.info(f"Completed multipart upload {upload_id} as '{info.object_name}' ({info.size} bytes{', deduplicated' if info.deduplicated else ''}).")
+        return info
+
+    async def abort_multipart_upload(self, upload_id: str) -> None:
+        await asyncio.to_thread(shutil.rmtree, self._upload_dir(upload_id), True)
+
+
+# --- Backend registry (pluggable: register e.g. an S3-compatible implementation under a new name) ---
+_OBJECT_STORE_BACKENDS: Dict[str, Callable[..., ObjectStore]] = {"local": LocalObjectStore}
+_object_stores: Dict[str, ObjectStore] = {}
+
+
+def register_object_store_backend(backend_name: str, factory: Callable[..., ObjectStore]) -> None:
+    """Registers an ObjectStore implementation selectable via OBJECT_STORE_BACKEND."""
+    _OBJECT_STORE_BACKENDS[backend_name] = factory
+
+
+def get_object_store(bucket_name: str = CLOUD_STORAGE_BUCKET_NAME) -> ObjectStore:
+    """Returns the process-wide store for `bucket_name` using the configured backend."""
+    store = _object_stores.get(bucket_name)
+    if store is None:
+        factory = _OBJECT_STORE_BACKENDS.get(OBJECT_STORE_BACKEND)
+        if factory is None:
+            raise ValueError(f"Unknown OBJECT_STORE_BACKEND '{OBJECT_STORE_BACKEND}'. Registered: {sorted(_OBJECT_STORE_BACKENDS)}")
+        store = _object_stores[bucket_name] = factory(bucket_name=bucket_name)
+    return store
@@ -0,0 +1,142 @@
+# src/common/pagination.py
+
+import base64
+import json
+import os
+import threading
+import time
+from datetime import datetime
+from typing import Any, Dict, Hashable, List, Optional, Tuple
+
+from sqlalchemy import text, tuple_
+from sqlalchemy.orm import Query, Session
+
+from common.utils import logger
+
+# --- Keyset (cursor) 페이지네이션 및 저비용 count ---
+# Admin list endpoints page newest-first on (timestamp, id). Instead of OFFSET (which
+# scans and discards every skipped row) the next page starts strictly after the last
+# row returned, encoded as an opaque `next_cursor`. The id tie-breaker keeps the order
+# total when several rows share a timestamp (e.g. a bulk insert).
+# COUNT(*) over a large table costs as much as the scan itself, so totals are estimated
+# (PostgreSQL planner statistics for unfiltered lists) or served from a short TTL cache;
+# callers opt in to an exact count with exact_count=true.
+PAGINATION_COUNT_CACHE_TTL = float(os.environ.get("PAGINATION_COUNT_CACHE_TTL", "30")) # Seconds a cached count is reused
+PAGINATION_COUNT_CACHE_SIZE = int(os.environ.get("PAGINATION_COUNT_CACHE_SIZE", "1024")) # Max cached filter combinations
+
+
+class InvalidCursorError(ValueError):
+    """Raised when a cursor is malformed or was not produced by encode_cursor."""
+
+
+def encode_cursor(timestamp: datetime, record_id: str) -> str:
+    """Opaque cursor for the position (timestamp, id)."""
+    raw = json.dumps([timestamp.isoformat(), record_id], separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, str]:
+    """Inverse of encode_cursor. Raises InvalidCursorError for anything else."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        timestamp, record_id = json.loads(raw)
+        return datetime.fromisoformat(timestamp), str(record_id)
+    except (ValueError, TypeError) as e:
+        raise InvalidCursorError(f"Invalid pagination cursor: {cursor!r}") from e
+
+
+def paginate_keyset(
+    query: Query,
+    timestamp_column,
+    id_column,
+    limit: int,
+    cursor: Optional[str] = None,
+    offset: int = 0,
+) -> Tuple[List[Any], Optional[str]]:
+    """
+    Returns up to `limit` rows of `query` ordered by (timestamp_column, id_column) descending,
+    starting after `cursor`, and the cursor of the next page (None on the last page).
+    `offset` is only honoured without a cursor, for clients still paging by offset.
+    """
+    if cursor:
+        cursor_timestamp, cursor_id = decode_cursor(cursor)
+        # Row-value comparison so PostgreSQL/SQLite seek into the (timestamp, id) index instead of scanning it
+        query = query.filter(tuple_(timestamp_column, id_column) < tuple_(cursor_timestamp, cursor_id))
+    query = query.order_by(timestamp_column.desc(), id_column.desc())
+    if offset and not cursor:
+        query = query.offset(offset)
+
+    rows = query.limit(limit + 1).all() # One extra row tells whether another page exists
+    if len(rows) <= limit:
+        return rows, None
+    rows = rows[:limit]
+    last_row = rows[-1]
+    return rows, encode_cursor(getattr(last_row, timestamp_column.key), getattr(last_row, id_column.key))
+
+
+class _CountCache:
+    """Thread-safe TTL cache of counts keyed by (table, filters)."""
+
+    def __init__(self, ttl: float, max_size: int):
+        self.ttl = ttl
+        self.max_size = max_size
+        self._entries: Dict[Hashable, Tuple[float, int]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable) -> Optional[int]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] < time.monotonic():
+                return None
+            return entry[1]
+
+    def put(self, key: Hashable, count: int) -> None:
+        with self._lock:
+            if len(self._entries) >= self.max_size:
+                now = time.monotonic()
+                self._entries = {k: v for k, v in self._entries.items() if v[0] >= now}
+                if len(self._entries) >= self.max_size:
+                    self._entries.pop(next(iter(self._entries)))
+            self._entries[key] = (time.monotonic() + self.ttl, count)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+count_cache = _CountCache(PAGINATION_COUNT_CACHE_TTL, PAGINATION_COUNT_CACHE_SIZE)
+
+
+def _estimated_row_count(db: Session, table_name: str) -> Optional[int]:
+    """Planner estimate of the table's row count (PostgreSQL only; None if unavailable)."""
+    if db.get_bind().dialect.name != "postgresql":
+        return None
+    try:
+        estimate = db.execute(text("SELECT reltuples::bigint FROM pg_class WHERE relname = :table_name"), {"table_name": table_name}).scalar()
+    except Exception as e:
+        logger.warning(f"Could not read row estimate for {table_name}: {e}")
+        return None
+    return estimate if estimate is not None and estimate >= 0 else None # -1: table never analyzed
+
+
+def count_rows(db: Session, query: Query, table_name: str, filters: Dict[str, Any], exact: bool = False) -> Tuple[int, str]:
+    """
+    Total row count for a list endpoint and how it was obtained: "exact", "estimated" or "cached".
+    `filters` are the endpoint's active filter values and key the cache.
+    """
+    if exact:
+        return query.count(), "exact"
+
+    active_filters = tuple(sorted((name, value) for name, value in filters.items() if value is not None))
+    if not active_filters:
+        estimate = _estimated_row_count(db, table_name)
+        if estimate is not None:
+            return estimate, "estimated"
+
+    cache_key = (table_name, active_filters)
+    cached = count_cache.get(cache_key)
+    if cached is not None:
+        return cached, "cached"
+    total = query.count()
+    count_cache.put(cache_key, total)
+    return total, "exact"
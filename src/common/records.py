@@ -0,0 +1,158 @@
+# src/common/records.py
+
+import json
+from dataclasses import dataclass, field
+from datetime import datetime
+from operator import attrgetter, itemgetter
+from typing import List, Dict, Any, Iterable, Optional, Sequence, Tuple
+
+from sqlalchemy import select
+
+from common.utils import ProcessedSwapDataDB
+
+try:
+    import orjson # Optional: serializes slotted dataclasses natively, much faster than json
+except ImportError:
+    orjson = None
+
+try:
+    import msgpack # Optional: binary wire format
+except ImportError:
+    msgpack = None
+
+# --- 공용 레코드 타입 (Canonical Swap Record) ---
+# One compact type for a processed swap row across the pipeline. Processing used to build
+# dicts/ORM objects, validation re-parsed every queue payload into a Pydantic model and dumped
+# it again for the next hop, and report generation read dicts once more.
+# SwapRecord is a slotted dataclass (no per-instance __dict__) whose fields are the
+# processed_swap_data columns in table order, so it maps to SQLAlchemy Core rows and
+# positional tuples without a translation layer, and to JSON/msgpack in one call.
+# Pydantic models remain the HTTP API contract; inside the pipeline use SwapRecord.
+
+# processed_swap_data columns, in SwapRecord field order
+SWAP_RECORD_FIELDS = (
+    "id", "unique_transaction_identifier", "reporting_counterparty_lei", "other_counterparty_lei",
+    "action_type", "event_type", "asset_class", "effective_date", "termination_date",
+    "notional_amount", "notional_currency", "price", "price_currency",
+    "processing_status", "processing_errors", "original_raw_data_id", "processing_timestamp", "validation_status",
+    "report_status", "generated_report_id",
+)
+WIRE_FORMATS = ("json", "msgpack")
+
+
+@dataclass(slots=True)
+class SwapRecord:
+    """A processed swap row. Field order matches SWAP_RECORD_FIELDS / the processed_swap_data table."""
+    id: Optional[str] = None
+    unique_transaction_identifier: Optional[str] = None
+    reporting_counterparty_lei: Optional[str] = None
+    other_counterparty_lei: Optional[str] = None
+    action_type: Optional[str] = None
+    event_type: Optional[str] = None
+    asset_class: Optional[str] = None
+    effective_date: Optional[str] = None
+    termination_date: Optional[str] = None
+    notional_amount: Optional[float] = None
+    notional_currency: Optional[str] = None
+    price: Optional[float] = None
+    price_currency: Optional[str] = None
+    processing_status: str = "Processed"
+    processing_errors: List[str] = field(default_factory=list)
+    original_raw_data_id: Optional[str] = None
+    processing_timestamp: Optional[datetime] = None
+    validation_status: str = "Pending"
+    report_status: Optional[str] = None # Set by report generation; a new life-cycle event of the trade resets it
+    generated_report_id: Optional[str] = None
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "SwapRecord":
+        """From a wire dict (stage queue payload, API body). Missing fields take their defaults."""
+        try:
+            record = cls(*_payload_values(data)) # Complete payloads (what to_dict produces): one C-level lookup
+        except KeyError:
+            record = cls(*[data.get(name) for name in SWAP_RECORD_FIELDS])
+        if record.processing_status is None:
+            record.processing_status = "Processed"
+        if record.processing_errors is None:
+            record.processing_errors = []
+        if record.validation_status is None:
+            record.validation_status = "Pending"
+        if isinstance(record.processing_timestamp, str):
+            record.processing_timestamp = datetime.fromisoformat(record.processing_timestamp)
+        return record
+
+    def to_tuple(self) -> Tuple[Any, ...]:
+        return _record_values(self)
+
+    def to_row(self) -> Dict[str, Any]:
+        """processed_swap_data row for a SQLAlchemy Core insert/update (datetime kept as is)."""
+        return dict(zip(SWAP_RECORD_FIELDS, _record_values(self)))
+
+    def to_dict(self) -> Dict[str, Any]:
+        """JSON-compatible wire dict (stage queue payloads, error reports)."""
+        data = dict(zip(SWAP_RECORD_FIELDS, _record_values(self)))
+        if data["processing_timestamp"] is not None:
+            data["processing_timestamp"] = data["processing_timestamp"].isoformat()
+        return data
+
+
+_record_values = attrgetter(*SWAP_RECORD_FIELDS)
+_payload_values = itemgetter(*SWAP_RECORD_FIELDS)
+
+
+def records_to_rows(records: Iterable[SwapRecord]) -> List[Dict[str, Any]]:
+    """Core executemany parameters for processed_swap_data."""
+    return [dict(zip(SWAP_RECORD_FIELDS, _record_values(record))) for record in records]
+
+
+def select_swap_records():
+    """select() of the processed_swap_data columns in SwapRecord order; build records with records_from_rows."""
+    return select(*[getattr(ProcessedSwapDataDB, name) for name in SWAP_RECORD_FIELDS])
+
+
+def records_from_rows(rows: Iterable[Sequence[Any]]) -> List[SwapRecord]:
+    """SwapRecords from Core result rows of select_swap_records() (positional, no ORM identity map)."""
+    return [SwapRecord(*row) for row in rows]
+
+
+def encode_records(records: Sequence[SwapRecord], wire_format: str = "json") -> bytes:
+    """
+    Batch wire encoding: {"fields": [...], "rows": [[...], ...]}. Positional rows keep field
+    names out of every record; datetimes become ISO strings.
+    """
+    rows = [record.to_tuple() for record in records]
+    if wire_format == "msgpack":
+        if msgpack is None:
+            raise ValueError("msgpack wire format requires the msgpack package")
+        return msgpack.packb({"fields": SWAP_RECORD_FIELDS, "rows": rows}, default=_encode_default)
+    if wire_format != "json":
+        raise ValueError(f"Unsupported wire format '{wire_format}'. Supported: {', '.join(WIRE_FORMATS)}")
+    if orjson is not None:
+        return orjson.dumps({"fields": SWAP_RECORD_FIELDS, "rows": rows})
+    return json.dumps({"fields": SWAP_RECORD_FIELDS, "rows": rows}, default=_encode_default).encode("utf-8")
+
+
+def decode_records(payload: bytes, wire_format: str = "json") -> List[SwapRecord]:
+    """Inverse of encode_records. Fields are matched by name, so older/newer field lists still decode."""
+    if wire_format == "msgpack":
+        if msgpack is None:
+            raise ValueError("msgpack wire format requires the msgpack package")
+        batch = msgpack.unpackb(payload)
+    elif wire_format == "json":
+        batch = orjson.loads(payload) if orjson is not None else json.loads(payload)
+    else:
+        raise ValueError(f"Unsupported wire format '{wire_format}'. Supported: {', '.join(WIRE_FORMATS)}")
+    fields = tuple(batch["fields"])
+    if fields == SWAP_RECORD_FIELDS:
+        records = [SwapRecord(*row) for row in batch["rows"]]
+        for record in records:
+            if isinstance(record.processing_timestamp, str):
+                record.processing_timestamp = datetime.fromisoformat(record.processing_timestamp)
+        return records
+    return [SwapRecord.from_dict(dict(zip(fields, row))) for row in batch["rows"]]
+
+
+def _encode_default(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return value.isoformat()
+    raise TypeError(f"Cannot encode {type(value).__name__}")
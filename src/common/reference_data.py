@@ -0,0 +1,162 @@
+# src/common/reference_data.py
+
+import json
+import os
+import threading
+import time
+from dataclasses import dataclass
+from typing import List, Dict, Any, FrozenSet, Optional, Sequence, Tuple
+
+from common.utils import logger
+
+# --- 참조 데이터 (Reference Data) ---
+# Code lists (ISO 4217 currencies, CFTC asset classes / action types / event types,
+# UPI prefixes) are loaded from versioned JSON files into frozensets once per process,
+# so checking a batch costs one set lookup per distinct value instead of a DB or file
+# hit per row. Layout: REFERENCE_DATA_DIR/<version>/<name>.json with
+# {"name", "version", "codes": [...], "match": "exact" | "prefix"}; the newest version
+# directory is used unless REFERENCE_DATA_VERSION pins one.
+# Hot reload: at most every REFERENCE_DATA_RELOAD_INTERVAL seconds, the next lookup
+# compares the directory listing and file mtimes and, when they changed, loads a new
+# snapshot and swaps it in. Readers keep using the old snapshot until the swap, and a
+# version that fails to load leaves the current one in place.
+REFERENCE_DATA_DIR = os.environ.get("REFERENCE_DATA_DIR", os.path.join(os.path.dirname(os.path.abspath(__file__)), "reference_data"))
+REFERENCE_DATA_VERSION = os.environ.get("REFERENCE_DATA_VERSION", "") # e.g. 2026-10-01 ; empty = newest version directory
+REFERENCE_DATA_RELOAD_INTERVAL = float(os.environ.get("REFERENCE_DATA_RELOAD_INTERVAL", "30.0")) # Seconds between change checks; 0 = no hot reload
+
+CURRENCIES = "currencies"
+ASSET_CLASSES = "asset_classes"
+ACTION_TYPES = "action_types"
+EVENT_TYPES = "event_types"
+UPI_PREFIXES = "upi_prefixes"
+
+
+@dataclass(frozen=True)
+class CodeList:
+    name: str
+    version: str
+    codes: FrozenSet[str]
+    prefix_lengths: Tuple[int, ...] = () # Non-empty for prefix lists: the distinct prefix lengths to try
+
+    def __contains__(self, value: str) -> bool:
+        if not self.prefix_lengths:
+            return value in self.codes
+        return any(value[:length] in self.codes for length in self.prefix_lengths)
+
+
+@dataclass(frozen=True)
+class ReferenceSnapshot:
+    version: str
+    code_lists: Dict[str, CodeList]
+    signature: Tuple[Any, ...] # Directory listing + mtimes the snapshot was loaded from
+    loaded_at: float
+
+
+class ReferenceData:
+    """
+    Process-wide holder of the current ReferenceSnapshot.
+    check_many() and contains() are safe to call from any thread.
+    """
+
+    def __init__(self, directory: str = REFERENCE_DATA_DIR, version: str = REFERENCE_DATA_VERSION,
+                 reload_interval: float = REFERENCE_DATA_RELOAD_INTERVAL):
+        self.directory = directory
+        self.version = version
+        self.reload_interval = reload_interval
+        self._snapshot: Optional[ReferenceSnapshot] = None
+        self._lock = threading.Lock()
+        self._next_check = 0.0
+        self.reloads = 0
+        self.reload_errors = 0
+
+    def _version_directory(self) -> str:
+        if self.version:
+            return os.path.join(self.directory, self.version)
+        versions = sorted(name for name in os.listdir(self.directory) if os.path.isdir(os.path.join(self.directory, name)))
+        if not versions:
+            raise FileNotFoundError(f"No reference data versions in {self.directory}")
+        return os.path.join(self.directory, versions[-1])
+
+    def _signature(self, version_directory: str) -> Tuple[Any, ...]:
+        files = sorted(name for name in os.listdir(version_directory) if name.endswith(".json"))
+        return (version_directory,) + tuple((name, os.path.getmtime(os.path.join(version_directory, name))) for name in files)
+
+    def _load(self, version_directory: str, signature: Tuple[Any, ...]) -> ReferenceSnapshot:
+        code_lists: Dict[str, CodeList] = {}
+        for name, _ in signature[1:]:
+            with open(os.path.join(version_directory, name), encoding="utf-8") as code_file:
+                content = json.load(code_file)
+            codes = frozenset(str(code).strip().upper() for code in content["codes"])
+            list_name = content.get("name") or name[:-len(".json")]
+            prefix_lengths = tuple(sorted({len(code) for code in codes})) if content.get("match") == "prefix" else ()
+            code_lists[list_name] = CodeList(list_name, str(content.get("version", "")), codes, prefix_lengths)
+        return ReferenceSnapshot(os.path.basename(version_directory), code_lists, signature, time.time())
+
+    def reload(self, force: bool = False) -> bool:
+        """Loads the current files when they changed since the last load (or always with force). Returns True when swapped."""
+        with self._lock:
+            self._next_check = time.monotonic() + self.reload_interval
+            try:
+                version_directory = self._version_directory()
+                signature = self._signature(version_directory)
+                if not force and self._snapshot is not None and signature == self._snapshot.signature:
+                    return False
+                snapshot = self._load(version_directory, signature)
+            except (OSError, ValueError, KeyError) as e:
+                self.reload_errors += 1
+                if self._snapshot is None:
+                    raise
+                logger.error(f"Reference data reload from {self.directory} failed, keeping version {self._snapshot.version}: {e}")
+                return False
+            previous = self._snapshot.version if self._snapshot is not None else None
+            self._snapshot = snapshot
+            self.reloads += 1
+        logger.info(f"Loaded reference data version {snapshot.version} ({', '.join(sorted(snapshot.code_lists))})"
+                    + (f", replacing {previous}." if previous else "."))
+        return True
+
+    @property
+    def snapshot(self) -> ReferenceSnapshot:
+        if self._snapshot is None or (self.reload_interval > 0 and time.monotonic() >= self._next_check):
+            self.reload()
+        return self._snapshot
+
+    def code_list(self, name: str) -> CodeList:
+        code_list = self.snapshot.code_lists.get(name)
+        if code_list is None:
+            raise KeyError(f"Unknown reference data list '{name}'")
+        return code_list
+
+    def contains(self, name: str, value: Optional[str]) -> bool:
+        return isinstance(value, str) and value in self.code_list(name)
+
+    def check_many(self, name: str, values: Sequence[Optional[str]], allow_missing: bool = False) -> List[bool]:
+        """
+        Membership of every value in the named list, checking each distinct value once.
+        None / empty values are accepted when allow_missing is set (optional fields).
+        """
+        code_list = self.code_list(name) # One snapshot for the whole batch, even if a reload happens meanwhile
+        distinct = {value: value in code_list for value in set(values) if isinstance(value, str) and value}
+        return [distinct[value] if isinstance(value, str) and value else allow_missing for value in values]
+
+    def metrics(self) -> Dict[str, Any]:
+        snapshot = self._snapshot
+        return {
+            "directory": self.directory,
+            "version": snapshot.version if snapshot is not None else None,
+            "lists": {name: len(code_list.codes) for name, code_list in snapshot.code_lists.items()} if snapshot is not None else {},
+            "reloads": self.reloads,
+            "reload_errors": self.reload_errors,
+        }
+
+
+# Process-wide reference data (each process-pool worker loads its own snapshot on first use)
+reference_data = ReferenceData()
+
+
+def check_many(name: str, values: Sequence[Optional[str]], allow_missing: bool = False) -> List[bool]:
+    return reference_data.check_many(name, values, allow_missing)
+
+
+def get_reference_data_metrics() -> Dict[str, Any]:
+    return reference_data.metrics()
@@ -0,0 +1,69 @@
+# src/common/report_source.py
+
+import asyncio
+import hashlib
+import os
+from typing import AsyncIterator
+
+# --- 보고서 소스 (Report Source) ---
+# A generated report readable by byte range in bounded chunks. Produced by the object
+# store (common/object_store.py) and consumed by the SDR upload (common/sdr_upload.py);
+# kept here so the storage layer does not depend on the SDR client.
+# SDR_UPLOAD_CHUNK_BYTES is still honoured as the default for backwards compatibility.
+REPORT_CHUNK_BYTES = int(os.environ.get("REPORT_CHUNK_BYTES", os.environ.get("SDR_UPLOAD_CHUNK_BYTES", str(1024 * 1024)))) # Read buffer
+
+
+class ReportSource:
+    """A report file readable by byte range."""
+
+    name: str
+    size: int
+
+    def iter_range(self, offset: int, length: int, chunk_size: int = REPORT_CHUNK_BYTES) -> AsyncIterator[bytes]:
+        raise NotImplementedError
+
+    def iter_chunks(self, chunk_size: int = REPORT_CHUNK_BYTES) -> AsyncIterator[bytes]:
+        return self.iter_range(0, self.size, chunk_size)
+
+    async def sha256_range(self, offset: int, length: int) -> str:
+        digest = hashlib.sha256()
+        async for chunk in self.iter_range(offset, length):
+            digest.update(chunk)
+        return digest.hexdigest()
+
+
+class FileReportSource(ReportSource):
+    """Local report file (file:// storage paths, e.g. daily reports written before the object store). Reads run in a worker thread."""
+
+    def __init__(self, path: str):
+        self.name = path
+        self.path = path
+        self.size = os.path.getsize(path) # FileNotFoundError if missing
+
+    async def iter_range(self, offset: int, length: int, chunk_size: int = REPORT_CHUNK_BYTES) -> AsyncIterator[bytes]:
+        report_file = await asyncio.to_thread(open, self.path, "rb")
+        try:
+            await asyncio.to_thread(report_file.seek, offset)
+            remaining = length
+            while remaining > 0:
+                chunk = await asyncio.to_thread(report_file.read, min(chunk_size, remaining))
+                if not chunk:
+                    break
+                remaining -= len(chunk)
+                yield chunk
+        finally:
+            await asyncio.to_thread(report_file.close)
+
+
+class BytesReportSource(ReportSource):
+    """Report content already held in memory (e.g. returned by an object storage client)."""
+
+    def __init__(self, content: bytes, name: str = "<memory>"):
+        self.name = name
+        self._content = memoryview(content)
+        self.size = len(content)
+
+    async def iter_range(self, offset: int, length: int, chunk_size: int = REPORT_CHUNK_BYTES) -> AsyncIterator[bytes]:
+        end = min(offset + length, self.size)
+        for start in range(offset, end, chunk_size):
+            yield bytes(self._content[start:min(start + chunk_size, end)]) # One chunk copied at a time
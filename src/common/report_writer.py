@@ -0,0 +1,417 @@
+# src/common/report_writer.py
+
+import csv
+import gzip
+import io
+import os
+from abc import ABC, abstractmethod
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import List, Dict, Any, Optional, Sequence, Tuple, Iterable, Iterator, BinaryIO, Union, Type
+
+from sqlalchemy.orm import Session
+
+from common.utils import logger
+
+try:
+    import zstandard # Optional: zstd compression for report files
+except ImportError:
+    zstandard = None
+
+try:
+    import pyarrow # Optional: Parquet archive copies
+    import pyarrow.parquet
+except ImportError:
+    pyarrow = None
+
+# --- 보고서 작성기 (Report Writer) ---
+# Report files are written chunk by chunk from an iterator of row tuples (typically a
+# DB cursor with yield_per), through a large write buffer and optional gzip/zstd
+# compression, so memory stays constant whatever the number of rows. Formats are
+# pluggable via register_report_format:
+#   - text:      the original human-readable batch layout
+#   - cftc_csv:  CSV with CFTC Part 45 data element names as the header
+#   - parquet:   compact columnar archive copy (requires pyarrow, compressed internally)
+REPORT_WRITE_BUFFER_BYTES = int(os.environ.get("REPORT_WRITE_BUFFER_BYTES", str(1024 * 1024))) # File write buffer
+REPORT_CHUNK_SIZE = int(os.environ.get("REPORT_CHUNK_SIZE", "10000")) # Rows fetched from the cursor and written per chunk
+REPORT_ZSTD_LEVEL = int(os.environ.get("REPORT_ZSTD_LEVEL", "3"))
+REPORT_GZIP_LEVEL = int(os.environ.get("REPORT_GZIP_LEVEL", "6"))
+
+# ProcessedSwapDataDB columns written to reports, in output order
+REPORT_COLUMNS = (
+    "unique_transaction_identifier",
+    "action_type",
+    "event_type",
+    "asset_class",
+    "effective_date",
+    "termination_date",
+    "notional_amount",
+    "notional_currency",
+    "price",
+    "price_currency",
+    "reporting_counterparty_lei",
+    "other_counterparty_lei",
+)
+
+COMPRESSION_SUFFIXES = {None: "", "gzip": ".gz", "zstd": ".zst"}
+
+Row = Sequence[Any]
+
+
+class ReportFormat(ABC):
+    """
+    Pluggable report file format.
+    A format instance is single-use: open() once, write_rows() per chunk, close() once.
+    Rows are sequences ordered like `columns`.
+    """
+    name: str = ""
+    extension: str = ""
+    binary: bool = False # True: writes bytes to the raw (uncompressed) stream itself
+    supports_compression: bool = True
+
+    @classmethod
+    def is_available(cls) -> bool:
+        """False when an optional package the format needs is not installed."""
+        return True
+
+    def open(self, stream: Any, columns: Sequence[str], metadata: Dict[str, Any]) -> None:
+        self.stream = stream
+        self.columns = tuple(columns)
+        self.metadata = metadata
+
+    @abstractmethod
+    def write_rows(self, rows: Sequence[Row]) -> None:
+        """
+        Writes one chunk of rows. Must write nothing when it raises (format the whole chunk
+        first): ReportWriter then retries the chunk row by row.
+        """
+
+    def close(self, row_count: int) -> None:
+        """Writes any trailer. Does not close the underlying stream."""
+
+
+class TextReportFormat(ReportFormat):
+    """The original batch report layout (one `UTI: ..., Action: ...` line per entry)."""
+    name = "text"
+    extension = ".txt"
+    separator = "----------------------------------------------------\n"
+
+    def open(self, stream, columns, metadata):
+        super().open(stream, columns, metadata)
+        index = {column: position for position, column in enumerate(self.columns)}
+        self._positions = tuple(index[column] for column in (
+            "unique_transaction_identifier", "action_type", "asset_class", "notional_amount",
+            "notional_currency", "effective_date", "reporting_counterparty_lei",
+        ))
+        generated_at = metadata.get("generated_at") or datetime.now()
+        stream.write(f"## Swap Report Batch - Generated at {generated_at.isoformat()}\n")
+        if metadata.get("entry_count") is not None:
+            stream.write(f"## Number of Entries: {metadata['entry_count']}\n")
+        stream.write(self.separator)
+
+    def write_rows(self, rows):
+        uti, action, asset_class, notional, currency, effective_date, lei = self._positions
+        self.stream.write("".join([
+            f"UTI: {row[uti] if row[uti] is not None else 'N/A'}, Action: {row[action]}, Asset Class: {row[asset_class]}, "
+            f"Notional: {row[notional]} {row[currency]}, Effective Date: {row[effective_date]}, Reporting LEI: {row[lei]}\n"
+            for row in rows
+        ]))
+
+    def close(self, row_count):
+        self.stream.write(self.separator)
+        if self.metadata.get("entry_count") is None:
+            self.stream.write(f"## Number of Entries: {row_count}\n")
+
+
+# CFTC Part 45 (Appendix 1) data element names for the report columns
+CFTC_CSV_HEADERS = {
+    "unique_transaction_identifier": "Unique transaction identifier (UTI)",
+    "action_type": "Action type",
+    "event_type": "Event type",
+    "asset_class": "Asset class",
+    "effective_date": "Effective date",
+    "termination_date": "Expiration date",
+    "notional_amount": "Notional amount",
+    "notional_currency": "Notional currency",
+    "price": "Price",
+    "price_currency": "Price currency",
+    "reporting_counterparty_lei": "Counterparty 1 (reporting counterparty)",
+    "other_counterparty_lei": "Counterparty 2",
+}
+
+
+class CftcCsvReportFormat(ReportFormat):
+    """
+    CSV with CFTC data element names as the header row (csv.writer does the quoting in C).
+    Each chunk is rendered into a buffer and written in one call, so a row that fails
+    half-way through writerows leaves nothing of the chunk in the report.
+    """
+    name = "cftc_csv"
+    extension = ".csv"
+
+    def open(self, stream, columns, metadata):
+        super().open(stream, columns, metadata)
+        self._buffer = io.StringIO()
+        self._writer = csv.writer(self._buffer, lineterminator="\n")
+        stream.write(self._render([[CFTC_CSV_HEADERS.get(column, column) for column in self.columns]]))
+
+    def _render(self, rows) -> str:
+        self._buffer.seek(0)
+        self._buffer.truncate()
+        self._writer.writerows(rows)
+        return self._buffer.getvalue()
+
+    def write_rows(self, rows):
+        self.stream.write(self._render(rows))
+
+
+# Arrow types for the Parquet archive; unknown columns are stored as strings
+PARQUET_COLUMN_TYPES = {
+    "notional_amount": "float64",
+    "price": "float64",
+    "processing_timestamp": "timestamp",
+    "generation_timestamp": "timestamp",
+}
+
+
+class ParquetReportFormat(ReportFormat):
+    """Columnar Parquet archive copy; each chunk becomes one row group, so memory stays bounded."""
+    name = "parquet"
+    extension = ".parquet"
+    binary = True
+    supports_compression = False # zstd inside the Parquet pages instead
+    compression = "zstd"
+
+    @classmethod
+    def is_available(cls):
+        return pyarrow is not None
+
+    def open(self, stream, columns, metadata):
+        super().open(stream, columns, metadata)
+        arrow_types = {"float64": pyarrow.float64(), "timestamp": pyarrow.timestamp("us")}
+        self._schema = pyarrow.schema([
+            (column, arrow_types.get(PARQUET_COLUMN_TYPES.get(column), pyarrow.string())) for column in self.columns
+        ])
+        self._writer = pyarrow.parquet.ParquetWriter(stream, self._schema, compression=self.compression)
+
+    def write_rows(self, rows):
+        columns = list(zip(*rows)) if rows else [() for _ in self.columns]
+        self._writer.write_table(pyarrow.Table.from_arrays(
+            [pyarrow.array(values, type=column_field.type) for values, column_field in zip(columns, self._schema)],
+            schema=self._schema,
+        ))
+
+    def close(self, row_count):
+        self._writer.close()
+
+
+REPORT_FORMATS: Dict[str, Type[ReportFormat]] = {}
+
+
+def register_report_format(format_class: Type[ReportFormat]) -> Type[ReportFormat]:
+    """Registers a ReportFormat subclass under its `name` (usable as a class decorator)."""
+    REPORT_FORMATS[format_class.name] = format_class
+    return format_class
+
+
+for _format_class in (TextReportFormat, CftcCsvReportFormat, ParquetReportFormat):
+    register_report_format(_format_class)
+
+
+def get_report_format(name: str) -> ReportFormat:
+    """Returns a new instance of the registered format. Raises ValueError for unknown names."""
+    try:
+        return REPORT_FORMATS[name]()
+    except KeyError:
+        raise ValueError(f"Unknown report format '{name}'. Available: {', '.join(sorted(REPORT_FORMATS))}")
+
+
+def check_report_options(format_name: str, compression: Optional[str]) -> None:
+    """Validates a format/compression pair before any file is opened. Raises ValueError."""
+    format_class = REPORT_FORMATS.get(format_name)
+    if format_class is None:
+        raise ValueError(f"Unknown report format '{format_name}'. Available: {', '.join(sorted(REPORT_FORMATS))}")
+    if not format_class.is_available():
+        raise ValueError(f"Report format '{format_name}' is not available (optional package not installed)")
+    if compression not in COMPRESSION_SUFFIXES:
+        raise ValueError(f"Unknown report compression '{compression}'. Available: gzip, zstd")
+    if compression == "zstd" and zstandard is None:
+        raise ValueError("zstd report compression requires the 'zstandard' package")
+    if compression and not format_class.supports_compression:
+        raise ValueError(f"Report format '{format_name}' does not support external compression")
+
+
+def report_object_suffix(format_name: str, compression: Optional[str]) -> str:
+    """File name suffix for a format/compression pair, e.g. '.csv.zst'."""
+    return REPORT_FORMATS[format_name].extension + COMPRESSION_SUFFIXES[compression]
+
+
+@dataclass
+class ReportWriteResult:
+    """Outcome of a report write."""
+    format: str
+    compression: Optional[str]
+    row_count: int = 0
+    size_bytes: int = 0 # Bytes written to the target (after compression)
+    path: Optional[str] = None
+    failed_rows: List[Tuple[Row, str]] = field(default_factory=list)
+
+
+class _CountingWriter(io.RawIOBase):
+    """Pass-through binary stream that counts bytes written to the target."""
+
+    def __init__(self, target: BinaryIO):
+        self.target = target
+        self.bytes_written = 0
+
+    def writable(self):
+        return True
+
+    def write(self, data):
+        self.bytes_written += len(data)
+        return self.target.write(data)
+
+
+class ReportWriter:
+    """
+    Writes one report file chunk by chunk.
+
+        with ReportWriter("/reports/2024-01-02.csv.zst", "cftc_csv", compression="zstd") as writer:
+            for chunk in iter_row_chunks(db, statement):
+                writer.write_chunk(chunk)
+
+    `target` is a path (written to `<path>.tmp` and renamed on success) or a binary file
+    object (left open). Compression is applied between the format and the target; the
+    text formats go through a TextIOWrapper so each chunk is a single buffered write.
+    """
+
+    def __init__(
+        self,
+        target: Union[str, os.PathLike, BinaryIO],
+        format_name: str = "text",
+        compression: Optional[str] = None,
+        columns: Sequence[str] = REPORT_COLUMNS,
+        metadata: Optional[Dict[str, Any]] = None,
+        buffer_size: int = REPORT_WRITE_BUFFER_BYTES,
+    ):
+        check_report_options(format_name, compression)
+        self.format = get_report_format(format_name)
+
+        self.compression = compression
+        self.columns = tuple(columns)
+        self.metadata = metadata or {}
+        self.buffer_size = buffer_size
+        self.result = ReportWriteResult(format=format_name, compression=compression)
+        self._target = target
+        self._file: Optional[BinaryIO] = None
+        self._compressor: Optional[BinaryIO] = None
+        self._text: Optional[io.TextIOWrapper] = None
+
+    def open(self) -> "ReportWriter":
+        if isinstance(self._target, (str, os.PathLike)):
+            self.result.path = os.fspath(self._target)
+            directory = os.path.dirname(self.result.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            self._file = open(self.result.path + ".tmp", "wb", buffering=self.buffer_size)
+            target = self._file
+        else:
+            target = self._target
+        self._counter = _CountingWriter(target)
+
+        stream: Any = self._counter
+        if self.compression == "gzip":
+            self._compressor = gzip.GzipFile(fileobj=self._counter, mode="wb", compresslevel=REPORT_GZIP_LEVEL, mtime=0)
+            stream = self._compressor
+        elif self.compression == "zstd":
+            self._compressor = zstandard.ZstdCompressor(level=REPORT_ZSTD_LEVEL).stream_writer(self._counter, closefd=False)
+            stream = self._compressor
+        if not self.format.binary:
+            self._text = io.TextIOWrapper(stream, encoding="utf-8", newline="", write_through=False)
+            stream = self._text
+
+        self.format.open(stream, self.columns, self.metadata)
+        return self
+
+    def write_chunk(self, rows: Sequence[Row]) -> List[Tuple[Row, str]]:
+        """
+        Writes a chunk of rows. If the chunk fails to format, it is retried row by row so a
+        single bad row does not lose the rest; failures are returned and kept in result.failed_rows.
+        """
+        try:
+            self.format.write_rows(rows)
+            self.result.row_count += len(rows)
+            return []
+        except Exception as e:
+            logger.warning(f"Report chunk of {len(rows)} rows failed to format ({e}); retrying row by row.")
+
+        failures: List[Tuple[Row, str]] = []
+        for row in rows:
+            try:
+                self.format.write_rows([row])
+                self.result.row_count += 1
+            except Exception as e:
+                failures.append((row, f"Error formatting report entry: {e}"))
+        self.result.failed_rows.extend(failures)
+        return failures
+
+    def close(self) -> ReportWriteResult:
+        self.format.close(self.result.row_count)
+        if self._text is not None:
+            self._text.flush()
+            self._text.detach() # Keep the compressor / target open
+        if self._compressor is not None:
+            self._compressor.close()
+        self.result.size_bytes = self._counter.bytes_written
+        if self._file is not None:
+            self._file.close()
+            os.replace(self.result.path + ".tmp", self.result.path)
+        return self.result
+
+    def abort(self) -> None:
+        """Discards a partially written path target."""
+        if self._file is not None:
+            self._file.close()
+            try:
+                os.remove(self.result.path + ".tmp")
+            except FileNotFoundError:
+                pass
+
+    def __enter__(self) -> "ReportWriter":
+        return self.open()
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+
+
+def iter_row_chunks(db: Session, statement, chunk_size: int = REPORT_CHUNK_SIZE) -> Iterator[List[Row]]:
+    """
+    Streams a SELECT in chunks of row tuples. yield_per turns on server-side cursors
+    (stream_results) on PostgreSQL, so only one chunk is held client-side at a time.
+    """
+    result = db.execute(statement.execution_options(yield_per=chunk_size))
+    for partition in result.partitions(chunk_size):
+        yield partition
+
+
+def write_report(
+    target: Union[str, os.PathLike, BinaryIO],
+    chunks: Iterable[Sequence[Row]],
+    format_name: str = "text",
+    compression: Optional[str] = None,
+    columns: Sequence[str] = REPORT_COLUMNS,
+    metadata: Optional[Dict[str, Any]] = None,
+) -> ReportWriteResult:
+    """Writes all chunks to one report file and returns the result."""
+    with ReportWriter(target, format_name, compression, columns, metadata) as writer:
+        for chunk in chunks:
+            writer.write_chunk(chunk)
+    return writer.result
+
+
+def rows_from_dicts(entries: Iterable[Dict[str, Any]], columns: Sequence[str] = REPORT_COLUMNS) -> List[Tuple[Any, ...]]:
+    """Converts payload dicts (e.g. stage queue messages) into report row tuples."""
+    return [tuple(entry.get(column) for column in columns) for entry in entries]
@@ -0,0 +1,167 @@
+# src/common/response_cache.py
+
+import asyncio
+import hashlib
+import os
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, Mapping, Optional, Tuple
+
+from fastapi import Request
+from fastapi.responses import Response
+
+from common.utils import logger
+
+# --- BFF 응답 캐시 (TTL + ETag + single-flight) ---
+# Every operator polling the Admin UI dashboard used to turn into one list query on
+# the pipeline services. The web BFF keeps the upstream JSON body of each /api/* list
+# call for a short TTL, keyed by (namespace, normalized query parameters).
+# Concurrent identical requests share one upstream call (single-flight); upstream
+# errors are never cached. Each body carries a content-hash ETag, so a client
+# revalidating with If-None-Match gets 304 without the body (also after the TTL
+# expired, as long as the content did not change).
+# Writes proxied by the BFF (status updates, retries) invalidate their namespaces.
+# The cache is per process: other web replicas serve their own copy for at most the TTL.
+BFF_CACHE_ENABLED = os.environ.get("BFF_CACHE_ENABLED", "true").lower() == "true"
+BFF_CACHE_TTL = float(os.environ.get("BFF_CACHE_TTL", "5")) # Seconds a cached upstream response is served
+BFF_CACHE_MAX_ENTRIES = int(os.environ.get("BFF_CACHE_MAX_ENTRIES", "512")) # Max cached (namespace, params) combinations
+
+CacheKey = Tuple[str, Tuple[Tuple[str, str], ...]]
+
+
+@dataclass(frozen=True)
+class CachedResponse:
+    """An upstream JSON body as served by the BFF."""
+    body: bytes
+    etag: str
+    media_type: str = "application/json"
+
+
+def make_etag(body: bytes) -> str:
+    """Strong ETag of a response body (content hash, identical across replicas)."""
+    return '"' + hashlib.blake2b(body, digest_size=16).hexdigest() + '"'
+
+
+def normalize_params(params: Mapping[str, Any]) -> Tuple[Tuple[str, str], ...]:
+    """Order-independent cache key part: None dropped, booleans lowercased, values as strings."""
+    normalized = []
+    for name, value in params.items():
+        if value is None:
+            continue
+        if isinstance(value, bool):
+            value = "true" if value else "false"
+        normalized.append((name, str(value)))
+    return tuple(sorted(normalized))
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """If-None-Match evaluation (weak comparison, RFC 9110 13.1.2)."""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    candidates = (candidate.strip() for candidate in if_none_match.split(","))
+    return any(candidate.removeprefix("W/") == etag for candidate in candidates)
+
+
+class ResponseCache:
+    """
+    In-process TTL cache of upstream responses with request coalescing and
+    namespace invalidation. Only used from the event loop thread.
+    """
+
+    def __init__(self, ttl: float = BFF_CACHE_TTL, max_entries: int = BFF_CACHE_MAX_ENTRIES,
+                 enabled: bool = BFF_CACHE_ENABLED, clock: Callable[[], float] = time.monotonic):
+        self.ttl = ttl
+        self.max_entries = max(1, max_entries)
+        self.enabled = enabled
+        self._clock = clock
+        self._entries: "OrderedDict[CacheKey, Tuple[float, CachedResponse]]" = OrderedDict()
+        self._inflight: Dict[CacheKey, asyncio.Task] = {}
+        self._generations: Dict[str, int] = {}
+        self.stats = {"hits": 0, "misses": 0, "coalesced": 0, "invalidations": 0, "not_modified": 0}
+
+    async def get_or_fetch(self, namespace: str, params: Mapping[str, Any],
+                           fetch: Callable[[], Awaitable[bytes]]) -> CachedResponse:
+        """
+        Returns the cached response for (namespace, params), or calls `fetch` (which
+        returns the upstream body and raises on failure) once for all concurrent callers.
+        """
+        if not self.enabled:
+            body = await fetch()
+            return CachedResponse(body, make_etag(body))
+
+        key = (namespace, normalize_params(params))
+        entry = self._entries.get(key)
+        if entry is not None:
+            if entry[0] > self._clock():
+                self._entries.move_to_end(key)
+                self.stats["hits"] += 1
+                return entry[1]
+            del self._entries[key]
+
+        task = self._inflight.get(key)
+        if task is None:
+            self.stats["misses"] += 1
+            task = asyncio.create_task(self._load(key, fetch, self._generations.get(namespace, 0)))
+            task.add_done_callback(_consume_exception)
+            self._inflight[key] = task
+        else:
+            self.stats["coalesced"] += 1
+        # shield: a caller that disconnects does not cancel the fetch the others are waiting for
+        return await asyncio.shield(task)
+
+    async def _load(self, key: CacheKey, fetch: Callable[[], Awaitable[bytes]], generation: int) -> CachedResponse:
+        try:
+            body = await fetch()
+            response = CachedResponse(body, make_etag(body))
+            # A write that invalidated the namespace while this fetch was in flight may not be reflected in it
+            if self._generations.get(key[0], 0) == generation:
+                self._store(key, response)
+            return response
+        finally:
+            # invalidate() may already have replaced this fetch with a newer one
+            if self._inflight.get(key) is asyncio.current_task():
+                del self._inflight[key]
+
+    def _store(self, key: CacheKey, response: CachedResponse) -> None:
+        self._entries[key] = (self._clock() + self.ttl, response)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def invalidate(self, *namespaces: str) -> int:
+        """Drops the cached responses of the namespaces; returns the number dropped."""
+        for namespace in namespaces:
+            self._generations[namespace] = self._generations.get(namespace, 0) + 1
+        stale = [key for key in self._entries if key[0] in namespaces]
+        for key in stale:
+            del self._entries[key]
+        # Callers arriving after the write start a fresh fetch instead of joining one started before it
+        for key in [key for key in self._inflight if key[0] in namespaces]:
+            del self._inflight[key]
+        self.stats["invalidations"] += 1
+        logger.debug(f"Invalidated {len(stale)} cached responses for {namespaces}")
+        return len(stale)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def metrics(self) -> Dict[str, Any]:
+        return {"enabled": self.enabled, "ttl_seconds": self.ttl, "entries": len(self._entries),
+                "in_flight": len(self._inflight), **self.stats}
+
+    def to_response(self, request: Request, cached: CachedResponse) -> Response:
+        """200 with the cached body, or 304 when the client's If-None-Match already has it."""
+        headers = {"ETag": cached.etag, "Cache-Control": f"private, max-age={int(self.ttl)}"}
+        if etag_matches(request.headers.get("if-none-match"), cached.etag):
+            self.stats["not_modified"] += 1
+            return Response(status_code=304, headers=headers)
+        return Response(content=cached.body, media_type=cached.media_type, headers=headers)
+
+
+def _consume_exception(task: asyncio.Task) -> None:
+    # The exception is re-raised to every waiter; retrieve it so a fetch whose callers all left is not logged as unhandled
+    if not task.cancelled():
+        task.exception()
@@ -0,0 +1,262 @@
+# src/common/retry_jobs.py
+
+import asyncio
+import os
+import time
+from datetime import datetime
+from typing import List, Dict, Any, Optional, Set, Tuple, Callable
+
+import httpx
+from sqlalchemy import select, update, func, tuple_
+
+from common.utils import logger, ErrorRecord, RawIngestedData, RetryJob
+from common.bulk_db import chunked
+from common.http_client import get_http_client
+
+# --- 대량 재처리 (Bulk Retry Jobs) ---
+# After an upstream outage tens of thousands of errors need to be replayed. A retry job
+# selects the errors matching its filters page by page in (timestamp, id) order, resolves
+# the payload to re-inject for each (loading raw_ingested_data rows with one IN query per
+# page), and posts them as multi-record /ingest or /process calls of `batch_size` records
+# with at most `concurrency` calls in flight. Errors re-injected successfully move to
+# Retrying, the others to Retry Failed, with one UPDATE ... WHERE id IN per page. A 2xx
+# response is checked entry by entry: records /process skipped as duplicates count as
+# skipped, records that failed processing again as failed.
+# Progress counters are stored on the retry_jobs row after every page, so any replica can
+# report status and ETA, and cancel the job (status Cancelling, checked between pages).
+# A job interrupted by a restart stays Running; re-submitting the same filters picks up
+# the errors that are still Open.
+RETRY_JOB_BATCH_SIZE = int(os.environ.get("RETRY_JOB_BATCH_SIZE", "500")) # Records per /ingest or /process call
+RETRY_JOB_CONCURRENCY = int(os.environ.get("RETRY_JOB_CONCURRENCY", "4")) # Calls in flight per job
+RETRY_JOB_PAGE_SIZE = int(os.environ.get("RETRY_JOB_PAGE_SIZE", "5000")) # Errors loaded from the DB per page
+RETRY_JOB_TIMEOUT = float(os.environ.get("RETRY_JOB_TIMEOUT", "120.0")) # Seconds per call
+
+INGESTION = "ingestion"
+PROCESSING = "processing"
+
+# Query parameters of a retry call per target stage. Retries resend the payload that was
+# already delivered once, so processing must not drop it as a duplicate delivery.
+RETRY_REQUEST_PARAMS: Dict[str, Dict[str, str]] = {PROCESSING: {"replay": "true"}}
+
+
+def retry_payload(source_module: str, data_payload: Optional[Dict[str, Any]], original_raw_data_payload: Optional[Dict[str, Any]]) -> Tuple[Optional[str], Optional[Dict[str, Any]], str]:
+    """
+    Stage to re-inject an error into (INGESTION or PROCESSING) and the record to send.
+    Returns (None, None, reason) when the error has nothing that can be re-injected.
+    """
+    if source_module == "data-ingestion":
+        # If ingestion failed, retry ingestion with the original raw data (or the payload, which is the raw data)
+        payload = original_raw_data_payload or data_payload
+        return (INGESTION, payload, "") if payload else (None, None, "No raw data available for ingestion retry")
+
+    if source_module in ("data-processing", "validation"):
+        # Processing and validation errors are retried from processing (validation depends on processing output)
+        if original_raw_data_payload:
+            return PROCESSING, original_raw_data_payload, ""
+        if data_payload and "trade_id" in data_payload: # data_payload looks like raw data
+            return PROCESSING, data_payload, ""
+        if source_module == "validation" and data_payload and "unique_transaction_identifier" in data_payload:
+            # Processed data only: processing must be able to handle it if the original raw data is unavailable
+            return PROCESSING, data_payload, ""
+        return None, None, "No raw data available for processing retry" if source_module == "data-processing" else "No data available for validation retry"
+
+    # TODO: Add retry logic for Report Generation and Report Submission errors (P2/P3)
+    return None, None, "Could not determine retry strategy for this error"
+
+
+def error_filter_clauses(filters: Dict[str, Any]) -> List[Any]:
+    """WHERE clauses on error_records for job filters {status, source_module, group_id, since, until}."""
+    clauses = []
+    if filters.get("status"):
+        clauses.append(ErrorRecord.status == filters["status"])
+    if filters.get("source_module"):
+        clauses.append(ErrorRecord.source_module == filters["source_module"])
+    if filters.get("group_id"):
+        clauses.append(ErrorRecord.group_id == filters["group_id"])
+    if filters.get("since"):
+        clauses.append(ErrorRecord.timestamp >= datetime.fromisoformat(filters["since"]))
+    if filters.get("until"):
+        clauses.append(ErrorRecord.timestamp < datetime.fromisoformat(filters["until"]))
+    return clauses
+
+
+def job_progress(job: RetryJob, now: Optional[datetime] = None) -> Dict[str, Any]:
+    """Progress of a job: percent done, throughput (errors/sec since start) and ETA in seconds."""
+    end = job.finished_at or now or datetime.utcnow()
+    elapsed = (end - job.started_at).total_seconds() if job.started_at else 0.0
+    processed = job.processed or 0
+    total = job.total or 0
+    throughput = processed / elapsed if elapsed > 0 else 0.0
+    remaining = max(total - processed, 0)
+    if job.finished_at:
+        eta = 0.0
+    else:
+        eta = remaining / throughput if throughput > 0 else None
+    return {
+        "percent": round(processed / total * 100, 1) if total else (100.0 if job.finished_at else 0.0),
+        "remaining": remaining,
+        "elapsed_seconds": round(elapsed, 3),
+        "throughput_per_second": round(throughput, 1),
+        "eta_seconds": round(eta, 1) if eta is not None else None,
+    }
+
+
+async def _load_raw_payloads(db, raw_ids: List[str]) -> Dict[str, Dict[str, Any]]:
+    """raw_ingested_data payloads by id, in the shape published to the processing queue."""
+    raw_payloads: Dict[str, Dict[str, Any]] = {}
+    for id_chunk in chunked(raw_ids):
+        rows = await db.execute(select(RawIngestedData.id, RawIngestedData.raw_payload).where(RawIngestedData.id.in_(id_chunk)))
+        raw_payloads.update({raw_id: {**raw_payload, "id": raw_id} for raw_id, raw_payload in rows if raw_payload})
+    return raw_payloads
+
+
+def rejected_positions(body: Any, batch_size: int) -> Tuple[Set[int], Set[int]]:
+    """
+    (duplicate, failed) positions of a re-injected batch, from the 2xx response body of
+    /process (duplicate_indexes / processing_failed_indexes). A target that only reports
+    duplicate_count / processing_failed_count can be attributed for single-record batches.
+    """
+    if not isinstance(body, dict):
+        return set(), set()
+    duplicates = set(body.get("duplicate_indexes") or ())
+    failed = set(body.get("processing_failed_indexes") or ()) - duplicates
+    if batch_size == 1 and not duplicates and not failed:
+        if body.get("duplicate_count"):
+            duplicates = {0}
+        elif body.get("processing_failed_count"):
+            failed = {0}
+    return duplicates, failed
+
+
+async def _send_batch(target_url: str, records: List[Dict[str, Any]], semaphore: asyncio.Semaphore,
+                      client_for: Callable[[str], httpx.AsyncClient], params: Optional[Dict[str, str]] = None) -> Tuple[Optional[str], Set[int], Set[int]]:
+    """
+    Posts one multi-record batch. Returns (None, duplicate positions, failed positions)
+    when the call succeeded, (error text, empty, empty) otherwise.
+    """
+    async with semaphore:
+        try:
+            response = await client_for(target_url).post(target_url, json=records, params=params, timeout=RETRY_JOB_TIMEOUT)
+            response.raise_for_status()
+        except httpx.HTTPError as exc:
+            return f"{target_url}: {exc!r}", set(), set()
+    try:
+        body = response.json()
+    except ValueError:
+        body = None
+    return (None, *rejected_positions(body, len(records)))
+
+
+async def run_retry_job(
+    job_id: str,
+    target_urls: Dict[str, str],
+    session_factory,
+    client_for: Callable[[str], httpx.AsyncClient] = get_http_client,
+    page_size: int = RETRY_JOB_PAGE_SIZE,
+) -> None:
+    """
+    Runs a retry job created with status Pending. `target_urls` maps INGESTION / PROCESSING
+    to the endpoint URLs; `session_factory` returns an AsyncSession context manager
+    (expire_on_commit=False, like common.utils.AsyncSessionLocal).
+    """
+    async with session_factory() as db:
+        job = await db.get(RetryJob, job_id)
+        filters = dict(job.filters or {})
+        clauses = error_filter_clauses(filters)
+        job.status = "Running"
+        job.started_at = job.updated_at = datetime.utcnow()
+        job.total = await db.scalar(select(func.count()).select_from(ErrorRecord).where(*clauses))
+        await db.commit()
+        logger.info(f"Retry job {job_id} started: {job.total} errors matching {filters}.")
+        semaphore = asyncio.Semaphore(job.concurrency)
+        batch_size = job.batch_size
+        start_time = time.perf_counter()
+
+        try:
+            last_key = None
+            while True:
+                # Next page in (timestamp, id) order; status changes below do not move the keyset cursor
+                page_query = select(ErrorRecord.id, ErrorRecord.timestamp, ErrorRecord.source_module, ErrorRecord.data_payload,
+                                    ErrorRecord.original_source_data_payload).where(*clauses)
+                if last_key is not None:
+                    page_query = page_query.where(tuple_(ErrorRecord.timestamp, ErrorRecord.id) > tuple_(*last_key))
+                page = (await db.execute(page_query.order_by(ErrorRecord.timestamp, ErrorRecord.id).limit(page_size))).all()
+                if not page:
+                    break
+                last_key = (page[-1].timestamp, page[-1].id)
+
+                raw_ids = [row.data_payload["original_raw_data_id"] for row in page
+                           if not row.original_source_data_payload and row.data_payload and row.data_payload.get("original_raw_data_id")]
+                raw_payloads = await _load_raw_payloads(db, raw_ids) if raw_ids else {}
+
+                # Group the page's payloads by target stage
+                by_target: Dict[str, List[Tuple[str, Dict[str, Any]]]] = {}
+                skipped = 0
+                for row in page:
+                    original_payload = row.original_source_data_payload
+                    if not original_payload and row.data_payload and row.data_payload.get("original_raw_data_id"):
+                        original_payload = raw_payloads.get(row.data_payload["original_raw_data_id"])
+                    target, payload, _ = retry_payload(row.source_module, row.data_payload, original_payload)
+                    if target is None or target not in target_urls:
+                        skipped += 1
+                        continue
+                    by_target.setdefault(target, []).append((row.id, payload))
+
+                batches = [
+                    (target, entries[start:start + batch_size])
+                    for target, entries in by_target.items()
+                    for start in range(0, len(entries), batch_size)
+                ]
+                results = await asyncio.gather(*(
+                    _send_batch(target_urls[target], [payload for _, payload in entries], semaphore, client_for, RETRY_REQUEST_PARAMS.get(target))
+                    for target, entries in batches
+                ))
+
+                succeeded_ids: List[str] = []
+                failed_ids: List[str] = []
+                last_error = None
+                for (target, entries), (error, duplicate_positions, failed_positions) in zip(batches, results):
+                    if error is not None:
+                        failed_ids.extend(error_id for error_id, _ in entries)
+                        last_error = error
+                        continue
+                    # Accepted batch: entries processing skipped as duplicates stay as they are, entries that failed again are Retry Failed
+                    for position, (error_id, _) in enumerate(entries):
+                        if position in duplicate_positions:
+                            skipped += 1
+                        elif position in failed_positions:
+                            failed_ids.append(error_id)
+                        else:
+                            succeeded_ids.append(error_id)
+                    if failed_positions:
+                        last_error = f"{target_urls[target]}: {len(failed_positions)} re-injected records failed processing again"
+                for new_status, ids in (("Retrying", succeeded_ids), ("Retry Failed", failed_ids)):
+                    for id_chunk in chunked(ids):
+                        await db.execute(update(ErrorRecord).where(ErrorRecord.id.in_(id_chunk)).values(status=new_status))
+
+                await db.refresh(job, ["status"]) # Picks up a cancel request from any replica
+                job.processed += len(page)
+                job.succeeded += len(succeeded_ids)
+                job.failed += len(failed_ids)
+                job.skipped += skipped
+                job.batches += len(batches)
+                job.updated_at = datetime.utcnow()
+                if last_error:
+                    job.last_error = last_error
+                    logger.error(f"Retry job {job_id}: {len(failed_ids)} errors in this page could not be re-injected: {last_error}")
+                await db.commit()
+                if job.status == "Cancelling":
+                    break
+
+            job.status = "Cancelled" if job.status == "Cancelling" else "Completed"
+        except Exception as e:
+            await db.rollback()
+            logger.error(f"Retry job {job_id} failed: {e}", exc_info=True)
+            job = await db.get(RetryJob, job_id)
+            job.status = "Failed"
+            job.last_error = str(e)
+        job.finished_at = job.updated_at = datetime.utcnow()
+        await db.commit()
+        elapsed = time.perf_counter() - start_time
+        logger.info(f"Retry job {job_id} {job.status.lower()}: {job.succeeded} re-injected, {job.failed} failed, {job.skipped} skipped in {elapsed:.2f}s.",
+                    extra={"stage": "error-monitoring", "retry_job_id": job_id, "batches": job.batches})
@@ -0,0 +1,260 @@
+# src/common/sdr_dispatch.py
+
+import asyncio
+import json
+import os
+import random
+import time
+from dataclasses import dataclass, field
+from typing import List, Dict, Any, Optional, Callable, Awaitable
+
+import httpx
+
+from common.utils import logger
+from common.http_client import get_http_client
+from common.sdr_upload import ReportSource, upload_report, is_retryable, SDR_MULTIPART_THRESHOLD_BYTES
+
+# --- 다중 SDR 전송 (Multi-destination Submission Dispatcher) ---
+# The same report goes to several swap data repositories. The dispatcher fans it out to
+# all destinations concurrently; each destination has its own limits so a slow or
+# throttling repository does not hold back the others:
+#   - max_concurrency: submissions in flight to the destination (semaphore)
+#   - rate_per_second / burst: request starts (token bucket; hedges take a token too)
+#   - max_attempts with exponential backoff and full jitter (random 0..min(backoff_max,
+#     backoff_base * 2^attempt)); Retry-After of a 429 is honoured as a lower bound
+#   - hedge_after: when a streamed submission has not finished after this many seconds, a
+#     second copy is sent and the first to succeed wins (cuts tail latency). Copies carry
+#     the same Idempotency-Key so the repository keeps one. Multipart uploads are not
+#     hedged; their parts are retried individually (common/sdr_upload.py).
+# SDR_DESTINATIONS is a JSON list of destination objects, e.g.
+#   [{"name": "DTCC", "url": "https://.../submit", "max_concurrency": 4, "rate_per_second": 2, "hedge_after": 20},
+#    {"name": "ICE", "url": "https://.../upload"}]
+# Without it there is one destination, "SDR", at SDR_SUBMISSION_URL.
+SDR_DESTINATIONS = os.environ.get("SDR_DESTINATIONS", "") # JSON list; empty = SDR_SUBMISSION_URL only
+SDR_SUBMISSION_URL = os.environ.get("SDR_SUBMISSION_URL", "http://localhost:9999/sdr-submit") # Default to a dummy local URL
+SDR_MAX_CONCURRENCY = int(os.environ.get("SDR_MAX_CONCURRENCY", "4")) # Defaults for destinations that do not set their own
+SDR_RATE_PER_SECOND = float(os.environ.get("SDR_RATE_PER_SECOND", "2.0"))
+SDR_RATE_BURST = int(os.environ.get("SDR_RATE_BURST", "4"))
+SDR_MAX_ATTEMPTS = int(os.environ.get("SDR_MAX_ATTEMPTS", "4"))
+SDR_BACKOFF_BASE = float(os.environ.get("SDR_BACKOFF_BASE", "1.0")) # Seconds
+SDR_BACKOFF_MAX = float(os.environ.get("SDR_BACKOFF_MAX", "60.0")) # Seconds
+SDR_HEDGE_AFTER = float(os.environ.get("SDR_HEDGE_AFTER", "0")) # Seconds; 0 = no hedging
+
+
+@dataclass(frozen=True)
+class SdrDestination:
+    name: str
+    url: str
+    max_concurrency: int = SDR_MAX_CONCURRENCY
+    rate_per_second: float = SDR_RATE_PER_SECOND
+    burst: int = SDR_RATE_BURST
+    max_attempts: int = SDR_MAX_ATTEMPTS
+    backoff_base: float = SDR_BACKOFF_BASE
+    backoff_max: float = SDR_BACKOFF_MAX
+    hedge_after: float = SDR_HEDGE_AFTER
+
+
+def load_sdr_destinations(config: str = SDR_DESTINATIONS, default_url: str = SDR_SUBMISSION_URL) -> List[SdrDestination]:
+    """Destinations from the SDR_DESTINATIONS JSON, or the single default destination."""
+    if not config.strip():
+        return [SdrDestination("SDR", default_url)]
+    destinations = [SdrDestination(**entry) for entry in json.loads(config)]
+    names = [destination.name for destination in destinations]
+    if len(set(names)) != len(names):
+        raise ValueError(f"Duplicate SDR destination names in SDR_DESTINATIONS: {names}")
+    return destinations
+
+
+class TokenBucket:
+    """Async token bucket: `rate` tokens per second, at most `burst` stored."""
+
+    def __init__(self, rate: float, burst: int):
+        self.rate = rate
+        self.burst = max(burst, 1)
+        self._tokens = float(self.burst)
+        self._refilled_at = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._tokens = min(self.burst, self._tokens + (now - self._refilled_at) * self.rate)
+        self._refilled_at = now
+
+    def try_acquire(self) -> bool:
+        self._refill()
+        if self._tokens >= 1:
+            self._tokens -= 1
+            return True
+        return False
+
+    async def acquire(self) -> None:
+        async with self._lock: # Waiters are served in order
+            while not self.try_acquire():
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+
+
+@dataclass
+class DestinationResult:
+    destination: str
+    success: bool
+    attempts: int = 0
+    hedges: int = 0
+    elapsed: float = 0.0
+    response: Optional[Dict[str, Any]] = None
+    error: Optional[str] = None
+    upload_id: Optional[str] = None
+    mode: Optional[str] = None
+
+
+@dataclass
+class _Channel:
+    """Runtime state of one destination."""
+    destination: SdrDestination
+    semaphore: asyncio.Semaphore
+    bucket: TokenBucket
+    stats: Dict[str, int] = field(default_factory=lambda: {
+        "submissions": 0, "succeeded": 0, "failed": 0, "attempts": 0, "retries": 0, "hedges": 0, "hedge_wins": 0, "in_flight": 0,
+    })
+
+
+class SubmissionDispatcher:
+    """
+    Sends reports to every configured SDR destination concurrently, with per-destination
+    concurrency / rate limits, retries with jittered backoff and optional hedging.
+    """
+
+    def __init__(self, destinations: List[SdrDestination], client_for: Callable[[str], httpx.AsyncClient] = get_http_client,
+                 rng: Optional[random.Random] = None):
+        self.destinations = list(destinations)
+        self.client_for = client_for
+        self._random = rng or random.Random()
+        self._channels: Dict[str, _Channel] = {}
+
+    def _channel(self, destination: SdrDestination) -> _Channel:
+        # Created lazily so the semaphore / lock belong to the running event loop
+        channel = self._channels.get(destination.name)
+        if channel is None:
+            channel = _Channel(destination, asyncio.Semaphore(destination.max_concurrency), TokenBucket(destination.rate_per_second, destination.burst))
+            self._channels[destination.name] = channel
+        return channel
+
+    def backoff_delay(self, destination: SdrDestination, attempt: int, exc: Optional[Exception] = None) -> float:
+        """Full jitter: uniform in [0, min(backoff_max, backoff_base * 2^(attempt-1))], at least the server's Retry-After."""
+        delay = self._random.uniform(0, min(destination.backoff_max, destination.backoff_base * 2 ** (attempt - 1)))
+        if isinstance(exc, httpx.HTTPStatusError):
+            retry_after = exc.response.headers.get("Retry-After", "")
+            if retry_after.isdigit():
+                delay = max(delay, min(float(retry_after), destination.backoff_max))
+        return delay
+
+    async def _send(self, channel: _Channel, source: ReportSource, filename: str, resume_upload_id: Optional[str],
+                    on_upload_id: Callable[[str], Awaitable[None]], take_token: bool = True) -> Dict[str, Any]:
+        if take_token:
+            await channel.bucket.acquire()
+        channel.stats["attempts"] += 1
+        destination = channel.destination
+        return await upload_report(self.client_for(destination.url), destination.url, source, filename,
+                                   resume_upload_id=resume_upload_id, on_upload_id=on_upload_id,
+                                   headers={"Idempotency-Key": filename})
+
+    async def _attempt(self, channel: _Channel, source: ReportSource, filename: str, resume_upload_id: Optional[str],
+                       on_upload_id: Callable[[str], Awaitable[None]]) -> Dict[str, Any]:
+        """One attempt (holding a concurrency slot), hedged when the destination allows it."""
+        hedge_after = channel.destination.hedge_after
+        async with channel.semaphore:
+            if not hedge_after or resume_upload_id or source.size > SDR_MULTIPART_THRESHOLD_BYTES:
+                return await self._send(channel, source, filename, resume_upload_id, on_upload_id)
+
+            primary = asyncio.create_task(self._send(channel, source, filename, None, on_upload_id))
+            tasks = {primary}
+            try:
+                done, _ = await asyncio.wait(tasks, timeout=hedge_after)
+                if not done and channel.bucket.try_acquire(): # Hedge only within the rate limit
+                    channel.stats["hedges"] += 1
+                    logger.info(f"Hedging submission of {filename} to {channel.destination.name} after {hedge_after:.1f}s.")
+                    tasks.add(asyncio.create_task(self._send(channel, source, filename, None, on_upload_id, take_token=False)))
+                error: Optional[BaseException] = None
+                while tasks:
+                    done, tasks = await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+                    for task in done:
+                        if task.exception() is None:
+                            if task is not primary:
+                                channel.stats["hedge_wins"] += 1
+                            return task.result()
+                        error = task.exception()
+                raise error
+            finally:
+                for task in tasks:
+                    task.cancel()
+                if tasks:
+                    await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def _submit(self, destination: SdrDestination, source: ReportSource, filename: str, resume_upload_id: Optional[str],
+                      on_upload_id: Optional[Callable[[str, str], Awaitable[None]]]) -> DestinationResult:
+        channel = self._channel(destination)
+        channel.stats["submissions"] += 1
+        channel.stats["in_flight"] += 1
+        result = DestinationResult(destination.name, success=False, upload_id=resume_upload_id)
+        start_time = time.perf_counter()
+        hedges_before = channel.stats["hedges"]
+
+        async def record_upload_id(upload_id: str) -> None:
+            result.upload_id = upload_id # The next attempt resumes it
+            if on_upload_id is not None:
+                await on_upload_id(destination.name, upload_id)
+
+        try:
+            for attempt in range(1, destination.max_attempts + 1):
+                result.attempts = attempt
+                try:
+                    upload = await self._attempt(channel, source, filename, result.upload_id, record_upload_id)
+                    result.success, result.response, result.mode, result.error = True, upload["response"], upload["mode"], None
+                    break
+                except httpx.HTTPError as exc:
+                    result.error = f"{type(exc).__name__}: {exc}"
+                    if attempt == destination.max_attempts or not is_retryable(exc):
+                        break
+                    delay = self.backoff_delay(destination, attempt, exc)
+                    channel.stats["retries"] += 1
+                    logger.warning(f"Submission of {filename} to {destination.name} failed ({result.error}); attempt {attempt + 1}/{destination.max_attempts} in {delay:.2f}s.")
+                    await asyncio.sleep(delay)
+                except Exception as exc: # Report source errors are not retried
+                    result.error = f"{type(exc).__name__}: {exc}"
+                    break
+        finally:
+            channel.stats["in_flight"] -= 1
+        result.elapsed = time.perf_counter() - start_time
+        result.hedges = channel.stats["hedges"] - hedges_before
+        channel.stats["succeeded" if result.success else "failed"] += 1
+        return result
+
+    async def dispatch(
+        self,
+        source: ReportSource,
+        filename: str,
+        destinations: Optional[List[str]] = None,
+        resume_upload_ids: Optional[Dict[str, str]] = None,
+        on_upload_id: Optional[Callable[[str, str], Awaitable[None]]] = None,
+    ) -> Dict[str, DestinationResult]:
+        """
+        Submits the report to the named destinations (default: all) concurrently.
+        `resume_upload_ids` maps destination -> multipart upload id left by a previous attempt;
+        `on_upload_id(destination, upload_id)` is awaited whenever a destination starts or resumes one.
+        Never raises for destination failures; check DestinationResult.success.
+        """
+        selected = [destination for destination in self.destinations if destinations is None or destination.name in destinations]
+        resume_upload_ids = resume_upload_ids or {}
+        results = await asyncio.gather(*(
+            self._submit(destination, source, filename, resume_upload_ids.get(destination.name), on_upload_id) for destination in selected
+        ))
+        return {result.destination: result for result in results}
+
+    def metrics(self) -> Dict[str, Dict[str, Any]]:
+        """Per-destination counters (zero until the destination is first used)."""
+        metrics = {}
+        for destination in self.destinations:
+            channel = self._channels.get(destination.name)
+            stats = channel.stats if channel is not None else _Channel(destination, None, None).stats
+            metrics[destination.name] = dict(stats, url=destination.url, max_concurrency=destination.max_concurrency,
+                                             rate_per_second=destination.rate_per_second, hedge_after=destination.hedge_after or None)
+        return metrics
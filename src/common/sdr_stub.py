@@ -0,0 +1,167 @@
+# src/common/sdr_stub.py
+
+import asyncio
+import hashlib
+import os
+import random
+import uuid
+from dataclasses import dataclass, field
+from typing import List, Dict, Any, Optional
+
+from fastapi import FastAPI, HTTPException, Request
+from fastapi.responses import JSONResponse
+
+from common.utils import logger
+
+# --- 로컬 SDR 대역 서버 (Stand-in SDR) ---
+# A local swap data repository speaking the upload API used by common/sdr_upload.py
+# (streamed POST and resumable multipart), for development and tests. Bodies are hashed
+# as they arrive, never buffered whole. Latency, tail latency, failures and a concurrency
+# limit (429) can be injected per instance to exercise the submission dispatcher.
+#   uvicorn common.sdr_stub:app --port 9999   (the default SDR_SUBMISSION_URL is http://localhost:9999/sdr-submit)
+# In tests, mount create_sdr_stub_app(SdrStub(...)) with httpx.ASGITransport.
+SDR_STUB_LATENCY = float(os.environ.get("SDR_STUB_LATENCY", "0.0")) # Seconds added to every submission / part
+SDR_STUB_FAILURE_RATE = float(os.environ.get("SDR_STUB_FAILURE_RATE", "0.0")) # Fraction of requests answered with 503
+
+
+@dataclass
+class SdrStub:
+    """Behaviour and state of one stand-in SDR."""
+    name: str = "SDR-STUB"
+    latency: float = SDR_STUB_LATENCY
+    slow_fraction: float = 0.0 # Fraction of requests that take slow_latency instead (tail latency)
+    slow_latency: float = 0.0
+    failure_rate: float = SDR_STUB_FAILURE_RATE
+    fail_first: int = 0 # The first N submission / part requests fail with 503
+    max_concurrency: Optional[int] = None # More requests in flight are rejected with 429
+    seed: Optional[int] = None
+    submissions: List[Dict[str, Any]] = field(default_factory=list)
+    requests: int = 0
+    rejected: int = 0
+    in_flight: int = 0
+    max_in_flight: int = 0
+
+    def __post_init__(self):
+        self._random = random.Random(self.seed)
+        self._uploads: Dict[str, Dict[int, Dict[str, Any]]] = {}
+        self._idempotency: Dict[str, Dict[str, Any]] = {}
+
+    async def _begin(self) -> Optional[JSONResponse]:
+        """Counts the request and applies injected limits / failures / latency. Returns an error response or None."""
+        self.requests += 1
+        if self.max_concurrency is not None and self.in_flight >= self.max_concurrency:
+            self.rejected += 1
+            return JSONResponse({"detail": "too many concurrent requests"}, status_code=429, headers={"Retry-After": "1"})
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            slow = self.slow_fraction and self._random.random() < self.slow_fraction
+            await asyncio.sleep(self.slow_latency if slow else self.latency)
+        except BaseException:
+            self.in_flight -= 1
+            raise
+        if self.fail_first > 0 or (self.failure_rate and self._random.random() < self.failure_rate):
+            self.fail_first = max(self.fail_first - 1, 0)
+            self.in_flight -= 1
+            self.rejected += 1
+            return JSONResponse({"detail": "repository temporarily unavailable"}, status_code=503)
+        return None
+
+    def _end(self) -> None:
+        self.in_flight -= 1
+
+
+async def _read_body(request: Request) -> Dict[str, Any]:
+    digest = hashlib.sha256()
+    size = 0
+    async for chunk in request.stream():
+        digest.update(chunk)
+        size += len(chunk)
+    return {"size": size, "sha256": digest.hexdigest()}
+
+
+def create_sdr_stub_app(stub: Optional[SdrStub] = None) -> FastAPI:
+    """FastAPI app serving `stub` under /sdr-submit."""
+    stub = stub or SdrStub()
+    app = FastAPI()
+    app.state.stub = stub
+
+    def accept(filename: str, size: int, sha256: str, idempotency_key: Optional[str], **extra) -> Dict[str, Any]:
+        if idempotency_key and idempotency_key in stub._idempotency:
+            return dict(stub._idempotency[idempotency_key], duplicate=True) # Hedged / retried copy of a received report
+        receipt = {"status": "received", "repository": stub.name, "receipt_id": str(uuid.uuid4()), "filename": filename, "size": size, "sha256": sha256}
+        stub.submissions.append(dict(receipt, **extra))
+        if idempotency_key:
+            stub._idempotency[idempotency_key] = receipt
+        logger.info(f"[{stub.name}] Received report {filename} ({size} bytes).")
+        return receipt
+
+    @app.post("/sdr-submit")
+    async def submit(request: Request):
+        error = await stub._begin()
+        if error is not None:
+            return error
+        try:
+            body = await _read_body(request)
+        finally:
+            stub._end()
+        return accept(request.headers.get("X-Report-Filename", ""), body["size"], body["sha256"], request.headers.get("Idempotency-Key"))
+
+    @app.post("/sdr-submit/uploads", status_code=201)
+    async def initiate_upload(manifest: Dict[str, Any]):
+        upload_id = str(uuid.uuid4())
+        stub._uploads[upload_id] = {}
+        return {"upload_id": upload_id}
+
+    @app.get("/sdr-submit/uploads/{upload_id}")
+    async def get_upload(upload_id: str):
+        if upload_id not in stub._uploads:
+            raise HTTPException(status_code=404, detail="Upload not found")
+        return {"upload_id": upload_id, "parts": [dict(part, part_number=number) for number, part in sorted(stub._uploads[upload_id].items())]}
+
+    @app.put("/sdr-submit/uploads/{upload_id}/parts/{part_number}")
+    async def put_part(upload_id: str, part_number: int, request: Request):
+        if upload_id not in stub._uploads:
+            raise HTTPException(status_code=404, detail="Upload not found")
+        error = await stub._begin()
+        if error is not None:
+            return error
+        try:
+            body = await _read_body(request)
+        finally:
+            stub._end()
+        if body["sha256"] != request.headers.get("X-Part-Sha256"):
+            raise HTTPException(status_code=400, detail="Part checksum mismatch")
+        stub._uploads[upload_id][part_number] = body
+        return {"part_number": part_number, "size": body["size"]}
+
+    @app.post("/sdr-submit/uploads/{upload_id}/complete")
+    async def complete_upload(upload_id: str, manifest: Dict[str, Any], request: Request):
+        parts = stub._uploads.get(upload_id)
+        if parts is None:
+            raise HTTPException(status_code=404, detail="Upload not found")
+        missing = [part["part_number"] for part in manifest["parts"] if parts.get(part["part_number"], {}).get("sha256") != part["sha256"]]
+        if missing:
+            raise HTTPException(status_code=400, detail=f"Parts missing or mismatching: {missing}")
+        size = sum(part["size"] for part in manifest["parts"])
+        digest = hashlib.sha256("".join(part["sha256"] for part in manifest["parts"]).encode()).hexdigest() # Hash of part hashes
+        del stub._uploads[upload_id]
+        return accept(manifest.get("filename", ""), size, digest, request.headers.get("Idempotency-Key"), parts=len(manifest["parts"]))
+
+    @app.get("/sdr-submit/submissions")
+    async def list_submissions():
+        return {"repository": stub.name, "submissions": stub.submissions}
+
+    @app.get("/health")
+    async def health():
+        return {"status": "ok", "repository": stub.name, "requests": stub.requests, "rejected": stub.rejected, "max_in_flight": stub.max_in_flight}
+
+    return app
+
+
+# Default instance for `uvicorn common.sdr_stub:app`
+app = create_sdr_stub_app()
+
+if __name__ == "__main__":
+    import uvicorn
+    uvicorn.run(app, host="127.0.0.1", port=int(os.environ.get("SDR_STUB_PORT", "9999")))
@@ -0,0 +1,159 @@
+# src/common/sdr_upload.py
+
+import asyncio
+import os
+from typing import List, Dict, Any, Optional, AsyncIterator, Callable, Awaitable
+
+import httpx
+
+from common.utils import logger
+from common.report_source import ReportSource, FileReportSource, BytesReportSource, REPORT_CHUNK_BYTES
+
+# --- SDR 스트리밍 업로드 (Streaming / Multipart Report Upload) ---
+# Report files are never read into memory as a whole. A report source yields the file in
+# SDR_UPLOAD_CHUNK_BYTES chunks (from the local file written by report-generation, or from
+# object storage), so memory stays flat whatever the report size:
+#   - Reports up to SDR_MULTIPART_THRESHOLD_BYTES are POSTed in one request whose body is
+#     the chunk iterator (chunked transfer encoding).
+#   - Larger reports use the SDR's resumable multipart upload: initiate, PUT each part of
+#     SDR_PART_SIZE_BYTES with its SHA-256 (retried up to SDR_PART_RETRIES times with
+#     exponential backoff), then complete. Parts are streamed too: one pass over the part
+#     computes its checksum, each (re)send reads it again from the source. The upload id is handed to the caller as soon
+#     as it exists, so a later attempt for the same report resumes it and only sends the
+#     parts the SDR does not have yet.
+# Multipart endpoints, relative to the submission URL:
+#   POST {url}/uploads                          -> {"upload_id"}
+#   GET  {url}/uploads/{upload_id}              -> {"parts": [{"part_number", "size", "sha256"}]} (404 once expired)
+#   PUT  {url}/uploads/{upload_id}/parts/{n}    (X-Part-Sha256)
+#   POST {url}/uploads/{upload_id}/complete     -> SDR submission response
+SDR_UPLOAD_CHUNK_BYTES = REPORT_CHUNK_BYTES # Read / send buffer
+SDR_MULTIPART_THRESHOLD_BYTES = int(os.environ.get("SDR_MULTIPART_THRESHOLD_BYTES", str(64 * 1024 * 1024))) # Larger reports use multipart upload
+SDR_PART_SIZE_BYTES = int(os.environ.get("SDR_PART_SIZE_BYTES", str(8 * 1024 * 1024))) # Multipart part size
+SDR_PART_RETRIES = int(os.environ.get("SDR_PART_RETRIES", "3")) # Extra attempts per part
+SDR_PART_RETRY_BACKOFF = float(os.environ.get("SDR_PART_RETRY_BACKOFF", "0.5")) # Seconds, doubled per attempt
+SDR_UPLOAD_TIMEOUT = float(os.environ.get("SDR_UPLOAD_TIMEOUT", "300.0")) # Seconds per request
+
+
+async def open_report_source(report_storage_path: Optional[str], object_name: str, storage) -> ReportSource:
+    """
+    Source of a generated report: the local file for file:// storage paths, otherwise the
+    object from `storage` - streamed when it has async open_source(object_name) (common/object_store.py),
+    else read with async download_file(object_name) -> bytes | None.
+    Raises FileNotFoundError when the report is missing.
+    """
+    if report_storage_path and report_storage_path.startswith("file://"):
+        return FileReportSource(report_storage_path[len("file://"):])
+    if hasattr(storage, "open_source"):
+        return await storage.open_source(object_name)
+    content = await storage.download_file(object_name)
+    if content is None:
+        raise FileNotFoundError(f"Report object not found in storage: {object_name}")
+    return BytesReportSource(content, object_name)
+
+
+def is_retryable(exc: Exception) -> bool:
+    """Transport errors, 429 and 5xx responses are worth retrying; other 4xx are not."""
+    if isinstance(exc, httpx.HTTPStatusError):
+        return exc.response.status_code == 429 or exc.response.status_code >= 500
+    return isinstance(exc, httpx.TransportError)
+
+
+async def stream_upload(client: httpx.AsyncClient, url: str, source: ReportSource, filename: str,
+                        chunk_size: int = SDR_UPLOAD_CHUNK_BYTES, headers: Optional[Dict[str, str]] = None) -> Dict[str, Any]:
+    """POSTs the whole report as one chunked request body. Returns the SDR JSON response."""
+    response = await client.post(
+        url, content=source.iter_chunks(chunk_size), timeout=SDR_UPLOAD_TIMEOUT,
+        headers={"Content-Type": "application/octet-stream", "X-Report-Filename": filename, **(headers or {})},
+    )
+    response.raise_for_status()
+    return response.json()
+
+
+async def _put_part(client: httpx.AsyncClient, part_url: str, source: ReportSource, offset: int, length: int, sha256: str) -> None:
+    for attempt in range(SDR_PART_RETRIES + 1):
+        try:
+            # Explicit Content-Length: the part is streamed from the source without chunked encoding
+            response = await client.put(part_url, content=source.iter_range(offset, length), timeout=SDR_UPLOAD_TIMEOUT, headers={
+                "Content-Type": "application/octet-stream", "Content-Length": str(length), "X-Part-Sha256": sha256,
+            })
+            response.raise_for_status()
+            return
+        except httpx.HTTPError as exc:
+            if attempt == SDR_PART_RETRIES or not is_retryable(exc):
+                raise
+            delay = SDR_PART_RETRY_BACKOFF * 2 ** attempt
+            logger.warning(f"SDR part upload {part_url} failed ({exc!r}), retrying in {delay:.1f}s (attempt {attempt + 2}/{SDR_PART_RETRIES + 1}).")
+            await asyncio.sleep(delay)
+
+
+async def multipart_upload(
+    client: httpx.AsyncClient,
+    url: str,
+    source: ReportSource,
+    filename: str,
+    part_size: int = SDR_PART_SIZE_BYTES,
+    resume_upload_id: Optional[str] = None,
+    on_upload_id: Optional[Callable[[str], Awaitable[None]]] = None,
+    headers: Optional[Dict[str, str]] = None,
+) -> Dict[str, Any]:
+    """
+    Resumable multipart upload. Resumes `resume_upload_id` when the SDR still has it, sending
+    only missing or mismatching parts. Returns {"response", "upload_id", "parts", "parts_sent", "parts_resumed"}.
+    """
+    upload_id = None
+    received: Dict[int, Dict[str, Any]] = {}
+    if resume_upload_id:
+        response = await client.get(f"{url}/uploads/{resume_upload_id}", timeout=SDR_UPLOAD_TIMEOUT)
+        if response.status_code == 404:
+            logger.info(f"SDR upload {resume_upload_id} for {filename} has expired; starting a new upload.")
+        else:
+            response.raise_for_status()
+            upload_id = resume_upload_id
+            received = {part["part_number"]: part for part in response.json().get("parts", [])}
+    if upload_id is None:
+        response = await client.post(f"{url}/uploads", timeout=SDR_UPLOAD_TIMEOUT,
+                                     json={"filename": filename, "size": source.size, "part_size": part_size})
+        response.raise_for_status()
+        upload_id = response.json()["upload_id"]
+    if on_upload_id is not None:
+        await on_upload_id(upload_id) # New or resumed: the attempt that fails next hands it on
+
+    parts: List[Dict[str, Any]] = []
+    parts_sent = 0
+    for part_number, offset in enumerate(range(0, source.size, part_size), start=1):
+        length = min(part_size, source.size - offset)
+        sha256 = await source.sha256_range(offset, length)
+        existing = received.get(part_number)
+        if not (existing and existing.get("size") == length and existing.get("sha256") == sha256):
+            await _put_part(client, f"{url}/uploads/{upload_id}/parts/{part_number}", source, offset, length, sha256)
+            parts_sent += 1
+        parts.append({"part_number": part_number, "size": length, "sha256": sha256})
+
+    response = await client.post(f"{url}/uploads/{upload_id}/complete", json={"filename": filename, "parts": parts},
+                                 timeout=SDR_UPLOAD_TIMEOUT, headers=headers)
+    response.raise_for_status()
+    return {"response": response.json(), "upload_id": upload_id, "parts": len(parts), "parts_sent": parts_sent, "parts_resumed": len(parts) - parts_sent}
+
+
+async def upload_report(
+    client: httpx.AsyncClient,
+    url: str,
+    source: ReportSource,
+    filename: str,
+    resume_upload_id: Optional[str] = None,
+    on_upload_id: Optional[Callable[[str], Awaitable[None]]] = None,
+    multipart_threshold: int = SDR_MULTIPART_THRESHOLD_BYTES,
+    part_size: int = SDR_PART_SIZE_BYTES,
+    headers: Optional[Dict[str, str]] = None,
+) -> Dict[str, Any]:
+    """
+    Sends a report to the SDR, streaming small reports and using resumable multipart above
+    `multipart_threshold` (or whenever a previous upload id is given). `headers` (e.g. an
+    Idempotency-Key) go with the request that delivers the report.
+    Returns {"response": SDR JSON, "mode", "size", ...multipart details}.
+    """
+    if source.size > multipart_threshold or resume_upload_id:
+        result = await multipart_upload(client, url, source, filename, part_size, resume_upload_id=resume_upload_id,
+                                        on_upload_id=on_upload_id, headers=headers)
+        return dict(result, mode="multipart", size=source.size)
+    return {"response": await stream_upload(client, url, source, filename, headers=headers), "mode": "stream", "size": source.size}
@@ -0,0 +1,492 @@
+# src/common/stage_queue.py
+
+import asyncio
+import inspect
+import os
+import random
+import uuid
+from abc import ABC, abstractmethod
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import List, Dict, Any, Optional, Sequence, Callable, Awaitable, AsyncIterator
+
+from sqlalchemy import select, update, delete, insert, func, or_, and_, event
+from sqlalchemy.orm import Session
+
+from common.utils import logger, SessionLocal, AsyncSession, StageQueueMessage, send_alert
+from common.bulk_db import chunked
+from common.http_client import http_client_pool
+from common.alerts import start_alert_aggregation, stop_alert_aggregation
+
+# --- 파이프라인 단계 간 내구성 큐 (Durable Stage Queue) ---
+# Stages no longer await each other over HTTP. Each stage publishes its output to the
+# next stage's queue and a background StageWorker in the next module consumes it, so
+# ingest latency is decoupled from (slow) SDR submission latency.
+#   ingestion -> [processing] -> processing -> [validation] -> validation
+#             -> [report-generation] -> report-generation -> [report-submission] -> submission
+# Delivery is at-least-once: a received message becomes invisible for the visibility
+# timeout and is redelivered if it is not acked in time (e.g. the consumer crashed).
+# Handlers must therefore tolerate redelivery.
+PROCESSING_QUEUE = "processing"
+VALIDATION_QUEUE = "validation"
+REPORT_GENERATION_QUEUE = "report-generation"
+REPORT_SUBMISSION_QUEUE = "report-submission"
+
+STAGE_QUEUE_BACKEND = os.environ.get("STAGE_QUEUE_BACKEND", "table") # table (SQLite/PostgreSQL via DATABASE_URL)
+STAGE_QUEUE_BATCH_SIZE = int(os.environ.get("STAGE_QUEUE_BATCH_SIZE", "500")) # Max messages per receive
+STAGE_QUEUE_VISIBILITY_TIMEOUT = float(os.environ.get("STAGE_QUEUE_VISIBILITY_TIMEOUT", "300")) # Seconds a received message stays hidden
+STAGE_QUEUE_MAX_ATTEMPTS = int(os.environ.get("STAGE_QUEUE_MAX_ATTEMPTS", "5")) # Deliveries before a message is dead-lettered
+STAGE_QUEUE_MAX_DEPTH = int(os.environ.get("STAGE_QUEUE_MAX_DEPTH", "200000")) # Backpressure: publish fails above this depth
+STAGE_QUEUE_POLL_INTERVAL = float(os.environ.get("STAGE_QUEUE_POLL_INTERVAL", "1.0")) # Seconds between polls of an empty queue
+STAGE_QUEUE_RETRY_DELAY = float(os.environ.get("STAGE_QUEUE_RETRY_DELAY", "5.0")) # Base delay before a failed batch is redelivered
+STAGE_WORKERS_ENABLED = os.environ.get("STAGE_WORKERS_ENABLED", "true").lower() == "true"
+
+
+class QueueFullError(Exception):
+    """Raised by publish when the target queue is above its max depth (backpressure)."""
+
+
+class LeaseLostError(Exception):
+    """Raised when messages are acked after their lease expired and another consumer received them."""
+
+
+@dataclass
+class QueueMessage:
+    """A received message. `lease_id` must be passed back on ack/nack."""
+    id: str
+    payload: Any
+    attempts: int
+    lease_id: str
+
+
+class StageQueue(ABC):
+    """
+    Pluggable stage queue interface.
+    `db` is optional on every call: backends that live in the application database use it
+    to join the caller's transaction (publish together with the stage's own writes);
+    other backends ignore it.
+    """
+
+    # True when ack(db=...) deletes the messages in the caller's transaction (queue in the application database)
+    transactional_ack = False
+
+    def __init__(self, name: str, max_depth: int = STAGE_QUEUE_MAX_DEPTH, max_attempts: int = STAGE_QUEUE_MAX_ATTEMPTS):
+        self.name = name
+        self.max_depth = max_depth
+        self.max_attempts = max_attempts
+
+    @abstractmethod
+    def publish(self, payloads: Sequence[Any], db: Optional[Session] = None) -> List[str]:
+        """Enqueues one message per payload. Raises QueueFullError when over max_depth."""
+
+    @abstractmethod
+    def receive(self, max_messages: int = STAGE_QUEUE_BATCH_SIZE, visibility_timeout: float = STAGE_QUEUE_VISIBILITY_TIMEOUT,
+                db: Optional[Session] = None) -> List[QueueMessage]:
+        """Claims up to `max_messages` visible messages and hides them for `visibility_timeout` seconds."""
+
+    @abstractmethod
+    def ack(self, messages: Sequence[QueueMessage], db: Optional[Session] = None) -> int:
+        """Removes successfully handled messages. Returns the number acked."""
+
+    @abstractmethod
+    def nack(self, messages: Sequence[QueueMessage], error: str, delay: float = 0.0, db: Optional[Session] = None) -> int:
+        """Makes messages visible again after `delay` seconds, or dead-letters them after max_attempts. Returns the number dead-lettered."""
+
+    @abstractmethod
+    def depth(self, db: Optional[Session] = None) -> int:
+        """Number of messages waiting or in flight (dead-lettered messages excluded)."""
+
+    @abstractmethod
+    def extend(self, messages: Sequence[QueueMessage], visibility_timeout: float, db: Optional[Session] = None) -> int:
+        """Keeps received messages hidden for another `visibility_timeout` seconds (lease still held). Returns the number extended."""
+
+    async def publish_async(self, payloads: Sequence[Any], db: Optional["AsyncSession"] = None) -> List[str]:
+        """
+        publish() for async callers. With an AsyncSession the messages join its transaction
+        (run via run_sync on the session's connection); without one the blocking publish
+        runs in a worker thread so the event loop is not held up.
+        """
+        if db is not None:
+            return await db.run_sync(lambda session: self.publish(payloads, db=session))
+        return await asyncio.to_thread(self.publish, payloads)
+
+
+class TableStageQueue(StageQueue):
+    """
+    Stage queue stored in the stage_queue_messages table of the application database.
+    Works on SQLite for local runs (no broker needed) and on PostgreSQL, where receive
+    uses FOR UPDATE SKIP LOCKED so concurrent consumers do not block each other.
+    """
+    transactional_ack = True
+
+    def __init__(self, name: str, session_factory: Callable[[], Session] = SessionLocal, **kwargs):
+        super().__init__(name, **kwargs)
+        self._session_factory = session_factory
+
+    def _run(self, db: Optional[Session], operation: Callable[[Session], Any]) -> Any:
+        """Runs `operation` in the caller's session (caller commits) or in a short-lived session of its own."""
+        if db is not None:
+            return operation(db)
+        own_db = self._session_factory()
+        try:
+            result = operation(own_db)
+            own_db.commit()
+            return result
+        except Exception:
+            own_db.rollback()
+            raise
+        finally:
+            own_db.close()
+
+    def _depth(self, db: Session) -> int:
+        return db.execute(
+            select(func.count()).select_from(StageQueueMessage)
+            .where(StageQueueMessage.queue_name == self.name, StageQueueMessage.status.in_(("Ready", "InFlight")))
+        ).scalar()
+
+    def publish(self, payloads: Sequence[Any], db: Optional[Session] = None) -> List[str]:
+        if not payloads:
+            return []
+
+        def operation(session: Session) -> List[str]:
+            current_depth = self._depth(session)
+            if current_depth + len(payloads) > self.max_depth:
+                raise QueueFullError(f"Queue '{self.name}' is full ({current_depth} messages, max {self.max_depth}).")
+            now = datetime.utcnow()
+            rows = [
+                {"id": str(uuid.uuid4()), "queue_name": self.name, "payload": payload, "status": "Ready",
+                 "attempts": 0, "enqueued_at": now, "visible_at": now}
+                for payload in payloads
+            ]
+            session.execute(insert(StageQueueMessage.__table__), rows)
+            return [row["id"] for row in rows]
+
+        message_ids = self._run(db, operation)
+        logger.info(f"Published {len(message_ids)} messages to stage queue '{self.name}'.")
+        return message_ids
+
+    def receive(self, max_messages: int = STAGE_QUEUE_BATCH_SIZE, visibility_timeout: float = STAGE_QUEUE_VISIBILITY_TIMEOUT,
+                db: Optional[Session] = None) -> List[QueueMessage]:
+
+        def operation(session: Session) -> List[QueueMessage]:
+            now = datetime.utcnow()
+            # Ready messages, plus in-flight messages whose visibility timeout expired (redelivery)
+            candidates = (
+                select(StageQueueMessage.id)
+                .where(
+                    StageQueueMessage.queue_name == self.name,
+                    StageQueueMessage.status.in_(("Ready", "InFlight")),
+                    StageQueueMessage.visible_at <= now,
+                )
+                .order_by(StageQueueMessage.visible_at)
+                .limit(max_messages)
+            )
+            if session.get_bind().dialect.name == "postgresql":
+                candidates = candidates.with_for_update(skip_locked=True)
+            candidate_ids = session.execute(candidates).scalars().all()
+            if not candidate_ids:
+                return []
+
+            # Claim with a fresh lease; the visible_at guard keeps a concurrent claimer from taking the same rows
+            lease_id = str(uuid.uuid4())
+            session.execute(
+                update(StageQueueMessage)
+                .where(StageQueueMessage.id.in_(candidate_ids), StageQueueMessage.visible_at <= now)
+                .values(
+                    status="InFlight",
+                    lease_id=lease_id,
+                    attempts=StageQueueMessage.attempts + 1,
+                    visible_at=now + timedelta(seconds=visibility_timeout),
+                )
+                .execution_options(synchronize_session=False)
+            )
+            rows = session.execute(
+                select(StageQueueMessage.id, StageQueueMessage.payload, StageQueueMessage.attempts)
+                .where(StageQueueMessage.lease_id == lease_id)
+                .order_by(StageQueueMessage.enqueued_at)
+            ).all()
+            return [QueueMessage(id=row.id, payload=row.payload, attempts=row.attempts, lease_id=lease_id) for row in rows]
+
+        return self._run(db, operation)
+
+    def _lease_filter(self, messages: Sequence[QueueMessage]):
+        """Matches only messages still held under the lease they were received with."""
+        return or_(*[
+            and_(StageQueueMessage.lease_id == lease_id, StageQueueMessage.id.in_([m.id for m in messages if m.lease_id == lease_id]))
+            for lease_id in {message.lease_id for message in messages}
+        ])
+
+    def ack(self, messages: Sequence[QueueMessage], db: Optional[Session] = None) -> int:
+        if not messages:
+            return 0
+
+        def operation(session: Session) -> int:
+            acked = 0
+            for message_chunk in chunked(list(messages)):
+                result = session.execute(
+                    delete(StageQueueMessage).where(self._lease_filter(message_chunk))
+                    .execution_options(synchronize_session=False)
+                )
+                acked += result.rowcount
+            return acked
+
+        acked = self._run(db, operation)
+        if acked < len(messages):
+            logger.warning(f"Acked {acked} of {len(messages)} messages on '{self.name}'; the rest had expired leases and may be redelivered.")
+        return acked
+
+    def extend(self, messages: Sequence[QueueMessage], visibility_timeout: float, db: Optional[Session] = None) -> int:
+        if not messages:
+            return 0
+
+        def operation(session: Session) -> int:
+            visible_at = datetime.utcnow() + timedelta(seconds=visibility_timeout)
+            return session.execute(
+                update(StageQueueMessage).where(self._lease_filter(messages)).values(visible_at=visible_at)
+                .execution_options(synchronize_session=False)
+            ).rowcount
+
+        return self._run(db, operation)
+
+    def nack(self, messages: Sequence[QueueMessage], error: str, delay: float = 0.0, db: Optional[Session] = None) -> int:
+        if not messages:
+            return 0
+
+        def operation(session: Session) -> int:
+            dead_lettered = 0
+            visible_at = datetime.utcnow() + timedelta(seconds=delay)
+            for message_chunk in chunked(list(messages)):
+                lease_filter = self._lease_filter(message_chunk)
+                result = session.execute(
+                    update(StageQueueMessage)
+                    .where(lease_filter, StageQueueMessage.attempts >= self.max_attempts)
+                    .values(status="Dead", lease_id=None, last_error=error)
+                    .execution_options(synchronize_session=False)
+                )
+                dead_lettered += result.rowcount
+                session.execute(
+                    update(StageQueueMessage)
+                    .where(lease_filter, StageQueueMessage.status == "InFlight")
+                    .values(status="Ready", lease_id=None, visible_at=visible_at, last_error=error)
+                    .execution_options(synchronize_session=False)
+                )
+            return dead_lettered
+
+        dead_lettered = self._run(db, operation)
+        if dead_lettered:
+            send_alert("Error", f"{dead_lettered} messages on stage queue '{self.name}' exceeded {self.max_attempts} attempts and were dead-lettered.",
+                       {"module": "stage-queue", "queue": self.name, "error": error})
+        return dead_lettered
+
+    def depth(self, db: Optional[Session] = None) -> int:
+        return self._run(db, self._depth)
+
+
+# --- Backend registry (pluggable: register e.g. an SQS/RabbitMQ implementation under a new name) ---
+_STAGE_QUEUE_BACKENDS: Dict[str, Callable[..., StageQueue]] = {"table": TableStageQueue}
+_stage_queues: Dict[str, StageQueue] = {}
+
+
+def register_stage_queue_backend(backend_name: str, factory: Callable[..., StageQueue]) -> None:
+    """Registers a StageQueue implementation selectable via STAGE_QUEUE_BACKEND."""
+    _STAGE_QUEUE_BACKENDS[backend_name] = factory
+
+
+def get_stage_queue(name: str) -> StageQueue:
+    """Returns the process-wide queue instance for `name` using the configured backend."""
+    queue = _stage_queues.get(name)
+    if queue is None:
+        factory = _STAGE_QUEUE_BACKENDS.get(STAGE_QUEUE_BACKEND)
+        if factory is None:
+            raise ValueError(f"Unknown STAGE_QUEUE_BACKEND '{STAGE_QUEUE_BACKEND}'. Registered: {sorted(_STAGE_QUEUE_BACKENDS)}")
+        queue = _stage_queues[name] = factory(name)
+    return queue
+
+
+# --- Consumer ---
+
+StageHandler = Callable[[List[Any], Any], Awaitable[None]] # (payloads, Session or AsyncSession)
+
+
+async def _maybe_await(result: Any) -> Any:
+    """Awaits `result` if it is awaitable (AsyncSession methods), else returns it (Session methods)."""
+    if inspect.isawaitable(result):
+        return await result
+    return result
+
+
+class StageWorker:
+    """
+    Background consumer for one stage queue.
+    Receives batches of up to `batch_size` messages and calls `handler(payloads, db)`, where
+    `db` comes from `session_factory` (SessionLocal or AsyncSessionLocal). Queue calls run in
+    a worker thread so polling never blocks the module's request handling.
+    The batch is acked when the handler returns and nacked (redelivered after a jittered,
+    growing delay) when it raises. Only one batch is in flight per worker, so a slow
+    stage lets its input queue grow until publishers hit QueueFullError (backpressure).
+    With ack_in_transaction (queues with transactional_ack), the messages are deleted in
+    the handler's own transaction, just before its first commit: the stage's writes and
+    the ack commit together, so a crash or an expired lease cannot redeliver a batch whose
+    writes are already committed. Use it for handlers that commit once.
+    A batch that fails on its last attempt is retried message by message, so one poison
+    message is dead-lettered alone instead of taking the whole batch with it.
+    With extend_lease, the lease of the batch is extended every visibility_timeout / 3 while
+    the handler runs, so a handler slower than the visibility timeout is not redelivered
+    to another consumer; the messages become visible again only when this process dies.
+    """
+
+    def __init__(
+        self,
+        queue: StageQueue,
+        handler: StageHandler,
+        batch_size: int = STAGE_QUEUE_BATCH_SIZE,
+        visibility_timeout: float = STAGE_QUEUE_VISIBILITY_TIMEOUT,
+        poll_interval: float = STAGE_QUEUE_POLL_INTERVAL,
+        retry_delay: float = STAGE_QUEUE_RETRY_DELAY,
+        session_factory: Callable[[], Any] = SessionLocal,
+        ack_in_transaction: bool = True,
+        extend_lease: bool = False,
+    ):
+        self.queue = queue
+        self.handler = handler
+        self.batch_size = batch_size
+        self.visibility_timeout = visibility_timeout
+        self.poll_interval = poll_interval
+        self.retry_delay = retry_delay
+        self._session_factory = session_factory
+        self.ack_in_transaction = ack_in_transaction and queue.transactional_ack
+        self.extend_lease = extend_lease
+        self._task: Optional[asyncio.Task] = None
+        self._stopping = asyncio.Event()
+        self.processed_count = 0
+        self.failed_batches = 0
+
+    def _ack_on_commit(self, db: Any, messages: Sequence[QueueMessage]) -> Dict[str, bool]:
+        """Deletes `messages` in `db`'s transaction right before its first commit. Returns the state dict ("acked" after that commit)."""
+        state = {"acked": False}
+        session = getattr(db, "sync_session", db) # AsyncSession wraps a Session
+
+        def ack_in_transaction(session: Session) -> None:
+            if self.queue.ack(messages, db=session) < len(messages):
+                raise LeaseLostError(f"Lease on {len(messages)} messages of '{self.queue.name}' expired and they were redelivered; not committing.")
+            event.listen(session, "after_commit", lambda session: state.update(acked=True), once=True)
+
+        event.listen(session, "before_commit", ack_in_transaction, once=True)
+        return state
+
+    async def _keep_leased(self, messages: Sequence[QueueMessage]) -> None:
+        while True:
+            await asyncio.sleep(self.visibility_timeout / 3)
+            try:
+                extended = await asyncio.to_thread(self.queue.extend, messages, self.visibility_timeout)
+            except Exception as e: # Retried on the next beat, before the lease runs out
+                logger.warning(f"Failed to extend the lease of {len(messages)} messages on '{self.queue.name}': {e}")
+                continue
+            if extended < len(messages):
+                logger.warning(f"Lease of {len(messages) - extended} messages on '{self.queue.name}' already expired; they may be redelivered.")
+                return
+
+    async def _handle(self, messages: Sequence[QueueMessage]) -> Optional[Exception]:
+        """Runs the handler on `messages` in a new session and acks them. Returns the handler's exception, if any."""
+        db = self._session_factory()
+        state = self._ack_on_commit(db, messages) if self.ack_in_transaction else {"acked": False}
+        heartbeat = asyncio.create_task(self._keep_leased(messages)) if self.extend_lease else None
+        try:
+            await self.handler([message.payload for message in messages], db)
+        except Exception as e:
+            await _maybe_await(db.rollback())
+            return e
+        finally:
+            if heartbeat is not None:
+                heartbeat.cancel()
+            await _maybe_await(db.close())
+        if not state["acked"]: # The handler did not commit (nothing to write) or acks separately
+            await asyncio.to_thread(self.queue.ack, messages)
+        self.processed_count += len(messages)
+        return None
+
+    async def _nack(self, messages: Sequence[QueueMessage], error: Exception) -> None:
+        attempts = max(message.attempts for message in messages)
+        delay = self.retry_delay * (2 ** (attempts - 1)) * random.uniform(0.5, 1.5)
+        logger.error(f"Stage worker '{self.queue.name}' failed on a batch of {len(messages)} messages (attempt {attempts}): {error}", exc_info=error)
+        await asyncio.to_thread(self.queue.nack, messages, error=str(error), delay=delay)
+
+    async def run_once(self) -> int:
+        """Receives and handles a single batch. Returns the number of messages received."""
+        messages = await asyncio.to_thread(self.queue.receive, max_messages=self.batch_size, visibility_timeout=self.visibility_timeout)
+        if not messages:
+            return 0
+
+        error = await self._handle(messages)
+        if error is None:
+            return len(messages)
+        self.failed_batches += 1
+        if len(messages) == 1 or all(message.attempts < self.queue.max_attempts for message in messages):
+            await self._nack(messages, error)
+            return len(messages)
+
+        # Last attempt for some messages: isolate the failing ones before anything is dead-lettered
+        logger.warning(f"Stage worker '{self.queue.name}' retrying a failed batch of {len(messages)} messages one by one: {error}")
+        for message in messages:
+            message_error = await self._handle([message])
+            if message_error is not None:
+                await self._nack([message], message_error)
+        return len(messages)
+
+    async def run(self) -> None:
+        logger.info(f"Stage worker for queue '{self.queue.name}' started (batch_size={self.batch_size}).")
+        while not self._stopping.is_set():
+            try:
+                received = await self.run_once()
+            except Exception as e:
+                # Queue/DB unavailable: keep the worker alive and try again later
+                logger.error(f"Stage worker '{self.queue.name}' could not poll its queue: {e}", exc_info=True)
+                received = 0
+            if received < self.batch_size:
+                try:
+                    await asyncio.wait_for(self._stopping.wait(), timeout=self.poll_interval)
+                except asyncio.TimeoutError:
+                    pass
+        logger.info(f"Stage worker for queue '{self.queue.name}' stopped.")
+
+    def status(self) -> Dict[str, Any]:
+        """Worker counters for /health."""
+        return {
+            "queue": self.queue.name,
+            "running": self._task is not None and not self._task.done(),
+            "processed_count": self.processed_count,
+            "failed_batches": self.failed_batches,
+        }
+
+    def start(self) -> None:
+        self._stopping.clear()
+        self._task = asyncio.get_running_loop().create_task(self.run())
+
+    async def stop(self) -> None:
+        self._stopping.set()
+        if self._task is not None:
+            await self._task
+            self._task = None
+
+
+def stage_lifespan(*workers: StageWorker):
+    """
+    FastAPI lifespan that starts alert aggregation and the given stage workers (unless
+    STAGE_WORKERS_ENABLED=false) and, on shutdown, stops them, flushes pending alerts
+    and closes the shared HTTP clients.
+    Use FastAPI(lifespan=stage_lifespan(worker)).
+    """
+    @asynccontextmanager
+    async def lifespan(app) -> AsyncIterator[None]:
+        await start_alert_aggregation()
+        if STAGE_WORKERS_ENABLED:
+            for worker in workers:
+                worker.start()
+        yield
+        for worker in workers:
+            await worker.stop()
+        await stop_alert_aggregation() # Before the HTTP clients close: the final digests may go to Alertmanager
+        await http_client_pool.aclose()
+
+    return lifespan
@@ -0,0 +1,287 @@
+# src/common/stream_ingest.py
+
+import json
+import os
+import re
+from typing import List, Dict, Any, Optional, Tuple, Callable, AsyncIterator, Union
+
+from sqlalchemy.orm import Session
+
+from common.bulk_ingest import build_raw_rows, bulk_insert_raw_rows
+
+try:
+    import msgspec # Optional: fastest untyped JSON decoder
+except ImportError:
+    msgspec = None
+
+try:
+    import orjson # Optional: fast JSON decoder (fallback when msgspec is missing)
+except ImportError:
+    orjson = None
+
+# --- 스트리밍 수집 (Streaming Ingest) 경로 ---
+# `List[SwapData]` bodies are buffered and validated as a whole before any work starts,
+# so a 200 MB end-of-day push holds the raw body, the parsed list and the models in
+# memory at once. The streaming path reads the request body chunk by chunk, splits it
+# into records incrementally and flushes micro-batches to raw_ingested_data and the
+# processing queue. At most one chunk, one partial record and one batch are held in
+# memory, whatever the payload size.
+#   - application/x-ndjson (jsonl): one JSON object per line (preferred, cheapest to split)
+#   - application/json: a single top-level JSON array, split element by element
+INGEST_STREAM_BATCH_SIZE = int(os.environ.get("INGEST_STREAM_BATCH_SIZE", "1000")) # Records per flush (insert + publish + commit)
+INGEST_STREAM_MAX_RECORD_BYTES = int(os.environ.get("INGEST_STREAM_MAX_RECORD_BYTES", str(1024 * 1024))) # Larger records are rejected
+INGEST_STREAM_MAX_REPORTED_REJECTS = int(os.environ.get("INGEST_STREAM_MAX_REPORTED_REJECTS", "100")) # Rejects listed in the response
+
+NDJSON_CONTENT_TYPES = ("application/x-ndjson", "application/ndjson", "application/jsonl", "application/x-jsonlines", "application/jsonlines")
+JSON_CONTENT_TYPES = ("application/json",)
+
+if msgspec is not None:
+    decode_json = msgspec.json.Decoder().decode
+    JSON_DECODE_ERRORS: Tuple[type, ...] = (msgspec.DecodeError,)
+elif orjson is not None:
+    decode_json = orjson.loads
+    JSON_DECODE_ERRORS = (orjson.JSONDecodeError,)
+else:
+    decode_json = json.loads
+    JSON_DECODE_ERRORS = (ValueError, UnicodeDecodeError)
+
+# (record number, raw bytes) - raw is None when the record exceeded max_record_bytes and was skipped
+RawRecord = Tuple[int, Optional[bytes]]
+# (record number, decoded object or None, error message or None)
+StreamRecord = Tuple[int, Optional[Dict[str, Any]], Optional[str]]
+
+
+class StreamFormatError(ValueError):
+    """Raised when a streamed body cannot be split into records (e.g. a malformed JSON array)."""
+
+    def __init__(self, message: str, record_number: int):
+        super().__init__(f"{message} (record {record_number})")
+        self.record_number = record_number
+
+
+class NDJSONSplitter:
+    """
+    Incremental newline-delimited JSON splitter.
+    Feed it body chunks in order; it returns the complete lines seen so far, numbered
+    from 1 (blank lines are counted but not returned). A line longer than
+    max_record_bytes is dropped without buffering the rest of it and returned as None.
+    """
+
+    def __init__(self, max_record_bytes: int = INGEST_STREAM_MAX_RECORD_BYTES):
+        self.max_record_bytes = max_record_bytes
+        self._buffer = bytearray()
+        self._line_number = 0
+        self._skipping = False # Inside an oversized line; discard until the next newline
+
+    def _complete_line(self, line: bytes, records: List[RawRecord]) -> None:
+        self._line_number += 1
+        if self._skipping:
+            self._skipping = False
+            records.append((self._line_number, None))
+        elif len(line) > self.max_record_bytes:
+            records.append((self._line_number, None))
+        elif line.strip():
+            records.append((self._line_number, line))
+
+    def feed(self, chunk: bytes) -> List[RawRecord]:
+        records: List[RawRecord] = []
+        start = 0
+        if self._buffer:
+            self._buffer += chunk
+            data: Union[bytes, bytearray] = self._buffer
+        else:
+            data = chunk
+
+        while True:
+            newline = data.find(b"\n", start)
+            if newline == -1:
+                break
+            self._complete_line(bytes(data[start:newline]), records)
+            start = newline + 1
+
+        remainder = data[start:]
+        if self._skipping or len(remainder) > self.max_record_bytes:
+            self._skipping = True
+            self._buffer = bytearray()
+        else:
+            self._buffer = bytearray(remainder)
+        return records
+
+    def close(self) -> List[RawRecord]:
+        """Flushes a final line without a trailing newline."""
+        records: List[RawRecord] = []
+        if self._buffer or self._skipping:
+            self._complete_line(bytes(self._buffer), records)
+            self._buffer = bytearray()
+        return records
+
+
+# Whole flat object in one regex pass (the common case: swap records have no nesting)
+_FLAT_OBJECT = re.compile(rb'\{(?:[^{}\[\]"]|"(?:[^"\\]|\\.)*")*\}', re.DOTALL)
+_STRING = re.compile(rb'"(?:[^"\\]|\\.)*"', re.DOTALL)
+_STRUCTURE = re.compile(rb'["{}\[\]]')
+_SCALAR_END = re.compile(rb"[,\]\s]")
+_WHITESPACE = b" \t\r\n"
+
+
+def _element_end(data: bytearray, start: int) -> Optional[int]:
+    """Returns the end offset of the JSON value starting at `start`, or None if it is not complete yet."""
+    opening = data[start]
+    if opening == 0x7B: # '{'
+        match = _FLAT_OBJECT.match(data, start)
+        if match:
+            return match.end()
+    if opening == 0x22: # '"'
+        match = _STRING.match(data, start)
+        return match.end() if match else None
+    if opening not in b"{[":
+        match = _SCALAR_END.search(data, start)
+        return match.start() if match else None
+
+    # Nested object / array: track depth, skipping over strings
+    depth = 0
+    position = start
+    while True:
+        match = _STRUCTURE.search(data, position)
+        if match is None:
+            return None
+        if data[match.start()] == 0x22:
+            string = _STRING.match(data, match.start())
+            if string is None:
+                return None
+            position = string.end()
+            continue
+        depth += 1 if data[match.start()] in b"{[" else -1
+        position = match.end()
+        if depth == 0:
+            return position
+
+
+class JSONArraySplitter:
+    """
+    Incremental splitter for a single top-level JSON array (`[{...}, {...}]`).
+    Returns each complete element as raw bytes, numbered from 1. Unlike NDJSON there is
+    no way to resynchronise after an oversized or malformed element, so both raise
+    StreamFormatError.
+    """
+
+    def __init__(self, max_record_bytes: int = INGEST_STREAM_MAX_RECORD_BYTES):
+        self.max_record_bytes = max_record_bytes
+        self._buffer = bytearray()
+        self._element_number = 0
+        self._state = "start" # start -> element|separator -> ... -> end
+
+    def _skip_whitespace(self, position: int) -> int:
+        while position < len(self._buffer) and self._buffer[position] in _WHITESPACE:
+            position += 1
+        return position
+
+    def feed(self, chunk: bytes) -> List[RawRecord]:
+        records: List[RawRecord] = []
+        self._buffer += chunk
+        data = self._buffer
+        position = 0
+
+        while True:
+            position = self._skip_whitespace(position)
+            if position >= len(data):
+                break
+            byte = data[position]
+            if self._state == "start":
+                if byte != 0x5B: # '['
+                    raise StreamFormatError("Expected a JSON array", self._element_number)
+                self._state = "first"
+                position += 1
+            elif self._state in ("first", "element"):
+                if byte == 0x5D and self._state == "first": # ']' - empty array
+                    self._state = "end"
+                    position += 1
+                    continue
+                end = _element_end(data, position)
+                if end is None:
+                    if len(data) - position > self.max_record_bytes:
+                        raise StreamFormatError(f"Record exceeds {self.max_record_bytes} bytes", self._element_number + 1)
+                    break
+                if end == position:
+                    raise StreamFormatError("Expected a value", self._element_number + 1)
+                self._element_number += 1
+                records.append((self._element_number, bytes(data[position:end])))
+                self._state = "separator"
+                position = end
+            elif self._state == "separator":
+                if byte == 0x2C: # ','
+                    self._state = "element"
+                elif byte == 0x5D:
+                    self._state = "end"
+                else:
+                    raise StreamFormatError("Expected ',' or ']' between array elements", self._element_number)
+                position += 1
+            else:
+                raise StreamFormatError("Unexpected data after the closing ']'", self._element_number)
+
+        del data[:position]
+        return records
+
+    def close(self) -> List[RawRecord]:
+        if self._state != "end" or self._buffer.strip():
+            raise StreamFormatError("Truncated JSON array", self._element_number)
+        return []
+
+
+def make_record_splitter(content_type: Optional[str], max_record_bytes: int = INGEST_STREAM_MAX_RECORD_BYTES):
+    """Picks the splitter for a request Content-Type. Raises ValueError for unsupported types."""
+    media_type = (content_type or "").split(";", 1)[0].strip().lower()
+    if media_type in NDJSON_CONTENT_TYPES:
+        return NDJSONSplitter(max_record_bytes)
+    if media_type in JSON_CONTENT_TYPES:
+        return JSONArraySplitter(max_record_bytes)
+    raise ValueError(f"Unsupported content type for streaming ingestion: '{content_type}'")
+
+
+def decode_record(raw: Optional[bytes], max_record_bytes: int = INGEST_STREAM_MAX_RECORD_BYTES) -> Tuple[Optional[Dict[str, Any]], Optional[str]]:
+    """Decodes one raw record. Returns (record, None) or (None, error message)."""
+    if raw is None:
+        return None, f"Record exceeds {max_record_bytes} bytes"
+    try:
+        record = decode_json(raw)
+    except JSON_DECODE_ERRORS as e:
+        return None, f"Invalid JSON: {e}"
+    if not isinstance(record, dict):
+        return None, f"Record must be a JSON object, got {type(record).__name__}"
+    return record, None
+
+
+async def iter_stream_records(chunks: AsyncIterator[bytes], splitter) -> AsyncIterator[StreamRecord]:
+    """Yields (record number, record, error) for each record in an async stream of body chunks."""
+    async for chunk in chunks:
+        if not chunk:
+            continue
+        for number, raw in splitter.feed(chunk):
+            record, error = decode_record(raw, splitter.max_record_bytes)
+            yield number, record, error
+    for number, raw in splitter.close():
+        record, error = decode_record(raw, splitter.max_record_bytes)
+        yield number, record, error
+
+
+def flush_raw_batch(
+    db: Session,
+    batch: List[Tuple[int, Dict[str, Any]]],
+    publish: Optional[Callable[[Session, List[Dict[str, Any]]], Any]] = None,
+) -> Tuple[int, List[Dict[str, Any]]]:
+    """
+    Writes one micro-batch of decoded records to raw_ingested_data and, if given, hands the
+    stored rows to `publish` (e.g. the processing stage queue) in the same transaction.
+    Returns (ingested count, rejected entries tagged with their record number).
+    The caller is responsible for committing the session.
+    """
+    rows, rejected = build_raw_rows([record for _, record in batch])
+    if rejected:
+        numbers = {id(record): number for number, record in batch}
+        for entry in rejected:
+            entry["record_number"] = numbers.get(id(entry["data"]))
+
+    bulk_insert_raw_rows(db, rows)
+    if publish is not None and rows:
+        publish(db, [{**row["raw_payload"], "id": row["id"]} for row in rows])
+    return len(rows), rejected
@@ -0,0 +1,159 @@
+# src/common/structured_logging.py
+
+import atexit
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import sys
+import threading
+from datetime import datetime, timezone
+from typing import Any, Dict, Optional
+
+try:
+    import orjson # Optional: faster JSON encoding of log lines
+except ImportError:
+    orjson = None
+
+# --- 구조화 로깅 (Structured, Queue-based Logging) ---
+# Log calls on the request path only build a LogRecord and put it on an in-memory queue;
+# a QueueListener thread formats it (JSON by default) and writes it to the stream, so a
+# slow or blocked stderr no longer stalls the pipeline. Messages use %-style arguments
+# and are only rendered by the listener (LazyQueueHandler skips the eager formatting the
+# stdlib QueueHandler does), so pass immutable values (ids, counts) as arguments.
+# Per-record messages go through a RecordLogSampler at DEBUG: disabled levels cost one
+# level check, and when DEBUG is on only every Nth record is logged.
+# Batch-level INFO summaries stay as they are.
+LOG_LEVEL = os.environ.get("LOG_LEVEL", "INFO").upper() # Root level of the project logger
+LOG_FORMAT = os.environ.get("LOG_FORMAT", "json").lower() # json | text
+LOG_ASYNC = os.environ.get("LOG_ASYNC", "true").lower() == "true" # false = write from the calling thread (old behaviour)
+LOG_QUEUE_SIZE = int(os.environ.get("LOG_QUEUE_SIZE", "10000")) # Records buffered for the listener; 0 = unbounded
+LOG_RECORD_SAMPLE_RATE = float(os.environ.get("LOG_RECORD_SAMPLE_RATE", "0.01")) # Fraction of per-record DEBUG messages kept
+
+TEXT_FORMAT = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+
+# LogRecord attributes that are not user-supplied `extra` fields
+_STANDARD_RECORD_ATTRS = frozenset(vars(logging.LogRecord("", 0, "", 0, "", (), None))) | {"message", "asctime", "taskName"}
+
+
+def _json_default(value: Any) -> str:
+    return str(value)
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line: timestamp, level, logger, message, exception and any `extra` fields."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry: Dict[str, Any] = {
+            "timestamp": datetime.fromtimestamp(record.created, tz=timezone.utc).isoformat(),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        for key, value in record.__dict__.items():
+            if key not in _STANDARD_RECORD_ATTRS and not key.startswith("_"):
+                entry[key] = value
+        if record.exc_info:
+            entry["exception"] = self.formatException(record.exc_info)
+        if orjson is not None:
+            return orjson.dumps(entry, default=_json_default).decode("utf-8")
+        return json.dumps(entry, default=_json_default)
+
+
+class LazyQueueHandler(logging.handlers.QueueHandler):
+    """
+    QueueHandler that enqueues the record as is. The stdlib handler formats the message
+    in the calling thread (to make records picklable); an in-process queue does not need that.
+    Drops (and counts) records when the queue is full instead of blocking the caller.
+    """
+
+    def __init__(self, log_queue: queue.Queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+class RecordLogSampler:
+    """
+    Per-record DEBUG logging at a sample rate: logs the 1st record and then every
+    round(1 / rate)-th call. Use for messages emitted once per entry of a batch.
+    """
+
+    def __init__(self, logger: logging.Logger, rate: float = LOG_RECORD_SAMPLE_RATE):
+        self.logger = logger
+        self.every = max(1, round(1 / rate)) if rate > 0 else 0
+        self._calls = 0
+        self._lock = threading.Lock()
+
+    def debug(self, msg: str, *args: Any, **kwargs: Any) -> None:
+        if not self.every or not self.logger.isEnabledFor(logging.DEBUG):
+            return
+        with self._lock:
+            self._calls += 1
+            sampled = (self._calls - 1) % self.every == 0
+        if sampled:
+            kwargs.setdefault("stacklevel", 2)
+            self.logger.debug(msg, *args, **kwargs)
+
+
+class _BlockingStopQueueListener(logging.handlers.QueueListener):
+    """QueueListener whose stop() waits for room for its sentinel in a full bounded queue."""
+
+    def enqueue_sentinel(self) -> None:
+        self.queue.put(self._sentinel)
+
+
+_listeners: Dict[str, logging.handlers.QueueListener] = {}
+
+
+def _stop_listeners() -> None:
+    for listener in _listeners.values():
+        listener.stop() # Flushes the records still in the queue
+    _listeners.clear()
+
+
+def configure_logger(name: str, level: Optional[str] = None, log_format: str = LOG_FORMAT, use_queue: bool = LOG_ASYNC,
+                     stream: Any = None) -> logging.Logger:
+    """
+    Attaches a JSON (or text) stream handler to the named logger, behind a QueueHandler /
+    QueueListener pair when use_queue is set. Handlers added by a plain StreamHandler setup are
+    replaced; a logger already configured here is returned as is.
+    """
+    logger = logging.getLogger(name)
+    logger.setLevel(level or LOG_LEVEL)
+    if getattr(logger, "_structured_logging", False):
+        return logger
+    for handler in list(logger.handlers):
+        logger.removeHandler(handler)
+    logger._structured_logging = True
+
+    stream_handler = logging.StreamHandler(stream if stream is not None else sys.stderr)
+    stream_handler.setFormatter(JsonFormatter() if log_format == "json" else logging.Formatter(TEXT_FORMAT))
+    if not use_queue:
+        logger.addHandler(stream_handler)
+        return logger
+
+    log_queue: queue.Queue = queue.Queue(maxsize=LOG_QUEUE_SIZE)
+    listener = _BlockingStopQueueListener(log_queue, stream_handler, respect_handler_level=True)
+    listener.start()
+    if not _listeners:
+        atexit.register(_stop_listeners)
+    _listeners[name] = listener
+    logger.addHandler(LazyQueueHandler(log_queue))
+    return logger
+
+
+def flush_logs() -> None:
+    """Waits until the listeners have written every queued record (tests, shutdown hooks)."""
+    for listener in list(_listeners.values()):
+        listener.stop()
+        listener.start()
@@ -167,18 +167,23 @@ def send_alert(severity: str, message: str, details: Optional[Dict[str, Any]] =
 #=================== more over the simulated ...
 # src/common/utils.py
 
+import hashlib
 import logging
+import os
+import re
 import time
 import uuid
 from typing import List, Dict, Any, Optional
 from datetime import datetime
 
 # --- SQLAlchemy Imports ---
-from sqlalchemy import create_engine, Column, String, Float, DateTime, Text, JSON, Boolean
+from sqlalchemy import create_engine, Column, String, Float, Integer, DateTime, Text, JSON, Boolean, Index, text, event, DDL
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker, Session
 from sqlalchemy.dialects.postgresql import JSONB # Use JSONB for PostgreSQL if needed
 
+from common.structured_logging import configure_logger # Queue-based JSON logging
+
 # --- Database Configuration (using Environment Variables) ---
 # In a real K8s deployment, these would be injected via Secrets or ConfigMaps
 DATABASE_URL = os.environ.get("DATABASE_URL", "sqlite:///./swap_reporting_mvp.db") # Default to SQLite for local dev
@@ -202,8 +207,67 @@ def get_db():
     finally:
         db.close()
 
+# --- Async Database Engine and Session Setup (AsyncSession) ---
+# Write-heavy endpoints use AsyncSession so a slow DB round trip does not block the event loop
+# (the sync Session above runs its I/O directly on the loop thread inside `async def` handlers).
+# The async URL is derived from DATABASE_URL (asyncpg for PostgreSQL, aiosqlite for SQLite)
+# unless ASYNC_DATABASE_URL is set explicitly.
+def to_async_database_url(url: str) -> str:
+    """Maps a sync SQLAlchemy URL to its async driver equivalent."""
+    scheme, sep, rest = url.partition("://")
+    dialect = scheme.split("+", 1)[0]
+    async_drivers = {"postgresql": "postgresql+asyncpg", "postgres": "postgresql+asyncpg", "sqlite": "sqlite+aiosqlite"}
+    if dialect in async_drivers and sep:
+        return f"{async_drivers[dialect]}://{rest}"
+    return url
+
+ASYNC_DATABASE_URL = os.environ.get("ASYNC_DATABASE_URL", to_async_database_url(DATABASE_URL))
+ASYNC_DB_POOL_SIZE = int(os.environ.get("ASYNC_DB_POOL_SIZE", "10"))
+ASYNC_DB_MAX_OVERFLOW = int(os.environ.get("ASYNC_DB_MAX_OVERFLOW", "20"))
+
+try:
+    from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
+    async_engine = create_async_engine(
+        ASYNC_DATABASE_URL,
+        pool_pre_ping=True,
+        pool_size=ASYNC_DB_POOL_SIZE,
+        max_overflow=ASYNC_DB_MAX_OVERFLOW,
+    )
+    # expire_on_commit=False: ORM objects stay readable after commit without an implicit (awaitable) refresh
+    AsyncSessionLocal = async_sessionmaker(async_engine, expire_on_commit=False, autoflush=False)
+except ImportError as e: # sqlalchemy[asyncio] (greenlet) or the async driver (asyncpg/aiosqlite) is not installed
+    AsyncSession = None
+    async_engine = None
+    AsyncSessionLocal = None
+    _async_db_import_error = e
+
+# Dependency to get an async DB session (for FastAPI)
+async def get_async_db():
+    if AsyncSessionLocal is None:
+        raise RuntimeError(f"Async database support is unavailable ({_async_db_import_error}). Install sqlalchemy[asyncio] and asyncpg/aiosqlite.")
+    async with AsyncSessionLocal() as db:
+        yield db
+
 # --- SQLAlchemy Models (Database Schema Definition) ---
 
+# Substring (ilike '%x%') searches of the admin list endpoints are backed by pg_trgm GIN
+# indexes. They exist on PostgreSQL only: create_all skips them elsewhere (ddl_if) and
+# include_object_for keeps autogenerate from comparing them against other databases.
+event.listen(Base.metadata, "before_create", DDL("CREATE EXTENSION IF NOT EXISTS pg_trgm").execute_if(dialect="postgresql"))
+
+
+def trigram_index(name: str, column: str) -> Index:
+    return Index(name, column, postgresql_using="gin", postgresql_ops={column: "gin_trgm_ops"},
+                 info={"dialect": "postgresql"}).ddl_if(dialect="postgresql")
+
+
+def include_object_for(dialect_name: str):
+    """Alembic include_object hook for a database: skips model indexes declared for another dialect (info["dialect"])."""
+    def include_object(obj, name, type_, reflected, compare_to) -> bool:
+        dialect = obj.info.get("dialect") if type_ == "index" and not reflected else None
+        return dialect is None or dialect == dialect_name
+    return include_object
+
 # Raw Ingested Data Table
 class RawIngestedData(Base):
     __tablename__ = "raw_ingested_data"
@@ -228,6 +292,15 @@ class RawIngestedData(Base):
 # Processed Data Table (Standardized)
 class ProcessedSwapDataDB(Base): # Renamed to avoid conflict with Pydantic model
     __tablename__ = "processed_swap_data"
+    __table_args__ = (
+        # /processed-data filters (status, asset class, effective date range) and keyset order
+        Index("ix_processed_swap_data_status_asset_effective", "validation_status", "asset_class", "effective_date"),
+        Index("ix_processed_swap_data_processing_ts_id", "processing_timestamp", "id"),
+        # Validation backlog: only the (small) Pending slice is indexed
+        Index("ix_processed_swap_data_pending_ts", "processing_timestamp", "id",
+              postgresql_where=text("validation_status = 'Pending'"), sqlite_where=text("validation_status = 'Pending'")),
+        trigram_index("ix_processed_swap_data_uti_trgm", "unique_transaction_identifier"),
+    )
 
     id = Column(String, primary_key=True, index=True, default=lambda: str(uuid.uuid4()))
     unique_transaction_identifier = Column(String, unique=True, index=True) # UTI
@@ -248,11 +321,19 @@ class ProcessedSwapDataDB(Base): # Renamed to avoid conflict with Pydantic model
     original_raw_data_id = Column(String) # Link back to raw data (Optional but good practice)
     processing_timestamp = Column(DateTime, default=datetime.utcnow)
     validation_status = Column(String, default="Pending") # Pending, Valid, Invalid
+    report_status = Column(String, nullable=True) # IncludedInReport once written to a report
+    generated_report_id = Column(String, nullable=True) # Latest report including the record (all of them: report_records)
 
 # Validation Results Table (Can be combined with Processed data or separate)
 # Let's keep it separate for clarity of validation results history
 class ValidationResult(Base):
     __tablename__ = "validation_results"
+    __table_args__ = (
+        # /validation-results is_valid filter ordered by validation time
+        Index("ix_validation_results_valid_ts", "is_valid", "validation_timestamp"),
+        Index("ix_validation_results_ts", "validation_timestamp"),
+        trigram_index("ix_validation_results_uti_trgm", "unique_transaction_identifier"),
+    )
 
     id = Column(String, primary_key=True, index=True, default=lambda: str(uuid.uuid4()))
     unique_transaction_identifier = Column(String, index=True) # Link to Processed data via UTI
@@ -264,6 +345,18 @@ class ValidationResult(Base):
 # Errors Table (P3 Error Management)
 class ErrorRecord(Base):
     __tablename__ = "error_records"
+    __table_args__ = (
+        # /errors filters (status, source module) in keyset order
+        Index("ix_error_records_status_module_ts", "status", "source_module", "timestamp", "id"),
+        Index("ix_error_records_module_ts", "source_module", "timestamp", "id"),
+        Index("ix_error_records_ts_id", "timestamp", "id"),
+        # Admin UI default view: unresolved errors only
+        Index("ix_error_records_open_ts", "timestamp", "id",
+              postgresql_where=text("status = 'Open'"), sqlite_where=text("status = 'Open'")),
+        # Errors of one group (Admin UI drill-down, group retry)
+        Index("ix_error_records_group_ts", "group_id", "timestamp", "id"),
+        trigram_index("ix_error_records_trade_id_trgm", "trade_id"),
+    )
 
     id = Column(String, primary_key=True, index=True, default=lambda: str(uuid.uuid4()))
     trade_id = Column(String, index=True, nullable=True) # Original ID or UTI
@@ -275,10 +368,17 @@ class ErrorRecord(Base):
     status = Column(String, default="Open") # e.g., Open, Investigating, Resolved, Closed
     assigned_to = Column(String, nullable=True)
     severity = Column(String, default="Error") # e.g., Info, Warning, Error, Critical
+    group_id = Column(String, nullable=True) # error_groups.id (fingerprint) the error was counted in
 
 # Generated Reports Table (P2 Report Generation)
 class GeneratedReport(Base):
     __tablename__ = "generated_reports"
+    __table_args__ = (
+        # /reports status filter in keyset order
+        Index("ix_generated_reports_status_ts", "status", "generation_timestamp", "id"),
+        Index("ix_generated_reports_ts_id", "generation_timestamp", "id"),
+        trigram_index("ix_generated_reports_filename_trgm", "report_filename"),
+    )
 
     id = Column(String, primary_key=True, index=True, default=lambda: str(uuid.uuid4()))
     report_filename = Column(String, unique=True, index=True) # Name of the generated file
@@ -287,10 +387,18 @@ class GeneratedReport(Base):
     generation_timestamp = Column(DateTime, default=datetime.utcnow)
     status = Column(String, default="Generated") # e.g., Generated, Submitted, SubmissionFailed, Acknowledged
     submission_id = Column(String, nullable=True) # Link to SubmissionHistory
+    submission_lease_expires_at = Column(DateTime, nullable=True) # SubmissionInProgress is renewed until then; after it, the attempt counts as abandoned
 
 # Submission History Table (P2 Report Submission)
 class SubmissionHistory(Base):
     __tablename__ = "submission_history"
+    __table_args__ = (
+        # /submissions filters (status, report) in keyset order
+        Index("ix_submission_history_status_report_ts", "status", "report_id", "submission_timestamp", "id"),
+        Index("ix_submission_history_report_ts", "report_id", "submission_timestamp", "id"),
+        Index("ix_submission_history_ts_id", "submission_timestamp", "id"),
+        trigram_index("ix_submission_history_submission_id_trgm", "submission_id"),
+    )
 
     id = Column(String, primary_key=True, index=True, default=lambda: str(uuid.uuid4()))
     submission_id = Column(String, unique=True, index=True) # Unique ID for this submission attempt
@@ -299,27 +407,107 @@ class SubmissionHistory(Base):
     status = Column(String, default="Pending") # e.g., Pending, Submitted, SubmissionFailed, SDR_Accepted, SDR_Rejected
     sdr_response_payload = Column(JSON, nullable=True) # Store SDR response details
     error_details = Column(Text, nullable=True) # Store submission error details
+    sdr_upload_id = Column(String, nullable=True) # SDR multipart upload of this attempt; resumed by the next attempt for the report
+    destination = Column(String, nullable=True) # SDR destination name (common/sdr_dispatch.py); one row per destination per attempt
+
+# Stage Queue Table (durable work queue between pipeline stages, see common/stage_queue.py)
+class StageQueueMessage(Base):
+    __tablename__ = "stage_queue_messages"
+    __table_args__ = (
+        Index("ix_stage_queue_messages_claim", "queue_name", "status", "visible_at"), # Receive / depth lookups
+    )
+
+    id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
+    queue_name = Column(String, nullable=False) # e.g., processing, validation, report-generation, report-submission
+    payload = Column(JSON) # Message body (one record or one report reference)
+    status = Column(String, default="Ready") # Ready, InFlight, Dead
+    attempts = Column(Integer, default=0) # Number of deliveries so far
+    lease_id = Column(String, nullable=True) # Set while a consumer holds the message
+    enqueued_at = Column(DateTime, default=datetime.utcnow)
+    visible_at = Column(DateTime, default=datetime.utcnow) # Not deliverable before this time (visibility timeout / retry delay)
+    last_error = Column(Text, nullable=True)
+
+# Idempotency Keys Table (deliveries already processed, see common/idempotency.py)
+class IdempotencyKey(Base):
+    __tablename__ = "idempotency_keys"
+    __table_args__ = (
+        Index("ux_idempotency_keys_scope_key", "scope", "idempotency_key", unique=True), # Duplicate-delivery lookups; rejects concurrent double inserts
+    )
+
+    id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
+    scope = Column(String, nullable=False) # Stage that recorded the key, e.g. data-processing
+    idempotency_key = Column(String, nullable=False) # Content hash of the source trade message
+    unique_transaction_identifier = Column(String, nullable=True) # UTI the delivery was processed under
+    record_id = Column(String, nullable=True) # Row written for the delivery (e.g. processed_swap_data.id)
+    created_at = Column(DateTime, default=datetime.utcnow)
+
+# Error Groups Table (error-monitoring: errors grouped by fingerprint)
+class ErrorGroup(Base):
+    __tablename__ = "error_groups"
+    __table_args__ = (
+        # /error-groups: most recently seen first, optionally per status / source module
+        Index("ix_error_groups_last_seen", "last_seen", "id"),
+        Index("ix_error_groups_status_module_last_seen", "status", "source_module", "last_seen", "id"),
+    )
+
+    id = Column(String, primary_key=True) # Fingerprint: hash of (source_module, message_template)
+    source_module = Column(String, nullable=False)
+    message_template = Column(Text, nullable=False) # Error messages with variable parts masked
+    error_count = Column(Integer, nullable=False, default=0)
+    first_seen = Column(DateTime, nullable=False)
+    last_seen = Column(DateTime, nullable=False)
+    sample_error_ids = Column(JSON) # First few error_records.id of the group (full payloads kept)
+    sample_messages = Column(JSON) # Error messages of the first error, unmasked
+    status = Column(String, default="Open") # e.g., Open, Investigating, Resolved
+
+# Retry Jobs Table (error-monitoring: bulk re-injection of errors, see common/retry_jobs.py)
+class RetryJob(Base):
+    __tablename__ = "retry_jobs"
+
+    id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
+    status = Column(String, default="Pending") # Pending, Running, Cancelling, Cancelled, Completed, Failed
+    filters = Column(JSON) # Error filters the job was created with (status, source_module, group_id, since, until)
+    batch_size = Column(Integer, nullable=False) # Records per /ingest or /process call
+    concurrency = Column(Integer, nullable=False) # Calls in flight at once
+    total = Column(Integer, default=0) # Errors matching the filters when the job started
+    processed = Column(Integer, default=0) # Errors handled so far (succeeded + failed + skipped)
+    succeeded = Column(Integer, default=0) # Re-injected; error status set to Retrying
+    failed = Column(Integer, default=0) # Call failed; error status set to Retry Failed
+    skipped = Column(Integer, default=0) # No payload that can be re-injected
+    batches = Column(Integer, default=0) # Calls made
+    created_at = Column(DateTime, default=datetime.utcnow)
+    started_at = Column(DateTime, nullable=True)
+    updated_at = Column(DateTime, nullable=True)
+    finished_at = Column(DateTime, nullable=True)
+    last_error = Column(Text, nullable=True)
+
+# Report <-> Record Mapping Table (which processed records each generated report contains, see common/bulk_db.py)
+class ReportRecord(Base):
+    __tablename__ = "report_records"
+    __table_args__ = (
+        Index("ix_report_records_record", "processed_record_id"), # Reports containing a record
+        Index("ix_report_records_uti", "unique_transaction_identifier"), # Reports containing a trade
+    )
+
+    report_id = Column(String, primary_key=True) # Link to GeneratedReport (leading key: records of a report)
+    processed_record_id = Column(String, primary_key=True) # Link to ProcessedSwapDataDB
+    unique_transaction_identifier = Column(String, nullable=False)
+    included_at = Column(DateTime, default=datetime.utcnow)
 
 # --- Create Database Tables ---
 # This should be run once to initialize the database schema.
-# In production, use Alembic for migrations.
+# In production, use Alembic for migrations: `alembic upgrade head` (alembic.ini, src/migrations).
 def create_database_tables():
     Base.metadata.create_all(bind=engine)
     logger.info("Database tables created (if they didn't exist).")
 
 # --- Logger Setup ---
-def setup_logger(name, level=logging.INFO):
+def setup_logger(name, level=None):
     """
-    Sets up a basic logger.
+    Sets up a logger writing structured JSON lines through a background queue listener
+    (LOG_LEVEL, LOG_FORMAT, LOG_ASYNC; see common/structured_logging.py).
     """
-    logger = logging.getLogger(name)
-    logger.setLevel(level)
-    if not logger.handlers:
-        handler = logging.StreamHandler()
-        formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
-        handler.setFormatter(formatter)
-        logger.addHandler(handler)
-    return logger
+    return configure_logger(name, level=level)
 
 # Project's main logger
 logger = setup_logger("swap-reporting-mvp")
@@ -327,26 +515,62 @@ logger = setup_logger("swap-reporting-mvp")
 # --- 예시 식별자 생성 함수 ---
 def generate_uti(trade_data: dict) -> str:
     """
-    Example function to generate a Unique Transaction Identifier (UTI).
+    Generates a deterministic Unique Transaction Identifier (UTI) from the source trade key
+    (reporting counterparty LEI + source trade id). A resent or retried trade, and every
+    life-cycle event of the same trade, gets the same UTI.
     """
-    timestamp = int(time.time() * 1000)
-    unique_part = str(uuid.uuid4()).split('-')[0]
-    source_id = trade_data.get('trade_id', 'UNKNOWN')
-    return f"MVP-{source_id}-{timestamp}-{unique_part}".replace('_', '-')
+    source_id = str(trade_data.get('trade_id') or 'UNKNOWN').strip()
+    reporting_lei = str(trade_data.get('party_a_lei') or '').strip().upper()
+    key_hash = hashlib.sha256(f"{reporting_lei}|{source_id}".encode("utf-8")).hexdigest()[:12].upper()
+    return f"MVP-{source_id}-{key_hash}".replace('_', '-')
+
+# ISO 17442: 18 upper-case alphanumerics followed by two check digits
+_LEI_FORMAT = re.compile(r"[0-9A-Z]{18}[0-9]{2}")
+# ISO 7064 MOD 97-10: letters become two-digit numbers (A=10 ... Z=35)
+_LEI_DIGITS = str.maketrans({chr(code): str(code - 55) for code in range(ord("A"), ord("Z") + 1)})
 
 def validate_lei(lei: str) -> bool:
     """
-    Example function to validate a Legal Entity Identifier (LEI).
+    Validates a Legal Entity Identifier (ISO 17442): format and MOD 97-10 check digits.
+    Existence in the GLEIF golden copy is checked separately (common/lei.py); for
+    batches use common.lei.validate_leis, which checks each distinct LEI once.
     """
     if not lei or not isinstance(lei, str):
         return False
-    if len(lei) != 20 or not lei.isalnum():
+    if not _LEI_FORMAT.fullmatch(lei):
         return False
-    # TODO: Add actual LEI validation logic (checksum, GLEIF database lookup)
-    return True
+    return int(lei.translate(_LEI_DIGITS)) % 97 == 1
+
+# --- 메시지 템플릿 (Message Templates) ---
+# Variable parts of error/alert messages (quoted values, ids, numbers) are masked so that
+# messages produced by the same rule compare equal (alert and error fingerprints).
+_QUOTED_VALUE = re.compile(r"'[^']*'|\"[^\"]*\"")
+_VARIABLE_TOKEN = re.compile(r"(?<!\S)\S*\d\S*") # Whole whitespace-separated tokens containing a digit
+
+def message_template(message: str) -> str:
+    """e.g. "LEI 'X1' invalid for TRADE_7" -> "LEI <v> invalid for <n>"."""
+    return _VARIABLE_TOKEN.sub("<n>", _QUOTED_VALUE.sub("<v>", message))
 
 # --- 예시 알림 함수 ---
+# While an AlertAggregator (common/alerts.py) is running, send_alert only counts the alert;
+# the aggregator coalesces repeats and dispatches digests in the background.
+_alert_aggregator = None
+
+def set_alert_aggregator(aggregator) -> None:
+    """Installs (or with None removes) the aggregator that send_alert hands alerts to."""
+    global _alert_aggregator
+    _alert_aggregator = aggregator
+
 def send_alert(severity: str, message: str, details: Optional[Dict[str, Any]] = None):
+    """
+    Sends an alert: coalesced by the running AlertAggregator, otherwise logged directly.
+    """
+    aggregator = _alert_aggregator
+    if aggregator is not None and aggregator.accept(severity, message, details):
+        return
+    emit_alert(severity, message, details)
+
+def emit_alert(severity: str, message: str, details: Optional[Dict[str, Any]] = None):
     """
     Simulates sending an alert based on severity.
     """
@@ -358,15 +582,15 @@ def send_alert(severity: str, message: str, details: Optional[Dict[str, Any]] =
         "details": details if details is not None else {}
     }
     if severity.lower() == 'critical' or severity.lower() == 'error':
-        logger.error(f"ALERT! {severity.upper()}: {message}", extra=alert_info)
+        logger.error(f"ALERT! {severity.upper()}: {message}", extra={"alert": alert_info})
         # TODO: Integrate with Alertmanager API or other alerting system
     elif severity.lower() == 'warning':
-        logger.warning(f"ALERT! {severity.upper()}: {message}", extra=alert_info)
+        logger.warning(f"ALERT! {severity.upper()}: {message}", extra={"alert": alert_info})
         # TODO: Integrate with alerting system
     else:
-        logger.info(f"ALERT! {severity.upper()}: {message}", extra=alert_info)
+        logger.info(f"ALERT! {severity.upper()}: {message}", extra={"alert": alert_info})
 
 # --- Run table creation on startup (for local dev) ---
-# In production, use Alembic migrations instead of calling this directly
+# In production, run `alembic upgrade head` instead of calling this directly (migrations mirror the models)
 # create_database_tables() # Uncomment to create tables when utils is imported
 
@@ -78,207 +78,235 @@ async def health_check():
 
 #=====================with real database
 
-# src/common/utils.py
+# src/data-ingestion/main.py
 
-import logging
-import time
-import uuid
-from typing import List, Dict, Any, Optional
-from datetime import datetime
+from fastapi import FastAPI, HTTPException, Depends, Request
+from pydantic import BaseModel, Field
+from typing import List, Dict, Any
+import uvicorn
+import httpx
+import os # To read environment variables
 
 # --- SQLAlchemy Imports ---
-from sqlalchemy import create_engine, Column, String, Float, DateTime, Text, JSON, Boolean
-from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker, Session
-from sqlalchemy.dialects.postgresql import JSONB # Use JSONB for PostgreSQL if needed
+from sqlalchemy.orm import Session
+
+# src.common에서 로거, DB 설정 및 모델 가져오기
+from common.utils import logger, get_db, RawIngestedData, create_database_tables # Import DB model
+from common.utils import send_alert # Import utilities
+from common.utils import get_async_db, AsyncSession # Async session for the streaming write path
+from common.bulk_ingest import build_raw_rows, bulk_insert_raw_rows # Bulk write path
+from common.stream_ingest import make_record_splitter, iter_stream_records, flush_raw_batch, StreamFormatError # Streaming (NDJSON) write path
+from common.stream_ingest import INGEST_STREAM_BATCH_SIZE, INGEST_STREAM_MAX_REPORTED_REJECTS
+from common.http_client import shared_http_client, get_http_pool_metrics # Pooled, lifespan-managed HTTP clients
+from common.stage_queue import get_stage_queue, stage_lifespan, QueueFullError, PROCESSING_QUEUE # Durable hand-off to processing
 
-# --- Database Configuration (using Environment Variables) ---
-# In a real K8s deployment, these would be injected via Secrets or ConfigMaps
-DATABASE_URL = os.environ.get("DATABASE_URL", "sqlite:///./swap_reporting_mvp.db") # Default to SQLite for local dev
+# --- Ensure database tables are created on startup (for local dev) ---
+# In production, handle migrations separately
+create_database_tables()
 
-# --- Database Engine and Session Setup ---
-# create_engine: Creates a database engine instance
-# pool_pre_ping=True: Helps handle dropped connections
-engine = create_engine(DATABASE_URL, pool_pre_ping=True)
+# TODO: Replace hardcoded URLs with Environment Variables injected by Kubernetes
+# Ingested rows are handed to processing through the 'processing' stage queue (common/stage_queue.py), not over HTTP
+ERROR_MONITOR_MODULE_URL = os.environ.get("ERROR_MONITOR_MODULE_URL", "http://localhost:8005/report_error") # Default to Local testing URL
 
-# declarative_base(): The base class for declarative models
-Base = declarative_base()
 
-# sessionmaker: Configures a Session class
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+# --- FastAPI 앱 인스턴스 생성 ---
+app = FastAPI(lifespan=stage_lifespan()) # Ingestion only publishes; closes the pooled HTTP clients on shutdown
 
-# Dependency to get DB session (for FastAPI)
-def get_db():
-    db = SessionLocal()
+processing_queue = get_stage_queue(PROCESSING_QUEUE)
+
+
+def queue_full_exception(exc: QueueFullError) -> HTTPException:
+    """Backpressure: ask the FEP to retry later instead of growing the queue without bound."""
+    logger.warning(f"Rejecting ingestion batch: {exc}")
+    send_alert("Warning", f"Ingestion backpressure: {exc}", {"module": "data-ingestion", "queue": PROCESSING_QUEUE})
+    return HTTPException(status_code=503, detail=str(exc), headers={"Retry-After": "30"})
+
+
+async def report_rejected_entries(rejected: List[Dict[str, Any]]) -> None:
+    """Forwards rejected entries to the error monitor; failures are logged and alerted, not raised."""
     try:
-        yield db
-    finally:
-        db.close()
-
-# --- SQLAlchemy Models (Database Schema Definition) ---
-
-# Raw Ingested Data Table
-class RawIngestedData(Base):
-    __tablename__ = "raw_ingested_data"
-
-    id = Column(String, primary_key=True, index=True, default=lambda: str(uuid.uuid4())) # Unique ID for each record
-    trade_id = Column(String, index=True) # Original ID from source
-    action = Column(String)
-    instrument_type = Column(String)
-    asset_class = Column(String)
-    effective_date = Column(String) # Store as string initially, validate format later
-    termination_date = Column(String) # Store as string initially
-    notional_amount = Column(Float)
-    notional_currency = Column(String)
-    party_a_lei = Column(String)
-    party_b_lei = Column(String)
-    price = Column(Float, nullable=True)
-    price_currency = Column(String, nullable=True)
-    raw_payload = Column(JSON) # Store the original JSON payload
-    ingestion_timestamp = Column(DateTime, default=datetime.utcnow)
-    status = Column(String, default="Ingested") # e.g., Ingested, Processed, Failed
-
-# Processed Data Table (Standardized)
-class ProcessedSwapDataDB(Base): # Renamed to avoid conflict with Pydantic model
-    __tablename__ = "processed_swap_data"
-
-    id = Column(String, primary_key=True, index=True, default=lambda: str(uuid.uuid4()))
-    unique_transaction_identifier = Column(String, unique=True, index=True) # UTI
-    reporting_counterparty_lei = Column(String)
-    other_counterparty_lei = Column(String)
-    action_type = Column(String)
-    event_type = Column(String, nullable=True)
-    asset_class = Column(String)
-    effective_date = Column(String)
-    termination_date = Column(String)
-    notional_amount = Column(Float, nullable=True)
-    notional_currency = Column(String, nullable=True)
-    price = Column(Float, nullable=True)
-    price_currency = Column(String, nullable=True)
-    # ... Add other CDE fields as columns ...
-    processing_status = Column(String, default="Processed") # e.g., Processed, ProcessedWithErrors
-    processing_errors = Column(JSON) # Store processing errors as JSON (or JSONB)
-    original_raw_data_id = Column(String) # Link back to raw data (Optional but good practice)
-    processing_timestamp = Column(DateTime, default=datetime.utcnow)
-    validation_status = Column(String, default="Pending") # Pending, Valid, Invalid
-
-# Validation Results Table (Can be combined with Processed data or separate)
-# Let's keep it separate for clarity of validation results history
-class ValidationResult(Base):
-    __tablename__ = "validation_results"
-
-    id = Column(String, primary_key=True, index=True, default=lambda: str(uuid.uuid4()))
-    unique_transaction_identifier = Column(String, index=True) # Link to Processed data via UTI
-    is_valid = Column(Boolean)
-    errors = Column(JSON) # Store validation errors as JSON (or JSONB)
-    validation_timestamp = Column(DateTime, default=datetime.utcnow)
-    processed_data_id = Column(String, nullable=True) # Link to Processed data via its ID
-
-# Errors Table (P3 Error Management)
-class ErrorRecord(Base):
-    __tablename__ = "error_records"
-
-    id = Column(String, primary_key=True, index=True, default=lambda: str(uuid.uuid4()))
-    trade_id = Column(String, index=True, nullable=True) # Original ID or UTI
-    source_module = Column(String) # e.g., data-processing, validation, report-submission
-    error_messages = Column(JSON) # Store error messages as JSON (or JSONB)
-    data_payload = Column(JSON) # Store the data associated with the error (raw or processed)
-    original_source_data_payload = Column(JSON, nullable=True) # Store original raw data if available
-    timestamp = Column(DateTime, default=datetime.utcnow)
-    status = Column(String, default="Open") # e.g., Open, Investigating, Resolved, Closed
-    assigned_to = Column(String, nullable=True)
-    severity = Column(String, default="Error") # e.g., Info, Warning, Error, Critical
-
-# Generated Reports Table (P2 Report Generation)
-class GeneratedReport(Base):
-    __tablename__ = "generated_reports"
-
-    id = Column(String, primary_key=True, index=True, default=lambda: str(uuid.uuid4()))
-    report_filename = Column(String, unique=True, index=True) # Name of the generated file
-    report_storage_path = Column(String) # Path or identifier in shared storage
-    entry_count = Column(Integer) # Number of entries in the report
-    generation_timestamp = Column(DateTime, default=datetime.utcnow)
-    status = Column(String, default="Generated") # e.g., Generated, Submitted, SubmissionFailed, Acknowledged
-    submission_id = Column(String, nullable=True) # Link to SubmissionHistory
-
-# Submission History Table (P2 Report Submission)
-class SubmissionHistory(Base):
-    __tablename__ = "submission_history"
-
-    id = Column(String, primary_key=True, index=True, default=lambda: str(uuid.uuid4()))
-    submission_id = Column(String, unique=True, index=True) # Unique ID for this submission attempt
-    report_id = Column(String) # Link to GeneratedReport
-    submission_timestamp = Column(DateTime, default=datetime.utcnow)
-    status = Column(String, default="Pending") # e.g., Pending, Submitted, SubmissionFailed, SDR_Accepted, SDR_Rejected
-    sdr_response_payload = Column(JSON, nullable=True) # Store SDR response details
-    error_details = Column(Text, nullable=True) # Store submission error details
-
-# --- Create Database Tables ---
-# This should be run once to initialize the database schema.
-# In production, use Alembic for migrations.
-def create_database_tables():
-    Base.metadata.create_all(bind=engine)
-    logger.info("Database tables created (if they didn't exist).")
-
-# --- Logger Setup ---
-def setup_logger(name, level=logging.INFO):
+        async with shared_http_client(ERROR_MONITOR_MODULE_URL) as client:
+            response = await client.post(ERROR_MONITOR_MODULE_URL, json=rejected, timeout=30.0)
+            response.raise_for_status()
+    except Exception as e:
+        logger.error(f"Failed to report rejected entries to error monitor module: {e}", exc_info=True)
+        send_alert("Error", f"Failed to report rejected ingestion entries: {e}", {"module": "data-ingestion", "error": str(e), "target_url": ERROR_MONITOR_MODULE_URL})
+
+
+@app.post("/ingest")
+async def ingest_swap_data(data: List[SwapData], db: Session = Depends(get_db)):
     """
-    Sets up a basic logger.
+    API endpoint to receive swap trade data from external sources.
+    Persists each entry as a RawIngestedData record and enqueues it for processing
+    in the same transaction, so the response does not wait for downstream stages.
     """
-    logger = logging.getLogger(name)
-    logger.setLevel(level)
-    if not logger.handlers:
-        handler = logging.StreamHandler()
-        formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
-        handler.setFormatter(formatter)
-        logger.addHandler(handler)
-    return logger
-
-# Project's main logger
-logger = setup_logger("swap-reporting-mvp")
-
-# --- 예시 식별자 생성 함수 ---
-def generate_uti(trade_data: dict) -> str:
+    logger.info(f"Received {len(data)} swap data entries for ingestion.")
+
+    raw_records: List[RawIngestedData] = []
+    for entry in data:
+        entry_dict = entry.model_dump()
+        raw_records.append(RawIngestedData(**entry_dict, raw_payload=entry_dict, status="Ingested"))
+
+    try:
+        db.add_all(raw_records)
+        db.flush() # Assigns raw record ids
+        # Pass the raw DB id along so processing can link processed records back to raw data
+        processing_queue.publish([{**record.raw_payload, "id": record.id} for record in raw_records], db=db)
+        db.commit()
+        logger.info(f"Successfully stored {len(raw_records)} entries in raw_ingested_data table and enqueued them for processing.")
+    except QueueFullError as exc:
+        db.rollback()
+        raise queue_full_exception(exc)
+    except Exception as e:
+        db.rollback()
+        logger.error(f"Failed to store raw data in database: {e}", exc_info=True)
+        send_alert("Critical", f"Database error storing raw data: {e}", {"module": "data-ingestion", "error": str(e)})
+        raise HTTPException(status_code=500, detail="Failed to store raw data")
+
+    return {"status": "success", "received_count": len(data), "processing_status": "queued"}
+
+
+@app.post("/ingest/bulk")
+async def ingest_swap_data_bulk(data: List[Dict[str, Any]], db: Session = Depends(get_db)):
     """
-    Example function to generate a Unique Transaction Identifier (UTI).
+    Bulk ingestion endpoint for large end-of-day batches.
+    Skips per-row model construction, writes all rows in one statement
+    (COPY on PostgreSQL, executemany elsewhere) and returns the generated ids.
+    Rows failing required-field or numeric checks are rejected and reported to the error monitor.
     """
-    timestamp = int(time.time() * 1000)
-    unique_part = str(uuid.uuid4()).split('-')[0]
-    source_id = trade_data.get('trade_id', 'UNKNOWN')
-    return f"MVP-{source_id}-{timestamp}-{unique_part}".replace('_', '-')
+    logger.info(f"Received {len(data)} swap data entries for bulk ingestion.")
+
+    rows, rejected = build_raw_rows(data)
+
+    try:
+        ingested_ids = bulk_insert_raw_rows(db, rows)
+        processing_queue.publish([{**row["raw_payload"], "id": row["id"]} for row in rows], db=db)
+        db.commit()
+    except QueueFullError as exc:
+        db.rollback()
+        raise queue_full_exception(exc)
+    except Exception as e:
+        db.rollback()
+        logger.error(f"Failed to bulk store raw data in database: {e}", exc_info=True)
+        send_alert("Critical", f"Database error bulk storing raw data: {e}", {"module": "data-ingestion", "error": str(e)})
+        raise HTTPException(status_code=500, detail="Failed to store raw data")
+
+    if rejected:
+        logger.warning(f"Rejected {len(rejected)} entries during bulk ingestion. Reporting to error monitor.")
+        await report_rejected_entries(rejected)
+
+    processing_status = "queued" if rows else "skipped (no data)"
+
+    return {
+        "status": "success",
+        "received_count": len(data),
+        "ingested_count": len(ingested_ids),
+        "rejected_count": len(rejected),
+        "ingested_ids": ingested_ids,
+        "processing_status": processing_status,
+    }
 
-def validate_lei(lei: str) -> bool:
+
+@app.post("/ingest/stream")
+async def ingest_swap_data_stream(request: Request, db: AsyncSession = Depends(get_async_db)):
     """
-    Example function to validate a Legal Entity Identifier (LEI).
+    Streaming ingestion endpoint for very large pushes (NDJSON or a chunked JSON array).
+    The body is parsed incrementally and flushed in micro-batches of INGEST_STREAM_BATCH_SIZE
+    records; each batch is stored, enqueued for processing and committed on its own, so
+    memory stays bounded by the batch size rather than the payload size.
+    On failure the response reports how many records were already committed.
     """
-    if not lei or not isinstance(lei, str):
-        return False
-    if len(lei) != 20 or not lei.isalnum():
-        return False
-    # TODO: Add actual LEI validation logic (checksum, GLEIF database lookup)
-    return True
-
-# --- 예시 알림 함수 ---
-def send_alert(severity: str, message: str, details: Optional[Dict[str, Any]] = None):
+    try:
+        splitter = make_record_splitter(request.headers.get("content-type"))
+    except ValueError as e:
+        raise HTTPException(status_code=415, detail=str(e))
+
+    received_count = 0
+    ingested_count = 0
+    rejected_count = 0
+    batch_count = 0
+    reported_rejects: List[Dict[str, Any]] = []
+    batch: List[Any] = []
+    batch_rejected: List[Dict[str, Any]] = []
+
+    def publish(session, payloads):
+        processing_queue.publish(payloads, db=session)
+
+    async def flush() -> None:
+        nonlocal ingested_count, rejected_count, batch_count
+        stored, rejected = await db.run_sync(flush_raw_batch, batch, publish)
+        await db.commit()
+        rejected += batch_rejected
+        ingested_count += stored
+        rejected_count += len(rejected)
+        batch_count += 1
+        for entry in rejected[:INGEST_STREAM_MAX_REPORTED_REJECTS - len(reported_rejects)]:
+            reported_rejects.append({"record_number": entry["record_number"], "errors": entry["errors"]})
+        if rejected:
+            await report_rejected_entries(rejected)
+        batch.clear()
+        batch_rejected.clear()
+
+    def failure_detail(message: str) -> Dict[str, Any]:
+        return {"message": message, "received_count": received_count, "ingested_count": ingested_count, "batch_count": batch_count}
+
+    try:
+        async for number, record, error in iter_stream_records(request.stream(), splitter):
+            received_count += 1
+            if error is not None:
+                batch_rejected.append({"source_module": "data-ingestion", "data": {"record_number": number}, "errors": [error], "record_number": number})
+            else:
+                batch.append((number, record))
+            if len(batch) + len(batch_rejected) >= INGEST_STREAM_BATCH_SIZE:
+                await flush()
+        if batch or batch_rejected:
+            await flush()
+    except StreamFormatError as e:
+        await db.rollback()
+        logger.warning(f"Malformed streaming ingestion body: {e}")
+        raise HTTPException(status_code=400, detail=failure_detail(str(e)))
+    except QueueFullError as exc:
+        await db.rollback()
+        raise HTTPException(status_code=503, detail=failure_detail(queue_full_exception(exc).detail), headers={"Retry-After": "30"})
+    except Exception as e:
+        await db.rollback()
+        logger.error(f"Failed to stream raw data into database: {e}", exc_info=True)
+        send_alert("Critical", f"Database error streaming raw data: {e}", {"module": "data-ingestion", "error": str(e), "ingested_count": ingested_count})
+        raise HTTPException(status_code=500, detail=failure_detail("Failed to store raw data"))
+
+    logger.info(f"Streamed {received_count} entries: {ingested_count} ingested, {rejected_count} rejected in {batch_count} batches.")
+
+    return {
+        "status": "success",
+        "received_count": received_count,
+        "ingested_count": ingested_count,
+        "rejected_count": rejected_count,
+        "batch_count": batch_count,
+        "rejected": reported_rejects,
+        "processing_status": "queued" if ingested_count else "skipped (no data)",
+    }
+
+
+@app.get("/health")
+async def health_check(db: Session = Depends(get_db)):
     """
-    Simulates sending an alert based on severity.
+    Health check endpoint for the Data Ingestion module.
+    Checks database connectivity.
     """
-    alert_timestamp = datetime.now().isoformat()
-    alert_info = {
-        "timestamp": alert_timestamp,
-        "severity": severity.upper(),
-        "message": message,
-        "details": details if details is not None else {}
-    }
-    if severity.lower() == 'critical' or severity.lower() == 'error':
-        logger.error(f"ALERT! {severity.upper()}: {message}", extra=alert_info)
-        # TODO: Integrate with Alertmanager API or other alerting system
-    elif severity.lower() == 'warning':
-        logger.warning(f"ALERT! {severity.upper()}: {message}", extra=alert_info)
-        # TODO: Integrate with alerting system
-    else:
-        logger.info(f"ALERT! {severity.upper()}: {message}", extra=alert_info)
-
-# --- Run table creation on startup (for local dev) ---
-# In production, use Alembic migrations instead of calling this directly
-# create_database_tables() # Uncomment to create tables when utils is imported
+    queue_depth = None
+    try:
+        db.query(RawIngestedData).limit(1).all()
+        queue_depth = processing_queue.depth(db=db)
+        db_status = "ok"
+    except Exception as e:
+        db_status = f"error: {e}"
+        logger.error(f"Database health check failed: {e}", exc_info=True)
+        send_alert("Critical", f"Database connectivity issue in Data Ingestion: {e}", {"module": "data-ingestion", "check": "db_connectivity"})
+
+    return {"status": "ok", "database_status": db_status, "processing_queue_depth": queue_depth, "http_pools": get_http_pool_metrics()}
+
+# To run this module locally:
+# 1. Ensure your database is running.
+# 2. Set the DATABASE_URL environment variable if not using SQLite.
+# 3. Set ERROR_MONITOR_MODULE_URL (and STAGE_QUEUE_* if needed) env vars if not using defaults.
+# 4. Run uvicorn: uvicorn main:app --reload --port 8000
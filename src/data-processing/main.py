@@ -448,6 +448,8 @@ from typing import List, Dict, Any, Optional
 import uvicorn
 import httpx
 import os # To read environment variables
+from contextlib import asynccontextmanager
+from datetime import datetime
 
 # --- SQLAlchemy Imports ---
 from sqlalchemy.orm import Session
@@ -455,7 +457,18 @@ from sqlalchemy import select, desc # For selecting data and ordering
 
 # src.common에서 로거, DB 설정 및 모델 가져오기
 from common.utils import logger, get_db, ProcessedSwapDataDB, RawIngestedData, create_database_tables # Import DB model
+from common.utils import get_async_db, AsyncSessionLocal, AsyncSession # Async session for the write path
 from common.utils import generate_uti, validate_lei, send_alert # Import utilities
+from common.bulk_db import bulk_upsert_processed_records # UTI-keyed insert / life-cycle update
+from common.records import SwapRecord, records_to_rows # Canonical processed record (wire dict / Core rows)
+from common.idempotency import IdempotencyIndex # Duplicate-delivery short-circuit (LRU + idempotency_keys)
+from common.reference_data import get_reference_data_metrics # Hot-reloaded code lists used by normalization
+from common.pagination import paginate_keyset, count_rows, InvalidCursorError # Keyset pagination for the Admin UI lists
+from common.http_client import shared_http_client, get_http_pool_metrics # Pooled, lifespan-managed HTTP clients
+from common.structured_logging import RecordLogSampler # Sampled per-record DEBUG logging
+from common.alerts import get_alert_metrics # Coalesced alert dispatch (started by stage_lifespan)
+from common.stage_queue import get_stage_queue, stage_lifespan, StageWorker, QueueFullError, PROCESSING_QUEUE, VALIDATION_QUEUE # Durable stage hand-off
+from transformers import ParallelNormalizer # Normalization rules; optional process pool (PROCESSING_PARALLEL_*)
 # data-processing 모듈에서 정의한 모델 임포트 (실제로는 공유 모델 사용 또는 API 스펙 정의)
 # This Pydantic model is used for API input/output, not directly for DB mapping
 class ProcessedSwapData(BaseModel):
@@ -488,183 +501,156 @@ class ProcessedSwapData(BaseModel):
     class Config:
         from_attributes = True # Use orm_mode = True for older Pydantic versions
 
+# --- Stage queues: consume raw rows from 'processing', publish processed rows to 'validation' ---
+validation_queue = get_stage_queue(VALIDATION_QUEUE)
+
+
+async def handle_processing_batch(payloads: List[Dict[str, Any]], db: AsyncSession) -> None:
+    """Stage worker handler for the 'processing' queue (payloads are ingested raw rows with their DB id)."""
+    await process_swap_data(payloads, db, replay=False) # Called directly: pass every Query parameter
+
+
+processing_worker = StageWorker(get_stage_queue(PROCESSING_QUEUE), handle_processing_batch, session_factory=AsyncSessionLocal)
+
+# Large batches are normalized in a process pool when PROCESSING_PARALLEL_WORKERS > 0
+parallel_normalizer = ParallelNormalizer()
+
+# Per-record DEBUG messages (LOG_RECORD_SAMPLE_RATE); batch summaries stay at INFO
+record_log = RecordLogSampler(logger)
+
+# Resent / retried trades already processed here are skipped before normalization
+idempotency_index = IdempotencyIndex("data-processing")
+
+
+@asynccontextmanager
+async def processing_lifespan(app):
+    """Stage worker + HTTP client lifespan, then stops the normalization process pool."""
+    async with stage_lifespan(processing_worker)(app):
+        yield
+    parallel_normalizer.shutdown()
+
 # --- FastAPI 앱 인스턴스 생성 ---
-app = FastAPI()
+app = FastAPI(lifespan=processing_lifespan) # Runs the processing queue consumer; closes pooled HTTP clients and the process pool on shutdown
 
 # TODO: Replace hardcoded URLs with Environment Variables injected by Kubernetes
-# VALIDATION_MODULE_URL = os.environ.get("VALIDATION_MODULE_URL", "http://validation-service:80/validate") # Example in K8s
 # ERROR_MONITOR_MODULE_URL = os.environ.get("ERROR_MONITOR_MODULE_URL", "http://error-monitoring-service:80/report_error") # Example in K8s
-VALIDATION_MODULE_URL = os.environ.get("VALIDATION_MODULE_URL", "http://localhost:8002/validate") # Default to Local testing URL
 ERROR_MONITOR_MODULE_URL = os.environ.get("ERROR_MONITOR_MODULE_URL", "http://localhost:8005/report_error") # Default to Local testing URL
 
 
 @app.post("/process")
-async def process_swap_data(data: List[Dict[str, Any]], db: Session = Depends(get_db)): # Receives data as Dict from Ingestion module
+async def process_swap_data(
+    data: List[Dict[str, Any]],
+    db: AsyncSession = Depends(get_async_db),
+    replay: bool = Query(False, description="Operator retry: process deliveries even if already processed"),
+): # Receives data as Dict from Ingestion module
     """
     API endpoint to process and standardize received swap trade data.
     Generates identifiers, performs basic transformations, stores processed data,
-    and forwards to validation.
+    and enqueues it for validation in the same transaction.
+    Deliveries that were already processed (FEP retransmits) are skipped, unless
+    replay is set: error-monitor retries resend the same payload on purpose.
+    Also called by the 'processing' stage worker.
     """
     logger.info(f"Received {len(data)} data entries for processing from Ingestion.")
 
-    processed_data_list: List[ProcessedSwapDataDB] = [] # SQLAlchemy models for DB
-    data_for_validation: List[ProcessedSwapData] = [] # Pydantic models for next module
+    processed_records: List[SwapRecord] = [] # processed_swap_data rows
+    processed_keys: List[Optional[str]] = [] # Idempotency keys of processed_records, in the same order (None: already recorded, replayed)
     processing_failed_for_reporting: List[Dict[str, Any]] = [] # Entries that failed processing to report
 
-    for entry in data:
-        source_trade_id = entry.get("trade_id", "N/A")
-        # Assuming the ingestion module passes the DB ID of the raw record if available
-        original_raw_db_id = entry.get("id") # Attempt to get the DB ID from the dict
-
-        logger.info(f"Processing entry with source ID: {source_trade_id}, Raw DB ID: {original_raw_db_id}")
-        processing_errors = []
-        processed_entry_dict = {}
-
-        try:
-            # --- Core Processing and Normalization Logic ---
-            # 1. Map raw data fields to standard CDE fields
-            # 2. Generate UTI
-            # 3. Standardize values (e.g., currency codes to uppercase, dates to YYYY-MM-DD)
-            # 4. Perform basic data type conversions
-            # 5. Perform basic LEI format validation (more detailed validation in validation module)
-
-            generated_uti = generate_uti(entry) # Generate UTI
-            reporting_lei = entry.get("party_a_lei", "").strip().upper()
-            other_lei = entry.get("party_b_lei", "").strip().upper()
-
-            # Safely convert notional amount and price, handle potential errors
-            notional_amt = None
-            try:
-                if entry.get("notional_amount") is not None:
-                    notional_amt = float(entry["notional_amount"])
-            except (ValueError, TypeError):
-                processing_errors.append(f"Invalid Notional Amount format: {entry.get('notional_amount')}")
-                send_alert("Warning", f"Invalid Notional Amount format for source ID {source_trade_id}", {"module": "data-processing", "field": "notional_amount", "value": entry.get('notional_amount'), "raw_db_id": original_raw_db_id})
-
-
-            price_val = None
-            try:
-                if entry.get("price") is not None:
-                     price_val = float(entry["price"])
-            except (ValueError, TypeError):
-                 processing_errors.append(f"Invalid Price format: {entry.get('price')}")
-                 send_alert("Warning", f"Invalid Price format for source ID {source_trade_id}", {"module": "data-processing", "field": "price", "value": entry.get('price'), "raw_db_id": original_raw_db_id})
-
-
-            # Basic LEI format check during processing
-            if not validate_lei(reporting_lei):
-                 processing_errors.append(f"Reporting Counterparty LEI '{reporting_lei}' has invalid format.")
-                 send_alert("Warning", f"Invalid Reporting Counterparty LEI format for source ID {source_trade_id}", {"module": "data-processing", "lei": reporting_lei, "raw_db_id": original_raw_db_id})
-
-            if not validate_lei(other_lei):
-                 processing_errors.append(f"Other Counterparty LEI '{other_lei}' has invalid format.")
-                 send_alert("Warning", f"Invalid Other Counterparty LEI format for source ID {source_trade_id}", {"module": "data-processing", "lei": other_lei, "raw_db_id": original_raw_db_id})
-
-            # Basic Notional check during processing
-            if notional_amt is not None and notional_amt < 0:
-                 processing_errors.append(f"Negative Notional Amount for source ID {source_trade_id}")
-                 send_alert("Warning", f"Negative Notional Amount for source ID {source_trade_id}", {"module": "data-processing", "notional_amount": notional_amt, "raw_db_id": original_raw_db_id})
-
-
-            # Create SQLAlchemy DB model instance
-            db_processed_entry = ProcessedSwapDataDB(
-                unique_transaction_identifier = generated_uti,
-                reporting_counterparty_lei = reporting_lei,
-                other_counterparty_lei = other_lei,
-                action_type = entry.get("action", "").strip().upper(),
-                event_type = None, # Logic for life cycle events needed (P2/P3)
-                asset_class = entry.get("asset_class", "").strip().upper(),
-                effective_date = entry.get("effective_date", "").strip(), # Date format validation in Validation module
-                termination_date = entry.get("termination_date", "").strip(), # Date format validation in Validation module
-                notional_amount = notional_amt,
-                notional_currency = entry.get("notional_currency", "").strip().upper() if entry.get("notional_currency") is not None else None,
-                price = price_val,
-                price_currency = entry.get("price_currency", "").strip().upper() if entry.get("price_currency") is not None else None,
-                # ... Map other fields based on CDE ...
-                processing_status = "Processed" if not processing_errors else "ProcessedWithErrors", # Indicate if processing had issues
-                processing_errors = processing_errors, # Store errors in DB
-                original_raw_data_id = original_raw_db_id, # Link to raw data
-                processing_timestamp = datetime.utcnow(),
-                validation_status = "Pending" # Initial validation status
-            )
-            processed_data_list.append(db_processed_entry)
-
-            # Prepare Pydantic model for the next module (Validation)
-            # This converts the DB model data back to a Pydantic model format expected by Validation
-            # Ensure all fields required by the Pydantic model are present
-            pydantic_processed_entry = ProcessedSwapData.from_orm(db_processed_entry) # Use from_orm
-
-            data_for_validation.append(pydantic_processed_entry)
-
-
-            # If processing errors occurred, mark this entry for reporting to error monitor
-            if processing_errors:
-                 processing_failed_for_reporting.append({
-                     "source_module": "data-processing",
-                     "data": pydantic_processed_entry.model_dump(), # Send the processed data payload
-                     "errors": processing_errors
-                 })
-
-
-        except Exception as e:
-            logger.error(f"Critical error processing entry with source ID {source_trade_id}: {e}", exc_info=True)
+    # --- Duplicate deliveries short-circuit before normalization ---
+    try:
+        new_entries, duplicate_entries = await db.run_sync(idempotency_index.split_new, data, replay)
+    except Exception as e:
+        logger.error(f"Failed to check idempotency keys: {e}", exc_info=True)
+        send_alert("Critical", f"Database error checking idempotency keys: {e}", {"module": "data-processing", "error": str(e)})
+        raise HTTPException(status_code=500, detail="Failed to check for duplicate deliveries")
+    if duplicate_entries:
+        logger.info(f"Skipping {len(duplicate_entries)} already processed (duplicate) entries.")
+    entry_keys = [key for key, _ in new_entries]
+    entries = [entry for _, entry in new_entries]
+    # Positions in the request, returned so retry callers can tell which entries were skipped or failed
+    positions = {id(entry): position for position, entry in enumerate(data)}
+    processing_failed_positions: List[int] = []
+
+    # --- Core Processing and Normalization Logic (transformers/normalize.py) ---
+    # Runs in the process pool for large batches, so the event loop stays responsive
+    normalized_entries = await parallel_normalizer.normalize(entries, datetime.utcnow())
+
+    for key, entry, normalized in zip(entry_keys, entries, normalized_entries):
+        record_log.debug("Processing entry with source ID %s", entry.get("trade_id", "N/A"))
+        for severity, message, details in normalized.alerts:
+            send_alert(severity, message, details)
+
+        if normalized.error:
+            source_trade_id = entry.get("trade_id", "N/A")
+            logger.error(f"Critical error processing entry with source ID {source_trade_id}: {normalized.error}")
             critical_error_details = {
                 "source_module": "data-processing",
                 "source_data": entry, # Send original raw data for critical failures
-                "errors": [f"Critical Processing Error: {e}"]
+                "errors": [normalized.error]
             }
             processing_failed_for_reporting.append(critical_error_details)
-            send_alert("Critical", f"Critical error during data processing for source ID {source_trade_id}: {e}", critical_error_details)
-            # TODO: Ensure critical failures are reported to error monitor even if forwarding to validation fails
+            processing_failed_positions.append(positions[id(entry)])
+            send_alert("Critical", f"Critical error during data processing for source ID {source_trade_id}: {normalized.error}", critical_error_details)
+            continue
 
-    logger.info(f"Finished processing {len(data)} entries. Generated {len(processed_data_list)} processed entries with {len(processing_failed_for_reporting)} processing issues.")
+        record = normalized.record
+        processed_records.append(record)
+        processed_keys.append(key)
 
-    # Simulate storing processed data persistently in the database
+        # If processing errors occurred, mark this entry for reporting to error monitor
+        if record.processing_errors:
+            processing_failed_for_reporting.append({
+                "source_module": "data-processing",
+                "data": record.to_dict(), # Send the processed data payload
+                "errors": record.processing_errors
+            })
+            processing_failed_positions.append(positions[id(entry)])
+
+    logger.info(
+        "Finished processing %d entries (%d duplicates skipped). Generated %d processed entries with %d processing issues.",
+        len(entries), len(duplicate_entries), len(processed_records), len(processing_failed_for_reporting),
+        extra={"stage": "data-processing", "batch_size": len(data), "duplicate_count": len(duplicate_entries),
+               "processed_count": len(processed_records), "issue_count": len(processing_failed_for_reporting)},
+    )
+
+    # Store processed data persistently in the database
     try:
-        db.add_all(processed_data_list) # Add all records to the session
-        db.commit() # Commit the transaction
-        # Refresh records to get generated IDs if needed
-        # for record in processed_data_list:
-        #     db.refresh(record)
-        logger.info(f"Successfully simulated storing {len(processed_data_list)} entries in processed_swap_data table.")
-
+        # Deterministic UTIs: a life-cycle event of a stored trade updates its row (one row per UTI)
+        ids_by_uti = await db.run_sync(bulk_upsert_processed_records, records_to_rows(processed_records)) if processed_records else {}
+        await db.run_sync(idempotency_index.record, [
+            {"idempotency_key": key, "unique_transaction_identifier": record.unique_transaction_identifier,
+             "record_id": ids_by_uti[record.unique_transaction_identifier]}
+            for key, record in zip(processed_keys, processed_records) if key is not None
+        ])
+        # Forward processed data (including those with processing_errors logged) to validation, once per stored UTI.
+        # Published in the same transaction, so a record is stored if and only if it is queued.
+        latest_records = {record.unique_transaction_identifier: record for record in processed_records}
+        for uti, record in latest_records.items():
+            record.id = ids_by_uti[uti] # Existing row id when a life-cycle event updated a stored trade
+        data_for_validation = [record.to_dict() for record in latest_records.values()]
+        await validation_queue.publish_async(data_for_validation, db=db)
+        await db.commit() # Commit the transaction
+        idempotency_index.remember(key for key in processed_keys if key is not None) # Only committed keys may short-circuit later deliveries
+        logger.info(f"Successfully stored {len(ids_by_uti)} entries in processed_swap_data table.")
+
+    except QueueFullError as exc:
+        await db.rollback()
+        logger.warning(f"Validation queue is full, rejecting processing batch: {exc}")
+        raise HTTPException(status_code=503, detail=str(exc), headers={"Retry-After": "30"})
     except Exception as e:
-        db.rollback() # Rollback the transaction in case of error
+        await db.rollback() # Rollback the transaction in case of error
         logger.error(f"Failed to store processed data in database: {e}", exc_info=True)
         send_alert("Critical", f"Database error storing processed data: {e}", {"module": "data-processing", "error": str(e)})
         # If database storage fails, we cannot proceed.
         raise HTTPException(status_code=500, detail="Failed to store processed data")
 
 
-    # Forward processed data (including those with processing_errors logged) to validation module
-    # The validation module will perform comprehensive validation and handle errors further.
-    if data_for_validation:
-        logger.info(f"Forwarding {len(data_for_validation)} entries to validation module.")
-        try:
-            async with httpx.AsyncClient() as client:
-                 # Use the URL from environment variables
-                 # Convert Pydantic models to dicts for JSON payload
-                 response = await client.post(VALIDATION_MODULE_URL, json=[entry.model_dump() for entry in data_for_validation], timeout=60.0) # Add timeout
-                 response.raise_for_status() # Raise an exception for 4xx or 5xx status codes
-                 logger.info(f"Successfully sent {len(data_for_validation)} entries to validation module. Response: {response.json()}")
-                 # TODO: Handle validation module response (e.g., check status)
-                 # TODO: Update status in processed_swap_data table based on validation outcome (later)
-
-        except httpx.RequestError as exc:
-            logger.error(f"Failed to send data to validation module: {exc}", exc_info=True)
-            send_alert("Error", f"Failed to forward data to validation module: {exc}", {"module": "data-processing", "error": str(exc), "target_url": VALIDATION_MODULE_URL})
-            # TODO: Implement robust error handling: retry logic, Dead Letter Queue (DLQ), or mark data for later processing in DB
-
-        except Exception as e:
-             logger.error(f"An unexpected error occurred during validation module call: {e}", exc_info=True)
-             send_alert("Critical", f"Unexpected error calling validation module: {e}", {"module": "data-processing", "error": str(e), "target_url": VALIDATION_MODULE_URL})
-             # TODO: Implement robust error handling
-
     # Report entries that had processing failures to the error monitor
     if processing_failed_for_reporting:
         logger.error(f"Reporting {len(processing_failed_for_reporting)} processing failures to error monitor.")
         try:
-            async with httpx.AsyncClient() as client:
+            async with shared_http_client(ERROR_MONITOR_MODULE_URL) as client:
                 # Use the URL from environment variables
                 response = await client.post(ERROR_MONITOR_MODULE_URL, json=processing_failed_for_reporting, timeout=30.0)
                 response.raise_for_status()
@@ -678,17 +664,24 @@ async def process_swap_data(data: List[Dict[str, Any]], db: Session = Depends(ge
              send_alert("Critical", f"Unexpected error reporting processing failures: {e}", {"module": "data-processing", "error": str(e), "target_url": ERROR_MONITOR_MODULE_URL})
 
 
-    return {"status": "success", "processed_count": len(processed_data_list), "processing_failed_count": len(processing_failed_for_reporting), "validation_forward_status": "attempted"}
+    return {
+        "status": "success", "processed_count": len(processed_records), "duplicate_count": len(duplicate_entries),
+        "processing_failed_count": len(processing_failed_for_reporting), "validation_forward_status": "queued",
+        "duplicate_indexes": [positions[id(entry)] for entry in duplicate_entries],
+        "processing_failed_indexes": processing_failed_positions,
+    }
 
 # --- P3: Admin UI를 위한 API 엔드포인트 추가 ---
 @app.get("/processed-data")
 async def get_processed_data_for_ui(
     db: Session = Depends(get_db), # Use DB session
     limit: int = Query(100, description="Maximum number of records to return"),
-    offset: int = Query(0, description="Offset for pagination"),
+    offset: int = Query(0, description="Offset for pagination (deprecated, ignored when cursor is set)"),
+    cursor: Optional[str] = Query(None, description="Opaque cursor from the previous page's next_cursor"),
+    exact_count: bool = Query(False, description="Compute an exact total_count (slow on large tables)"),
     uti: Optional[str] = Query(None, description="Filter by Unique Transaction Identifier (partial match)"),
     status: Optional[str] = Query(None, description="Filter by validation status (e.g., Pending, Valid, Invalid)"),
-    asset_class: Optional[str] = Query(None, description="Filter by asset class"),
+    asset_class: Optional[str] = Query(None, description="Filter by asset class code (e.g. IR, case-insensitive)"),
     start_date: Optional[str] = Query(None, description="Filter by effective date >= (YYYY-MM-DD)"),
     end_date: Optional[str] = Query(None, description="Filter by effective date <= (YYYY-MM-DD)")
 ):
@@ -696,7 +689,7 @@ async def get_processed_data_for_ui(
     API endpoint for the Admin UI frontend to fetch processed data.
     Fetches from the database.
     """
-    logger.info(f"Received request to list processed data with filters: uti={uti}, status={status}, asset_class={asset_class}, start_date={start_date}, end_date={end_date}, limit={limit}, offset={offset}")
+    logger.info(f"Received request to list processed data with filters: uti={uti}, status={status}, asset_class={asset_class}, start_date={start_date}, end_date={end_date}, limit={limit}, offset={offset}, cursor={cursor}")
 
     # Build SQLAlchemy query
     query = db.query(ProcessedSwapDataDB)
@@ -706,7 +699,8 @@ async def get_processed_data_for_ui(
     if status:
         query = query.filter(ProcessedSwapDataDB.validation_status == status)
     if asset_class:
-        query = query.filter(ProcessedSwapDataDB.asset_class.ilike(f"%{asset_class}%")) # Case-insensitive match for asset class
+        # Stored upper-cased (transformers/normalize.py): equality keeps ix_processed_swap_data_status_asset_effective usable past its first column
+        query = query.filter(ProcessedSwapDataDB.asset_class == asset_class.strip().upper())
     if start_date:
         # Assuming effective_date is stored as YYYY-MM-DD string
         query = query.filter(ProcessedSwapDataDB.effective_date >= start_date)
@@ -715,11 +709,20 @@ async def get_processed_data_for_ui(
         query = query.filter(ProcessedSwapDataDB.effective_date <= end_date)
 
 
-    # Get total count before applying limit/offset
-    total_count = query.count()
+    # Total count: estimated/cached unless exact_count=true
+    total_count, total_count_mode = count_rows(
+        db, query, ProcessedSwapDataDB.__tablename__,
+        {"uti": uti, "status": status, "asset_class": asset_class, "start_date": start_date, "end_date": end_date},
+        exact=exact_count,
+    )
 
-    # Apply ordering (e.g., by processing timestamp descending), limit, and offset
-    processed_records = query.order_by(desc(ProcessedSwapDataDB.processing_timestamp)).offset(offset).limit(limit).all()
+    # Newest first, keyset-paginated on (processing_timestamp, id)
+    try:
+        processed_records, next_cursor = paginate_keyset(
+            query, ProcessedSwapDataDB.processing_timestamp, ProcessedSwapDataDB.id, limit, cursor=cursor, offset=offset
+        )
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=400, detail=str(e))
 
     # Convert SQLAlchemy objects to Pydantic models for response
     processed_data_list = []
@@ -738,9 +741,11 @@ async def get_processed_data_for_ui(
     return {
         "status": "success",
         "total_count": total_count,
+        "total_count_mode": total_count_mode,
         "returned_count": len(processed_data_list),
         "offset": offset,
         "limit": limit,
+        "next_cursor": next_cursor,
         "data": processed_data_list
     }
 
@@ -759,10 +764,10 @@ async def health_check(db: Session = Depends(get_db)):
         logger.error(f"Database health check failed: {e}", exc_info=True)
         send_alert("Critical", f"Database connectivity issue in Data Processing: {e}", {"module": "data-processing", "check": "db_connectivity"})
 
-    return {"status": "ok", "database_status": db_status}
+    return {"status": "ok", "database_status": db_status, "stage_worker": processing_worker.status(), "idempotency": idempotency_index.metrics(), "reference_data": get_reference_data_metrics(), "alerts": get_alert_metrics(), "http_pools": get_http_pool_metrics()}
 
 # To run this module locally:
 # 1. Ensure your database is running.
 # 2. Set the DATABASE_URL environment variable if not using SQLite.
-# 3. Set VALIDATION_MODULE_URL and ERROR_MONITOR_MODULE_URL env vars if not using defaults.
+# 3. Set ERROR_MONITOR_MODULE_URL (and STAGE_QUEUE_* if needed) env vars if not using defaults.
 # 4. Run uvicorn: uvicorn main:app --reload --port 8001
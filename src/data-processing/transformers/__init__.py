@@ -0,0 +1,4 @@
+# src/data-processing/transformers/__init__.py
+
+from .normalize import NormalizedEntry, normalize_entry, normalize_chunk
+from .parallel import ParallelNormalizer
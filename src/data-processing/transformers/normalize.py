@@ -0,0 +1,194 @@
+# src/data-processing/transformers/normalize.py
+
+import uuid
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import List, Dict, Any, Optional, Sequence, Tuple
+
+from common.utils import generate_uti
+from common.lei import validate_leis
+from common.reference_data import check_many, CURRENCIES, ASSET_CLASSES
+from common.records import SwapRecord, SWAP_RECORD_FIELDS
+
+# --- 정규화 (Normalization) 변환 ---
+# Pure per-entry transformation from an ingested raw row to a processed_swap_data row.
+# No DB session, HTTP or alerting happens here, so a chunk can run in a worker process:
+# alerts are returned as (severity, message, details) tuples and raised by the caller
+# (details carry a fixed "rule" so the alert aggregator can fingerprint them cheaply),
+# and rows are SwapRecords (common/records.py) ready for a Core executemany.
+# Results crossing the process boundary are compacted to value tuples with repeated
+# codes/dates shared (pickle memoizes identical objects): unpickling in the parent is
+# the serial part of the parallel path, and full dicts take about twice as long.
+
+# Low-cardinality fields shared across a chunk's compact tuples
+SHARED_VALUE_FIELDS = frozenset((
+    "reporting_counterparty_lei", "other_counterparty_lei", "action_type", "asset_class", "effective_date",
+    "termination_date", "notional_currency", "price_currency", "processing_status", "validation_status",
+))
+
+
+@dataclass
+class NormalizedEntry:
+    """Result for one input entry. `record` is None when the entry failed critically (`error`)."""
+    record: Optional[SwapRecord] = None
+    alerts: List[Tuple[str, str, Dict[str, Any]]] = field(default_factory=list)
+    error: Optional[str] = None
+
+
+def _upper(value: Optional[str]) -> Optional[str]:
+    return value.strip().upper() if value is not None else None
+
+
+@dataclass
+class ChunkChecks:
+    """Lookup results for the distinct LEIs / codes of a chunk, computed with one batch call per kind."""
+    leis: Dict[str, bool]
+    currencies: Dict[str, bool]
+    asset_classes: Dict[str, bool]
+
+
+def _distinct_upper(entries: Sequence[Dict[str, Any]], *names: str) -> List[str]:
+    # Missing keys default to "" like normalize_entry does, so a row without an LEI is looked up (and rejected) too
+    return list({
+        value.strip().upper()
+        for entry in entries
+        for name in names
+        if isinstance(value := entry.get(name, ""), str)
+    })
+
+
+def build_chunk_checks(entries: Sequence[Dict[str, Any]]) -> ChunkChecks:
+    """LEI format/check digits (validate_leis) and reference codes (check_many) for every distinct value of a chunk."""
+    leis = _distinct_upper(entries, "party_a_lei", "party_b_lei")
+    currencies = _distinct_upper(entries, "notional_currency", "price_currency")
+    asset_classes = _distinct_upper(entries, "asset_class")
+    return ChunkChecks(
+        leis=dict(zip(leis, validate_leis(leis))),
+        currencies=dict(zip(currencies, check_many(CURRENCIES, currencies))),
+        asset_classes=dict(zip(asset_classes, check_many(ASSET_CLASSES, asset_classes))),
+    )
+
+
+def normalize_entry(entry: Dict[str, Any], processing_timestamp: datetime,
+                    checks: Optional[ChunkChecks] = None) -> NormalizedEntry:
+    """
+    Maps raw fields to CDE fields, generates the UTI, standardizes values (upper-case codes,
+    stripped dates), converts numbers and runs the basic LEI / code / notional checks.
+    Same rules as the former inline loop of process_swap_data. `checks` is the chunk's
+    build_chunk_checks result; without it the entry is looked up on its own.
+    """
+    source_trade_id = entry.get("trade_id", "N/A")
+    original_raw_db_id = entry.get("id") # DB id of the raw record, passed along by ingestion
+    result = NormalizedEntry()
+    processing_errors: List[str] = []
+
+    try:
+        generated_uti = generate_uti(entry)
+        reporting_lei = entry.get("party_a_lei", "").strip().upper()
+        other_lei = entry.get("party_b_lei", "").strip().upper()
+
+        notional_amt = None
+        try:
+            if entry.get("notional_amount") is not None:
+                notional_amt = float(entry["notional_amount"])
+        except (ValueError, TypeError):
+            processing_errors.append(f"Invalid Notional Amount format: {entry.get('notional_amount')}")
+            result.alerts.append(("Warning", f"Invalid Notional Amount format for source ID {source_trade_id}", {"module": "data-processing", "rule": "notional_format", "field": "notional_amount", "value": entry.get('notional_amount'), "raw_db_id": original_raw_db_id}))
+
+        price_val = None
+        try:
+            if entry.get("price") is not None:
+                price_val = float(entry["price"])
+        except (ValueError, TypeError):
+            processing_errors.append(f"Invalid Price format: {entry.get('price')}")
+            result.alerts.append(("Warning", f"Invalid Price format for source ID {source_trade_id}", {"module": "data-processing", "rule": "price_format", "field": "price", "value": entry.get('price'), "raw_db_id": original_raw_db_id}))
+
+        # Basic LEI format/check-digit check during processing (GLEIF existence in the validation module)
+        if checks is None:
+            checks = build_chunk_checks([entry])
+        if not checks.leis[reporting_lei]:
+            processing_errors.append(f"Reporting Counterparty LEI '{reporting_lei}' has invalid format.")
+            result.alerts.append(("Warning", f"Invalid Reporting Counterparty LEI format for source ID {source_trade_id}", {"module": "data-processing", "rule": "reporting_lei_format", "lei": reporting_lei, "raw_db_id": original_raw_db_id}))
+
+        if not checks.leis[other_lei]:
+            processing_errors.append(f"Other Counterparty LEI '{other_lei}' has invalid format.")
+            result.alerts.append(("Warning", f"Invalid Other Counterparty LEI format for source ID {source_trade_id}", {"module": "data-processing", "rule": "other_lei_format", "lei": other_lei, "raw_db_id": original_raw_db_id}))
+
+        # Reference code checks (ISO 4217 / CFTC asset classes, see common/reference_data.py)
+        asset_class = entry.get("asset_class", "").strip().upper()
+        notional_currency = _upper(entry.get("notional_currency"))
+        price_currency = _upper(entry.get("price_currency"))
+        if asset_class and not checks.asset_classes[asset_class]:
+            processing_errors.append(f"Asset Class '{asset_class}' is not a valid CFTC asset class.")
+            result.alerts.append(("Warning", f"Unknown Asset Class for source ID {source_trade_id}", {"module": "data-processing", "rule": "asset_class_code", "value": asset_class, "raw_db_id": original_raw_db_id}))
+        for field_label, currency in (("Notional Currency", notional_currency), ("Price Currency", price_currency)):
+            if currency and not checks.currencies[currency]:
+                processing_errors.append(f"{field_label} '{currency}' is not a valid ISO 4217 code.")
+                result.alerts.append(("Warning", f"Unknown {field_label} for source ID {source_trade_id}", {"module": "data-processing", "rule": "currency_code", "field": field_label, "value": currency, "raw_db_id": original_raw_db_id}))
+
+        if notional_amt is not None and notional_amt < 0:
+            processing_errors.append(f"Negative Notional Amount for source ID {source_trade_id}")
+            result.alerts.append(("Warning", f"Negative Notional Amount for source ID {source_trade_id}", {"module": "data-processing", "rule": "negative_notional", "notional_amount": notional_amt, "raw_db_id": original_raw_db_id}))
+
+        result.record = SwapRecord(
+            id=str(uuid.uuid4()),
+            unique_transaction_identifier=generated_uti,
+            reporting_counterparty_lei=reporting_lei,
+            other_counterparty_lei=other_lei,
+            action_type=entry.get("action", "").strip().upper(),
+            event_type=None, # Logic for life cycle events needed (P2/P3)
+            asset_class=asset_class,
+            effective_date=entry.get("effective_date", "").strip(), # Date format validation in Validation module
+            termination_date=entry.get("termination_date", "").strip(), # Date format validation in Validation module
+            notional_amount=notional_amt,
+            notional_currency=notional_currency,
+            price=price_val,
+            price_currency=price_currency,
+            processing_status="Processed" if not processing_errors else "ProcessedWithErrors",
+            processing_errors=processing_errors,
+            original_raw_data_id=original_raw_db_id,
+            processing_timestamp=processing_timestamp,
+            validation_status="Pending", # Initial validation status
+        )
+    except Exception as e:
+        result.error = f"Critical Processing Error: {e}"
+
+    return result
+
+
+def normalize_chunk(entries: Sequence[Dict[str, Any]], processing_timestamp: datetime) -> List[NormalizedEntry]:
+    """Normalizes a slice of a batch inline."""
+    checks = build_chunk_checks(entries)
+    return [normalize_entry(entry, processing_timestamp, checks) for entry in entries]
+
+
+CompactEntry = Tuple[Optional[Tuple[Any, ...]], Optional[list], Optional[str]]
+
+
+def normalize_chunk_compact(entries: Sequence[Dict[str, Any]], processing_timestamp: datetime) -> List[CompactEntry]:
+    """
+    Process-pool task: normalizes a slice and returns (record values, alerts, error) tuples.
+    Module-level so it can be pickled; expand with expand_compact_chunk.
+    """
+    shared: Dict[Any, Any] = {}
+    shared_positions = [position for position, name in enumerate(SWAP_RECORD_FIELDS) if name in SHARED_VALUE_FIELDS]
+    compact: List[CompactEntry] = []
+    checks = build_chunk_checks(entries)
+    for entry in entries:
+        result = normalize_entry(entry, processing_timestamp, checks)
+        if result.record is None:
+            compact.append((None, result.alerts or None, result.error))
+            continue
+        values = list(result.record.to_tuple())
+        for position in shared_positions:
+            values[position] = shared.setdefault(values[position], values[position])
+        compact.append((tuple(values), result.alerts or None, None))
+    return compact
+
+
+def expand_compact_chunk(compact: Sequence[CompactEntry]) -> List[NormalizedEntry]:
+    """Rebuilds NormalizedEntry results from normalize_chunk_compact output."""
+    return [
+        NormalizedEntry(SwapRecord(*values) if values is not None else None, alerts or [], error)
+        for values, alerts, error in compact
+    ]
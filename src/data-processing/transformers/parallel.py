@@ -0,0 +1,66 @@
+# src/data-processing/transformers/parallel.py
+
+import asyncio
+import os
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from typing import List, Dict, Any, Optional, Sequence
+
+from common.utils import logger
+from .normalize import NormalizedEntry, normalize_chunk, normalize_chunk_compact, expand_compact_chunk
+
+# --- 병렬 정규화 (Process-pool Normalization) ---
+# Normalization is pure-Python CPU work (string handling, UTI generation, LEI checks),
+# so threads would serialize on the GIL. Large batches are sharded into chunks and
+# normalized in a process pool; the event loop only awaits the futures and stays free
+# for other requests and the stage worker. asyncio.gather keeps results in input order.
+# Small batches are normalized inline because pickling them costs more than it saves.
+PROCESSING_PARALLEL_WORKERS = int(os.environ.get("PROCESSING_PARALLEL_WORKERS", "0")) # 0 disables the process pool
+PROCESSING_PARALLEL_CHUNK_SIZE = int(os.environ.get("PROCESSING_PARALLEL_CHUNK_SIZE", "5000")) # Entries per pool task
+PROCESSING_PARALLEL_MIN_BATCH = int(os.environ.get("PROCESSING_PARALLEL_MIN_BATCH", "10000")) # Smaller batches run inline
+
+
+class ParallelNormalizer:
+    """
+    Normalizes batches inline or across a lazily created process pool.
+    Call shutdown() on application shutdown.
+    """
+
+    def __init__(
+        self,
+        workers: int = PROCESSING_PARALLEL_WORKERS,
+        chunk_size: int = PROCESSING_PARALLEL_CHUNK_SIZE,
+        min_batch: int = PROCESSING_PARALLEL_MIN_BATCH,
+    ):
+        self.workers = workers
+        self.chunk_size = max(1, chunk_size)
+        self.min_batch = min_batch
+        self._executor: Optional[ProcessPoolExecutor] = None
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=self.workers)
+            logger.info(f"Started normalization process pool ({self.workers} workers, chunk size {self.chunk_size}).")
+        return self._executor
+
+    def uses_pool(self, batch_size: int) -> bool:
+        return self.workers > 0 and batch_size >= self.min_batch
+
+    async def normalize(self, entries: Sequence[Dict[str, Any]], processing_timestamp: Optional[datetime] = None) -> List[NormalizedEntry]:
+        """Returns one NormalizedEntry per input entry, in input order."""
+        processing_timestamp = processing_timestamp or datetime.utcnow()
+        if not self.uses_pool(len(entries)):
+            return normalize_chunk(entries, processing_timestamp)
+
+        loop = asyncio.get_running_loop()
+        executor = self._get_executor()
+        chunk_results = await asyncio.gather(*[
+            loop.run_in_executor(executor, normalize_chunk_compact, entries[start:start + self.chunk_size], processing_timestamp)
+            for start in range(0, len(entries), self.chunk_size)
+        ])
+        return [result for chunk in chunk_results for result in expand_compact_chunk(chunk)]
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=True, cancel_futures=True)
+            self._executor = None
@@ -72,17 +72,28 @@ async def health_check():
 from fastapi import FastAPI, HTTPException, Query, Depends
 from typing import List, Dict, Any, Optional
 import uvicorn
+import httpx # Used for retry calls to other modules
 from datetime import datetime
 import uuid # To generate unique IDs for errors
 import os # To read environment variables
+import asyncio # Bulk retry jobs run as background tasks
+from pydantic import BaseModel, Field
 
 # --- SQLAlchemy Imports ---
 from sqlalchemy.orm import Session
 from sqlalchemy import desc # For sorting
 
 # src.common에서 로거, DB 설정 및 모델 가져오기
-from common.utils import logger, get_db, ErrorRecord, create_database_tables # Import get_db and ErrorRecord
+from common.utils import logger, get_db, ErrorRecord, ErrorGroup, RawIngestedData, RetryJob, create_database_tables # Import get_db and ErrorRecord
 from common.utils import send_alert # Import alert utility
+from common.utils import get_async_db, AsyncSession, AsyncSessionLocal # Async session for the write paths
+from common.pagination import paginate_keyset, count_rows, InvalidCursorError # Keyset pagination for the Admin UI lists
+from common.http_client import shared_http_client, http_client_lifespan, get_http_pool_metrics # Pooled, lifespan-managed HTTP clients
+from common.error_groups import bulk_record_errors # Bulk error insert + fingerprint groups
+from common.retry_jobs import ( # Bulk retry jobs
+    retry_payload, run_retry_job, job_progress, INGESTION, PROCESSING, RETRY_JOB_BATCH_SIZE, RETRY_JOB_CONCURRENCY,
+    RETRY_REQUEST_PARAMS, rejected_positions,
+)
 
 # --- Ensure database tables are created on startup (for local dev) ---
 # In production, handle migrations separately
@@ -92,75 +103,48 @@ create_database_tables()
 # PROCESSING_MODULE_URL = os.environ.get("PROCESSING_MODULE_URL", "http://data-processing-service:80/process") # Example in K8s
 PROCESSING_MODULE_URL = os.environ.get("PROCESSING_MODULE_URL", "http://localhost:8001/process") # Default to Local testing URL for retry simulation
 INGESTION_MODULE_URL = os.environ.get("INGESTION_MODULE_URL", "http://localhost:8000/ingest") # Default to Local testing URL for retry simulation
+RETRY_TARGET_URLS = {INGESTION: INGESTION_MODULE_URL, PROCESSING: PROCESSING_MODULE_URL}
+RETRY_SOURCE_MODULES = ("data-ingestion", "data-processing", "validation") # Modules whose errors can be re-injected
 
+# Background retry job tasks of this process (referenced so they are not garbage-collected)
+_retry_job_tasks = set()
 
 # --- FastAPI 앱 인스턴스 생성 ---
-app = FastAPI()
+app = FastAPI(lifespan=http_client_lifespan) # Closes the pooled HTTP clients on shutdown
 
 # --- P1: 오류 수신 및 기록 엔드포인트 ---
 @app.post("/report_error")
-async def report_error(errors_data: List[Dict[str, Any]], db: Session = Depends(get_db)):
+async def report_error(errors_data: List[Any], db: AsyncSession = Depends(get_async_db)):
     """
     API endpoint to receive and record error information from other modules.
-    Stores errors persistently in the database.
+    Stores errors persistently in the database with one bulk insert and counts them
+    per fingerprint (source module, message template) in error_groups.
     """
     logger.error(f"Received {len(errors_data)} error entries from other modules.")
 
-    new_error_records = []
-    for error_entry in errors_data:
-        try:
-            # Assuming error_entry has keys like 'data' and 'errors' and 'source_module'
-            data_payload = error_entry.get("data", {})
-            errors = error_entry.get("errors", [])
-            source_module = error_entry.get("source_module", "Unknown")
-            original_source_data_payload = data_payload.get("original_source_data") # Get original raw data if available
-
-            # Attempt to get UTI or source ID for logging and storage
-            trade_id = data_payload.get("unique_transaction_identifier", data_payload.get("trade_id", "N/A"))
-            error_messages = errors if isinstance(errors, list) else [str(errors)] # Ensure errors is a list of strings
-
-            logger.error(f"Error reported from {source_module} for ID {trade_id}: Errors: {error_messages}")
-
-            # Create a database model instance for the error record
-            db_error_record = ErrorRecord(
-                trade_id=trade_id,
-                source_module=source_module,
-                error_messages=error_messages,
-                data_payload=data_payload, # Store the data associated with the error
-                original_source_data_payload=original_source_data_payload, # Store original raw data if available
-                timestamp=datetime.utcnow(),
-                status="Open", # Initial status
-                severity="Error" # Default severity, could be passed from source module
-            )
-            new_error_records.append(db_error_record)
-
-            # TODO: Trigger alerts based on error severity or type
-            # send_alert(db_error_record.severity, f"New Error in {source_module} for {trade_id}", {"error_id": db_error_record.id, "uti": trade_id, "module": source_module, "errors": error_messages}) # Uncomment to send alerts
-
-        except Exception as e:
-             logger.error(f"Critical error while processing received error entry: {e}", exc_info=True)
-             send_alert("Critical", f"Internal error processing received error: {e}", {"module": "error-monitoring", "received_data_sample": str(error_entry)[:200]}) # Avoid logging full data in alert
-
-
-    # Simulate storing error records in the database
     try:
-        db.add_all(new_error_records)
-        db.commit()
-        # Refresh records to get generated IDs for alerts if needed
-        # for record in new_error_records:
-        #     db.refresh(record)
-        logger.info(f"Successfully simulated storing {len(new_error_records)} error records in error_records table.")
-        recorded_count = len(new_error_records)
+        summary = await db.run_sync(bulk_record_errors, errors_data)
+        await db.commit()
+        logger.info("Successfully stored %d error records in %d error groups (%d new).", summary["recorded"], summary["groups"], summary["new_groups"],
+                    extra={"stage": "error-monitoring", "batch_size": len(errors_data), "errors_by_module": summary["errors_by_module"],
+                           "slimmed_payloads": summary["slimmed_payloads"]})
+        recorded_count = summary["recorded"]
+        group_count = summary["groups"]
 
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         logger.error(f"Failed to store error records in database: {e}", exc_info=True)
         send_alert("Critical", f"Database error storing errors: {e}", {"module": "error-monitoring", "error": str(e)})
-        # This is a critical failure in the error monitoring itself
-        recorded_count = 0 # Indicate that storage failed
+        # This is a critical failure in the error monitoring itself: nothing was stored, so the reporter must not treat it as delivered
+        raise HTTPException(status_code=503, detail=f"Failed to store {len(errors_data)} error entries: {e}")
 
+    if summary["invalid"]:
+        logger.error(f"Skipped {summary['invalid']} malformed error entries.")
+        send_alert("Critical", f"Internal error processing {summary['invalid']} received error entries", {"module": "error-monitoring", "rule": "malformed_error_entry", "received_data_sample": str(errors_data[0])[:200]}) # Avoid logging full data in alert
+        if not recorded_count:
+            raise HTTPException(status_code=422, detail=f"None of the {summary['invalid']} error entries could be stored (malformed).")
 
-    return {"status": "success", "received_error_count": len(errors_data), "recorded_error_count": recorded_count}
+    return {"status": "success", "received_error_count": len(errors_data), "recorded_error_count": recorded_count, "error_group_count": group_count}
 
 # --- P3: Admin UI를 위한 API 엔드포인트 ---
 
@@ -170,14 +154,17 @@ async def list_errors(
     status: Optional[str] = Query(None, description="Filter by error status (e.g., Open, Resolved)"),
     source_module: Optional[str] = Query(None, description="Filter by source module"),
     trade_id: Optional[str] = Query(None, description="Filter by trade ID or UTI (partial match)"),
+    group_id: Optional[str] = Query(None, description="Filter by error group (see /error-groups)"),
     limit: int = Query(100, description="Maximum number of errors to return"),
-    offset: int = Query(0, description="Offset for pagination")
+    offset: int = Query(0, description="Offset for pagination (deprecated, ignored when cursor is set)"),
+    cursor: Optional[str] = Query(None, description="Opaque cursor from the previous page's next_cursor"),
+    exact_count: bool = Query(False, description="Compute an exact total_count (slow on large tables)")
 ):
     """
     API endpoint to list recorded errors (for Admin UI).
     Supports filtering and pagination. Fetches from the database.
     """
-    logger.info(f"Received request to list errors with filters: status={status}, module={source_module}, trade_id={trade_id}, limit={limit}, offset={offset}")
+    logger.info(f"Received request to list errors with filters: status={status}, module={source_module}, trade_id={trade_id}, limit={limit}, offset={offset}, cursor={cursor}")
 
     # Build SQLAlchemy query
     query = db.query(ErrorRecord)
@@ -189,12 +176,21 @@ async def list_errors(
     if trade_id:
         # Use ilike for case-insensitive partial match
         query = query.filter(ErrorRecord.trade_id.ilike(f"%{trade_id}%"))
+    if group_id:
+        query = query.filter(ErrorRecord.group_id == group_id)
 
-    # Get total count before applying limit/offset
-    total_count = query.count()
+    # Total count: estimated/cached unless exact_count=true
+    total_count, total_count_mode = count_rows(
+        db, query, ErrorRecord.__tablename__,
+        {"status": status, "source_module": source_module, "trade_id": trade_id, "group_id": group_id},
+        exact=exact_count,
+    )
 
-    # Apply ordering, limit, and offset
-    errors = query.order_by(desc(ErrorRecord.timestamp)).offset(offset).limit(limit).all()
+    # Newest first, keyset-paginated on (timestamp, id)
+    try:
+        errors, next_cursor = paginate_keyset(query, ErrorRecord.timestamp, ErrorRecord.id, limit, cursor=cursor, offset=offset)
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=400, detail=str(e))
 
     # Convert SQLAlchemy objects to dictionaries for response (excluding sensitive raw_payload if needed)
     error_list = []
@@ -209,12 +205,68 @@ async def list_errors(
     return {
         "status": "success",
         "total_count": total_count,
+        "total_count_mode": total_count_mode,
         "returned_count": len(error_list),
         "offset": offset,
         "limit": limit,
+        "next_cursor": next_cursor,
         "errors": error_list
     }
 
+@app.get("/error-groups")
+async def list_error_groups(
+    db: Session = Depends(get_db),
+    status: Optional[str] = Query(None, description="Filter by group status (e.g., Open, Resolved)"),
+    source_module: Optional[str] = Query(None, description="Filter by source module"),
+    limit: int = Query(100, description="Maximum number of groups to return"),
+    cursor: Optional[str] = Query(None, description="Opaque cursor from the previous page's next_cursor"),
+):
+    """
+    API endpoint to list error groups (for Admin UI), most recently seen first.
+    One row per (source module, message template) with its count, first/last seen and sample error ids.
+    """
+    logger.info(f"Received request to list error groups with filters: status={status}, module={source_module}, limit={limit}, cursor={cursor}")
+
+    query = db.query(ErrorGroup)
+    if status:
+        query = query.filter(ErrorGroup.status == status)
+    if source_module:
+        query = query.filter(ErrorGroup.source_module == source_module)
+
+    try:
+        groups, next_cursor = paginate_keyset(query, ErrorGroup.last_seen, ErrorGroup.id, limit, cursor=cursor)
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    group_list = []
+    for group in groups:
+        group_dict = group.__dict__
+        group_dict.pop('_sa_instance_state', None)
+        group_list.append(group_dict)
+
+    return {"status": "success", "returned_count": len(group_list), "limit": limit, "next_cursor": next_cursor, "groups": group_list}
+
+@app.get("/error-groups/{group_id}")
+async def get_error_group_details(group_id: str, db: Session = Depends(get_db)):
+    """
+    API endpoint to get one error group with its sample errors (for Admin UI).
+    The group's other errors are listed with /errors?group_id=...
+    """
+    group = db.query(ErrorGroup).filter(ErrorGroup.id == group_id).first()
+    if not group:
+        logger.warning(f"Error group with ID {group_id} not found.")
+        raise HTTPException(status_code=404, detail="Error group not found")
+
+    samples = db.query(ErrorRecord).filter(ErrorRecord.id.in_(group.sample_error_ids or [])).all()
+    sample_list = []
+    for error in samples:
+        error_dict = error.__dict__
+        error_dict.pop('_sa_instance_state', None)
+        sample_list.append(error_dict)
+    group_dict = group.__dict__
+    group_dict.pop('_sa_instance_state', None)
+    return {"status": "success", "group": group_dict, "sample_errors": sample_list}
+
 @app.get("/errors/{error_id}")
 async def get_error_details(error_id: str, db: Session = Depends(get_db)):
     """
@@ -236,7 +288,7 @@ async def get_error_details(error_id: str, db: Session = Depends(get_db)):
     raise HTTPException(status_code=404, detail="Error not found")
 
 @app.put("/errors/{error_id}/status")
-async def update_error_status(error_id: str, new_status: str, db: Session = Depends(get_db)):
+async def update_error_status(error_id: str, new_status: str, db: AsyncSession = Depends(get_async_db)):
     """
     API endpoint to update the status of an error (for Admin UI). Updates in the database.
     e.g., new_status can be 'Investigating', 'Resolved', 'Closed'.
@@ -244,13 +296,13 @@ async def update_error_status(error_id: str, new_status: str, db: Session = Depe
     logger.info(f"Received request to update status for error {error_id} to {new_status}")
 
     # Find the error record in the database
-    error = db.query(ErrorRecord).filter(ErrorRecord.id == error_id).first()
+    error = await db.get(ErrorRecord, error_id)
 
     if error:
         logger.info(f"Updating status for error {error_id} from {error.status} to {new_status}.")
         error.status = new_status
-        db.commit() # Commit the status change
-        db.refresh(error) # Refresh to get the updated state if needed
+        await db.commit() # Commit the status change
+        await db.refresh(error) # Refresh to get the updated state if needed
         # TODO: Log the status change with timestamp and user (if authentication is added)
         error_dict = error.__dict__
         error_dict.pop('_sa_instance_state', None)
@@ -260,7 +312,7 @@ async def update_error_status(error_id: str, new_status: str, db: Session = Depe
     raise HTTPException(status_code=404, detail="Error not found")
 
 @app.post("/errors/{error_id}/retry")
-async def retry_error_processing(error_id: str, db: Session = Depends(get_db)):
+async def retry_error_processing(error_id: str, db: AsyncSession = Depends(get_async_db)):
     """
     API endpoint to trigger re-processing for a specific error (for Admin UI).
     Retrieves data from the database and re-injects it into the pipeline.
@@ -268,7 +320,7 @@ async def retry_error_processing(error_id: str, db: Session = Depends(get_db)):
     logger.info(f"Received request to retry processing for error {error_id}")
 
     # Find the error record in the database
-    error_to_retry = db.query(ErrorRecord).filter(ErrorRecord.id == error_id).first()
+    error_to_retry = await db.get(ErrorRecord, error_id)
 
     if not error_to_retry:
         logger.warning(f"Error with ID {error_id} not found for retry.")
@@ -278,6 +330,11 @@ async def retry_error_processing(error_id: str, db: Session = Depends(get_db)):
     source_module = error_to_retry.source_module
     data_payload = error_to_retry.data_payload # This is the data received by the module that reported the error
     original_raw_data_payload = error_to_retry.original_source_data_payload # Original raw data if available
+    if not original_raw_data_payload and data_payload and data_payload.get("original_raw_data_id"):
+        # Processed payloads (full or reduced to references by error grouping) point to the ingested raw row
+        raw_record = await db.get(RawIngestedData, data_payload["original_raw_data_id"])
+        if raw_record is not None and raw_record.raw_payload:
+            original_raw_data_payload = {**raw_record.raw_payload, "id": raw_record.id} # Shape published to the processing queue
 
     if not data_payload and not original_raw_data_payload:
         logger.error(f"No data payload found for retry for error {error_id}.")
@@ -286,87 +343,44 @@ async def retry_error_processing(error_id: str, db: Session = Depends(get_db)):
     logger.info(f"Attempting to re-inject data for error {error_id} (Source Module: {source_module}).")
 
     # --- Implement the actual re-injection logic ---
-    # This is complex and depends on your pipeline design and where the error occurred.
-    # We need to send the correct data payload to the correct module's API.
-
-    retry_target_url = None
-    data_to_send = None # Data payload to send in the HTTP request
-
-    if source_module == "data-ingestion":
-        # If ingestion failed, retry ingestion. Need original raw data.
-        retry_target_url = INGESTION_MODULE_URL
-        if original_raw_data_payload:
-             # Ingestion expects a list of raw data dicts
-             data_to_send = [original_raw_data_payload]
-        elif data_payload:
-             # If original_raw_data_payload is not stored, try using data_payload
-             # This assumes data_payload for ingestion error is the raw data.
-             data_to_send = [data_payload]
-        else:
-             logger.error(f"No suitable data found to retry ingestion error {error_id}.")
-             raise HTTPException(status_code=400, detail="No raw data available for ingestion retry")
-
-    elif source_module == "data-processing":
-        # If processing failed, retry processing. Need raw data.
-        retry_target_url = PROCESSING_MODULE_URL
-        if original_raw_data_payload:
-             # Processing expects a list of raw data dicts
-             data_to_send = [original_raw_data_payload]
-        elif data_payload and 'trade_id' in data_payload: # Check if data_payload looks like raw data
-             data_to_send = [data_payload]
-        else:
-            logger.error(f"No suitable raw data found to retry processing error {error_id}.")
-            raise HTTPException(status_code=400, detail="No raw data available for processing retry")
-
-
-    elif source_module == "validation":
-        # If validation failed, retry processing. Need raw data.
-        # Retrying from processing is safer as validation depends on processing output.
-        retry_target_url = PROCESSING_MODULE_URL
-        if original_raw_data_payload:
-             # Processing expects a list of raw data dicts
-             data_to_send = [original_raw_data_payload]
-        elif data_payload and 'trade_id' in data_payload: # Check if data_payload looks like raw data
-             data_to_send = [data_payload]
-        elif data_payload and 'unique_transaction_identifier' in data_payload: # data_payload might be processed data
-             # If original raw data is not available, we could try sending processed data to processing,
-             # but this might cause issues if processing is not idempotent or expects raw format.
-             # A safer retry point is usually the start of the pipeline (Ingestion) or Processing.
-             # Let's prioritize original raw data if available.
-             logger.warning(f"Original raw data not available for validation error {error_id}. Attempting retry with processed data payload.")
-             data_to_send = [data_payload] # Send processed data payload
-             # Note: Processing module MUST be able to handle this if original raw is unavailable.
-
-        else:
-            logger.error(f"No suitable data found to retry validation error {error_id}.")
-            raise HTTPException(status_code=400, detail="No data available for validation retry")
-
-    # TODO: Add retry logic for Report Generation and Report Submission errors (P2/P3)
-    # If Report Generation failed, retry generation with processed data.
-    # If Report Submission failed, retry submission with the generated report file info.
-
-
-    if not retry_target_url or not data_to_send:
-         logger.error(f"Could not determine retry target or data for error {error_id}.")
-         raise HTTPException(status_code=500, detail="Could not determine retry strategy for this error")
-
+    # Which module's API gets which payload depends on where the error occurred (shared with bulk retry jobs).
+    retry_target, retry_record, reason = retry_payload(source_module, data_payload, original_raw_data_payload)
+    if retry_target is None:
+        logger.error(f"{reason} (error {error_id}).")
+        raise HTTPException(status_code=400 if source_module in RETRY_SOURCE_MODULES else 500, detail=reason)
+    if retry_record is data_payload and source_module == "validation" and "trade_id" not in data_payload:
+        # A safer retry point is usually the start of the pipeline (Ingestion) or Processing, with the original raw data.
+        logger.warning(f"Original raw data not available for validation error {error_id}. Attempting retry with processed data payload.")
+    retry_target_url = RETRY_TARGET_URLS[retry_target]
+    data_to_send = [retry_record] # Ingestion and processing expect a list of records
 
     logger.info(f"Simulating sending data for retry to {retry_target_url}")
 
     try:
-        async with httpx.AsyncClient() as client:
+        async with shared_http_client(retry_target_url) as client:
             # Using client.post for demonstration. MQ is better for reliability.
-            response = await client.post(retry_target_url, json=data_to_send, timeout=60.0)
+            response = await client.post(retry_target_url, json=data_to_send, params=RETRY_REQUEST_PARAMS.get(retry_target), timeout=60.0)
             response.raise_for_status()
             logger.info(f"Successfully initiated retry for error {error_id}. Target: {retry_target_url}. Response: {response.json()}")
 
+            # A 2xx does not mean the record was re-processed: check the entry's outcome in the body
+            duplicate_positions, failed_positions = rejected_positions(response.json(), len(data_to_send))
+            if duplicate_positions:
+                logger.warning(f"Retry of error {error_id} was skipped by {retry_target_url} as a duplicate delivery.")
+                return {"status": "success", "error_id": error_id, "retry_status": "skipped_duplicate", "target_url": retry_target_url}
+            if failed_positions:
+                logger.warning(f"Retried record of error {error_id} failed processing again.")
+                error_to_retry.status = "Retry Failed"
+                await db.commit()
+                return {"status": "success", "error_id": error_id, "retry_status": "failed", "target_url": retry_target_url}
+
             # TODO: Update error status to 'Retrying' or 'Resolved' if retry is successful (requires async update based on downstream success)
             # For now, just log success. A better approach is to have downstream modules report back success/failure of retried data.
             # Or update status to 'Retrying' immediately and have a separate process monitor retries.
             # Let's update status to 'Retrying' for now.
             error_to_retry.status = "Retrying"
-            db.commit()
-            db.refresh(error_to_retry)
+            await db.commit()
+            await db.refresh(error_to_retry)
 
             return {"status": "success", "error_id": error_id, "retry_status": "initiated", "target_url": retry_target_url}
 
@@ -382,6 +396,73 @@ async def retry_error_processing(error_id: str, db: Session = Depends(get_db)):
         raise HTTPException(status_code=500, detail=f"Unexpected error initiating retry: {e}")
 
 
+# --- 대량 재처리 작업 (Bulk Retry Jobs) ---
+class RetryJobRequest(BaseModel):
+    status: Optional[str] = Field("Open", description="Error status to retry (default Open)")
+    source_module: Optional[str] = Field(None, description="Only errors reported by this module")
+    group_id: Optional[str] = Field(None, description="Only errors of this error group (see /error-groups)")
+    since: Optional[datetime] = Field(None, description="Errors reported at or after this time")
+    until: Optional[datetime] = Field(None, description="Errors reported before this time (default: job creation time)")
+    batch_size: int = Field(RETRY_JOB_BATCH_SIZE, ge=1, le=10000, description="Records per /ingest or /process call")
+    concurrency: int = Field(RETRY_JOB_CONCURRENCY, ge=1, le=64, description="Calls in flight at once")
+
+def retry_job_dict(job: RetryJob) -> Dict[str, Any]:
+    job_dict = {column.name: getattr(job, column.name) for column in RetryJob.__table__.columns}
+    job_dict["progress"] = job_progress(job)
+    return job_dict
+
+@app.post("/retry-jobs", status_code=202)
+async def create_retry_job(request: RetryJobRequest, db: AsyncSession = Depends(get_async_db)):
+    """
+    API endpoint to re-inject every error matching the filters (for Admin UI), e.g. after an upstream outage.
+    Runs in the background in batches of multi-record /ingest or /process calls; poll GET /retry-jobs/{job_id}.
+    """
+    if AsyncSessionLocal is None:
+        raise HTTPException(status_code=503, detail="Async database support is unavailable")
+    created_at = datetime.utcnow()
+    # Errors reported while the job runs (including retried records failing again) are left for the next job
+    until = request.until or created_at
+    filters = {
+        "status": request.status, "source_module": request.source_module, "group_id": request.group_id,
+        "since": request.since.isoformat() if request.since else None, "until": until.isoformat(),
+    }
+    job = RetryJob(id=str(uuid.uuid4()), status="Pending", filters=filters, batch_size=request.batch_size,
+                   concurrency=request.concurrency, created_at=created_at)
+    db.add(job)
+    await db.commit()
+    logger.info(f"Created retry job {job.id} with filters {filters} (batch_size={request.batch_size}, concurrency={request.concurrency}).")
+
+    task = asyncio.create_task(run_retry_job(job.id, RETRY_TARGET_URLS, AsyncSessionLocal))
+    _retry_job_tasks.add(task)
+    task.add_done_callback(_retry_job_tasks.discard)
+    return {"status": "accepted", "job_id": job.id, "filters": filters}
+
+@app.get("/retry-jobs/{job_id}")
+async def get_retry_job(job_id: str, db: AsyncSession = Depends(get_async_db)):
+    """
+    API endpoint to get the status of a bulk retry job: counters, percent done, throughput and ETA.
+    """
+    job = await db.get(RetryJob, job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Retry job not found")
+    return {"status": "success", "job": retry_job_dict(job)}
+
+@app.post("/retry-jobs/{job_id}/cancel")
+async def cancel_retry_job(job_id: str, db: AsyncSession = Depends(get_async_db)):
+    """
+    API endpoint to stop a bulk retry job after the page it is working on.
+    """
+    job = await db.get(RetryJob, job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Retry job not found")
+    if job.status not in ("Pending", "Running"):
+        raise HTTPException(status_code=409, detail=f"Retry job is already {job.status}")
+    job.status = "Cancelling"
+    await db.commit()
+    logger.info(f"Cancellation requested for retry job {job_id}.")
+    return {"status": "success", "job_id": job_id, "job_status": job.status}
+
+
 @app.get("/health")
 async def health_check(db: Session = Depends(get_db)):
     """
@@ -397,7 +478,7 @@ async def health_check(db: Session = Depends(get_db)):
         logger.error(f"Database health check failed: {e}", exc_info=True)
         send_alert("Critical", f"Database connectivity issue in Error Monitoring: {e}", {"module": "error-monitoring", "check": "db_connectivity"})
 
-    return {"status": "ok", "database_status": db_status}
+    return {"status": "ok", "database_status": db_status, "http_pools": get_http_pool_metrics()}
 
 # To run this module locally:
 # 1. Ensure your database is running.
@@ -0,0 +1,51 @@
+# src/migrations/env.py
+
+from logging.config import fileConfig
+
+from alembic import context
+from sqlalchemy import engine_from_config, make_url, pool
+
+from common.utils import Base, DATABASE_URL, include_object_for
+
+# --- Alembic 환경 설정 ---
+# The target database is DATABASE_URL (same as the services) unless sqlalchemy.url
+# is set on the Alembic config, e.g. by tests running migrations on a scratch database.
+config = context.config
+if config.config_file_name is not None:
+    fileConfig(config.config_file_name, disable_existing_loggers=False)
+if not config.get_main_option("sqlalchemy.url"):
+    config.set_main_option("sqlalchemy.url", DATABASE_URL.replace("%", "%%"))
+
+# Models in common/utils.py; used by `alembic revision --autogenerate`
+target_metadata = Base.metadata
+
+
+def run_migrations_offline() -> None:
+    """Emits the migration SQL without a DB connection (alembic upgrade head --sql)."""
+    context.configure(
+        url=config.get_main_option("sqlalchemy.url"),
+        target_metadata=target_metadata,
+        literal_binds=True,
+        dialect_opts={"paramstyle": "named"},
+        include_object=include_object_for(make_url(config.get_main_option("sqlalchemy.url")).get_backend_name()),
+        render_as_batch=True,
+    )
+    with context.begin_transaction():
+        context.run_migrations()
+
+
+def run_migrations_online() -> None:
+    connectable = engine_from_config(config.get_section(config.config_ini_section, {}), prefix="sqlalchemy.", poolclass=pool.NullPool)
+    with connectable.connect() as connection:
+        # render_as_batch: SQLite cannot ALTER most constraints in place
+        # include_object: PostgreSQL-only indexes (pg_trgm) are not compared against other databases
+        context.configure(connection=connection, target_metadata=target_metadata, render_as_batch=True,
+                          include_object=include_object_for(connection.dialect.name))
+        with context.begin_transaction():
+            context.run_migrations()
+
+
+if context.is_offline_mode():
+    run_migrations_offline()
+else:
+    run_migrations_online()
@@ -0,0 +1,144 @@
+"""Baseline schema (tables previously created by create_database_tables)
+
+Revision ID: 0001_baseline_schema
+Revises:
+Create Date: 2026-10-17 00:00:00.000000
+
+Existing databases created with create_database_tables() should be stamped
+instead of upgraded: `alembic stamp 0001_baseline_schema`.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0001_baseline_schema"
+down_revision: Union[str, Sequence[str], None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "raw_ingested_data",
+        sa.Column("id", sa.String(), primary_key=True),
+        sa.Column("trade_id", sa.String()),
+        sa.Column("action", sa.String()),
+        sa.Column("instrument_type", sa.String()),
+        sa.Column("asset_class", sa.String()),
+        sa.Column("effective_date", sa.String()),
+        sa.Column("termination_date", sa.String()),
+        sa.Column("notional_amount", sa.Float()),
+        sa.Column("notional_currency", sa.String()),
+        sa.Column("party_a_lei", sa.String()),
+        sa.Column("party_b_lei", sa.String()),
+        sa.Column("price", sa.Float(), nullable=True),
+        sa.Column("price_currency", sa.String(), nullable=True),
+        sa.Column("raw_payload", sa.JSON()),
+        sa.Column("ingestion_timestamp", sa.DateTime()),
+        sa.Column("status", sa.String()),
+    )
+    op.create_index("ix_raw_ingested_data_id", "raw_ingested_data", ["id"])
+    op.create_index("ix_raw_ingested_data_trade_id", "raw_ingested_data", ["trade_id"])
+
+    op.create_table(
+        "processed_swap_data",
+        sa.Column("id", sa.String(), primary_key=True),
+        sa.Column("unique_transaction_identifier", sa.String()),
+        sa.Column("reporting_counterparty_lei", sa.String()),
+        sa.Column("other_counterparty_lei", sa.String()),
+        sa.Column("action_type", sa.String()),
+        sa.Column("event_type", sa.String(), nullable=True),
+        sa.Column("asset_class", sa.String()),
+        sa.Column("effective_date", sa.String()),
+        sa.Column("termination_date", sa.String()),
+        sa.Column("notional_amount", sa.Float(), nullable=True),
+        sa.Column("notional_currency", sa.String(), nullable=True),
+        sa.Column("price", sa.Float(), nullable=True),
+        sa.Column("price_currency", sa.String(), nullable=True),
+        sa.Column("processing_status", sa.String()),
+        sa.Column("processing_errors", sa.JSON()),
+        sa.Column("original_raw_data_id", sa.String()),
+        sa.Column("processing_timestamp", sa.DateTime()),
+        sa.Column("validation_status", sa.String()),
+    )
+    op.create_index("ix_processed_swap_data_id", "processed_swap_data", ["id"])
+    op.create_index("ix_processed_swap_data_unique_transaction_identifier", "processed_swap_data", ["unique_transaction_identifier"], unique=True)
+
+    op.create_table(
+        "validation_results",
+        sa.Column("id", sa.String(), primary_key=True),
+        sa.Column("unique_transaction_identifier", sa.String()),
+        sa.Column("is_valid", sa.Boolean()),
+        sa.Column("errors", sa.JSON()),
+        sa.Column("validation_timestamp", sa.DateTime()),
+        sa.Column("processed_data_id", sa.String(), nullable=True),
+    )
+    op.create_index("ix_validation_results_id", "validation_results", ["id"])
+    op.create_index("ix_validation_results_unique_transaction_identifier", "validation_results", ["unique_transaction_identifier"])
+
+    op.create_table(
+        "error_records",
+        sa.Column("id", sa.String(), primary_key=True),
+        sa.Column("trade_id", sa.String(), nullable=True),
+        sa.Column("source_module", sa.String()),
+        sa.Column("error_messages", sa.JSON()),
+        sa.Column("data_payload", sa.JSON()),
+        sa.Column("original_source_data_payload", sa.JSON(), nullable=True),
+        sa.Column("timestamp", sa.DateTime()),
+        sa.Column("status", sa.String()),
+        sa.Column("assigned_to", sa.String(), nullable=True),
+        sa.Column("severity", sa.String()),
+    )
+    op.create_index("ix_error_records_id", "error_records", ["id"])
+    op.create_index("ix_error_records_trade_id", "error_records", ["trade_id"])
+
+    op.create_table(
+        "generated_reports",
+        sa.Column("id", sa.String(), primary_key=True),
+        sa.Column("report_filename", sa.String()),
+        sa.Column("report_storage_path", sa.String()),
+        sa.Column("entry_count", sa.Integer()),
+        sa.Column("generation_timestamp", sa.DateTime()),
+        sa.Column("status", sa.String()),
+        sa.Column("submission_id", sa.String(), nullable=True),
+    )
+    op.create_index("ix_generated_reports_id", "generated_reports", ["id"])
+    op.create_index("ix_generated_reports_report_filename", "generated_reports", ["report_filename"], unique=True)
+
+    op.create_table(
+        "submission_history",
+        sa.Column("id", sa.String(), primary_key=True),
+        sa.Column("submission_id", sa.String()),
+        sa.Column("report_id", sa.String()),
+        sa.Column("submission_timestamp", sa.DateTime()),
+        sa.Column("status", sa.String()),
+        sa.Column("sdr_response_payload", sa.JSON(), nullable=True),
+        sa.Column("error_details", sa.Text(), nullable=True),
+    )
+    op.create_index("ix_submission_history_id", "submission_history", ["id"])
+    op.create_index("ix_submission_history_submission_id", "submission_history", ["submission_id"], unique=True)
+
+    op.create_table(
+        "stage_queue_messages",
+        sa.Column("id", sa.String(), primary_key=True),
+        sa.Column("queue_name", sa.String(), nullable=False),
+        sa.Column("payload", sa.JSON()),
+        sa.Column("status", sa.String()),
+        sa.Column("attempts", sa.Integer()),
+        sa.Column("lease_id", sa.String(), nullable=True),
+        sa.Column("enqueued_at", sa.DateTime()),
+        sa.Column("visible_at", sa.DateTime()),
+        sa.Column("last_error", sa.Text(), nullable=True),
+    )
+    op.create_index("ix_stage_queue_messages_claim", "stage_queue_messages", ["queue_name", "status", "visible_at"])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for table_name in ("stage_queue_messages", "submission_history", "generated_reports", "error_records",
+                       "validation_results", "processed_swap_data", "raw_ingested_data"):
+        op.drop_table(table_name)
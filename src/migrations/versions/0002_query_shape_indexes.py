@@ -0,0 +1,84 @@
+"""Composite, partial and trigram indexes for the admin list / pipeline query shapes
+
+Revision ID: 0002_query_shape_indexes
+Revises: 0001_baseline_schema
+Create Date: 2026-10-17 00:00:01.000000
+
+B-tree indexes follow the endpoint filters and their keyset order (timestamp, id).
+On PostgreSQL every index is built CONCURRENTLY (outside the migration transaction)
+so large tables stay writable, and pg_trgm GIN indexes back the ilike('%x%') searches.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0002_query_shape_indexes"
+down_revision: Union[str, Sequence[str], None] = "0001_baseline_schema"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# (index name, table, columns, partial WHERE clause or None) - mirrors __table_args__ in common/utils.py
+BTREE_INDEXES = [
+    ("ix_processed_swap_data_status_asset_effective", "processed_swap_data", ["validation_status", "asset_class", "effective_date"], None),
+    ("ix_processed_swap_data_processing_ts_id", "processed_swap_data", ["processing_timestamp", "id"], None),
+    ("ix_processed_swap_data_pending_ts", "processed_swap_data", ["processing_timestamp", "id"], "validation_status = 'Pending'"),
+    ("ix_validation_results_valid_ts", "validation_results", ["is_valid", "validation_timestamp"], None),
+    ("ix_validation_results_ts", "validation_results", ["validation_timestamp"], None),
+    ("ix_error_records_status_module_ts", "error_records", ["status", "source_module", "timestamp", "id"], None),
+    ("ix_error_records_module_ts", "error_records", ["source_module", "timestamp", "id"], None),
+    ("ix_error_records_ts_id", "error_records", ["timestamp", "id"], None),
+    ("ix_error_records_open_ts", "error_records", ["timestamp", "id"], "status = 'Open'"),
+    ("ix_generated_reports_status_ts", "generated_reports", ["status", "generation_timestamp", "id"], None),
+    ("ix_generated_reports_ts_id", "generated_reports", ["generation_timestamp", "id"], None),
+    ("ix_submission_history_status_report_ts", "submission_history", ["status", "report_id", "submission_timestamp", "id"], None),
+    ("ix_submission_history_report_ts", "submission_history", ["report_id", "submission_timestamp", "id"], None),
+    ("ix_submission_history_ts_id", "submission_history", ["submission_timestamp", "id"], None),
+]
+
+# (index name, table, column) - substring (ilike '%x%') searches, PostgreSQL only (asset_class dropped again in 0010)
+TRIGRAM_INDEXES = [
+    ("ix_processed_swap_data_uti_trgm", "processed_swap_data", "unique_transaction_identifier"),
+    ("ix_processed_swap_data_asset_class_trgm", "processed_swap_data", "asset_class"),
+    ("ix_validation_results_uti_trgm", "validation_results", "unique_transaction_identifier"),
+    ("ix_error_records_trade_id_trgm", "error_records", "trade_id"),
+    ("ix_generated_reports_filename_trgm", "generated_reports", "report_filename"),
+    ("ix_submission_history_submission_id_trgm", "submission_history", "submission_id"),
+]
+
+
+def _is_postgresql() -> bool:
+    return op.get_bind().dialect.name == "postgresql"
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    if not _is_postgresql():
+        for name, table, columns, where in BTREE_INDEXES:
+            op.create_index(name, table, columns, sqlite_where=sa.text(where) if where else None)
+        return
+
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    with op.get_context().autocommit_block():
+        for name, table, columns, where in BTREE_INDEXES:
+            op.create_index(name, table, columns, postgresql_where=sa.text(where) if where else None,
+                            postgresql_concurrently=True, if_not_exists=True)
+        for name, table, column in TRIGRAM_INDEXES:
+            op.create_index(name, table, [column], postgresql_using="gin", postgresql_ops={column: "gin_trgm_ops"},
+                            postgresql_concurrently=True, if_not_exists=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if not _is_postgresql():
+        for name, table, _, _ in reversed(BTREE_INDEXES):
+            op.drop_index(name, table_name=table)
+        return
+
+    with op.get_context().autocommit_block():
+        for name, table, _ in reversed(TRIGRAM_INDEXES):
+            op.drop_index(name, table_name=table, postgresql_concurrently=True, if_exists=True)
+        for name, table, _, _ in reversed(BTREE_INDEXES):
+            op.drop_index(name, table_name=table, postgresql_concurrently=True, if_exists=True)
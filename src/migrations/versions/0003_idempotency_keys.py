@@ -0,0 +1,40 @@
+"""Idempotency index for duplicate trade deliveries
+
+Revision ID: 0003_idempotency_keys
+Revises: 0002_query_shape_indexes
+Create Date: 2026-10-17 00:00:02.000000
+
+One row per processed delivery, keyed by (scope, content hash). The unique index
+is the durable half of common/idempotency.py; an in-memory LRU sits in front of it.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0003_idempotency_keys"
+down_revision: Union[str, Sequence[str], None] = "0002_query_shape_indexes"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "idempotency_keys",
+        sa.Column("id", sa.String(), primary_key=True),
+        sa.Column("scope", sa.String(), nullable=False),
+        sa.Column("idempotency_key", sa.String(), nullable=False),
+        sa.Column("unique_transaction_identifier", sa.String(), nullable=True),
+        sa.Column("record_id", sa.String(), nullable=True),
+        sa.Column("created_at", sa.DateTime()),
+    )
+    op.create_index("ux_idempotency_keys_scope_key", "idempotency_keys", ["scope", "idempotency_key"], unique=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ux_idempotency_keys_scope_key", table_name="idempotency_keys")
+    op.drop_table("idempotency_keys")
@@ -0,0 +1,50 @@
+"""Error groups for fingerprinted error ingestion
+
+Revision ID: 0004_error_groups
+Revises: 0003_idempotency_keys
+Create Date: 2026-10-17 00:00:03.000000
+
+error_groups holds one row per (source module, message template) with counts and
+sample error ids; error_records.group_id links each error to its group.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0004_error_groups"
+down_revision: Union[str, Sequence[str], None] = "0003_idempotency_keys"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "error_groups",
+        sa.Column("id", sa.String(), primary_key=True),
+        sa.Column("source_module", sa.String(), nullable=False),
+        sa.Column("message_template", sa.Text(), nullable=False),
+        sa.Column("error_count", sa.Integer(), nullable=False),
+        sa.Column("first_seen", sa.DateTime(), nullable=False),
+        sa.Column("last_seen", sa.DateTime(), nullable=False),
+        sa.Column("sample_error_ids", sa.JSON()),
+        sa.Column("sample_messages", sa.JSON()),
+        sa.Column("status", sa.String()),
+    )
+    op.create_index("ix_error_groups_last_seen", "error_groups", ["last_seen", "id"])
+    op.create_index("ix_error_groups_status_module_last_seen", "error_groups", ["status", "source_module", "last_seen", "id"])
+    op.add_column("error_records", sa.Column("group_id", sa.String(), nullable=True))
+    op.create_index("ix_error_records_group_ts", "error_records", ["group_id", "timestamp", "id"])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_error_records_group_ts", table_name="error_records")
+    with op.batch_alter_table("error_records") as batch_op:
+        batch_op.drop_column("group_id")
+    op.drop_index("ix_error_groups_status_module_last_seen", table_name="error_groups")
+    op.drop_index("ix_error_groups_last_seen", table_name="error_groups")
+    op.drop_table("error_groups")
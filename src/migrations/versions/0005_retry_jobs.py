@@ -0,0 +1,47 @@
+"""Retry jobs for bulk error re-injection
+
+Revision ID: 0005_retry_jobs
+Revises: 0004_error_groups
+Create Date: 2026-10-17 00:00:04.000000
+
+retry_jobs holds one row per bulk retry job with its filters and progress counters.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0005_retry_jobs"
+down_revision: Union[str, Sequence[str], None] = "0004_error_groups"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "retry_jobs",
+        sa.Column("id", sa.String(), primary_key=True),
+        sa.Column("status", sa.String()),
+        sa.Column("filters", sa.JSON()),
+        sa.Column("batch_size", sa.Integer(), nullable=False),
+        sa.Column("concurrency", sa.Integer(), nullable=False),
+        sa.Column("total", sa.Integer()),
+        sa.Column("processed", sa.Integer()),
+        sa.Column("succeeded", sa.Integer()),
+        sa.Column("failed", sa.Integer()),
+        sa.Column("skipped", sa.Integer()),
+        sa.Column("batches", sa.Integer()),
+        sa.Column("created_at", sa.DateTime()),
+        sa.Column("started_at", sa.DateTime()),
+        sa.Column("updated_at", sa.DateTime()),
+        sa.Column("finished_at", sa.DateTime()),
+        sa.Column("last_error", sa.Text()),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table("retry_jobs")
@@ -0,0 +1,31 @@
+"""SDR multipart upload id on submission history
+
+Revision ID: 0006_submission_sdr_upload_id
+Revises: 0005_retry_jobs
+Create Date: 2026-10-17 00:00:05.000000
+
+submission_history.sdr_upload_id records the SDR's resumable upload of an attempt so the
+next attempt for the same report can resume it.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0006_submission_sdr_upload_id"
+down_revision: Union[str, Sequence[str], None] = "0005_retry_jobs"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column("submission_history", sa.Column("sdr_upload_id", sa.String(), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table("submission_history") as batch_op:
+        batch_op.drop_column("sdr_upload_id")
@@ -0,0 +1,31 @@
+"""SDR destination on submission history
+
+Revision ID: 0007_submission_destination
+Revises: 0006_submission_sdr_upload_id
+Create Date: 2026-10-17 00:00:06.000000
+
+Reports are submitted to several SDR destinations; submission_history.destination names
+the destination of each row (one row per destination per attempt).
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0007_submission_destination"
+down_revision: Union[str, Sequence[str], None] = "0006_submission_sdr_upload_id"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column("submission_history", sa.Column("destination", sa.String(), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table("submission_history") as batch_op:
+        batch_op.drop_column("destination")
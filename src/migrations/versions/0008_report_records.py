@@ -0,0 +1,46 @@
+"""Report <-> record mapping and report status of processed records
+
+Revision ID: 0008_report_records
+Revises: 0007_submission_destination
+Create Date: 2026-10-17 00:00:07.000000
+
+report_records maps each generated report to the processed_swap_data rows it contains.
+processed_swap_data.report_status / generated_report_id are set with one set-based
+UPDATE per chunk when a report is generated.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0008_report_records"
+down_revision: Union[str, Sequence[str], None] = "0007_submission_destination"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column("processed_swap_data", sa.Column("report_status", sa.String(), nullable=True))
+    op.add_column("processed_swap_data", sa.Column("generated_report_id", sa.String(), nullable=True))
+    op.create_table(
+        "report_records",
+        sa.Column("report_id", sa.String(), primary_key=True),
+        sa.Column("processed_record_id", sa.String(), primary_key=True),
+        sa.Column("unique_transaction_identifier", sa.String(), nullable=False),
+        sa.Column("included_at", sa.DateTime(), nullable=True),
+    )
+    op.create_index("ix_report_records_record", "report_records", ["processed_record_id"])
+    op.create_index("ix_report_records_uti", "report_records", ["unique_transaction_identifier"])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_report_records_uti", table_name="report_records")
+    op.drop_index("ix_report_records_record", table_name="report_records")
+    op.drop_table("report_records")
+    with op.batch_alter_table("processed_swap_data") as batch_op:
+        batch_op.drop_column("generated_report_id")
+        batch_op.drop_column("report_status")
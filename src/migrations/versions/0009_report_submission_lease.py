@@ -0,0 +1,32 @@
+"""Submission lease on generated reports
+
+Revision ID: 0009_report_submission_lease
+Revises: 0008_report_records
+Create Date: 2026-10-17 00:00:08.000000
+
+generated_reports.submission_lease_expires_at is renewed while a submission attempt is
+running. A report left in SubmissionInProgress after its lease expired (the submitting
+process died) is submitted again instead of being skipped.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0009_report_submission_lease"
+down_revision: Union[str, Sequence[str], None] = "0008_report_records"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column("generated_reports", sa.Column("submission_lease_expires_at", sa.DateTime(), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table("generated_reports") as batch_op:
+        batch_op.drop_column("submission_lease_expires_at")
@@ -0,0 +1,43 @@
+"""Drop the asset_class trigram index
+
+Revision ID: 0010_drop_asset_class_trigram
+Revises: 0009_report_submission_lease
+Create Date: 2026-10-17 00:00:09.000000
+
+/processed-data filters asset_class by equality, which the (validation_status,
+asset_class, effective_date) B-tree index serves. The pg_trgm GIN index created for
+the former ilike('%x%') filter is never used and only slows down writes.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0010_drop_asset_class_trigram"
+down_revision: Union[str, Sequence[str], None] = "0009_report_submission_lease"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _is_postgresql() -> bool:
+    return op.get_bind().dialect.name == "postgresql"
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    if not _is_postgresql():
+        return
+    with op.get_context().autocommit_block():
+        op.drop_index("ix_processed_swap_data_asset_class_trgm", table_name="processed_swap_data",
+                      postgresql_concurrently=True, if_exists=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if not _is_postgresql():
+        return
+    with op.get_context().autocommit_block():
+        op.create_index("ix_processed_swap_data_asset_class_trgm", "processed_swap_data", ["asset_class"],
+                        postgresql_using="gin", postgresql_ops={"asset_class": "gin_trgm_ops"},
+                        postgresql_concurrently=True, if_not_exists=True)
@@ -674,72 +674,68 @@ from typing import List, Dict, Any, Optional
 import uvicorn
 import httpx
 import os # To read environment variables
-from datetime import datetime
+import asyncio
+from datetime import datetime, date, timedelta
 import uuid # To generate unique IDs
-import io # To simulate writing to an in-memory file before "upload"
 
 # --- SQLAlchemy Imports ---
 from sqlalchemy.orm import Session
-from sqlalchemy import select, desc
+from sqlalchemy import select, desc, and_
 
 # src.common에서 로거, DB 설정 및 모델 가져오기
-from common.utils import logger, get_db, GeneratedReport, ProcessedSwapDataDB, create_database_tables # Import DB models
+from common.utils import logger, get_db, GeneratedReport, ProcessedSwapDataDB, ReportRecord, create_database_tables # Import DB models
 from common.utils import send_alert # Import utility
+from common.utils import get_async_db, AsyncSessionLocal, AsyncSession, SessionLocal # Async session for the write path
+from common.report_writer import ReportWriter, iter_row_chunks, rows_from_dicts, report_object_suffix, check_report_options, REPORT_COLUMNS, REPORT_FORMATS # Streaming report files
+from common.pagination import paginate_keyset, count_rows, InvalidCursorError # Keyset pagination for the Admin UI lists
+from common.http_client import shared_http_client, get_http_pool_metrics # Pooled, lifespan-managed HTTP clients
+from common.stage_queue import get_stage_queue, stage_lifespan, StageWorker, QueueFullError, REPORT_GENERATION_QUEUE, REPORT_SUBMISSION_QUEUE # Durable stage hand-off
+from common.object_store import get_object_store # Report object store shared with report-submission
+from common.bulk_db import link_record_ids_to_report, link_utis_to_report # Set-based report <-> record linking
 
 # --- Ensure database tables are created on startup (for local dev) ---
 # In production, handle migrations separately
 # create_database_tables() # Already called in ingestion/error_monitoring, ensure it's run once
 
 # TODO: Replace hardcoded URLs with Environment Variables injected by Kubernetes
-REPORT_SUBMISSION_MODULE_URL = os.environ.get("REPORT_SUBMISSION_MODULE_URL", "http://localhost:8004/submit-report") # Default to Local testing URL (P2 module)
 ERROR_MONITOR_MODULE_URL = os.environ.get("ERROR_MONITOR_MODULE_URL", "http://localhost:8005/report_error") # Default to Local testing URL
 
-# --- Cloud Storage Configuration (Placeholders) ---
-# In a real system, use environment variables for bucket name, region, etc.
-# Credentials should be managed via Kubernetes Secrets or cloud-specific mechanisms (IAM roles, service principals)
+# --- Report Object Store (common/object_store.py) ---
+# OBJECT_STORE_BACKEND / OBJECT_STORE_ROOT select the store; it must be the one report-submission reads.
+# Credentials for a cloud backend should be managed via Kubernetes Secrets or cloud-specific mechanisms (IAM roles, service principals)
 CLOUD_STORAGE_BUCKET_NAME = os.environ.get("CLOUD_STORAGE_BUCKET_NAME", "my-swap-reports-bucket")
-# TODO: Add configuration for region, endpoint, credentials
+
+# --- Report file configuration (common/report_writer.py) ---
+REPORT_BATCH_FORMAT = os.environ.get("REPORT_BATCH_FORMAT", "text") # Format of the per-batch reports built from queue messages
+REPORT_DAILY_FORMAT = os.environ.get("REPORT_DAILY_FORMAT", "cftc_csv") # Default format of /generate-daily-report
+REPORT_DAILY_COMPRESSION = os.environ.get("REPORT_DAILY_COMPRESSION", "gzip") or None # gzip, zstd or empty for none
+REPORT_ARCHIVE_FORMAT = os.environ.get("REPORT_ARCHIVE_FORMAT", "parquet") or None # Compact archive copy of daily reports; empty disables
+
+# --- Stage queues: consume valid rows from 'report-generation', publish report ids to 'report-submission' ---
+report_submission_queue = get_stage_queue(REPORT_SUBMISSION_QUEUE)
+
+
+async def handle_report_generation_batch(payloads: List[Dict[str, Any]], db: AsyncSession) -> None:
+    """Stage worker handler for the 'report-generation' queue: one report file per received batch."""
+    await generate_report(payloads, db)
+
+
+report_generation_worker = StageWorker(get_stage_queue(REPORT_GENERATION_QUEUE), handle_report_generation_batch, session_factory=AsyncSessionLocal)
 
 # --- FastAPI 앱 인스턴스 생성 ---
-app = FastAPI()
+app = FastAPI(lifespan=stage_lifespan(report_generation_worker)) # Runs the report generation queue consumer; closes pooled HTTP clients on shutdown
 
-# --- Simulate Cloud Object Storage SDK Interaction ---
-# In a real system, replace this with actual SDK calls (e.g., boto3 for S3, azure-storage-blob)
-class SimulatedCloudStorage:
-    def __init__(self, bucket_name):
-        self.bucket_name = bucket_name
-        self._storage = {} # In-memory dict to simulate storage
-
-    async def upload_file(self, file_content: bytes, object_name: str):
-        """Simulates uploading file content to the object storage."""
-        logger.info(f"Simulating upload to bucket '{self.bucket_name}', object '{object_name}'")
-        # In a real SDK, this would be a network call to the cloud provider API
-        self._storage[object_name] = file_content # Store content in memory
-        logger.info(f"Simulated upload complete for '{object_name}'. Size: {len(file_content)} bytes.")
-        # Simulate returning some identifier or confirmation
-        return {"object_name": object_name, "bucket": self.bucket_name, "size": len(file_content)}
-
-    async def download_file(self, object_name: str) -> Optional[bytes]:
-         """Simulates downloading file content from the object storage."""
-         logger.info(f"Simulating download from bucket '{self.bucket_name}', object '{object_name}'")
-         # In a real SDK, this would be a network call
-         content = self._storage.get(object_name)
-         if content is not None:
-              logger.info(f"Simulated download complete for '{object_name}'. Size: {len(content)} bytes.")
-         else:
-              logger.warning(f"Simulated object '{object_name}' not found.")
-         return content
-
-# Instantiate the simulated storage
-simulated_storage = SimulatedCloudStorage(CLOUD_STORAGE_BUCKET_NAME)
+# Reports are written to staging files of the store and committed into it (renamed, never copied through memory)
+report_store = get_object_store(CLOUD_STORAGE_BUCKET_NAME)
 
 
 @app.post("/generate-report")
-async def generate_report(data: List[Dict[str, Any]], db: Session = Depends(get_db)): # Receives Valid ProcessedSwapData as Dict from Validation
+async def generate_report(data: List[Dict[str, Any]], db: AsyncSession = Depends(get_async_db)): # Receives Valid ProcessedSwapData as Dict from Validation
     """
     API endpoint to generate regulatory report files from valid swap data.
-    Generates report content, uploads to cloud storage (simulated),
-    stores report info in the database, and forwards to submission.
+    Writes the report file into the object store,
+    stores report info in the database and enqueues it for submission (same transaction).
+    Also called by the 'report-generation' stage worker.
     """
     logger.info(f"Received {len(data)} valid data entries for report generation.")
 
@@ -747,63 +743,60 @@ async def generate_report(data: List[Dict[str, Any]], db: Session = Depends(get_
         logger.info("No valid data received for report generation.")
         return {"status": "success", "generated_count": 0, "submission_forward_status": "skipped (no data)"}
 
-    # --- Generate Report Content in Memory ---
+    # --- Generate Report File ---
     report_timestamp = datetime.now().strftime("%Y%m%d%H%M%S")
     # Use a unique object name for the cloud storage file
-    report_object_name = f"reports/swap_report_batch_{report_timestamp}_{uuid.uuid4().hex}.txt" # Example object key/name (can include date/time/batch ID)
+    report_object_name = f"reports/swap_report_batch_{report_timestamp}_{uuid.uuid4().hex}{report_object_suffix(REPORT_BATCH_FORMAT, None)}" # Example object key/name (can include date/time/batch ID)
 
-    report_content_stream = io.StringIO() # Use StringIO to build text report in memory
+    staging_path = report_store.staging_path(report_object_suffix(REPORT_BATCH_FORMAT, None)) # Committed into the store below
 
     generated_report_info_list: List[GeneratedReport] = []
     report_generation_errors: List[Dict[str, Any]] = []
     successfully_formatted_utis: List[str] = [] # Track UTIs that were successfully formatted
 
     try:
-        report_content_stream.write(f"## Swap Report Batch - Generated at {datetime.now().isoformat()}\n")
-        report_content_stream.write(f"## Number of Entries: {len(data)}\n")
-        report_content_stream.write("----------------------------------------------------\n")
-
-        for entry_dict in data: # Data is received as list of dicts
+        # Rows are formatted in one chunk; a chunk that fails is retried row by row by the writer
+        rows = rows_from_dicts(data)
+        with ReportWriter(staging_path, REPORT_BATCH_FORMAT, metadata={"entry_count": len(data)}) as writer:
+            failures = writer.write_chunk(rows)
+        report_result = writer.result
+
+        entries_by_row = {id(row): entry_dict for entry_dict, row in zip(data, rows)}
+        failed_rows = set()
+        for row, error in failures:
+            failed_rows.add(id(row))
+            entry_dict = entries_by_row[id(row)]
             uti = entry_dict.get("unique_transaction_identifier", "N/A")
-            try:
-                # Simulate formatting a single entry based on the dict data
-                # This is where you'd map dict fields to the specific report format (XML, CSV)
-                report_line = f"UTI: {uti}, Action: {entry_dict.get('action_type')}, Asset Class: {entry_dict.get('asset_class')}, Notional: {entry_dict.get('notional_amount')} {entry_dict.get('notional_currency')}, Effective Date: {entry_dict.get('effective_date')}, Reporting LEI: {entry_dict.get('reporting_counterparty_lei')}\n"
-                report_content_stream.write(report_line)
-                logger.debug(f"Formatted entry for report: {uti}")
-                successfully_formatted_utis.append(uti)
-
-            except Exception as e:
-                logger.error(f"Error formatting report entry for UTI {uti}: {e}", exc_info=True)
-                report_generation_errors.append({
-                    "source_module": "report-generation",
-                    "data": entry_dict, # Include the data that failed formatting
-                    "errors": [f"Error formatting report entry: {e}"]
-                })
-                send_alert("Error", f"Error formatting report entry for UTI {uti}: {e}", {"module": "report-generation", "uti": uti, "error": str(e)})
-                # Continue processing other entries
-
-        report_content_stream.write("----------------------------------------------------\n")
-        report_content = report_content_stream.getvalue().encode('utf-8') # Get content as bytes
-
-        logger.info(f"Finished generating report content in memory. Size: {len(report_content)} bytes.")
+            logger.error(f"Error formatting report entry for UTI {uti}: {error}")
+            report_generation_errors.append({
+                "source_module": "report-generation",
+                "data": entry_dict, # Include the data that failed formatting
+                "errors": [error]
+            })
+            send_alert("Error", f"Error formatting report entry for UTI {uti}: {error}", {"module": "report-generation", "uti": uti, "error": error})
+        successfully_formatted_utis = [
+            entry_dict.get("unique_transaction_identifier", "N/A") for entry_dict, row in zip(data, rows) if id(row) not in failed_rows
+        ]
+
+        logger.info(f"Finished writing report file. Size: {report_result.size_bytes} bytes.")
 
     except Exception as e:
-        logger.error(f"Critical error generating report content in memory: {e}", exc_info=True)
+        logger.error(f"Critical error generating report content: {e}", exc_info=True)
         send_alert("Critical", f"Critical error generating report content: {e}", {"module": "report-generation", "error": str(e)})
         raise HTTPException(status_code=500, detail=f"Failed to generate report content: {e}")
 
 
-    # --- Simulate Uploading Report File to Cloud Storage ---
-    # In a real system, replace this with actual SDK upload call
+    # --- Commit the Report File to the Object Store ---
     upload_success = False
     try:
-        upload_result = await simulated_storage.upload_file(report_content, report_object_name)
+        upload_result = await report_store.put_file(staging_path, report_object_name, move=True)
         upload_success = True
-        logger.info(f"Simulated upload successful for object: {report_object_name}")
+        logger.info(f"Stored report object: {report_object_name}{' (deduplicated)' if upload_result.deduplicated else ''}")
 
     except Exception as e:
-        logger.error(f"Critical error uploading report file to cloud storage (simulated): {e}", exc_info=True)
+        if os.path.exists(staging_path):
+            os.remove(staging_path)
+        logger.error(f"Critical error uploading report file to the object store: {e}", exc_info=True)
         send_alert("Critical", f"Critical error uploading report file: {e}", {"module": "report-generation", "object_name": report_object_name, "error": str(e)})
         # If upload fails critically, we cannot proceed.
         raise HTTPException(status_code=500, detail=f"Failed to upload report file: {e}")
@@ -815,7 +808,7 @@ async def generate_report(data: List[Dict[str, Any]], db: Session = Depends(get_
         # Create the main GeneratedReport DB record for the batch file
         db_generated_report = GeneratedReport(
             report_filename=report_object_name, # Store object name as filename
-            report_storage_path=f"s3://{CLOUD_STORAGE_BUCKET_NAME}/{report_object_name}", # Store a conceptual path/identifier
+            report_storage_path=report_store.uri(report_object_name), # Read back by report-submission through the same store
             entry_count=len(successfully_formatted_utis), # Count entries successfully formatted
             generation_timestamp=datetime.utcnow(),
             status="Generated"
@@ -825,28 +818,32 @@ async def generate_report(data: List[Dict[str, Any]], db: Session = Depends(get_
     try:
         if db_generated_report:
             db.add(db_generated_report) # Add the new report record
+            await db.flush() # Assigns the report id used below
+
+            # Link the successfully formatted records to the report (report_records) and mark them
+            # IncludedInReport: INSERT ... SELECT and UPDATE ... WHERE uti IN (...) per chunk, no rows loaded
+            report_id = db_generated_report.id
+            linked_count = await db.run_sync(lambda session: link_utis_to_report(session, report_id, successfully_formatted_utis))
 
-            # Update the status of ProcessedSwapDataDB records that were successfully formatted
-            if successfully_formatted_utis:
-                processed_records_to_update = db.query(ProcessedSwapDataDB).filter(
-                    ProcessedSwapDataDB.unique_transaction_identifier.in_(successfully_formatted_utis)
-                ).all()
-                for record in processed_records_to_update:
-                    record.report_status = "IncludedInReport" # Add a 'report_status' column to ProcessedSwapDataDB model in common/utils.py
-                    record.generated_report_id = db_generated_report.id # Link to the generated report record
-                    db.add(record) # Stage the update
+            # Forward the generated report (DB ID) to the Report Submission stage.
+            # The submission module fetches path/details from DB using this ID.
+            await report_submission_queue.publish_async([{"report_id": db_generated_report.id}], db=db)
 
-            db.commit() # Commit the new report record AND the processed data updates
-            logger.info(f"Successfully simulated storing generated report record ({db_generated_report.id}) and updating {len(successfully_formatted_utis)} processed data statuses in DB.")
+            await db.commit() # Commit the new report record, the processed data updates and the queued submission
+            logger.info(f"Stored generated report record ({db_generated_report.id}) and linked {linked_count} processed records to it.")
 
+    except QueueFullError as exc:
+        await db.rollback()
+        logger.warning(f"Report submission queue is full, rejecting report generation batch: {exc}")
+        raise HTTPException(status_code=503, detail=str(exc), headers={"Retry-After": "30"})
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         logger.error(f"Failed to store generated report info or update processed data status in database: {e}", exc_info=True)
         send_alert("Critical", f"Database error storing generated report info: {e}", {"module": "report-generation", "error": str(e)})
         # If DB storage fails, we cannot reliably track this report.
         # TODO: Decide how to handle this - maybe delete the uploaded file?
 
-        # If DB storage fails, we cannot proceed to submission reliably.
+        # If DB storage fails, the report is not queued for submission.
         raise HTTPException(status_code=500, detail="Failed to store generated report info")
 
 
@@ -854,7 +851,7 @@ async def generate_report(data: List[Dict[str, Any]], db: Session = Depends(get_
     if report_generation_errors:
          logger.error(f"Reporting {len(report_generation_errors)} report generation errors to error monitor.")
          try:
-             async with httpx.AsyncClient() as client:
+             async with shared_http_client(ERROR_MONITOR_MODULE_URL) as client:
                  response = await client.post(ERROR_MONITOR_MODULE_URL, json=report_generation_errors, timeout=30.0)
                  response.raise_for_status()
                  logger.info(f"Successfully reported report generation errors. Response: {response.json()}")
@@ -867,44 +864,161 @@ async def generate_report(data: List[Dict[str, Any]], db: Session = Depends(get_
               send_alert("Critical", f"Unexpected error reporting report generation errors: {e}", {"module": "report-generation", "error": str(e), "target_url": ERROR_MONITOR_MODULE_URL})
 
 
-    # Forward the generated report file info (including DB ID) to the Report Submission module
-    if db_generated_report: # Only attempt submission if a report record was created
-        logger.info(f"Forwarding generated report info (DB ID: {db_generated_report.id}, Filename: {db_generated_report.report_filename}) to Report Submission.")
-        try:
-            async with httpx.AsyncClient() as client:
-                # Use the URL from environment variables
-                # Send the DB record ID to the submission module
-                submission_payload = {
-                    "report_id": db_generated_report.id, # Pass the DB ID
-                    # The submission module will now fetch path/details from DB using this ID
-                }
-                response = await client.post(REPORT_SUBMISSION_MODULE_URL, json=submission_payload, timeout=120.0) # Allow longer timeout for submission
-                response.raise_for_status()
-                logger.info(f"Successfully sent report info to report submission module. Response: {response.json()}")
-                # TODO: Handle submission module response (e.g., update report status in DB to 'Submitted' or 'SubmissionFailed')
-                # A better approach is for the submission module to update the status directly or via a callback.
+    return {"status": "success", "generated_count": len(generated_report_info_list), "submission_forward_status": "queued" if db_generated_report else "skipped"}
 
-        except httpx.RequestError as exc:
-            logger.error(f"Failed to send report info to report submission module: {exc}", exc_info=True)
-            send_alert("Error", f"Failed to forward report to submission: {exc}", {"module": "report-generation", "report_id": db_generated_report.id, "error": str(exc), "target_url": REPORT_SUBMISSION_MODULE_URL})
-            # TODO: Implement robust error handling: retry, DLQ, or mark report for manual submission/re-generation
-            # TODO: Update report status in DB to 'SubmissionFailed'
+def daily_report_criteria(report_date: date, as_of: datetime):
+    """
+    Valid processed rows of one processing day, processed before `as_of` (when the report was
+    started), so rows arriving while the file is written are left for the next report.
+    """
+    day_start = datetime.combine(report_date, datetime.min.time())
+    return and_(
+        ProcessedSwapDataDB.validation_status == "Valid",
+        ProcessedSwapDataDB.processing_timestamp >= day_start,
+        ProcessedSwapDataDB.processing_timestamp < min(day_start + timedelta(days=1), as_of),
+    )
 
-        except Exception as e:
-             logger.error(f"An unexpected error occurred during report submission module call: {e}", exc_info=True)
-             send_alert("Critical", f"Unexpected error calling report submission module: {e}", {"module": "report-generation", "report_id": db_generated_report.id, "error": str(e), "target_url": REPORT_SUBMISSION_MODULE_URL})
-             # TODO: Implement robust error handling
-             # TODO: Update report status in DB to 'SubmissionFailed'
 
+def daily_report_statement(report_date: date, as_of: datetime):
+    """
+    daily_report_criteria rows in (processing_timestamp, id) order (ix_processed_swap_data_processing_ts_id):
+    the record id followed by REPORT_COLUMNS.
+    """
+    return (
+        select(ProcessedSwapDataDB.id, *[getattr(ProcessedSwapDataDB, column) for column in REPORT_COLUMNS])
+        .where(daily_report_criteria(report_date, as_of))
+        .order_by(ProcessedSwapDataDB.processing_timestamp, ProcessedSwapDataDB.id)
+    )
 
-    return {"status": "success", "generated_count": len(generated_report_info_list), "submission_forward_status": "attempted"}
+
+def write_daily_report_files(report_date: date, format_name: str, compression: Optional[str], archive_format: Optional[str],
+                             as_of: datetime) -> Dict[str, Any]:
+    """
+    Streams the day's rows from a DB cursor into the report file and, optionally, the archive
+    copy in a single pass, both as staging files of the object store (committed by the caller).
+    Also returns the ids of the rows written to the report ("record_ids"), which are linked to it:
+    rows that failed to format are not in the file and are not linked.
+    Blocking (cursor + file IO), so it runs in a worker thread.
+    """
+    base_name = f"reports/daily/swap_report_{report_date:%Y%m%d}_{uuid.uuid4().hex}"
+    report_object_name = base_name + report_object_suffix(format_name, compression)
+    archive_object_name = base_name + report_object_suffix(archive_format, None) if archive_format else None
+    writers = [ReportWriter(report_store.staging_path(report_object_suffix(format_name, compression)), format_name, compression,
+                            metadata={"generated_at": datetime.now(), "report_date": report_date})]
+    if archive_format:
+        writers.append(ReportWriter(report_store.staging_path(report_object_suffix(archive_format, None)), archive_format))
+
+    record_ids: List[str] = []
+    db = SessionLocal()
+    try:
+        for writer in writers:
+            writer.open()
+        for chunk in iter_row_chunks(db, daily_report_statement(report_date, as_of)):
+            rows = [row[1:] for row in chunk] # Without the id column
+            failed = {id(row) for row, _ in writers[0].write_chunk(rows)}
+            for writer in writers[1:]:
+                writer.write_chunk(rows)
+            record_ids.extend(record[0] for record, row in zip(chunk, rows) if id(row) not in failed)
+        results = [writer.close() for writer in writers]
+    except Exception:
+        for writer in writers:
+            writer.abort()
+        raise
+    finally:
+        db.close()
+
+    return {"report_object_name": report_object_name, "report": results[0], "record_ids": record_ids,
+            "archive_object_name": archive_object_name, "archive": results[1] if archive_format else None}
+
+
+@app.post("/generate-daily-report")
+async def generate_daily_report(
+    report_date: date = Query(..., description="Processing date to report (YYYY-MM-DD)"),
+    format: str = Query(REPORT_DAILY_FORMAT, description=f"Report format ({', '.join(sorted(REPORT_FORMATS))})"),
+    compression: Optional[str] = Query(REPORT_DAILY_COMPRESSION, description="gzip, zstd or omitted for none"),
+    archive: bool = Query(True, description="Also write the compact archive copy (REPORT_ARCHIVE_FORMAT)"),
+    db: AsyncSession = Depends(get_async_db),
+):
+    """
+    Generates the daily report file for all valid rows processed on `report_date`.
+    Rows are streamed from a DB cursor in chunks straight into a (compressed) file that is
+    committed into the object store, so memory stays constant regardless of the row count.
+    The report is recorded in generated_reports and enqueued for submission.
+    """
+    compression = compression or None # ?compression= (empty) means uncompressed
+    try:
+        check_report_options(format, compression)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    archive_format = REPORT_ARCHIVE_FORMAT if archive else None
+    if archive_format and not (archive_format in REPORT_FORMATS and REPORT_FORMATS[archive_format].is_available()):
+        logger.warning(f"Archive format '{archive_format}' is not available; writing the daily report without an archive copy.")
+        archive_format = None
+
+    try:
+        as_of = datetime.utcnow()
+        written = await asyncio.to_thread(write_daily_report_files, report_date, format, compression, archive_format, as_of)
+        await report_store.put_file(written["report"].path, written["report_object_name"], move=True)
+        if written["archive"]:
+            await report_store.put_file(written["archive"].path, written["archive_object_name"], move=True)
+    except Exception as e:
+        logger.error(f"Failed to write daily report for {report_date}: {e}", exc_info=True)
+        send_alert("Critical", f"Failed to write daily report for {report_date}: {e}", {"module": "report-generation", "report_date": str(report_date), "error": str(e)})
+        raise HTTPException(status_code=500, detail=f"Failed to generate daily report: {e}")
+
+    report_result = written["report"]
+    logger.info(f"Wrote daily report {written['report_object_name']}: {report_result.row_count} rows, {report_result.size_bytes} bytes ({format}, {compression or 'uncompressed'}).")
+
+    try:
+        db_generated_report = GeneratedReport(
+            report_filename=written["report_object_name"],
+            report_storage_path=report_store.uri(written["report_object_name"]),
+            entry_count=report_result.row_count,
+            generation_timestamp=datetime.utcnow(),
+            status="Generated"
+        )
+        db.add(db_generated_report)
+        await db.flush() # Assigns the report id
+        report_id = db_generated_report.id
+        # The rows actually written, not the criteria again: rows re-validated since the file was written
+        # would differ. One INSERT ... SELECT into report_records and one UPDATE per chunk of ids
+        linked_count = await db.run_sync(lambda session: link_record_ids_to_report(session, report_id, written["record_ids"]))
+        await report_submission_queue.publish_async([{"report_id": db_generated_report.id}], db=db)
+        await db.commit()
+        logger.info(f"Stored daily report record {report_id} and linked {linked_count} processed records to it.")
+    except QueueFullError as exc:
+        await db.rollback()
+        logger.warning(f"Report submission queue is full, rejecting daily report: {exc}")
+        raise HTTPException(status_code=503, detail=str(exc), headers={"Retry-After": "30"})
+    except Exception as e:
+        await db.rollback()
+        logger.error(f"Failed to store daily report info in database: {e}", exc_info=True)
+        send_alert("Critical", f"Database error storing daily report info: {e}", {"module": "report-generation", "error": str(e)})
+        raise HTTPException(status_code=500, detail="Failed to store generated report info")
+
+    archive_result = written["archive"]
+    return {
+        "status": "success",
+        "report_id": db_generated_report.id,
+        "report_filename": written["report_object_name"],
+        "entry_count": report_result.row_count,
+        "size_bytes": report_result.size_bytes,
+        "format": format,
+        "compression": compression,
+        "archive_path": report_store.uri(written["archive_object_name"]) if archive_result else None,
+        "archive_size_bytes": archive_result.size_bytes if archive_result else None,
+        "submission_forward_status": "queued",
+    }
 
 # --- P3: Admin UI를 위한 API 엔드포인트 추가 ---
 @app.get("/reports")
 async def get_reports_for_ui(
     db: Session = Depends(get_db), # Use DB session
     limit: int = Query(100, description="Maximum number of records to return"),
-    offset: int = Query(0, description="Offset for pagination"),
+    offset: int = Query(0, description="Offset for pagination (deprecated, ignored when cursor is set)"),
+    cursor: Optional[str] = Query(None, description="Opaque cursor from the previous page's next_cursor"),
+    exact_count: bool = Query(False, description="Compute an exact total_count (slow on large tables)"),
     filename: Optional[str] = Query(None, description="Filter by report filename (partial match)"),
     status: Optional[str] = Query(None, description="Filter by report status (e.g., Generated, Submitted, SubmissionFailed)"),
     # TODO: Add filters for date range, entry count range, linked submission ID
@@ -913,7 +1027,7 @@ async def get_reports_for_ui(
     API endpoint for the Admin UI frontend to fetch generated report info.
     Fetches from the database.
     """
-    logger.info(f"Received request to list reports with filters: filename={filename}, status={status}, limit={limit}, offset={offset}")
+    logger.info(f"Received request to list reports with filters: filename={filename}, status={status}, limit={limit}, offset={offset}, cursor={cursor}")
 
     # Build SQLAlchemy query
     query = db.query(GeneratedReport)
@@ -923,11 +1037,18 @@ async def get_reports_for_ui(
     if status:
         query = query.filter(GeneratedReport.status == status)
 
-    # Get total count before applying limit/offset
-    total_count = query.count()
+    # Total count: estimated/cached unless exact_count=true
+    total_count, total_count_mode = count_rows(
+        db, query, GeneratedReport.__tablename__, {"filename": filename, "status": status}, exact=exact_count
+    )
 
-    # Apply ordering (e.g., by generation timestamp descending), limit, and offset
-    report_records = query.order_by(desc(GeneratedReport.generation_timestamp)).offset(offset).limit(limit).all()
+    # Newest first, keyset-paginated on (generation_timestamp, id)
+    try:
+        report_records, next_cursor = paginate_keyset(
+            query, GeneratedReport.generation_timestamp, GeneratedReport.id, limit, cursor=cursor, offset=offset
+        )
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=400, detail=str(e))
 
     # Convert SQLAlchemy objects to dictionaries for response
     report_list = []
@@ -941,18 +1062,48 @@ async def get_reports_for_ui(
     return {
         "status": "success",
         "total_count": total_count,
+        "total_count_mode": total_count_mode,
         "returned_count": len(report_list),
         "offset": offset,
         "limit": limit,
+        "next_cursor": next_cursor,
         "reports": report_list
     }
 
 
+@app.get("/reports/{report_id}/records")
+async def get_report_records(
+    report_id: str,
+    db: Session = Depends(get_db),
+    limit: int = Query(1000, ge=1, le=10000, description="Maximum number of records to return"),
+    after: Optional[str] = Query(None, description="processed_record_id of the last record of the previous page"),
+):
+    """
+    Processed records contained in a generated report (report_records), keyset-paginated
+    on the mapping table's primary key (report_id, processed_record_id).
+    """
+    query = db.query(ReportRecord).filter(ReportRecord.report_id == report_id)
+    if after:
+        query = query.filter(ReportRecord.processed_record_id > after)
+    records = query.order_by(ReportRecord.processed_record_id).limit(limit + 1).all()
+    next_after = records[limit - 1].processed_record_id if len(records) > limit else None
+    return {
+        "status": "success",
+        "report_id": report_id,
+        "returned_count": min(len(records), limit),
+        "next_after": next_after,
+        "records": [
+            {"processed_record_id": record.processed_record_id, "unique_transaction_identifier": record.unique_transaction_identifier, "included_at": record.included_at}
+            for record in records[:limit]
+        ],
+    }
+
+
 @app.get("/health")
 async def health_check(db: Session = Depends(get_db)):
     """
     Health check endpoint for the Report Generation module.
-    Checks database connectivity and simulated cloud storage access.
+    Checks database connectivity and object store access.
     """
     db_status = "ok"
     try:
@@ -964,35 +1115,34 @@ async def health_check(db: Session = Depends(get_db)):
         logger.error(f"Database health check failed: {e}", exc_info=True)
         send_alert("Critical", f"Database connectivity issue in Report Generation: {e}", {"module": "report-generation", "check": "db_connectivity"})
 
-    # --- Simulate Cloud Storage Access Check ---
+    # --- Object Store Access Check ---
     storage_status = "ok"
     try:
-        # Simulate a small upload/download to check connectivity/credentials
-        test_object_name = f"health_check_test_{uuid.uuid4().hex[:8]}.txt"
+        # A small write/read/delete round trip checks the store is writable and readable
+        test_object_name = f"health_check/test_{uuid.uuid4().hex[:8]}.txt"
         test_content = b"health check test content"
-        upload_result = simulated_storage.upload_file(test_content, test_object_name) # Use await if upload_file is async
-        downloaded_content = simulated_storage.download_file(test_object_name) # Use await if download_file is async
+        await report_store.upload_file(test_content, test_object_name)
+        downloaded_content = await report_store.download_file(test_object_name)
+        await report_store.delete_object(test_object_name)
 
         if downloaded_content != test_content:
              storage_status = "error: content mismatch"
-             logger.error(f"Simulated storage health check failed: content mismatch for {test_object_name}")
-             send_alert("Critical", f"Simulated storage content mismatch in Report Generation: {test_object_name}", {"module": "report-generation", "check": "storage_access"})
+             logger.error(f"Object store health check failed: content mismatch for {test_object_name}")
+             send_alert("Critical", f"Object store content mismatch in Report Generation: {test_object_name}", {"module": "report-generation", "check": "storage_access"})
         else:
-             # Simulate deleting the test object
-             # simulated_storage.delete_object(test_object_name) # Add delete method to simulated storage
-             logger.debug(f"Simulated storage health check successful for {test_object_name}")
+             logger.debug(f"Object store health check successful for {test_object_name}")
 
     except Exception as e:
         storage_status = f"error: {e}"
-        logger.error(f"Simulated storage access check failed: {e}", exc_info=True)
-        send_alert("Critical", f"Simulated storage access issue in Report Generation: {e}", {"module": "report-generation", "check": "storage_access"})
+        logger.error(f"Object store access check failed: {e}", exc_info=True)
+        send_alert("Critical", f"Object store access issue in Report Generation: {e}", {"module": "report-generation", "check": "storage_access"})
 
 
-    return {"status": "ok", "database_status": db_status, "simulated_storage_status": storage_status}
+    return {"status": "ok", "database_status": db_status, "storage_status": storage_status, "stage_worker": report_generation_worker.status(), "http_pools": get_http_pool_metrics()}
 
 # To run this module locally:
 # 1. Ensure your database is running.
 # 2. Set the DATABASE_URL environment variable if not using SQLite.
-# 3. Set REPORT_SUBMISSION_MODULE_URL and ERROR_MONITOR_MODULE_URL env vars if not using defaults.
-# 4. Set CLOUD_STORAGE_BUCKET_NAME env var if not using default.
+# 3. Set ERROR_MONITOR_MODULE_URL (and STAGE_QUEUE_* if needed) env vars if not using defaults.
+# 4. Set CLOUD_STORAGE_BUCKET_NAME / OBJECT_STORE_ROOT env vars if not using defaults (report-submission must use the same store).
 # 5. Run uvicorn: uvicorn main:app --reload --port 8003
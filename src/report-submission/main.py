@@ -792,18 +792,25 @@ from fastapi import FastAPI, HTTPException, Depends, Query
 from typing import List, Dict, Any, Optional
 import uvicorn
 import httpx # Used for simulating HTTP calls to SDR (external)
-from datetime import datetime
+from datetime import datetime, timedelta
 import os # Simulate file reading/transfer
 import uuid # To generate unique IDs
-import io # To simulate reading from an in-memory file
+import asyncio
 
 # --- SQLAlchemy Imports ---
 from sqlalchemy.orm import Session
-from sqlalchemy import select, desc
+from sqlalchemy import select, desc, update
 
 # src.common에서 로거, DB 설정 및 모델 가져오기
 from common.utils import logger, get_db, SubmissionHistory, GeneratedReport, create_database_tables # Import DB models
 from common.utils import send_alert # Import utility
+from common.utils import get_async_db, AsyncSessionLocal, AsyncSession # Async session for the write path
+from common.pagination import paginate_keyset, count_rows, InvalidCursorError # Keyset pagination for the Admin UI lists
+from common.http_client import shared_http_client, get_http_pool_metrics # Pooled, lifespan-managed HTTP clients
+from common.stage_queue import get_stage_queue, stage_lifespan, StageWorker, REPORT_SUBMISSION_QUEUE # Durable stage hand-off
+from common.sdr_upload import open_report_source # Streaming / resumable multipart SDR upload
+from common.sdr_dispatch import SubmissionDispatcher, load_sdr_destinations # Concurrent submission to every SDR destination
+from common.object_store import get_object_store # Report object store shared with report-generation
 
 # --- Ensure database tables are created on startup (for local dev) ---
 # In production, handle migrations separately
@@ -816,52 +823,47 @@ SDR_SUBMISSION_URL = os.environ.get("SDR_SUBMISSION_URL", "http://localhost:9999
 # SDR_SFTP_PASSWORD = os.environ.get("SDR_SFTP_PASSWORD", "your_sdr_password") # Use secrets management!
 # ERROR_MONITOR_MODULE_URL = os.environ.get("ERROR_MONITOR_MODULE_URL", "http://error-monitoring-service:80/report_error") # Example in K8s
 ERROR_MONITOR_MODULE_URL = os.environ.get("ERROR_MONITOR_MODULE_URL", "http://localhost:8005/report_error") # Default to Local testing URL
+# A report in SubmissionInProgress holds a lease, renewed every third of it while the SDR calls run.
+# Once it expired (the submitting process died), the report is submitted again instead of being skipped.
+SUBMISSION_LEASE_SECONDS = float(os.environ.get("SUBMISSION_LEASE_SECONDS", "120")) # Seconds
 
-# --- Cloud Storage Configuration (Placeholders) ---
-# In a real system, use environment variables for bucket name, region, etc.
+# --- Report Object Store (common/object_store.py) ---
+# Must be the store report-generation writes to (same OBJECT_STORE_BACKEND / OBJECT_STORE_ROOT and bucket).
 CLOUD_STORAGE_BUCKET_NAME = os.environ.get("CLOUD_STORAGE_BUCKET_NAME", "my-swap-reports-bucket")
-# TODO: Add configuration for region, endpoint, credentials
+report_store = get_object_store(CLOUD_STORAGE_BUCKET_NAME)
 
-# --- Simulate Cloud Object Storage SDK Interaction (Must be consistent with Report Generation) ---
-# In a real system, replace this with actual SDK calls (e.g., boto3 for S3, azure-storage-blob)
-# This class should ideally be in common/ or a shared library if used by multiple modules
-class SimulatedCloudStorage:
-    def __init__(self, bucket_name):
-        self.bucket_name = bucket_name
-        self._storage = {} # In-memory dict to simulate storage (shared state is complex in real K8s)
+# Every report goes to each destination in SDR_DESTINATIONS (default: the single SDR_SUBMISSION_URL),
+# concurrently and with per-destination concurrency / rate limits, retries and hedging
+sdr_dispatcher = SubmissionDispatcher(load_sdr_destinations(default_url=SDR_SUBMISSION_URL))
 
-    async def upload_file(self, file_content: bytes, object_name: str):
-        """Simulates uploading file content to the object storage."""
-        logger.info(f"Simulating upload to bucket '{self.bucket_name}', object '{object_name}'")
-        self._storage[object_name] = file_content
-        logger.info(f"Simulated upload complete for '{object_name}'. Size: {len(file_content)} bytes.")
-        return {"object_name": object_name, "bucket": self.bucket_name, "size": len(file_content)}
 
-    async def download_file(self, object_name: str) -> Optional[bytes]:
-         """Simulates downloading file content from the object storage."""
-         logger.info(f"Simulating download from bucket '{self.bucket_name}', object '{object_name}'")
-         content = self._storage.get(object_name)
-         if content is not None:
-              logger.info(f"Simulated download complete for '{object_name}'. Size: {len(content)} bytes.")
-         else:
-              logger.warning(f"Simulated object '{object_name}' not found.")
-         return content
+# --- Stage queue: consume report references from 'report-submission' ---
+async def handle_report_submission_batch(payloads: List[Dict[str, Any]], db: AsyncSession) -> None:
+    """
+    Stage worker handler for the 'report-submission' queue (payloads are {"report_id": ...}).
+    Redelivered reports are skipped by the status check in submit_report; a report whose
+    submission is still in progress elsewhere raises 409, so the message is retried later.
+    """
+    for report_info in payloads:
+        await submit_report(report_info, db)
 
-# Instantiate the simulated storage (Note: In-memory state is NOT shared between processes/pods!)
-# In a real K8s system, this simulation would be replaced by a real SDK instance
-# configured to connect to the actual shared cloud storage.
-simulated_storage = SimulatedCloudStorage(CLOUD_STORAGE_BUCKET_NAME)
 
+# One report per batch. Dispatch (retries x SDR timeout) can outlast the visibility timeout, so the
+# lease is extended while it runs; the message is only redelivered when this process dies.
+# submit_report commits several times (history rows, multipart upload ids), so the message is acked after it returns
+report_submission_worker = StageWorker(get_stage_queue(REPORT_SUBMISSION_QUEUE), handle_report_submission_batch, batch_size=1,
+                                       session_factory=AsyncSessionLocal, ack_in_transaction=False, extend_lease=True)
 
 # --- FastAPI 앱 인스턴스 생성 ---
-app = FastAPI()
+app = FastAPI(lifespan=stage_lifespan(report_submission_worker)) # Runs the report submission queue consumer; closes pooled HTTP clients on shutdown
 
 @app.post("/submit-report")
-async def submit_report(report_info: Dict[str, Any], db: Session = Depends(get_db)): # Receives report info from Report Generation
+async def submit_report(report_info: Dict[str, Any], db: AsyncSession = Depends(get_async_db)): # Receives report info from Report Generation
     """
     API endpoint to submit generated report files to the SDR.
-    Retrieves report info from the database, downloads report content from storage (simulated),
-    and updates submission history.
+    Retrieves report info from the database, streams the report from the object store to
+    every SDR destination and updates submission history.
+    Also called by the 'report-submission' stage worker.
     """
     report_id = report_info.get("report_id") # Get the DB ID of the generated report record
 
@@ -873,146 +875,214 @@ async def submit_report(report_info: Dict[str, Any], db: Session = Depends(get_d
     logger.info(f"Received request to submit report (Report DB ID: {report_id})")
 
     # Retrieve the generated report record from the database
-    generated_report = db.query(GeneratedReport).filter(GeneratedReport.id == report_id).first()
+    generated_report = await db.get(GeneratedReport, report_id)
     if not generated_report:
          logger.error(f"Generated report record not found in DB for submission: {report_id}")
          send_alert("Error", f"Generated report record not found for submission: {report_id}", {"module": "report-submission", "report_id": report_id})
          raise HTTPException(status_code=404, detail=f"Generated report record not found: {report_id}")
 
     # Check if the report is already submitted or in progress
-    if generated_report.status in ["Submitted", "SubmissionInProgress", "SDR_Accepted", "SDR_Rejected"]:
+    if generated_report.status in ["Submitted", "SDR_Accepted", "SDR_Rejected"]:
         logger.warning(f"Report {report_id} is already in status {generated_report.status}. Skipping submission.")
         return {"status": "skipped", "message": f"Report already in status {generated_report.status}", "report_id": report_id}
 
+    observed_status, observed_lease = generated_report.status, generated_report.submission_lease_expires_at
+    if observed_status == "SubmissionInProgress":
+        if observed_lease is not None and observed_lease > datetime.utcnow():
+            logger.warning(f"Report {report_id} is being submitted by another attempt (lease until {observed_lease}).")
+            raise HTTPException(status_code=409, detail=f"Submission of report {report_id} is already in progress",
+                                headers={"Retry-After": str(int(SUBMISSION_LEASE_SECONDS))})
+        # The attempt holding the report died: close its rows (their upload ids are resumed below) and submit again
+        logger.warning(f"Submission of report {report_id} was abandoned (lease expired at {observed_lease}); submitting again.")
+        send_alert("Warning", f"Abandoned submission of report {report_id} is retried", {"module": "report-submission", "report_id": report_id, "lease_expired_at": str(observed_lease)})
+        for abandoned in (await db.scalars(
+            select(SubmissionHistory).where(SubmissionHistory.report_id == generated_report.id, SubmissionHistory.status == "Pending")
+        )).all():
+            abandoned.status = "Failed"
+            abandoned.error_details = "Submission attempt abandoned: its submission lease expired before it finished"
+        await db.flush()
+
+
+    # Destinations that already accepted this report (an earlier attempt failed elsewhere) are not sent again
+    submitted_destinations = set((await db.scalars(
+        select(SubmissionHistory.destination)
+        .where(SubmissionHistory.report_id == generated_report.id, SubmissionHistory.status == "Submitted")
+    )).all())
+    destinations = [destination.name for destination in sdr_dispatcher.destinations if destination.name not in submitted_destinations]
+
+    # Create a submission history record per destination in the database
+    submission_records = {
+        destination: SubmissionHistory(
+            submission_id = str(uuid.uuid4()), # Unique ID for this submission attempt
+            report_id = generated_report.id, # Link to GeneratedReport
+            submission_timestamp = datetime.utcnow(),
+            status = "Pending", # Initial status
+            destination = destination,
+        )
+        for destination in destinations
+    }
+    submission_id = next(iter(submission_records.values())).submission_id if submission_records else generated_report.submission_id
 
-    # Create a submission history record in the database
-    db_submission_record = SubmissionHistory(
-        submission_id = str(uuid.uuid4()), # Unique ID for this submission attempt
-        report_id = generated_report.id, # Link to GeneratedReport
-        submission_timestamp = datetime.utcnow(),
-        status = "Pending", # Initial status
-        report_filename = generated_report.report_filename, # Store filename in history too
-        entry_count = generated_report.entry_count # Store entry count in history too
-    )
+    # SDR multipart uploads left by previous failed attempts for this report (latest per destination), resumed below
+    previous_upload_ids: Dict[str, str] = {}
+    for destination, upload_id in (await db.execute(
+        select(SubmissionHistory.destination, SubmissionHistory.sdr_upload_id)
+        .where(SubmissionHistory.report_id == generated_report.id, SubmissionHistory.status == "Failed", SubmissionHistory.sdr_upload_id.isnot(None))
+        .order_by(SubmissionHistory.submission_timestamp.desc(), SubmissionHistory.id.desc())
+    )).all():
+        previous_upload_ids.setdefault(destination or "SDR", upload_id) # Rows before multi-destination submission belong to the default SDR
 
     try:
-        db.add(db_submission_record)
-        # Update the status of the generated report record to indicate submission started
-        generated_report.status = "SubmissionInProgress"
-        generated_report.submission_id = db_submission_record.submission_id # Link submission to report
-        db.add(generated_report) # Stage the update
-        db.commit()
-        db.refresh(db_submission_record) # Get the generated ID
-        db.refresh(generated_report)
-        logger.info(f"Simulated storing submission record {db_submission_record.submission_id} and updating report {generated_report.id} status to SubmissionInProgress.")
-
+        db.add_all(submission_records.values())
+        # Claim the report (status and lease as read above), so two attempts never submit it concurrently
+        claimed = await db.execute(
+            update(GeneratedReport)
+            .where(
+                GeneratedReport.id == generated_report.id,
+                GeneratedReport.status == observed_status,
+                GeneratedReport.submission_lease_expires_at.is_(None) if observed_lease is None else GeneratedReport.submission_lease_expires_at == observed_lease,
+            )
+            .values(status="SubmissionInProgress", submission_id=submission_id,
+                    submission_lease_expires_at=datetime.utcnow() + timedelta(seconds=SUBMISSION_LEASE_SECONDS))
+            .execution_options(synchronize_session=False)
+        )
+        if claimed.rowcount != 1:
+            await db.rollback()
+            logger.warning(f"Report {report_id} was claimed by another submission attempt.")
+            raise HTTPException(status_code=409, detail=f"Submission of report {report_id} is already in progress",
+                                headers={"Retry-After": str(int(SUBMISSION_LEASE_SECONDS))})
+        await db.commit() # Releases the DB connection before the (slow) SDR calls
+        await db.refresh(generated_report)
+        logger.info(f"Simulated storing submission records {[record.submission_id for record in submission_records.values()]} and updating report {generated_report.id} status to SubmissionInProgress.")
+
+    except HTTPException:
+        raise
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         logger.error(f"Failed to store submission record or update report status in database: {e}", exc_info=True)
         send_alert("Critical", f"Database error storing submission record: {e}", {"module": "report-submission", "report_id": report_id, "error": str(e)})
         raise HTTPException(status_code=500, detail="Failed to record submission attempt")
 
 
-    # --- TODO: Implement actual SDR submission logic ---
-    # This is the critical external integration point.
-    # It involves downloading the report file from shared storage and sending it to the SDR.
+    # --- SDR submission ---
+    # The report is read from storage while it is sent to every pending destination concurrently.
 
-    submission_successful = False
-    sdr_response_data = None
+    results = {}
     submission_error = None
-    report_content = None
+    commit_lock = asyncio.Lock() # Destinations and the lease renewal run concurrently on one session
+    submission_done = asyncio.Event()
+
+    async def renew_lease() -> None:
+        while True:
+            try:
+                await asyncio.wait_for(submission_done.wait(), SUBMISSION_LEASE_SECONDS / 3)
+                return
+            except asyncio.TimeoutError:
+                pass
+            async with commit_lock:
+                try:
+                    generated_report.submission_lease_expires_at = datetime.utcnow() + timedelta(seconds=SUBMISSION_LEASE_SECONDS)
+                    await db.commit()
+                except Exception as e: # Retried on the next renewal, before the lease runs out
+                    await db.rollback()
+                    logger.warning(f"Failed to renew the submission lease of report {report_id}: {e}")
+
+    lease_renewal = asyncio.create_task(renew_lease())
 
     try:
-        # --- Simulate Reading Report File from Storage ---
+        # --- Open the Report in the Object Store ---
         # Use the object name stored in the generated_report DB record
         report_object_name = generated_report.report_filename
         if not report_object_name:
              raise ValueError(f"Report object name is missing for report ID {report_id}")
 
-        # In a real system, replace this with S3/Blob Storage SDK read operation
-        report_content = await simulated_storage.download_file(report_object_name)
-
-        if report_content is None:
-             raise FileNotFoundError(f"Report object not found in storage: {report_object_name}")
-
-        logger.info(f"Simulated reading report file content from storage object: {report_object_name}")
-
-
-        # --- Simulate SDR Submission (using HTTP POST as example) ---
-        # In a real scenario, replace this with actual SDR API call or SFTP logic.
-        # Use the URL/credentials from environment variables.
-        SDR_SUBMISSION_URL = os.environ.get("SDR_SUBMISSION_URL") # Get from env vars
-        if not SDR_SUBMISSION_URL:
-             # Fallback for local testing if env var is not set
-             SDR_SUBMISSION_URL = "http://localhost:9999/sdr-submit"
-             logger.warning(f"SDR_SUBMISSION_URL environment variable not set. Using default local URL: {SDR_SUBMISSION_URL}")
-
-
-        async with httpx.AsyncClient() as client:
-            # Example HTTP POST submission
-            # Send the report content as the request body
-            response = await client.post(SDR_SUBMISSION_URL, content=report_content, timeout=300.0) # Allow long timeout
-            response.raise_for_status() # Raise for bad status codes
-            sdr_response_data = response.json() # Assuming SDR returns JSON response
-            submission_successful = True # Assume success if no exception and status is good
-
-        # --- End Simulation ---
-
+        # Reports are store objects (older daily reports may still be local file:// paths).
+        # Either way the content is read in chunks while it is sent, never as a whole.
+        report_source = await open_report_source(generated_report.report_storage_path, report_object_name, report_store)
+        logger.info(f"Opened report {report_object_name} for submission to {destinations} ({report_source.size} bytes).")
+
+        async def record_upload_id(destination: str, upload_id: str) -> None:
+            # Stored as soon as the SDR assigns it, so the next attempt can resume a failed multipart upload
+            async with commit_lock:
+                submission_records[destination].sdr_upload_id = upload_id
+                await db.commit()
+
+        # Streamed (chunked) POST for normal reports, resumable multipart for large ones; never raises for SDR errors
+        results = await sdr_dispatcher.dispatch(report_source, report_object_name, destinations=destinations,
+                                                resume_upload_ids=previous_upload_ids, on_upload_id=record_upload_id)
+        for destination, result in results.items():
+            if result.success:
+                logger.info(f"Submitted report {report_object_name} to {destination} ({result.mode}, {result.attempts} attempt(s), {result.hedges} hedge(s), {result.elapsed:.2f}s).")
+            else:
+                logger.error(f"SDR submission to {destination} failed for report {report_object_name} after {result.attempts} attempt(s): {result.error}")
+                send_alert("Error", f"SDR submission to {destination} failed for {report_object_name}: {result.error}", {"module": "report-submission", "report_id": report_id, "filename": report_object_name, "destination": destination, "error": result.error})
 
     except FileNotFoundError:
          submission_error = f"Report file not found in storage during submission attempt: {report_object_name}"
          logger.error(submission_error, exc_info=True)
          send_alert("Critical", submission_error, {"module": "report-submission", "report_id": report_id, "object_name": report_object_name})
-    except httpx.RequestError as exc:
-        submission_error = f"SDR Submission Failed: {exc}"
-        logger.error(f"SDR submission failed for report {generated_report.report_filename}: {exc}", exc_info=True)
-        send_alert("Error", f"SDR submission failed for {generated_report.report_filename}: {exc}", {"module": "report-submission", "report_id": report_id, "filename": generated_report.report_filename, "error": str(exc)})
     except Exception as e:
         submission_error = f"Unexpected Submission Error: {e}"
         logger.error(f"An unexpected error occurred during submission of {generated_report.report_filename}: {e}", exc_info=True)
         send_alert("Critical", f"Unexpected error during SDR submission: {e}", {"module": "report-submission", "report_id": report_id, "filename": generated_report.report_filename, "error": str(e)})
+    finally:
+        submission_done.set()
+        await lease_renewal # A renewal commit in progress finishes before the final update
 
+    submission_successful = submission_error is None and all(result.success for result in results.values())
+    if submission_error is None and not submission_successful:
+        submission_error = "SDR Submission Failed: " + "; ".join(f"{result.destination}: {result.error}" for result in results.values() if not result.success)
 
-    # --- Update Submission Record and Generated Report Status ---
-    try:
-        # Retrieve the records again in case the session was closed or state is stale
-        # Or pass the session to this part of the logic if it's separated
-        db_submission_record = db.query(SubmissionHistory).filter(SubmissionHistory.id == db_submission_record.id).first()
-        generated_report = db.query(GeneratedReport).filter(GeneratedReport.id == generated_report.id).first() # Re-fetch report record
-
-        if db_submission_record and generated_report:
-            if submission_successful:
-                db_submission_record.status = "Submitted"
-                db_submission_record.sdr_response_payload = sdr_response_data
-                generated_report.status = "Submitted" # Update report status
-                logger.info(f"Submission {db_submission_record.submission_id} for report {generated_report.id} marked as Submitted.")
-                # TODO: Trigger next step: SDR acknowledgement processing (P3/later)
-                # SDR might send an acknowledgement file/message later. A separate process would handle this.
-            else:
-                db_submission_record.status = "Failed"
-                db_submission_record.error_details = submission_error
-                generated_report.status = "SubmissionFailed" # Update report status
-                logger.error(f"Submission {db_submission_record.submission_id} for report {generated_report.id} marked as Failed.")
-                # TODO: Trigger error reporting to Error Monitoring module (already done via send_alert, but maybe a dedicated error record is needed)
-                # TODO: Implement retry logic for failed submissions (e.g., queue for retry worker)
 
-            db.add(db_submission_record)
+    # --- Update Submission Records and Generated Report Status ---
+    try:
+        generated_report = await db.get(GeneratedReport, generated_report.id) # Re-fetch report record
+
+        if generated_report:
+            for destination, db_submission_record in submission_records.items():
+                result = results.get(destination)
+                if result is not None and result.success:
+                    db_submission_record.status = "Submitted"
+                    db_submission_record.sdr_response_payload = result.response
+                else:
+                    db_submission_record.status = "Failed"
+                    db_submission_record.error_details = result.error if result is not None else submission_error
+                    # TODO: Implement retry logic for failed submissions (e.g., queue for retry worker)
+                db.add(db_submission_record)
+            # The report counts as submitted once every destination has it
+            generated_report.status = "Submitted" if submission_successful else "SubmissionFailed"
+            generated_report.submission_lease_expires_at = None
+            # TODO: Trigger next step: SDR acknowledgement processing (P3/later)
+            # SDR might send an acknowledgement file/message later. A separate process would handle this.
             db.add(generated_report)
-            db.commit()
-            logger.info("Updated submission and report statuses in DB.")
+            await db.commit()
+            logger.info(f"Report {generated_report.id} marked as {generated_report.status}; updated {len(submission_records)} submission record(s) in DB.")
         else:
-             logger.error(f"Could not find submission or report record in DB to update status after submission attempt for report {report_id}.")
+             logger.error(f"Could not find report record in DB to update status after submission attempt for report {report_id}.")
              send_alert("Critical", f"Failed to update DB status after submission attempt: {report_id}", {"module": "report-submission", "report_id": report_id})
 
 
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         logger.error(f"Critical database error updating status after submission: {e}", exc_info=True)
         send_alert("Critical", f"Database error updating status after submission: {e}", {"module": "report-submission", "report_id": report_id, "error": str(e)})
         # This is a critical failure in the submission module itself
 
+    destination_results = {
+        destination: {
+            "status": "Submitted" if result.success else "Failed",
+            "submission_id": submission_records[destination].submission_id,
+            "attempts": result.attempts,
+            "hedges": result.hedges,
+            "mode": result.mode,
+            "elapsed_seconds": round(result.elapsed, 3),
+            "sdr_response": result.response,
+            "error": result.error,
+        }
+        for destination, result in results.items()
+    }
     if submission_successful:
-        return {"status": "success", "submission_id": db_submission_record.submission_id, "sdr_response": sdr_response_data}
+        return {"status": "success", "submission_id": submission_id, "destinations": destination_results}
     else:
         # If submission failed, raise an HTTPException
         raise HTTPException(status_code=500, detail=f"Report submission failed: {submission_error}")
@@ -1022,7 +1092,9 @@ async def submit_report(report_info: Dict[str, Any], db: Session = Depends(get_d
 async def get_submissions_for_ui(
     db: Session = Depends(get_db), # Use DB session
     limit: int = Query(100, description="Maximum number of records to return"),
-    offset: int = Query(0, description="Offset for pagination"),
+    offset: int = Query(0, description="Offset for pagination (deprecated, ignored when cursor is set)"),
+    cursor: Optional[str] = Query(None, description="Opaque cursor from the previous page's next_cursor"),
+    exact_count: bool = Query(False, description="Compute an exact total_count (slow on large tables)"),
     submission_id: Optional[str] = Query(None, description="Filter by submission ID (partial match)"),
     report_id: Optional[str] = Query(None, description="Filter by report ID"),
     status: Optional[str] = Query(None, description="Filter by submission status (e.g., Pending, Submitted, Failed)"),
@@ -1032,7 +1104,7 @@ async def get_submissions_for_ui(
     API endpoint for the Admin UI frontend to fetch submission history.
     Fetches from the database.
     """
-    logger.info(f"Received request to list submissions with filters: submission_id={submission_id}, report_id={report_id}, status={status}, limit={limit}, offset={offset}")
+    logger.info(f"Received request to list submissions with filters: submission_id={submission_id}, report_id={report_id}, status={status}, limit={limit}, offset={offset}, cursor={cursor}")
 
     # Build SQLAlchemy query
     query = db.query(SubmissionHistory)
@@ -1044,11 +1116,20 @@ async def get_submissions_for_ui(
     if status:
         query = query.filter(SubmissionHistory.status == status)
 
-    # Get total count before applying limit/offset
-    total_count = query.count()
+    # Total count: estimated/cached unless exact_count=true
+    total_count, total_count_mode = count_rows(
+        db, query, SubmissionHistory.__tablename__,
+        {"submission_id": submission_id, "report_id": report_id, "status": status},
+        exact=exact_count,
+    )
 
-    # Apply ordering (e.g., by submission timestamp descending), limit, and offset
-    submission_records = query.order_by(desc(SubmissionHistory.submission_timestamp)).offset(offset).limit(limit).all()
+    # Newest first, keyset-paginated on (submission_timestamp, id)
+    try:
+        submission_records, next_cursor = paginate_keyset(
+            query, SubmissionHistory.submission_timestamp, SubmissionHistory.id, limit, cursor=cursor, offset=offset
+        )
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=400, detail=str(e))
 
     # Convert SQLAlchemy objects to dictionaries for response
     submission_list = []
@@ -1062,9 +1143,11 @@ async def get_submissions_for_ui(
     return {
         "status": "success",
         "total_count": total_count,
+        "total_count_mode": total_count_mode,
         "returned_count": len(submission_list),
         "offset": offset,
         "limit": limit,
+        "next_cursor": next_cursor,
         "submissions": submission_list
     }
 
@@ -1072,7 +1155,7 @@ async def get_submissions_for_ui(
 async def health_check(db: Session = Depends(get_db)):
     """
     Health check endpoint for the Report Submission module.
-    Checks database connectivity and simulated cloud storage access.
+    Checks database connectivity and object store access.
     """
     db_status = "ok"
     try:
@@ -1084,39 +1167,16 @@ async def health_check(db: Session = Depends(get_db)):
         logger.error(f"Database health check failed: {e}", exc_info=True)
         send_alert("Critical", f"Database connectivity issue in Report Submission: {e}", {"module": "report-submission", "check": "db_connectivity"})
 
-    # --- Simulate Cloud Storage Access Check ---
-    # This requires the simulated_storage instance to be accessible here.
-    # In a real system, you'd have a storage client instance configured with credentials.
+    # --- Object Store Access Check ---
     storage_status = "ok"
     try:
-        # Simulate downloading a known small object or attempting a list operation
-        # For this simple simulation, let's try to download an object that *might* exist
-        # or just check if the simulated storage object itself is initialized.
-        # A real health check would attempt a minimal operation like listing a few objects
-        # or downloading a small test file if one exists and is known.
-        if simulated_storage is None:
-             storage_status = "error: simulated storage not initialized"
-        else:
-             # Attempt a simulated download of a dummy object name
-             dummy_object_name = "health_check_dummy_object.txt"
-             content = simulated_storage.download_file(dummy_object_name) # This will log a warning if not found, which is expected
-
-             # A more robust check would be to upload a test file and then download it.
-             # test_object_name = f"health_check_test_{uuid.uuid4().hex[:8]}.txt"
-             # test_content = b"health check test content"
-             # await simulated_storage.upload_file(test_content, test_object_name)
-             # downloaded_content = await simulated_storage.download_file(test_object_name)
-             # if downloaded_content != test_content:
-             #      raise Exception("Content mismatch")
-             # await simulated_storage.delete_object(test_object_name) # Need delete method
-
-             logger.debug("Simulated storage health check attempted download.")
-
-
+        # Reading a missing object's metadata exercises the store without writing to it
+        await report_store.stat("health_check/missing_object.txt")
+        logger.debug("Object store health check succeeded.")
     except Exception as e:
         storage_status = f"error: {e}"
-        logger.error(f"Simulated storage access check failed: {e}", exc_info=True)
-        send_alert("Critical", f"Simulated storage access issue in Report Submission: {e}", {"module": "report-submission", "check": "storage_access"})
+        logger.error(f"Object store access check failed: {e}", exc_info=True)
+        send_alert("Critical", f"Object store access issue in Report Submission: {e}", {"module": "report-submission", "check": "storage_access"})
 
 
     # TODO: Add check for connectivity to SDR endpoint (if possible without submitting)
@@ -1133,12 +1193,13 @@ async def health_check(db: Session = Depends(get_db)):
     #      send_alert("Critical", f"SDR connectivity issue in Report Submission: {e}", {"module": "report-submission", "check": "sdr_connectivity"})
 
 
-    return {"status": "ok", "database_status": db_status, "simulated_storage_status": storage_status, "sdr_connectivity_status": sdr_connectivity_status}
+    return {"status": "ok", "database_status": db_status, "storage_status": storage_status, "sdr_connectivity_status": sdr_connectivity_status, "sdr_destinations": sdr_dispatcher.metrics(), "stage_worker": report_submission_worker.status(), "http_pools": get_http_pool_metrics()}
 
 # To run this module locally:
 # 1. Ensure your database is running.
 # 2. Set the DATABASE_URL environment variable if not using SQLite.
 # 3. Set ERROR_MONITOR_MODULE_URL env var if not using default.
-# 4. Set SDR_SUBMISSION_URL env var for real submission (or keep default local dummy).
-# 5. Ensure the Report Generation module is running and has "uploaded" files to the SAME simulated_storage instance (complex in local setup).
+# 4. Set SDR_SUBMISSION_URL (or SDR_DESTINATIONS for several repositories) for real submission,
+#    or run the stand-in SDR: uvicorn common.sdr_stub:app --port 9999
+# 5. Ensure the Report Generation module writes to the SAME object store (OBJECT_STORE_ROOT / CLOUD_STORAGE_BUCKET_NAME).
 # 6. Run uvicorn: uvicorn main:app --reload --port 8004
@@ -423,6 +423,16 @@ from sqlalchemy import select, desc # For selecting data and ordering
 # src.common에서 로거, DB 설정 및 모델 가져오기
 from common.utils import logger, get_db, ValidationResult, ProcessedSwapDataDB, create_database_tables # Import DB models
 from common.utils import validate_lei, send_alert # Import utilities
+from common.utils import get_async_db, AsyncSessionLocal, AsyncSession # Async session for the write path
+from common.bulk_db import fetch_processed_ids_by_uti, bulk_update_validation_status, bulk_insert_validation_results # Set-based DB operations
+from common.http_client import shared_http_client, get_http_pool_metrics # Pooled, lifespan-managed HTTP clients
+from common.records import SwapRecord # Canonical processed record (stage payloads are its wire dicts)
+from common.structured_logging import RecordLogSampler # Sampled per-record DEBUG logging
+from common.alerts import get_alert_metrics # Coalesced alert dispatch (started by stage_lifespan)
+from common.lei import get_lei_metrics # Memory-mapped GLEIF golden-copy index (LEI existence rules)
+from common.reference_data import get_reference_data_metrics # Hot-reloaded code lists (code rules)
+from common.stage_queue import get_stage_queue, stage_lifespan, StageWorker, QueueFullError, VALIDATION_QUEUE, REPORT_GENERATION_QUEUE # Durable stage hand-off
+from rules import CFTC_RULES, evaluate_rules # Columnar rule engine (src/validation/rules)
 # data-processing 모듈에서 정의한 모델 임포트 (실제로는 공유 모델 사용 또는 API 스펙 정의)
 from data_processing.main import ProcessedSwapData # Pydantic model for input (Processed data)
 
@@ -432,126 +442,69 @@ from data_processing.main import ProcessedSwapData # Pydantic model for input (P
 
 # TODO: Replace hardcoded URLs with Environment Variables injected by Kubernetes
 # ERROR_MONITOR_MODULE_URL = os.environ.get("ERROR_MONITOR_MODULE_URL", "http://error-monitoring-service:80/report_error") # Example in K8s
-# REPORT_GENERATION_MODULE_URL = os.environ.get("REPORT_GENERATION_MODULE_URL", "http://report-generation-service:80/generate-report") # Example in K8s
 ERROR_MONITOR_MODULE_URL = os.environ.get("ERROR_MONITOR_MODULE_URL", "http://localhost:8005/report_error") # Default to Local testing URL
-REPORT_GENERATION_MODULE_URL = os.environ.get("REPORT_GENERATION_MODULE_URL", "http://localhost:8003/generate-report") # Default to Local testing URL (P2 module)
+
+# --- Stage queues: consume processed rows from 'validation', publish valid rows to 'report-generation' ---
+report_generation_queue = get_stage_queue(REPORT_GENERATION_QUEUE)
+
+
+async def handle_validation_batch(payloads: List[Dict[str, Any]], db: AsyncSession) -> None:
+    """Stage worker handler for the 'validation' queue (payloads are SwapRecord wire dicts)."""
+    await validate_records([SwapRecord.from_dict(payload) for payload in payloads], db)
+
+
+# Per-record DEBUG messages (LOG_RECORD_SAMPLE_RATE); batch summaries stay at INFO
+record_log = RecordLogSampler(logger)
+
+validation_worker = StageWorker(get_stage_queue(VALIDATION_QUEUE), handle_validation_batch, session_factory=AsyncSessionLocal)
 
 
 # --- FastAPI 앱 인스턴스 생성 ---
-app = FastAPI()
+app = FastAPI(lifespan=stage_lifespan(validation_worker)) # Runs the validation queue consumer; closes pooled HTTP clients on shutdown
 
 @app.post("/validate")
-async def validate_swap_data(data: List[ProcessedSwapData], db: Session = Depends(get_db)): # Receives ProcessedSwapData model from Processing module
+async def validate_swap_data(data: List[ProcessedSwapData], db: AsyncSession = Depends(get_async_db)): # Receives ProcessedSwapData model from Processing module
     """
     API endpoint to validate processed swap trade data against regulatory rules.
-    Performs validation, stores results in the database, and forwards valid data
-    to report generation and invalid data to error monitor.
+    Performs validation, stores results in the database, enqueues valid data
+    for report generation (same transaction) and reports invalid data to error monitor.
     """
     logger.info(f"Received {len(data)} data entries for validation from Processing.")
+    # The Pydantic models are the API contract only; validation works on SwapRecords
+    return await validate_records([SwapRecord.from_dict(entry.model_dump()) for entry in data], db)
 
-    validation_results_list: List[ValidationResult] = [] # SQLAlchemy models for DB
+
+async def validate_records(data: List[SwapRecord], db: AsyncSession) -> Dict[str, Any]:
+    """Validation of a batch of processed records (shared by /validate and the 'validation' stage worker)."""
+
+    validation_results_list: List[Dict[str, Any]] = [] # validation_results rows for bulk insert
     invalid_entries_for_reporting: List[Dict[str, Any]] = [] # Data and errors to send to error monitor
-    valid_entries: List[ProcessedSwapData] = [] # Data that passed validation, for next module
+    valid_entries: List[SwapRecord] = [] # Data that passed validation, for next module
 
     # Dictionary to hold updates for ProcessedSwapDataDB status
     processed_data_updates: Dict[str, str] = {} # {uti: validation_status}
 
-    for entry in data:
-        trade_id = entry.unique_transaction_identifier
-        is_valid = True
-        errors: List[str] = [] # List to store validation error messages
-
-        logger.info(f"Validating entry with UTI: {trade_id}")
-
-        # --- Core Validation Logic (Based on CFTC Part 45/43 and CDE examples) ---
-        # Implement comprehensive validation rules here. Refer to the CFTC document.
-
-        # Rule 1: Check if Processing had critical errors (already reported, but mark as invalid here)
-        if entry.processing_errors:
-             is_valid = False
-             errors.extend([f"Processing Error: {err}" for err in entry.processing_errors])
-             logger.warning(f"Validation failed for UTI {trade_id} due to processing errors.") # Already logged in processing, but useful here
-
-
-        # Rule 2: Check if Notional Amount is positive and valid (re-check after processing)
-        if entry.notional_amount is None or entry.notional_amount <= 0:
-            is_valid = False
-            errors.append("Notional Amount must be a positive value.")
-            logger.warning(f"Validation failed for UTI {trade_id}: Notional Amount is not positive or missing.")
-
-        # Rule 3: Check if required Date fields are present and in valid format (YYYY-MM-DD)
-        try:
-            datetime.strptime(entry.effective_date, '%Y-%m-%d')
-        except (ValueError, TypeError):
-            is_valid = False
-            errors.append(f"Effective Date '{entry.effective_date}' is missing or invalid format (YYYY-MM-DD).")
-            logger.warning(f"Validation failed for UTI {trade_id}: Invalid Effective Date.")
+    # --- Core Validation Logic (Based on CFTC Part 45/43 and CDE examples) ---
+    # All rules are evaluated column-wise over the whole batch; see src/validation/rules/cftc.py
+    # for the rule table. Add new rules there rather than in this loop.
+    rule_results = evaluate_rules(data, CFTC_RULES)
+    for rule_code, failure_count in rule_results.failure_counts.items():
+        logger.warning(f"Validation rule {rule_code} failed for {failure_count} of {len(data)} entries.")
 
-        try:
-            datetime.strptime(entry.termination_date, '%Y-%m-%d')
-        except (ValueError, TypeError):
-            is_valid = False
-            errors.append(f"Termination Date '{entry.termination_date}' is missing or invalid format (YYYY-MM-DD).")
-            logger.warning(f"Validation failed for UTI {trade_id}: Invalid Termination Date.")
-
-        # Rule 4: Check if Effective Date is before or equal to Termination Date
-        if is_valid and entry.effective_date and entry.termination_date: # Only check if dates are valid format based on Rule 3
-            try:
-                eff_date = datetime.strptime(entry.effective_date, '%Y-%m-%d')
-                term_date = datetime.strptime(entry.termination_date, '%Y-%m-%d')
-                if eff_date > term_date:
-                     is_valid = False
-                     errors.append("Effective Date must be before or equal to Termination Date.")
-                     logger.warning(f"Validation failed for UTI {trade_id}: Effective Date after Termination Date.")
-            except Exception as e:
-                 # Should not happen if previous date format checks passed, but for safety
-                 logger.error(f"Unexpected error during date comparison for UTI {trade_id}: {e}", exc_info=True)
-                 is_valid = False # Treat as invalid if comparison fails unexpectedly
-                 errors.append(f"Internal error comparing dates: {e}")
-                 send_alert("Error", f"Internal error during date comparison for UTI {trade_id}", {"module": "validation", "uti": trade_id, "error": str(e)})
-
-
-        # Rule 5: Check LEI format validity (using common utility) - Re-check
-        if not validate_lei(entry.reporting_counterparty_lei):
-            is_valid = False
-            errors.append(f"Reporting Counterparty LEI '{entry.reporting_counterparty_lei}' has invalid format.")
-            logger.warning(f"Validation failed for UTI {trade_id}: Invalid Reporting Counterparty LEI format.")
-
-        if not validate_lei(entry.other_counterparty_lei):
-            is_valid = False
-            errors.append(f"Other Counterparty LEI '{entry.other_counterparty_lei}' has invalid format.")
-            logger.warning(f"Validation failed for UTI {trade_id}: Invalid Other Counterparty LEI format.")
-
-        # Rule 6: Check if required LEIs are present for Action Type NEWT (New Trade)
-        if entry.action_type == "NEWT":
-            if not entry.reporting_counterparty_lei:
-                 is_valid = False
-                 errors.append("Reporting Counterparty LEI is required for NEWT action.")
-                 logger.warning(f"Validation failed for UTI {trade_id}: Reporting LEI missing for NEWT.")
-            if not entry.other_counterparty_lei:
-                 is_valid = False
-                 errors.append("Other Counterparty LEI is required for NEWT action.")
-                 logger.warning(f"Validation failed for UTI {trade_id}: Other LEI missing for NEWT.")
-
-        # TODO: Add many more validation rules based on specific regulations (Part 45/43, CDE)
-        # - Asset class specific rules (e.g., IRS requires specific rate fields)
-        # - Conditional field requirements based on Action Type or Event Type
-        # - Consistency checks across related fields (e.g., Price Currency must match Notional Currency if applicable)
-        # - LEI status check (Active) - might require external lookup (P2/P3 feature)
-        # - Collateral/Margin fields validation (refer to document snippets)
-        #   - Check presence and format of variation_margin_collected, currency_of_variation_margin_collected etc. (Pages 60-61)
-
-        # --- End of Validation Rules ---
+    validation_timestamp = datetime.utcnow()
+    for row, (entry, is_valid) in enumerate(zip(data, rule_results.is_valid.tolist())):
+        trade_id = entry.unique_transaction_identifier
+        errors = rule_results.errors_for(row)
+        record_log.debug("Validating entry with UTI %s", trade_id)
 
-        # Create SQLAlchemy DB model instance for validation result
-        db_validation_result = ValidationResult(
-            unique_transaction_identifier = trade_id,
-            is_valid = is_valid,
-            errors = errors,
-            validation_timestamp = datetime.utcnow(),
-            # processed_data_id will be linked after committing processed data updates
-        )
-        validation_results_list.append(db_validation_result)
+        # Row for the validation_results table (inserted in bulk below)
+        validation_results_list.append({
+            "unique_transaction_identifier": trade_id,
+            "is_valid": is_valid,
+            "errors": errors,
+            "validation_timestamp": validation_timestamp,
+            # processed_data_id is linked after resolving all UTIs in one query
+        })
 
         # Store validation status to update the ProcessedSwapDataDB record later
         processed_data_updates[trade_id] = "Valid" if is_valid else "Invalid"
@@ -561,7 +514,7 @@ async def validate_swap_data(data: List[ProcessedSwapData], db: Session = Depend
             # Prepare data for error reporting
             invalid_entries_for_reporting.append({
                 "source_module": "validation",
-                "data": entry.model_dump(), # Send the processed data payload
+                "data": entry.to_dict(), # Send the processed data payload
                 "errors": errors
             })
             send_alert("Warning" if not entry.processing_errors else "Error", # Escalate if processing errors were present
@@ -570,37 +523,41 @@ async def validate_swap_data(data: List[ProcessedSwapData], db: Session = Depend
         else:
             valid_entries.append(entry)
 
-    logger.info(f"Finished validation for {len(data)} entries. Found {len(invalid_entries_for_reporting)} invalid entries.")
+    logger.info(
+        "Finished validation for %d entries. Found %d invalid entries.", len(data), len(invalid_entries_for_reporting),
+        extra={"stage": "validation", "batch_size": len(data), "invalid_count": len(invalid_entries_for_reporting),
+               "rule_failures": dict(rule_results.failure_counts)},
+    )
 
-    # --- Database Operations ---
+    # --- Database Operations (set-based: queries scale with chunks/statuses, not rows) ---
+    # The bulk helpers take a sync Session; run_sync runs them on the AsyncSession's connection
+    # without blocking the event loop.
     try:
-        # 1. Update the validation_status in the processed data records
-        # Find the corresponding processed data records in the DB by UTI
-        utis_to_update = list(processed_data_updates.keys())
-        if utis_to_update:
-             processed_records_to_update = db.query(ProcessedSwapDataDB).filter(
-                 ProcessedSwapDataDB.unique_transaction_identifier.in_(utis_to_update)
-             ).all()
-
-             for record in processed_records_to_update:
-                 record.validation_status = processed_data_updates.get(record.unique_transaction_identifier, record.validation_status)
-                 # Link the validation result to the processed data record ID
-                 # Find the validation result for this UTI in our list
-                 validation_result_for_uti = next((vr for vr in validation_results_list if vr.unique_transaction_identifier == record.unique_transaction_identifier), None)
-                 if validation_result_for_uti:
-                      validation_result_for_uti.processed_data_id = record.id # Link the validation result DB record
-
-             db.add_all(processed_records_to_update) # Stage the updates
-
-        # 2. Add the new validation result records
-        db.add_all(validation_results_list)
-
-        # 3. Commit the transaction (updates and new records)
-        db.commit()
-        logger.info(f"Successfully simulated storing {len(validation_results_list)} validation results and updating {len(processed_data_updates)} processed data statuses in DB.")
+        # 1. Resolve processed_swap_data ids for all UTIs in one IN (...) query
+        processed_ids_by_uti = await db.run_sync(fetch_processed_ids_by_uti, list(processed_data_updates.keys()))
+        for result in validation_results_list:
+            result["processed_data_id"] = processed_ids_by_uti.get(result["unique_transaction_identifier"])
+
+        # 2. Apply validation_status with one bulk UPDATE per status value
+        updated_count = await db.run_sync(bulk_update_validation_status, processed_data_updates)
+
+        # 3. Insert the new validation result records in bulk
+        await db.run_sync(bulk_insert_validation_results, validation_results_list)
+
+        # 4. Enqueue valid entries for the next stage (Report Generation - P2) in the same transaction
+        if valid_entries:
+            await report_generation_queue.publish_async([entry.to_dict() for entry in valid_entries], db=db)
+
+        # 5. Commit the transaction (updates, new records and queued messages)
+        await db.commit()
+        logger.info(f"Successfully stored {len(validation_results_list)} validation results and updated {updated_count} processed data statuses in DB.")
 
+    except QueueFullError as exc:
+        await db.rollback()
+        logger.warning(f"Report generation queue is full, rejecting validation batch: {exc}")
+        raise HTTPException(status_code=503, detail=str(exc), headers={"Retry-After": "30"})
     except Exception as e:
-        db.rollback() # Rollback the transaction in case of error
+        await db.rollback() # Rollback the transaction in case of error
         logger.error(f"Failed to store validation results or update processed data status in database: {e}", exc_info=True)
         send_alert("Critical", f"Database error storing validation results: {e}", {"module": "validation", "error": str(e)})
         # If database storage fails, we cannot proceed reliably.
@@ -611,7 +568,7 @@ async def validate_swap_data(data: List[ProcessedSwapData], db: Session = Depend
     if invalid_entries_for_reporting:
         logger.info(f"Reporting {len(invalid_entries_for_reporting)} invalid entries to error monitor.")
         try:
-            async with httpx.AsyncClient() as client:
+            async with shared_http_client(ERROR_MONITOR_MODULE_URL) as client:
                 # Use the URL from environment variables
                 response = await client.post(ERROR_MONITOR_MODULE_URL, json=invalid_entries_for_reporting, timeout=30.0)
                 response.raise_for_status()
@@ -625,29 +582,7 @@ async def validate_swap_data(data: List[ProcessedSwapData], db: Session = Depend
              send_alert("Critical", f"Unexpected error reporting validation failures: {e}", {"module": "validation", "error": str(e), "target_url": ERROR_MONITOR_MODULE_URL})
 
 
-    # Forward valid entries to the next stage (Report Generation - P2)
-    if valid_entries:
-         logger.info(f"Passing {len(valid_entries)} valid entries to the next stage (Report Generation).")
-         try:
-             async with httpx.AsyncClient() as client:
-                 # Use the URL from environment variables
-                 # Convert Pydantic models to dicts for JSON payload
-                 response = await client.post(REPORT_GENERATION_MODULE_URL, json=[entry.model_dump() for entry in valid_entries], timeout=60.0)
-                 response.raise_for_status()
-                 logger.info(f"Successfully sent {len(valid_entries)} valid entries to report generation module. Response: {response.json()}")
-                 # TODO: Handle report generation module response
-
-         except httpx.RequestError as exc:
-             logger.error(f"Failed to send valid data to report generation module: {exc}", exc_info=True)
-             send_alert("Error", f"Failed to forward valid data to report generation: {exc}", {"module": "validation", "error": str(exc), "target_url": REPORT_GENERATION_MODULE_URL})
-             # TODO: Implement robust error handling: retry, DLQ, or mark data for later processing
-         except Exception as e:
-             logger.error(f"An unexpected error occurred during report generation module call: {e}", exc_info=True)
-             send_alert("Critical", f"Unexpected error calling report generation module: {e}", {"module": "validation", "error": str(e), "target_url": REPORT_GENERATION_MODULE_URL})
-             # TODO: Implement robust error handling
-
-
-    return {"status": "success", "validated_count": len(data), "invalid_count": len(invalid_entries_for_reporting), "valid_count": len(valid_entries), "report_generation_forward_status": "attempted"}
+    return {"status": "success", "validated_count": len(data), "invalid_count": len(invalid_entries_for_reporting), "valid_count": len(valid_entries), "report_generation_forward_status": "queued" if valid_entries else "skipped (no valid entries)"}
 
 # --- P3: Admin UI를 위한 API 엔드포인트 추가 ---
 @app.get("/validation-results")
@@ -714,10 +649,11 @@ async def health_check(db: Session = Depends(get_db)):
         logger.error(f"Database health check failed: {e}", exc_info=True)
         send_alert("Critical", f"Database connectivity issue in Validation: {e}", {"module": "validation", "check": "db_connectivity"})
 
-    return {"status": "ok", "database_status": db_status}
+    return {"status": "ok", "database_status": db_status, "stage_worker": validation_worker.status(), "alerts": get_alert_metrics(), "http_pools": get_http_pool_metrics(), "gleif_index": get_lei_metrics(), "reference_data": get_reference_data_metrics()}
 
 # To run this module locally:
 # 1. Ensure your database is running.
 # 2. Set the DATABASE_URL environment variable if not using SQLite.
-# 3. Set ERROR_MONITOR_MODULE_URL and REPORT_GENERATION_MODULE_URL env vars if not using defaults.
+# 3. Set ERROR_MONITOR_MODULE_URL (and STAGE_QUEUE_* if needed) env vars if not using defaults.
+#    Set GLEIF_INDEX_PATH or GLEIF_GOLDEN_COPY_PATH to enable the LEI existence check.
 # 4. Run uvicorn: uvicorn main:app --reload --port 8002
@@ -0,0 +1,4 @@
+# src/validation/rules/__init__.py
+
+from .engine import ColumnBatch, Rule, BatchValidationResult, evaluate_rules
+from .cftc import CFTC_RULES
@@ -0,0 +1,53 @@
+# src/validation/rules/cftc.py
+
+from common.lei import validate_leis, registered_leis
+from common.reference_data import check_many, CURRENCIES, ASSET_CLASSES, ACTION_TYPES, EVENT_TYPES
+
+from .engine import (
+    Rule,
+    non_empty_list,
+    positive,
+    iso_date,
+    date_not_after,
+    distinct_batch_predicate,
+    required_when,
+)
+
+
+def known_code(code_list: str):
+    """Batch predicate for distinct_batch_predicate: value is in the reference code list (missing values pass)."""
+    return lambda values: check_many(code_list, values, allow_missing=True)
+
+
+# --- CFTC Part 45/43 검증 규칙 테이블 ---
+# Rules are evaluated in this order; messages match the original row-by-row validator.
+# To add a rule, append an entry here (use an existing builder from rules.engine or add
+# a new builder there if the check shape is new).
+CFTC_RULES = [
+    # Rule 1: Processing had errors (already reported by processing, but the record is invalid)
+    Rule("PROCESSING_ERROR", non_empty_list("processing_errors"), "Processing Error: {item}", expand_field="processing_errors"),
+    # Rule 2: Notional Amount must be present and positive
+    Rule("NOTIONAL_NOT_POSITIVE", positive("notional_amount"), "Notional Amount must be a positive value."),
+    # Rule 3: Date fields must be present and YYYY-MM-DD
+    Rule("EFFECTIVE_DATE_FORMAT", iso_date("effective_date"), "Effective Date '{effective_date}' is missing or invalid format (YYYY-MM-DD)."),
+    Rule("TERMINATION_DATE_FORMAT", iso_date("termination_date"), "Termination Date '{termination_date}' is missing or invalid format (YYYY-MM-DD)."),
+    # Rule 4: Effective Date <= Termination Date (only checked when all earlier rules passed)
+    Rule("EFFECTIVE_AFTER_TERMINATION", date_not_after("effective_date", "termination_date"), "Effective Date must be before or equal to Termination Date.", requires_valid=True),
+    # Rule 5: LEI format and MOD 97-10 check digits (ISO 17442)
+    Rule("REPORTING_LEI_FORMAT", distinct_batch_predicate("reporting_counterparty_lei", validate_leis), "Reporting Counterparty LEI '{reporting_counterparty_lei}' has invalid format."),
+    Rule("OTHER_LEI_FORMAT", distinct_batch_predicate("other_counterparty_lei", validate_leis), "Other Counterparty LEI '{other_counterparty_lei}' has invalid format."),
+    # Rule 5b: well-formed LEIs must exist in the GLEIF golden copy (skipped when no index is configured, see common/lei.py)
+    Rule("REPORTING_LEI_NOT_REGISTERED", distinct_batch_predicate("reporting_counterparty_lei", registered_leis), "Reporting Counterparty LEI '{reporting_counterparty_lei}' is not registered in the GLEIF golden copy."),
+    Rule("OTHER_LEI_NOT_REGISTERED", distinct_batch_predicate("other_counterparty_lei", registered_leis), "Other Counterparty LEI '{other_counterparty_lei}' is not registered in the GLEIF golden copy."),
+    # Rule 6: LEIs required for NEWT (New Trade)
+    Rule("NEWT_REPORTING_LEI_REQUIRED", required_when("reporting_counterparty_lei", "action_type", "NEWT"), "Reporting Counterparty LEI is required for NEWT action."),
+    Rule("NEWT_OTHER_LEI_REQUIRED", required_when("other_counterparty_lei", "action_type", "NEWT"), "Other Counterparty LEI is required for NEWT action."),
+    # Rule 7: Enumerated fields must use reference codes (src/common/reference_data, hot-reloaded)
+    Rule("NOTIONAL_CURRENCY_CODE", distinct_batch_predicate("notional_currency", known_code(CURRENCIES)), "Notional Currency '{notional_currency}' is not a valid ISO 4217 code."),
+    Rule("PRICE_CURRENCY_CODE", distinct_batch_predicate("price_currency", known_code(CURRENCIES)), "Price Currency '{price_currency}' is not a valid ISO 4217 code."),
+    Rule("ASSET_CLASS_CODE", distinct_batch_predicate("asset_class", known_code(ASSET_CLASSES)), "Asset Class '{asset_class}' is not a valid CFTC asset class."),
+    Rule("ACTION_TYPE_CODE", distinct_batch_predicate("action_type", known_code(ACTION_TYPES)), "Action Type '{action_type}' is not a valid CFTC action type."),
+    Rule("EVENT_TYPE_CODE", distinct_batch_predicate("event_type", known_code(EVENT_TYPES)), "Event Type '{event_type}' is not a valid CFTC event type."),
+    # TODO: Asset class specific rules, conditional fields by Action/Event Type,
+    # cross-field consistency and collateral/margin fields (Pages 60-61)
+]
@@ -0,0 +1,242 @@
+# src/validation/rules/engine.py
+
+import re
+from collections import defaultdict
+from dataclasses import dataclass, field
+from datetime import date, datetime
+from functools import lru_cache
+from itertools import repeat
+from operator import itemgetter
+from string import Formatter
+from typing import List, Dict, Any, Callable, Iterable, Optional, Sequence
+
+import numpy as np
+
+# --- 컬럼 기반 (Columnar) 검증 엔진 ---
+# A batch is converted once into NumPy columns and every rule is evaluated as a
+# boolean failure mask over the whole batch. Expensive scalar checks (strptime,
+# LEI format) run once per *distinct* value and are broadcast back, since dates
+# and LEIs repeat heavily within a reporting batch. Each field is factorized on its
+# own, so a check runs once per distinct value of its field (a joint factorization
+# would run it once per distinct combination). Messages are only formatted
+# for failing rows, in rule order, so they match the row-by-row validator exactly.
+
+
+class ColumnBatch:
+    """
+    Column view of a batch of processed swap records.
+    Accepts Pydantic models, slotted records (SwapRecord) or dicts; string fields become object arrays,
+    numeric fields float64 arrays (None -> NaN).
+    """
+
+    def __init__(self, records: Sequence[Any], numeric_fields: Iterable[str] = ("notional_amount", "price")):
+        self.size = len(records)
+        if records and not isinstance(records[0], dict):
+            if hasattr(records[0], "__dict__"):
+                records = [record.__dict__ for record in records] # Pydantic models: read field values directly
+            else:
+                records = [{name: getattr(record, name) for name in record.__slots__} for record in records] # Slotted records (SwapRecord)
+        self._records = records
+        self._numeric_fields = set(numeric_fields)
+        self._values: Dict[str, List[Any]] = {}
+        self._columns: Dict[str, np.ndarray] = {}
+        self._factorized: Dict[str, Any] = {}
+        self._derived: Dict[Any, np.ndarray] = {}
+
+    def values(self, name: str) -> List[Any]:
+        """Raw Python values of a field, in row order (cached)."""
+        values = self._values.get(name)
+        if values is None:
+            try:
+                values = list(map(itemgetter(name), self._records))
+            except KeyError:
+                values = list(map(dict.get, self._records, repeat(name))) # Field missing from some records
+            self._values[name] = values
+        return values
+
+    def __getitem__(self, name: str) -> np.ndarray:
+        column = self._columns.get(name)
+        if column is None:
+            if name in self._numeric_fields:
+                column = np.array(self.values(name), dtype=np.float64) # None -> NaN
+            else:
+                column = np.fromiter(self.values(name), dtype=object, count=self.size)
+            self._columns[name] = column
+        return column
+
+    def _factorize_values(self, values: Iterable[Any]):
+        # defaultdict(len) assigns the next code on first sight: one hash lookup per row
+        index: Dict[Any, int] = defaultdict()
+        index.default_factory = index.__len__
+        codes = np.fromiter(map(index.__getitem__, values), dtype=np.intp, count=self.size)
+        return list(index), codes
+
+    def factorize(self, name: str):
+        """
+        Splits a column into (distinct values, per-row codes) so scalar checks can run
+        once per distinct value and be broadcast back with a NumPy take (cached).
+        """
+        factorized = self._factorized.get(name)
+        if factorized is None:
+            factorized = self._factorized[name] = self._factorize_values(self.values(name))
+        return factorized
+
+    def map_distinct(self, name: str, func: Callable[[Any], Any], dtype) -> np.ndarray:
+        """Applies `func` once per distinct value of a column and broadcasts the result (memoized per column/func)."""
+        key = (name, func)
+        mapped = self._derived.get(key)
+        if mapped is None:
+            uniques, codes = self.factorize(name)
+            mapped = np.fromiter(map(func, uniques), dtype=dtype, count=len(uniques))[codes]
+            self._derived[key] = mapped
+        return mapped
+
+    def map_distinct_batch(self, name: str, func: Callable[[List[Any]], Sequence[Any]], dtype) -> np.ndarray:
+        """Like map_distinct, but `func` takes the list of distinct values and returns one result per value."""
+        key = (name, func)
+        mapped = self._derived.get(key)
+        if mapped is None:
+            uniques, codes = self.factorize(name)
+            mapped = np.asarray(func(uniques), dtype=dtype)[codes] if uniques else np.zeros(0, dtype=dtype)
+            self._derived[key] = mapped
+        return mapped
+
+
+@dataclass(frozen=True)
+class Rule:
+    """
+    Declarative validation rule.
+    - check: returns a boolean mask of *failing* rows for a ColumnBatch
+    - message: str.format template over record fields (or `{item}` when expand_field is set)
+    - expand_field: list field producing one message per item (e.g. processing_errors)
+    - requires_valid: only evaluated for rows that passed every earlier rule
+    """
+    code: str
+    check: Callable[[ColumnBatch], np.ndarray]
+    message: str
+    expand_field: Optional[str] = None
+    requires_valid: bool = False
+    message_fields: tuple = field(init=False, default=())
+
+    def __post_init__(self):
+        names = tuple(name for _, name, _, _ in Formatter().parse(self.message) if name)
+        object.__setattr__(self, "message_fields", names)
+
+
+# --- Rule builders (used by declarative rule tables) ---
+
+_STRICT_ISO_DATE = re.compile(r"[0-9]{4}-[0-9]{2}-[0-9]{2}")
+
+
+def _iso_date_ordinal(value: Any) -> int:
+    """Ordinal for a valid YYYY-MM-DD string (same acceptance as datetime.strptime), -1 otherwise."""
+    try:
+        if _STRICT_ISO_DATE.fullmatch(value):
+            return date.fromisoformat(value).toordinal() # ~10x faster; same result on zero-padded dates
+        return datetime.strptime(value, '%Y-%m-%d').toordinal() # strptime also takes e.g. 2024-1-5
+    except (ValueError, TypeError):
+        return -1
+
+
+@lru_cache(maxsize=None)
+def _equals(expected: Any) -> Callable[[Any], bool]:
+    """Cached equality predicate, so map_distinct can memoize it across rules."""
+    return lambda value: value == expected
+
+
+def non_empty_list(name: str) -> Callable[[ColumnBatch], np.ndarray]:
+    """Fails rows whose list field is non-empty."""
+    def check(batch: ColumnBatch) -> np.ndarray:
+        return np.fromiter(map(bool, batch.values(name)), dtype=bool, count=batch.size)
+    return check
+
+
+def positive(name: str) -> Callable[[ColumnBatch], np.ndarray]:
+    """Fails rows where the numeric field is missing or <= 0."""
+    def check(batch: ColumnBatch) -> np.ndarray:
+        column = batch[name]
+        return np.isnan(column) | (column <= 0)
+    return check
+
+
+def iso_date(name: str) -> Callable[[ColumnBatch], np.ndarray]:
+    """Fails rows where the field is missing or not a valid YYYY-MM-DD date."""
+    return lambda batch: batch.map_distinct(name, _iso_date_ordinal, np.int64) < 0
+
+
+def date_not_after(start: str, end: str) -> Callable[[ColumnBatch], np.ndarray]:
+    """Fails rows where `start` is after `end` (both must already be valid dates)."""
+    def check(batch: ColumnBatch) -> np.ndarray:
+        start_ordinal = batch.map_distinct(start, _iso_date_ordinal, np.int64)
+        end_ordinal = batch.map_distinct(end, _iso_date_ordinal, np.int64)
+        return (start_ordinal >= 0) & (end_ordinal >= 0) & (start_ordinal > end_ordinal)
+    return check
+
+
+def distinct_predicate(name: str, predicate: Callable[[Any], bool]) -> Callable[[ColumnBatch], np.ndarray]:
+    """Fails rows where `predicate(value)` is False; predicate runs once per distinct value."""
+    return lambda batch: ~batch.map_distinct(name, predicate, bool)
+
+
+def distinct_batch_predicate(name: str, predicate: Callable[[List[Any]], Sequence[bool]]) -> Callable[[ColumnBatch], np.ndarray]:
+    """Fails rows whose value `predicate` marks False; predicate gets all distinct values in one call (batch APIs)."""
+    return lambda batch: ~batch.map_distinct_batch(name, predicate, bool)
+
+
+def required_when(name: str, condition_field: str, condition_value: Any) -> Callable[[ColumnBatch], np.ndarray]:
+    """Fails rows where `condition_field == condition_value` and `name` is empty or missing."""
+    def check(batch: ColumnBatch) -> np.ndarray:
+        applies = batch.map_distinct(condition_field, _equals(condition_value), bool)
+        return applies & ~batch.map_distinct(name, bool, bool)
+    return check
+
+
+# --- Evaluation ---
+
+@dataclass
+class BatchValidationResult:
+    """
+    Outcome of evaluating a rule set against a batch.
+    error_codes / errors are keyed by row index and only hold failing rows,
+    so a mostly-valid batch does not allocate a list per record.
+    """
+    is_valid: np.ndarray
+    error_codes: Dict[int, List[str]]
+    errors: Dict[int, List[str]]
+    failure_counts: Dict[str, int]
+
+    def errors_for(self, row: int) -> List[str]:
+        """Error messages for `row` in rule order (empty list when the row is valid)."""
+        return self.errors.get(row, [])
+
+
+def evaluate_rules(records: Sequence[Any], rules: Sequence[Rule]) -> BatchValidationResult:
+    """
+    Evaluates `rules` in order against all records at once.
+    Returns per-row validity plus error codes and messages (in rule order) for failing rows.
+    """
+    batch = records if isinstance(records, ColumnBatch) else ColumnBatch(records)
+    failed = np.zeros(batch.size, dtype=bool)
+    error_codes: Dict[int, List[str]] = {}
+    errors: Dict[int, List[str]] = {}
+    failure_counts: Dict[str, int] = {}
+
+    for rule in rules:
+        mask = np.asarray(rule.check(batch), dtype=bool)
+        if rule.requires_valid:
+            mask = mask & ~failed
+        failing_rows = np.flatnonzero(mask)
+        if failing_rows.size == 0:
+            continue
+
+        failure_counts[rule.code] = int(failing_rows.size)
+        message_columns = {name: batch.values(name) for name in rule.message_fields if name != "item"}
+        for row in failing_rows.tolist():
+            error_codes.setdefault(row, []).append(rule.code)
+            if rule.expand_field:
+                errors.setdefault(row, []).extend(rule.message.format(item=item) for item in batch.values(rule.expand_field)[row])
+            else:
+                errors.setdefault(row, []).append(rule.message.format(**{name: column[row] for name, column in message_columns.items()}))
+        failed |= mask
+
+    return BatchValidationResult(is_valid=~failed, error_codes=error_codes, errors=errors, failure_counts=failure_counts)
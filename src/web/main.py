@@ -203,16 +203,23 @@ async def health_check():
 
 # src/web/main.py
 
-from fastapi import FastAPI, HTTPException, Query, Depends
+from fastapi import FastAPI, HTTPException, Query, Depends, Request
 from fastapi.responses import HTMLResponse # Example for serving a simple HTML page
 from fastapi.staticfiles import StaticFiles # Example for serving static files
 from typing import List, Dict, Any, Optional
 import uvicorn
 import httpx # Used for calling other internal services
 import os # To read environment variables
+import json
+
+# --- SQLAlchemy Imports ---
+from sqlalchemy.orm import Session
 
 # src.common에서 로거 가져오기
-from common.utils import logger
+from common.utils import logger, get_db
+from common.http_client import shared_http_client, get_http_client, http_client_lifespan, get_http_pool_metrics # Pooled, lifespan-managed HTTP clients
+from common.response_cache import ResponseCache # TTL + ETag cache of the /api/* list proxies
+from common.fanout import gather_sections # Concurrent dashboard sections with per-call timeouts
 
 # TODO: Replace hardcoded URLs with Environment Variables injected by Kubernetes
 # ERROR_MONITOR_SERVICE_URL = os.environ.get("ERROR_MONITOR_SERVICE_URL", "http://error-monitoring-service:80") # Example in K8s
@@ -225,9 +232,19 @@ DATA_PROCESSING_SERVICE_URL = os.environ.get("DATA_PROCESSING_SERVICE_URL", "htt
 REPORT_GENERATION_SERVICE_URL = os.environ.get("REPORT_GENERATION_SERVICE_URL", "http://localhost:8003") # Default to Local testing URL
 REPORT_SUBMISSION_SERVICE_URL = os.environ.get("REPORT_SUBMISSION_SERVICE_URL", "http://localhost:8004") # Default to Local testing URL
 
+DASHBOARD_SECTION_LIMIT = int(os.environ.get("DASHBOARD_SECTION_LIMIT", "20")) # Rows per /api/dashboard section
+
+
+# --- 응답 캐시 (polling 대시보드의 upstream 부하 완화) ---
+# Namespaces are invalidated by the write endpoints below; see common/response_cache.py
+response_cache = ResponseCache()
+
+# Namespaces whose cached lists a write through the BFF makes stale
+ERROR_WRITE_INVALIDATES = ("errors", "processed-data") # A retry re-runs the trade through processing
+
 
 # --- FastAPI 앱 인스턴스 생성 ---
-app = FastAPI()
+app = FastAPI(lifespan=http_client_lifespan) # Closes the pooled HTTP clients on shutdown
 
 # --- Serve static files (e.g., HTML, CSS, JS for the Admin UI frontend) ---
 # Assuming your frontend files are in a 'static' directory within src/web
@@ -263,14 +280,41 @@ async def read_root():
 
 # --- API Endpoints for the Admin UI Frontend (Calling Other Modules) ---
 
+def pagination_params(cursor: Optional[str], exact_count: bool) -> Dict[str, Any]:
+    """Keyset pagination parameters forwarded unchanged to the list endpoints (cursor is opaque to the BFF)."""
+    params: Dict[str, Any] = {"exact_count": exact_count}
+    if cursor:
+        params["cursor"] = cursor
+    return params
+
+
+async def fetch_upstream_body(service_url: str, path: str, params: Dict[str, Any], timeout: float = 30.0) -> bytes:
+    """GET of a downstream list endpoint; returns the raw JSON body (httpx errors propagate, so they are never cached)."""
+    async with shared_http_client(service_url) as client:
+        response = await client.get(f"{service_url}{path}", params=params, timeout=timeout)
+        response.raise_for_status()
+        return response.content
+
+
+def upstream_error_detail(response: httpx.Response) -> Any:
+    """The `detail` of a FastAPI error response from a downstream module, or its raw body."""
+    try:
+        return response.json().get("detail", response.text)
+    except ValueError:
+        return response.text
+
+
 # --- Error Management Endpoints ---
 @app.get("/api/errors")
 async def get_errors_for_ui(
+    request: Request,
     status: Optional[str] = Query(None, description="Filter by error status"),
     source_module: Optional[str] = Query(None, description="Filter by source module"),
     trade_id: Optional[str] = Query(None, description="Filter by trade ID or UTI (partial match)"),
     limit: int = Query(100, description="Maximum number of errors to return"),
-    offset: int = Query(0, description="Offset for pagination")
+    offset: int = Query(0, description="Offset for pagination (deprecated, ignored when cursor is set)"),
+    cursor: Optional[str] = Query(None, description="Opaque cursor from the previous page's next_cursor"),
+    exact_count: bool = Query(False, description="Compute an exact total_count (slow on large tables)")
 ):
     """
     API endpoint for the Admin UI frontend to fetch error list.
@@ -278,23 +322,25 @@ async def get_errors_for_ui(
     """
     logger.info("Admin UI backend received request to fetch errors.")
     try:
-        async with httpx.AsyncClient() as client:
-            # Forward the request to the Error Monitoring module using its URL from env var
-            response = await client.get(
-                f"{ERROR_MONITOR_SERVICE_URL}/errors",
-                params={
-                    "status": status,
-                    "source_module": source_module,
-                    "trade_id": trade_id,
-                    "limit": limit,
-                    "offset": offset
-                },
-                timeout=30.0
-            )
-            response.raise_for_status()
-            logger.info("Successfully fetched errors from Error Monitoring module.")
-            return response.json() # Return the response from the Error Monitoring module
+        params = {
+            "status": status,
+            "source_module": source_module,
+            "trade_id": trade_id,
+            "limit": limit,
+            "offset": offset,
+            **pagination_params(cursor, exact_count)
+        }
+        # Forward the request to the Error Monitoring module (served from the response cache while fresh)
+        cached = await response_cache.get_or_fetch(
+            "errors", params, lambda: fetch_upstream_body(ERROR_MONITOR_SERVICE_URL, "/errors", params)
+        )
+        logger.info("Successfully fetched errors from Error Monitoring module.")
+        return response_cache.to_response(request, cached) # 304 when the client's ETag is current
 
+    except httpx.HTTPStatusError as exc:
+        # Pass client errors (e.g. an invalid or expired cursor) through instead of masking them as 500
+        logger.warning(f"Fetching errors failed with status {exc.response.status_code}: {exc.response.text}")
+        raise HTTPException(status_code=exc.response.status_code, detail=upstream_error_detail(exc.response))
     except httpx.RequestError as exc:
         logger.error(f"Failed to fetch errors from Error Monitoring module: {exc}", exc_info=True)
         raise HTTPException(status_code=500, detail=f"Failed to fetch errors: {exc}")
@@ -311,7 +357,7 @@ async def get_error_details_for_ui(error_id: str):
     """
     logger.info(f"Admin UI backend received request for error details: {error_id}")
     try:
-        async with httpx.AsyncClient() as client:
+        async with shared_http_client(ERROR_MONITOR_SERVICE_URL) as client:
             # Forward the request to the Error Monitoring module using its URL from env var
             response = await client.get(
                 f"{ERROR_MONITOR_SERVICE_URL}/errors/{error_id}",
@@ -342,7 +388,7 @@ async def update_error_status_for_ui(error_id: str, new_status: str, db: Session
     """
     logger.info(f"Admin UI backend received request to update status for error {error_id} to {new_status}")
     try:
-        async with httpx.AsyncClient() as client:
+        async with shared_http_client(ERROR_MONITOR_SERVICE_URL) as client:
             # Forward the request to the Error Monitoring module using its URL from env var
             response = await client.put(
                 f"{ERROR_MONITOR_SERVICE_URL}/errors/{error_id}/status",
@@ -351,6 +397,7 @@ async def update_error_status_for_ui(error_id: str, new_status: str, db: Session
             )
             response.raise_for_status()
             logger.info(f"Successfully updated status for error {error_id}.")
+            response_cache.invalidate(*ERROR_WRITE_INVALIDATES)
             # TODO: Log the user action (who changed status, when) in the DB
             return response.json() # Return the response from the Error Monitoring module
 
@@ -375,7 +422,7 @@ async def retry_error_processing_for_ui(error_id: str, db: Session = Depends(get
     """
     logger.info(f"Admin UI backend received request to retry processing for error {error_id}")
     try:
-        async with httpx.AsyncClient() as client:
+        async with shared_http_client(ERROR_MONITOR_SERVICE_URL) as client:
             # Forward the request to the Error Monitoring module using its URL from env var
             response = await client.post(
                 f"{ERROR_MONITOR_SERVICE_URL}/errors/{error_id}/retry",
@@ -383,6 +430,7 @@ async def retry_error_processing_for_ui(error_id: str, db: Session = Depends(get
             )
             response.raise_for_status()
             logger.info(f"Successfully initiated retry for error {error_id}.")
+            response_cache.invalidate(*ERROR_WRITE_INVALIDATES)
             # TODO: Log the user action (who initiated retry, when) in the DB
             return response.json() # Return the response from the Error Monitoring module
 
@@ -402,9 +450,12 @@ async def retry_error_processing_for_ui(error_id: str, db: Session = Depends(get
 
 @app.get("/api/processed-data")
 async def get_processed_data_for_ui(
+    request: Request,
     # Add query parameters for filtering, pagination, etc.
     limit: int = Query(100, description="Maximum number of records to return"),
-    offset: int = Query(0, description="Offset for pagination")
+    offset: int = Query(0, description="Offset for pagination (deprecated, ignored when cursor is set)"),
+    cursor: Optional[str] = Query(None, description="Opaque cursor from the previous page's next_cursor"),
+    exact_count: bool = Query(False, description="Compute an exact total_count (slow on large tables)")
     # TODO: Add filters for UTI, date range, status, etc.
 ):
     """
@@ -413,18 +464,17 @@ async def get_processed_data_for_ui(
     """
     logger.info("Admin UI backend received request to fetch processed data.")
     try:
-        async with httpx.AsyncClient() as client:
-            # Call the Data Processing module's API (assuming it has a /processed-data endpoint)
-            # You'll need to implement this endpoint in data-processing/main.py
-            response = await client.get(
-                f"{DATA_PROCESSING_SERVICE_URL}/processed-data",
-                params={"limit": limit, "offset": offset},
-                timeout=30.0
-            )
-            response.raise_for_status()
-            logger.info("Successfully fetched processed data from Data Processing module.")
-            return response.json()
+        params = {"limit": limit, "offset": offset, **pagination_params(cursor, exact_count)}
+        cached = await response_cache.get_or_fetch(
+            "processed-data", params, lambda: fetch_upstream_body(DATA_PROCESSING_SERVICE_URL, "/processed-data", params)
+        )
+        logger.info("Successfully fetched processed data from Data Processing module.")
+        return response_cache.to_response(request, cached)
 
+    except httpx.HTTPStatusError as exc:
+        # Pass client errors (e.g. an invalid or expired cursor) through instead of masking them as 500
+        logger.warning(f"Fetching processed data failed with status {exc.response.status_code}: {exc.response.text}")
+        raise HTTPException(status_code=exc.response.status_code, detail=upstream_error_detail(exc.response))
     except httpx.RequestError as exc:
         logger.error(f"Failed to fetch processed data from Data Processing module: {exc}", exc_info=True)
         raise HTTPException(status_code=500, detail=f"Failed to fetch processed data: {exc}")
@@ -434,9 +484,12 @@ async def get_processed_data_for_ui(
 
 @app.get("/api/reports")
 async def get_reports_for_ui(
+    request: Request,
     # Add query parameters for filtering, pagination, etc.
     limit: int = Query(100, description="Maximum number of records to return"),
-    offset: int = Query(0, description="Offset for pagination")
+    offset: int = Query(0, description="Offset for pagination (deprecated, ignored when cursor is set)"),
+    cursor: Optional[str] = Query(None, description="Opaque cursor from the previous page's next_cursor"),
+    exact_count: bool = Query(False, description="Compute an exact total_count (slow on large tables)")
     # TODO: Add filters for filename, date range, status, etc.
 ):
     """
@@ -445,18 +498,17 @@ async def get_reports_for_ui(
     """
     logger.info("Admin UI backend received request to fetch reports.")
     try:
-        async with httpx.AsyncClient() as client:
-            # Call the Report Generation module's API (assuming it has a /reports endpoint)
-            # You'll need to implement this endpoint in report-generation/main.py
-            response = await client.get(
-                f"{REPORT_GENERATION_SERVICE_URL}/reports",
-                params={"limit": limit, "offset": offset},
-                timeout=30.0
-            )
-            response.raise_for_status()
-            logger.info("Successfully fetched reports from Report Generation module.")
-            return response.json()
+        params = {"limit": limit, "offset": offset, **pagination_params(cursor, exact_count)}
+        cached = await response_cache.get_or_fetch(
+            "reports", params, lambda: fetch_upstream_body(REPORT_GENERATION_SERVICE_URL, "/reports", params)
+        )
+        logger.info("Successfully fetched reports from Report Generation module.")
+        return response_cache.to_response(request, cached)
 
+    except httpx.HTTPStatusError as exc:
+        # Pass client errors (e.g. an invalid or expired cursor) through instead of masking them as 500
+        logger.warning(f"Fetching reports failed with status {exc.response.status_code}: {exc.response.text}")
+        raise HTTPException(status_code=exc.response.status_code, detail=upstream_error_detail(exc.response))
     except httpx.RequestError as exc:
         logger.error(f"Failed to fetch reports from Report Generation module: {exc}", exc_info=True)
         raise HTTPException(status_code=500, detail=f"Failed to fetch reports: {exc}")
@@ -466,9 +518,12 @@ async def get_reports_for_ui(
 
 @app.get("/api/submissions")
 async def get_submissions_for_ui(
+    request: Request,
     # Add query parameters for filtering, pagination, etc.
     limit: int = Query(100, description="Maximum number of records to return"),
-    offset: int = Query(0, description="Offset for pagination")
+    offset: int = Query(0, description="Offset for pagination (deprecated, ignored when cursor is set)"),
+    cursor: Optional[str] = Query(None, description="Opaque cursor from the previous page's next_cursor"),
+    exact_count: bool = Query(False, description="Compute an exact total_count (slow on large tables)")
     # TODO: Add filters for submission ID, report ID, date range, status, etc.
 ):
     """
@@ -477,18 +532,17 @@ async def get_submissions_for_ui(
     """
     logger.info("Admin UI backend received request to fetch submissions.")
     try:
-        async with httpx.AsyncClient() as client:
-            # Call the Report Submission module's API (assuming it has a /submissions endpoint)
-            # You'll need to implement this endpoint in report-submission/main.py
-            response = await client.get(
-                f"{REPORT_SUBMISSION_SERVICE_URL}/submissions",
-                params={"limit": limit, "offset": offset},
-                timeout=30.0
-            )
-            response.raise_for_status()
-            logger.info("Successfully fetched submissions from Report Submission module.")
-            return response.json()
+        params = {"limit": limit, "offset": offset, **pagination_params(cursor, exact_count)}
+        cached = await response_cache.get_or_fetch(
+            "submissions", params, lambda: fetch_upstream_body(REPORT_SUBMISSION_SERVICE_URL, "/submissions", params)
+        )
+        logger.info("Successfully fetched submissions from Report Submission module.")
+        return response_cache.to_response(request, cached)
 
+    except httpx.HTTPStatusError as exc:
+        # Pass client errors (e.g. an invalid or expired cursor) through instead of masking them as 500
+        logger.warning(f"Fetching submissions failed with status {exc.response.status_code}: {exc.response.text}")
+        raise HTTPException(status_code=exc.response.status_code, detail=upstream_error_detail(exc.response))
     except httpx.RequestError as exc:
         logger.error(f"Failed to fetch submissions from Report Submission module: {exc}", exc_info=True)
         raise HTTPException(status_code=500, detail=f"Failed to fetch submissions: {exc}")
@@ -497,6 +551,52 @@ async def get_submissions_for_ui(
         raise HTTPException(status_code=500, detail=f"Unexpected error fetching submissions: {e}")
 
 
+# --- Dashboard (all summaries in one round trip) ---
+
+def dashboard_section(namespace: str, service_url: str, limit: int):
+    """
+    Fetcher of the first page of a list endpoint for /api/dashboard. Uses the same
+    parameters as the list proxies above, so both share the response cache entry.
+    A timed-out section only stops waiting: the shielded upstream fetch completes and
+    fills the cache for the next poll.
+    """
+    params = {"limit": limit, "offset": 0, **pagination_params(None, False)}
+
+    async def fetch():
+        try:
+            cached = await response_cache.get_or_fetch(
+                namespace, params, lambda: fetch_upstream_body(service_url, f"/{namespace}", params)
+            )
+        except httpx.HTTPStatusError as exc:
+            # Short section error for the UI instead of httpx's multi-line message
+            raise RuntimeError(f"{exc.response.status_code}: {upstream_error_detail(exc.response)}") from exc
+        return json.loads(cached.body)
+    return fetch
+
+
+@app.get("/api/dashboard")
+async def get_dashboard_for_ui(
+    limit: int = Query(DASHBOARD_SECTION_LIMIT, ge=1, le=100, description="Rows per section")
+):
+    """
+    API endpoint for the Admin UI frontend's first paint.
+    Fetches the error, processed-data, report and submission summaries concurrently.
+    A section that times out or fails is returned with its status and error instead
+    of failing the whole response (overall status "partial" or "unavailable").
+    """
+    logger.info("Admin UI backend received request for the dashboard.")
+    dashboard = await gather_sections({
+        "errors": dashboard_section("errors", ERROR_MONITOR_SERVICE_URL, limit),
+        "processed_data": dashboard_section("processed-data", DATA_PROCESSING_SERVICE_URL, limit),
+        "reports": dashboard_section("reports", REPORT_GENERATION_SERVICE_URL, limit),
+        "submissions": dashboard_section("submissions", REPORT_SUBMISSION_SERVICE_URL, limit),
+    })
+    if dashboard["status"] != "ok":
+        failed = [name for name, section in dashboard["sections"].items() if section["status"] != "ok"]
+        logger.warning(f"Dashboard served with status '{dashboard['status']}'; unavailable sections: {failed}")
+    return dashboard
+
+
 @app.get("/health")
 async def health_check():
     """
@@ -511,20 +611,19 @@ async def health_check():
         "report_submission": REPORT_SUBMISSION_SERVICE_URL,
     }
 
-    async with httpx.AsyncClient() as client:
-        for service_name, url in services_to_check.items():
-            health_url = f"{url}/health" # Assuming all modules have a /health endpoint
-            try:
-                response = await client.get(health_url, timeout=5.0)
-                response.raise_for_status()
-                dependency_statuses[service_name] = response.json()
-            except Exception as e:
-                dependency_statuses[service_name] = {"status": "down", "error": str(e)}
-                logger.error(f"Health check failed for {service_name} ({health_url}): {e}")
+    for service_name, url in services_to_check.items():
+        health_url = f"{url}/health" # Assuming all modules have a /health endpoint
+        try:
+            response = await get_http_client(health_url).get(health_url, timeout=5.0)
+            response.raise_for_status()
+            dependency_statuses[service_name] = response.json()
+        except Exception as e:
+            dependency_statuses[service_name] = {"status": "down", "error": str(e)}
+            logger.error(f"Health check failed for {service_name} ({health_url}): {e}")
 
     overall_status = "ok" if all(s.get("status") == "ok" for s in dependency_statuses.values()) else "degraded"
 
-    return {"status": overall_status, "dependencies": dependency_statuses}
+    return {"status": overall_status, "dependencies": dependency_statuses, "http_pools": get_http_pool_metrics(), "response_cache": response_cache.metrics()}
 
 # To run this module locally:
 # 1. Set environment variables for all dependent service URLs (ERROR_MONITOR_SERVICE_URL, etc.)
@@ -0,0 +1,110 @@
+# tests/conftest.py
+
+import os
+import random
+import string
+import sys
+
+# src/ 아래의 서비스 공용 모듈(common.*)을 import 할 수 있도록 경로 추가
+# (최상위 common/ 디렉터리보다 src/common 이 우선하도록 맨 앞에 삽입)
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "src")))
+
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+
+
+def make_lei(rng: random.Random) -> str:
+    """MOD 97-10 검증 숫자가 맞는 임의 LEI."""
+    base = "".join(rng.choice(string.ascii_uppercase + string.digits) for _ in range(18))
+    remainder = int("".join(str(int(char, 36)) for char in base + "00")) % 97
+    return f"{base}{98 - remainder:02d}"
+
+
+@pytest.fixture
+def db_url(tmp_path):
+    """ORM 모델(Base.metadata)로 테이블을 만든 임시 SQLite 파일 DB 의 URL."""
+    from common.utils import Base
+
+    url = f"sqlite:///{tmp_path / 'test.db'}"
+    engine = create_engine(url)
+    Base.metadata.create_all(bind=engine)
+    engine.dispose()
+    return url
+
+
+@pytest.fixture
+def session_factory(db_url):
+    """db_url 에 바인딩된 sessionmaker (서비스와 같은 autocommit/autoflush 설정)."""
+    engine = create_engine(db_url)
+    yield sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    engine.dispose()
+
+
+@pytest.fixture
+def db_session(session_factory):
+    session = session_factory()
+    yield session
+    session.close()
+
+
+@pytest.fixture
+def migrated_engine(tmp_path):
+    """
+    Alembic 마이그레이션(alembic upgrade head)을 적용한 DB 엔진.
+    기본은 임시 SQLite 파일. TEST_DATABASE_URL 에 PostgreSQL(빈 스크래치 DB)을 지정하면 그 DB 에서 실행.
+    """
+    alembic_config = pytest.importorskip("alembic.config")
+    alembic_command = pytest.importorskip("alembic.command")
+
+    db_url = os.environ.get("TEST_DATABASE_URL", f"sqlite:///{tmp_path / 'migrated.db'}")
+    config = alembic_config.Config(os.path.join(ROOT_DIR, "alembic.ini"))
+    config.set_main_option("sqlalchemy.url", db_url)
+    alembic_command.upgrade(config, "head")
+    engine = create_engine(db_url)
+    yield engine
+    engine.dispose()
+    alembic_command.downgrade(config, "base")
+
+
+def explain_plan(connection, statement) -> list:
+    """실행 계획을 줄 단위 문자열로 반환 (SQLite: EXPLAIN QUERY PLAN, PostgreSQL: EXPLAIN)."""
+    compiled = statement.compile(dialect=connection.dialect, compile_kwargs={"render_postcompile": True})
+    dialect_name = connection.dialect.name
+    if dialect_name == "sqlite":
+        params = tuple(compiled.params[name] for name in compiled.positiontup)
+        return [row[-1] for row in connection.exec_driver_sql(f"EXPLAIN QUERY PLAN {compiled}", params)]
+    if dialect_name == "postgresql":
+        # 작은 테스트 테이블에서는 seq scan 이 더 싸므로 비활성화: 인덱스로 풀 수 없는 쿼리만 Seq Scan 으로 남는다
+        connection.exec_driver_sql("SET enable_seqscan = off")
+        return [row[0] for row in connection.exec_driver_sql(f"EXPLAIN {compiled}", compiled.params)]
+    raise NotImplementedError(f"EXPLAIN check is not implemented for {dialect_name}")
+
+
+def sequential_scans(plan: list, ordered_index_scan: bool = False) -> list:
+    """
+    계획에서 전체 스캔 단계만 골라낸다.
+    SQLite 는 인덱스 검색이 "SEARCH table USING INDEX ix (col=? ...)" 이고, "SCAN table USING INDEX ix" 는
+    (ORDER BY 를 위해) 인덱스 전체를 읽는 스캔이므로 역시 전체 스캔으로 본다.
+    ordered_index_scan=True 는 필터 없는 keyset 첫 페이지처럼 인덱스 순서대로 읽다가 LIMIT 에서 멈추는 쿼리용.
+    """
+    return [
+        line for line in plan
+        if "Seq Scan" in line # PostgreSQL
+        or (line.startswith("SCAN ") and not (ordered_index_scan and " USING " in line and "INDEX" in line)) # SQLite
+    ]
+
+
+@pytest.fixture
+def assert_no_seq_scan(migrated_engine):
+    """마이그레이션된 스키마에서 주어진 쿼리가 순차 스캔으로 떨어지면 실패시키는 검사 함수."""
+    def check(statement, label: str = "", ordered_index_scan: bool = False):
+        with migrated_engine.connect() as connection:
+            plan = explain_plan(connection, statement)
+        scans = sequential_scans(plan, ordered_index_scan)
+        assert not scans, f"{label or statement} falls back to a sequential scan:\n" + "\n".join(plan)
+        return plan
+    return check
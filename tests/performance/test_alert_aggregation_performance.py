@@ -0,0 +1,78 @@
+# tests/performance/test_alert_aggregation_performance.py
+
+import asyncio
+import logging
+import time
+
+from common import utils
+from common.alerts import AlertAggregator
+
+# 성능 테스트 설정
+NUM_ALERTS = 50000 # 체계적 데이터 오류가 있는 배치 1개 분량 (레코드당 알림 1건)
+
+
+class CountingHandler(logging.Handler):
+    """실제 출력 없이 로그 레코드 포맷 비용만 치르는 핸들러."""
+
+    def __init__(self):
+        super().__init__()
+        self.count = 0
+
+    def emit(self, record):
+        self.format(record)
+        self.count += 1
+
+
+def emit_alerts(count: int, with_rule: bool = True):
+    """processing 정규화와 같은 형태의 알림 (with_rule=False 면 메시지 템플릿으로 지문 계산)."""
+    for i in range(count):
+        details = {"module": "data-processing", "lei": f"BAD{i}", "raw_db_id": f"RAW-{i}"}
+        if with_rule:
+            details["rule"] = "other_lei_format"
+        utils.send_alert("Warning", f"Invalid Other Counterparty LEI format for source ID TRADE-{i}", details)
+
+
+def test_aggregated_send_alert_hot_path():
+    handler = CountingHandler()
+    original_handlers = utils.logger.handlers[:]
+    utils.logger.handlers = [handler]
+    try:
+        # 기존 경로: 알림마다 동기 로그 (prod 에서는 Alertmanager 호출)
+        utils.set_alert_aggregator(None)
+        start_time = time.perf_counter()
+        emit_alerts(NUM_ALERTS)
+        direct_elapsed = time.perf_counter() - start_time
+        direct_lines = handler.count
+
+        async def aggregated(with_rule):
+            aggregator = AlertAggregator(window=60, flush_interval=0.05)
+            await aggregator.start()
+            start_time = time.perf_counter()
+            emit_alerts(NUM_ALERTS, with_rule)
+            elapsed = time.perf_counter() - start_time
+            await aggregator.stop()
+            return elapsed, aggregator.metrics()
+
+        handler.count = 0
+        aggregated_elapsed, metrics = asyncio.run(aggregated(True))
+        aggregated_lines = handler.count
+        handler.count = 0
+        template_elapsed, template_metrics = asyncio.run(aggregated(False))
+        template_lines = handler.count
+    finally:
+        utils.logger.handlers = original_handlers
+        utils.set_alert_aggregator(None)
+
+    print(f"\n--- send_alert 핫 패스 ({NUM_ALERTS} alerts, 지문 1개) ---")
+    print(f"직접 로깅: {direct_elapsed:.3f} 초, 호출당 {direct_elapsed / NUM_ALERTS * 1e6:.1f} us, 로그 {direct_lines} 줄")
+    print(f"집계 (details rule): {aggregated_elapsed:.3f} 초, 호출당 {aggregated_elapsed / NUM_ALERTS * 1e6:.1f} us, "
+          f"로그 {aggregated_lines} 줄, 직접 대비 {direct_elapsed / aggregated_elapsed:.1f}x")
+    print(f"집계 (메시지 템플릿): {template_elapsed:.3f} 초, 호출당 {template_elapsed / NUM_ALERTS * 1e6:.1f} us, "
+          f"로그 {template_lines} 줄, 직접 대비 {direct_elapsed / template_elapsed:.1f}x")
+
+    assert direct_lines == NUM_ALERTS
+    assert metrics["accepted"] == template_metrics["accepted"] == NUM_ALERTS
+    # 배치 루프가 한 번에 돌므로 첫 알림 1건 (occurrences=NUM_ALERTS) 으로 합쳐짐
+    assert aggregated_lines == template_lines == 1
+    assert aggregated_elapsed * 4 < direct_elapsed
+    assert template_elapsed * 2 < direct_elapsed
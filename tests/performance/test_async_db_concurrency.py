@@ -0,0 +1,134 @@
+# tests/performance/test_async_db_concurrency.py
+
+import asyncio
+import time
+import uuid
+from datetime import datetime
+
+import httpx
+import pytest
+from fastapi import FastAPI, Depends, HTTPException
+from sqlalchemy import create_engine, event, insert, select, func
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
+from sqlalchemy.orm import sessionmaker, Session
+
+from common.utils import Base, ErrorRecord, to_async_database_url
+
+# 성능 테스트 설정
+CONCURRENCY_LEVELS = [1, 16, 64]
+REQUESTS_PER_LEVEL = 256
+DB_LATENCY = 0.010 # 원격 PostgreSQL 왕복 시간 흉내 (초)
+NUM_ERRORS = 64
+
+
+def register_latency_function(engine):
+    """
+    db_latency(seconds) SQL 함수를 등록한다. 드라이버 스레드 안에서 sleep 하므로 네트워크 왕복처럼
+    동작한다: sync Session 에서는 이벤트 루프를 막고, aiosqlite 에서는 루프를 막지 않는다.
+    """
+    @event.listens_for(engine, "connect")
+    def _on_connect(dbapi_connection, connection_record):
+        dbapi_connection.create_function("db_latency", 1, lambda seconds: time.sleep(seconds) or 1)
+
+
+def build_apps(db_url: str):
+    """error-monitoring 의 PUT /errors/{id}/status 와 같은 패턴을 sync / async 세션으로 각각 구성."""
+    sync_engine = create_engine(db_url, connect_args={"timeout": 30})
+    register_latency_function(sync_engine)
+    SyncSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=sync_engine)
+
+    async_engine = create_async_engine(to_async_database_url(db_url), pool_size=10, max_overflow=20, connect_args={"timeout": 30})
+    register_latency_function(async_engine.sync_engine)
+    AsyncSessionLocal = async_sessionmaker(async_engine, expire_on_commit=False, autoflush=False)
+
+    def get_sync_db():
+        db = SyncSessionLocal()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    async def get_async_db():
+        async with AsyncSessionLocal() as db:
+            yield db
+
+    sync_app = FastAPI()
+    async_app = FastAPI()
+
+    @sync_app.put("/errors/{error_id}/status")
+    async def update_status_sync(error_id: str, new_status: str, db: Session = Depends(get_sync_db)):
+        error = db.execute(select(ErrorRecord).where(ErrorRecord.id == error_id, func.db_latency(DB_LATENCY) == 1)).scalars().first()
+        if error is None:
+            raise HTTPException(status_code=404, detail="Error not found")
+        error.status = new_status
+        db.commit()
+        return {"status": "success"}
+
+    @async_app.put("/errors/{error_id}/status")
+    async def update_status_async(error_id: str, new_status: str, db: AsyncSession = Depends(get_async_db)):
+        error = (await db.execute(select(ErrorRecord).where(ErrorRecord.id == error_id, func.db_latency(DB_LATENCY) == 1))).scalars().first()
+        if error is None:
+            raise HTTPException(status_code=404, detail="Error not found")
+        error.status = new_status
+        await db.commit()
+        return {"status": "success"}
+
+    return sync_engine, async_engine, sync_app, async_app
+
+
+async def measure_requests_per_second(app: FastAPI, error_ids, concurrency: int) -> float:
+    """`concurrency` 개의 클라이언트가 REQUESTS_PER_LEVEL 건을 나눠 보낼 때의 초당 요청 수."""
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://testserver") as client:
+        async def client_loop(worker: int):
+            for i in range(worker, REQUESTS_PER_LEVEL, concurrency):
+                response = await client.put(f"/errors/{error_ids[i % len(error_ids)]}/status", params={"new_status": "Investigating"})
+                assert response.status_code == 200
+
+        start_time = time.perf_counter()
+        await asyncio.gather(*(client_loop(worker) for worker in range(concurrency)))
+        return REQUESTS_PER_LEVEL / (time.perf_counter() - start_time)
+
+
+@pytest.fixture
+def apps(tmp_path):
+    db_url = f"sqlite:///{tmp_path / 'async_db.db'}"
+    sync_engine, async_engine, sync_app, async_app = build_apps(db_url)
+    Base.metadata.create_all(bind=sync_engine)
+    with sync_engine.begin() as conn:
+        conn.exec_driver_sql("PRAGMA journal_mode=WAL")
+        error_ids = [str(uuid.uuid4()) for _ in range(NUM_ERRORS)]
+        conn.execute(insert(ErrorRecord.__table__), [
+            {"id": error_id, "trade_id": f"UTI-{i}", "source_module": "validation", "error_messages": ["LEI invalid"],
+             "timestamp": datetime.utcnow(), "status": "Open", "severity": "Error"}
+            for i, error_id in enumerate(error_ids)
+        ])
+    yield sync_app, async_app, error_ids
+    asyncio.run(async_engine.dispose())
+    sync_engine.dispose()
+
+
+def test_async_session_throughput_scales_with_concurrency(apps):
+    sync_app, async_app, error_ids = apps
+
+    async def run_all():
+        results = {}
+        for concurrency in CONCURRENCY_LEVELS:
+            sync_rps = await measure_requests_per_second(sync_app, error_ids, concurrency)
+            async_rps = await measure_requests_per_second(async_app, error_ids, concurrency)
+            results[concurrency] = (sync_rps, async_rps)
+        return results
+
+    results = asyncio.run(run_all())
+
+    print(f"\n--- DB 세션 동시성 성능 ({REQUESTS_PER_LEVEL} requests/level, DB 왕복 {DB_LATENCY * 1000:.0f}ms) ---")
+    print(f"{'clients':>8} | {'sync Session (req/s)':>22} | {'AsyncSession (req/s)':>22} | {'speedup':>8}")
+    for concurrency, (sync_rps, async_rps) in results.items():
+        print(f"{concurrency:>8} | {sync_rps:>22.1f} | {async_rps:>22.1f} | {async_rps / sync_rps:>7.1f}x")
+
+    # sync Session 은 DB 왕복마다 이벤트 루프를 막으므로 동시 클라이언트 수와 무관하게 처리량이 고정된다.
+    # AsyncSession 은 왕복을 겹쳐 처리하므로 동시성이 늘수록 처리량이 증가해야 한다.
+    for concurrency in (16, 64):
+        sync_rps, async_rps = results[concurrency]
+        assert async_rps > 2 * sync_rps
+    assert results[64][0] < 2 * results[1][0]
@@ -0,0 +1,112 @@
+# tests/performance/test_bulk_retry_performance.py
+
+import asyncio
+import json
+import time
+from datetime import datetime, timedelta
+
+import httpx
+from sqlalchemy import create_engine, insert, select, update, func
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
+
+from common.utils import Base, ErrorRecord, RawIngestedData, RetryJob, to_async_database_url
+from common.retry_jobs import run_retry_job, job_progress, INGESTION, PROCESSING
+
+# 성능 테스트 설정
+NUM_ERRORS = 20000 # 상위 장애 후 재처리할 오류 수
+LEGACY_SAMPLE = 300 # 오류 단위 재시도는 표본으로 측정 후 환산
+CALL_LATENCY = 0.004 # 하위 모듈 호출 1회의 고정 비용 (초): 네트워크 왕복 + 요청 처리
+RECORD_LATENCY = 0.00002 # 레코드당 처리 비용 (초)
+BATCH_SIZE = 500
+CONCURRENCY = 4
+TARGET_URLS = {INGESTION: "http://ingestion.test/ingest", PROCESSING: "http://processing.test/process"}
+BASE_TIME = datetime(2024, 1, 1)
+
+
+def seed(db_url):
+    engine = create_engine(db_url)
+    Base.metadata.create_all(bind=engine)
+    with engine.begin() as connection:
+        connection.execute(insert(RawIngestedData.__table__), [
+            {"id": f"R-{i}", "trade_id": f"T-{i}", "raw_payload": {"trade_id": f"T-{i}", "notional_amount": 100.0 + i}}
+            for i in range(NUM_ERRORS)
+        ])
+        connection.execute(insert(ErrorRecord.__table__), [
+            {"id": f"E-{i:06d}", "trade_id": f"UTI-{i}", "source_module": "validation", "error_messages": ["upstream timeout"],
+             "data_payload": {"id": f"P-{i}", "unique_transaction_identifier": f"UTI-{i}", "original_raw_data_id": f"R-{i}"},
+             "timestamp": BASE_TIME + timedelta(milliseconds=i), "status": "Open"}
+            for i in range(NUM_ERRORS)
+        ])
+    engine.dispose()
+
+
+def make_client(stats):
+    async def handle(request: httpx.Request) -> httpx.Response:
+        records = json.loads(request.content)
+        stats["calls"] += 1
+        await asyncio.sleep(CALL_LATENCY + RECORD_LATENCY * len(records))
+        return httpx.Response(200, json={"status": "success", "count": len(records)})
+    return httpx.AsyncClient(transport=httpx.MockTransport(handle))
+
+
+async def legacy_retry(session_factory, client, error_ids):
+    """기존 POST /errors/{id}/retry 를 오류마다 호출: 조회 + 1건 호출 + 상태 커밋."""
+    for error_id in error_ids:
+        async with session_factory() as db:
+            error = await db.get(ErrorRecord, error_id)
+            raw = await db.get(RawIngestedData, error.data_payload["original_raw_data_id"])
+            response = await client.post(TARGET_URLS[PROCESSING], json=[{**raw.raw_payload, "id": raw.id}])
+            response.raise_for_status()
+            error.status = "Retrying"
+            await db.commit()
+
+
+async def run_comparison(db_url):
+    engine = create_async_engine(to_async_database_url(db_url))
+    session_factory = async_sessionmaker(engine, expire_on_commit=False, autoflush=False)
+
+    legacy_stats = {"calls": 0}
+    legacy_client = make_client(legacy_stats)
+    start_time = time.perf_counter()
+    await legacy_retry(session_factory, legacy_client, [f"E-{i:06d}" for i in range(LEGACY_SAMPLE)])
+    legacy_elapsed = (time.perf_counter() - start_time) * (NUM_ERRORS / LEGACY_SAMPLE)
+    await legacy_client.aclose()
+    async with session_factory() as db: # 표본을 다시 Open 으로 되돌려 같은 조건에서 비교
+        await db.execute(update(ErrorRecord).values(status="Open"))
+        await db.commit()
+
+    job_stats = {"calls": 0}
+    job_client = make_client(job_stats)
+    async with session_factory() as db:
+        db.add(RetryJob(id="J-1", status="Pending", filters={"status": "Open"}, batch_size=BATCH_SIZE, concurrency=CONCURRENCY))
+        await db.commit()
+    start_time = time.perf_counter()
+    await run_retry_job("J-1", TARGET_URLS, session_factory, client_for=lambda url: job_client)
+    job_elapsed = time.perf_counter() - start_time
+    await job_client.aclose()
+
+    async with session_factory() as db:
+        job = await db.get(RetryJob, "J-1")
+        retrying = await db.scalar(select(func.count()).select_from(ErrorRecord).where(ErrorRecord.status == "Retrying"))
+    await engine.dispose()
+    return legacy_elapsed, job_elapsed, job, job_stats, retrying
+
+
+def test_bulk_retry_job_throughput(tmp_path):
+    db_url = f"sqlite:///{tmp_path / 'bulk_retry.db'}"
+    seed(db_url)
+
+    legacy_elapsed, job_elapsed, job, job_stats, retrying = asyncio.run(run_comparison(db_url))
+    progress = job_progress(job)
+
+    print(f"\n--- 대량 재처리 ({NUM_ERRORS} errors, 호출 지연 {CALL_LATENCY * 1000:.0f} ms) ---")
+    print(f"오류 단위 재시도 (환산): {legacy_elapsed:.2f} 초, {NUM_ERRORS / legacy_elapsed:,.0f} errors/sec, 호출 {NUM_ERRORS}회")
+    print(f"재처리 작업 (batch {BATCH_SIZE}, 동시 {CONCURRENCY}): {job_elapsed:.2f} 초, {NUM_ERRORS / job_elapsed:,.0f} errors/sec, "
+          f"호출 {job_stats['calls']}회, 속도 {legacy_elapsed / job_elapsed:.1f}x")
+    print(f"상태 API: {progress['percent']}% 완료, {progress['throughput_per_second']:,.0f} errors/sec")
+
+    assert job.status == "Completed"
+    assert job.succeeded == NUM_ERRORS and retrying == NUM_ERRORS
+    assert job_stats["calls"] == NUM_ERRORS // BATCH_SIZE
+    assert progress["percent"] == 100.0
+    assert job_elapsed * 5 < legacy_elapsed
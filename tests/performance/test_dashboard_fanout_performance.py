@@ -0,0 +1,59 @@
+# tests/performance/test_dashboard_fanout_performance.py
+
+import asyncio
+import time
+
+from common.fanout import gather_sections
+
+# 성능 테스트 설정
+# Admin UI 첫 화면의 네 개 목록 조회 지연 (초); submissions 는 장애로 응답이 매우 느린 경우
+SECTION_LATENCIES = {"errors": 0.12, "processed_data": 0.20, "reports": 0.08, "submissions": 0.10}
+SLOW_SUBMISSIONS = 10.0
+SECTION_TIMEOUT = 0.5
+RUNS = 3
+
+
+def make_fetchers(latencies):
+    def fetcher(name, delay):
+        async def fetch():
+            await asyncio.sleep(delay)
+            return {"items": [], "section": name}
+        return fetch
+    return {name: fetcher(name, delay) for name, delay in latencies.items()}
+
+
+async def sequential(fetchers):
+    """기존 경로: 프런트엔드가 목록 API 를 차례로 호출."""
+    return {name: await fetch() for name, fetch in fetchers.items()}
+
+
+async def concurrent(fetchers):
+    """/api/dashboard: asyncio.gather fan-out + section 별 타임아웃."""
+    return await gather_sections(fetchers, timeout=SECTION_TIMEOUT)
+
+
+def best_of(run, latencies):
+    best = float("inf")
+    for _ in range(RUNS):
+        start_time = time.perf_counter()
+        result = asyncio.run(run(make_fetchers(latencies)))
+        best = min(best, time.perf_counter() - start_time)
+    return best, result
+
+
+def test_dashboard_first_paint():
+    sequential_elapsed, _ = best_of(sequential, SECTION_LATENCIES)
+    concurrent_elapsed, result = best_of(concurrent, SECTION_LATENCIES)
+    degraded_elapsed, degraded = best_of(concurrent, {**SECTION_LATENCIES, "submissions": SLOW_SUBMISSIONS})
+
+    total, slowest = sum(SECTION_LATENCIES.values()), max(SECTION_LATENCIES.values())
+    print(f"\n--- 대시보드 첫 화면 (section {len(SECTION_LATENCIES)}개, 합계 {total:.2f} 초 / 최대 {slowest:.2f} 초) ---")
+    print(f"순차 호출: {sequential_elapsed:.3f} 초")
+    print(f"동시 fan-out: {concurrent_elapsed:.3f} 초 (속도 향상 {sequential_elapsed / concurrent_elapsed:.1f}배)")
+    print(f"submissions 장애 ({SLOW_SUBMISSIONS:.0f} 초): {degraded_elapsed:.3f} 초, 상태 {degraded['status']}")
+
+    assert result["status"] == "ok"
+    assert sequential_elapsed >= total
+    assert concurrent_elapsed < slowest + 0.1 # sum 이 아니라 max(latency)
+    assert degraded["status"] == "partial" and degraded["sections"]["submissions"]["status"] == "timeout"
+    assert degraded_elapsed < SECTION_TIMEOUT + 0.2 # 느린 모듈이 페이지 전체를 붙잡지 않음
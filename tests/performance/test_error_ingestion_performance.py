@@ -0,0 +1,98 @@
+# tests/performance/test_error_ingestion_performance.py
+
+import time
+import uuid
+from datetime import datetime
+
+from sqlalchemy import create_engine, func, select
+from sqlalchemy.orm import sessionmaker
+
+from common.utils import Base, ErrorRecord, ErrorGroup
+from common.error_groups import bulk_record_errors
+from common.pagination import paginate_keyset
+
+# 성능 테스트 설정
+NUM_ERRORS = 50000 # 체계적 데이터 문제: 같은 규칙 위반이 수만 건
+BATCH_SIZE = 5000 # /report_error 한 번에 들어오는 오류 수
+FIELDS = ["Reporting Counterparty", "Other Counterparty", "Execution Agent", "Beneficiary"] # 서로 다른 규칙 위반 (그룹)
+NUM_RULES = len(FIELDS)
+
+
+def make_batches():
+    errors = [{
+        "data": {
+            "id": f"P-{i}", "unique_transaction_identifier": f"UTI-{i}", "original_raw_data_id": f"R-{i}",
+            "reporting_counterparty_lei": f"BADLEI{i:014d}", "asset_class": "IR", "notional_amount": 1000000.0 + i,
+            "notional_currency": "USD", "effective_date": "2024-01-02", "termination_date": "2029-01-02",
+            "processing_errors": [],
+        },
+        "errors": [f"{FIELDS[i % NUM_RULES]} LEI 'BADLEI{i:014d}' has an invalid format."],
+        "source_module": "validation",
+    } for i in range(NUM_ERRORS)]
+    return [errors[start:start + BATCH_SIZE] for start in range(0, NUM_ERRORS, BATCH_SIZE)]
+
+
+def legacy_record(db, batch):
+    """기존 /report_error: 오류마다 ErrorRecord ORM 객체 + 전체 payload 저장."""
+    for error_entry in batch:
+        data_payload = error_entry.get("data", {})
+        db.add(ErrorRecord(
+            id=str(uuid.uuid4()),
+            trade_id=data_payload.get("unique_transaction_identifier", data_payload.get("trade_id", "N/A")),
+            source_module=error_entry.get("source_module", "Unknown"),
+            error_messages=error_entry.get("errors", []),
+            data_payload=data_payload,
+            original_source_data_payload=data_payload.get("original_source_data"),
+            timestamp=datetime.utcnow(),
+            status="Open",
+            severity="Error",
+            assigned_to=None,
+        ))
+    db.commit()
+
+
+def grouped_record(db, batch):
+    bulk_record_errors(db, batch)
+    db.commit()
+
+
+def ingest(tmp_path, name, record_fn, batches):
+    engine = create_engine(f"sqlite:///{tmp_path / name}")
+    Base.metadata.create_all(bind=engine)
+    session = sessionmaker(autocommit=False, autoflush=False, bind=engine)()
+    start_time = time.perf_counter()
+    for batch in batches:
+        record_fn(session, batch)
+    elapsed = time.perf_counter() - start_time
+    return engine, session, elapsed
+
+
+def test_bulk_grouped_error_ingestion(tmp_path):
+    batches = make_batches()
+
+    legacy_engine, legacy_db, legacy_elapsed = ingest(tmp_path, "legacy.db", legacy_record, batches)
+    legacy_db.close()
+    legacy_engine.dispose()
+    legacy_bytes = (tmp_path / "legacy.db").stat().st_size
+
+    engine, db, grouped_elapsed = ingest(tmp_path, "grouped.db", grouped_record, batches)
+    grouped_bytes = (tmp_path / "grouped.db").stat().st_size
+
+    # Admin UI 목록: 오류 5만 건 대신 그룹 수만큼
+    start_time = time.perf_counter()
+    groups, next_cursor = paginate_keyset(db.query(ErrorGroup), ErrorGroup.last_seen, ErrorGroup.id, 100)
+    list_elapsed = time.perf_counter() - start_time
+    recorded = db.scalar(select(func.count()).select_from(ErrorRecord))
+    db.close()
+    engine.dispose()
+
+    print(f"\n--- 오류 적재 ({NUM_ERRORS} errors, 배치 {BATCH_SIZE}, 규칙 {NUM_RULES}종) ---")
+    print(f"기존 (ORM 행 단위, 전체 payload): {legacy_elapsed:.3f} 초, {NUM_ERRORS / legacy_elapsed:,.0f} errors/sec, DB {legacy_bytes / 1024 / 1024:.1f} MiB")
+    print(f"일괄 적재 + 그룹화: {grouped_elapsed:.3f} 초, {NUM_ERRORS / grouped_elapsed:,.0f} errors/sec, DB {grouped_bytes / 1024 / 1024:.1f} MiB, 속도 {legacy_elapsed / grouped_elapsed:.1f}x")
+    print(f"그룹 목록: {len(groups)}개 그룹, {list_elapsed * 1000:.2f} ms")
+
+    assert recorded == NUM_ERRORS
+    assert len(groups) == NUM_RULES and next_cursor is None
+    assert sum(group.error_count for group in groups) == NUM_ERRORS
+    assert grouped_elapsed * 1.5 < legacy_elapsed
+    assert grouped_bytes < legacy_bytes
@@ -0,0 +1,125 @@
+# tests/performance/test_http_client_pool_performance.py
+
+import asyncio
+import time
+
+import httpx
+
+from common.http_client import HttpClientPool
+
+# 성능 테스트 설정
+NUM_REQUESTS = 200 # 모듈 간 hop 호출 횟수
+CONCURRENCY = 10
+
+
+class CountingHttpServer:
+    """keep-alive 를 지원하는 최소 HTTP/1.1 서버. 수락한 TCP 연결 수를 센다."""
+
+    def __init__(self):
+        self.connections = 0
+        self.server = None
+
+    async def start(self) -> str:
+        self.server = await asyncio.start_server(self._handle, "127.0.0.1", 0)
+        host, port = self.server.sockets[0].getsockname()[:2]
+        return f"http://{host}:{port}"
+
+    async def stop(self):
+        self.server.close()
+        await self.server.wait_closed()
+
+    async def _handle(self, reader, writer):
+        self.connections += 1
+        try:
+            while True:
+                headers = await reader.readuntil(b"\r\n\r\n")
+                length = 0
+                for line in headers.split(b"\r\n"):
+                    if line.lower().startswith(b"content-length:"):
+                        length = int(line.split(b":")[1])
+                if length:
+                    await reader.readexactly(length)
+                body = b'{"status": "ok"}'
+                writer.write(b"HTTP/1.1 200 OK\r\nContent-Type: application/json\r\n"
+                             b"Content-Length: " + str(len(body)).encode() + b"\r\n\r\n" + body)
+                await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionResetError):
+            pass
+        finally:
+            writer.close()
+
+
+async def call_with_fresh_clients(url: str):
+    """기존 경로: 요청마다 새 AsyncClient 를 열고 닫음."""
+    async def one():
+        async with httpx.AsyncClient() as client:
+            response = await client.post(url, json={"trade_id": "T-1"})
+            response.raise_for_status()
+    semaphore = asyncio.Semaphore(CONCURRENCY)
+    async def bounded():
+        async with semaphore:
+            await one()
+    await asyncio.gather(*(bounded() for _ in range(NUM_REQUESTS)))
+
+
+async def call_with_pool(pool: HttpClientPool, url: str):
+    """공유 풀 경로: 대상별 keep-alive 연결을 재사용."""
+    async def one():
+        response = await pool.get_client(url).post(url, json={"trade_id": "T-1"})
+        response.raise_for_status()
+    semaphore = asyncio.Semaphore(CONCURRENCY)
+    async def bounded():
+        async with semaphore:
+            await one()
+    await asyncio.gather(*(bounded() for _ in range(NUM_REQUESTS)))
+
+
+async def run_comparison():
+    server = CountingHttpServer()
+    base_url = await server.start()
+    url = f"{base_url}/process"
+    try:
+        start_time = time.perf_counter()
+        await call_with_fresh_clients(url)
+        fresh_elapsed = time.perf_counter() - start_time
+        fresh_connections = server.connections
+
+        server.connections = 0
+        pool = HttpClientPool(http2=False)
+        start_time = time.perf_counter()
+        await call_with_pool(pool, url)
+        pooled_elapsed = time.perf_counter() - start_time
+        pooled_connections = server.connections
+        metrics = pool.metrics()
+        await pool.aclose()
+    finally:
+        await server.stop()
+    return fresh_elapsed, fresh_connections, pooled_elapsed, pooled_connections, metrics, url
+
+
+def test_shared_pool_reuses_connections():
+    fresh_elapsed, fresh_connections, pooled_elapsed, pooled_connections, metrics, url = asyncio.run(run_comparison())
+
+    print(f"\n--- HTTP 클라이언트 풀 성능 ({NUM_REQUESTS} requests, concurrency {CONCURRENCY}) ---")
+    print(f"요청마다 새 클라이언트: {fresh_elapsed:.3f} 초, TCP 연결 {fresh_connections} 회")
+    print(f"공유 풀 클라이언트: {pooled_elapsed:.3f} 초, TCP 연결 {pooled_connections} 회")
+
+    target_metrics = metrics[HttpClientPool.target_key(url)]
+    assert fresh_connections == NUM_REQUESTS
+    assert pooled_connections <= CONCURRENCY
+    assert target_metrics["requests"] == NUM_REQUESTS
+    assert target_metrics["errors"] == 0
+    assert target_metrics["in_flight"] == 0
+    assert target_metrics["status_counts"] == {"2xx": NUM_REQUESTS}
+    assert pooled_elapsed < fresh_elapsed
+
+
+def test_target_key_groups_urls_by_origin():
+    assert HttpClientPool.target_key("http://localhost:8001/process") == "http://localhost:8001"
+    assert HttpClientPool.target_key("http://localhost:8001/processed-data?limit=1") == "http://localhost:8001"
+    assert HttpClientPool.target_key("https://sdr.example.com/submit") == "https://sdr.example.com:443"
+
+    pool = HttpClientPool(http2=False)
+    assert pool.get_client("http://localhost:8005/report_error") is pool.get_client("http://localhost:8005/errors")
+    assert pool.get_client("http://localhost:8005/errors") is not pool.get_client("http://localhost:8001/process")
+    asyncio.run(pool.aclose())
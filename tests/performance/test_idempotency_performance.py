@@ -0,0 +1,81 @@
+# tests/performance/test_idempotency_performance.py
+
+import os
+import sys
+import time
+from datetime import datetime
+
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "..", "src", "data-processing"))
+
+from common.idempotency import IdempotencyIndex
+from common.bulk_db import bulk_upsert_processed_records
+from common.records import records_to_rows
+from transformers import normalize_chunk
+
+# 성능 테스트 설정
+NUM_ROWS = 50000 # FEP 재전송 배치 크기
+
+
+def make_raw_rows(count: int, id_prefix: str = "RAW"):
+    """processing 큐로 넘어오는 원시 행 (재전송 시 raw id 만 달라짐)."""
+    return [
+        {
+            "id": f"{id_prefix}-{i}",
+            "trade_id": f"TRADE-{i}",
+            "action": "NEWT",
+            "instrument_type": "IRS",
+            "asset_class": "IR",
+            "effective_date": "2024-01-02",
+            "termination_date": "2029-01-02",
+            "notional_amount": 1000000.0 + i,
+            "notional_currency": "USD",
+            "party_a_lei": "5493001KJTIIGC8Y1R12",
+            "party_b_lei": "529900T8BM49AURSDO55",
+        }
+        for i in range(count)
+    ]
+
+
+def process_batch(session_factory, index, data):
+    """process_swap_data 의 DB/CPU 경로: 중복 판정 -> 정규화 -> upsert + 키 기록 -> commit. (처리 건수, 중복 건수) 반환."""
+    with session_factory() as db:
+        new_entries, duplicates = index.split_new(db, data)
+        normalized = normalize_chunk([entry for _, entry in new_entries], datetime(2024, 1, 2))
+        records = [result.record for result in normalized]
+        if records:
+            ids_by_uti = bulk_upsert_processed_records(db, records_to_rows(records))
+            index.record(db, [
+                {"idempotency_key": key, "unique_transaction_identifier": record.unique_transaction_identifier,
+                 "record_id": ids_by_uti[record.unique_transaction_identifier]}
+                for (key, _), record in zip(new_entries, records)
+            ])
+        db.commit()
+    index.remember(key for key, _ in new_entries)
+    return len(records), len(duplicates)
+
+
+def timed(fn, *args):
+    start_time = time.perf_counter()
+    result = fn(*args)
+    return time.perf_counter() - start_time, result
+
+
+def test_resent_batch_short_circuits(session_factory):
+    index = IdempotencyIndex("data-processing")
+
+    first_elapsed, first = timed(process_batch, session_factory, index, make_raw_rows(NUM_ROWS))
+    warm_elapsed, warm = timed(process_batch, session_factory, index, make_raw_rows(NUM_ROWS, "RESENT"))
+    # 재시작 직후 (LRU 비어 있음): 유니크 인덱스 조회로만 판정
+    cold_elapsed, cold = timed(process_batch, session_factory, IdempotencyIndex("data-processing"), make_raw_rows(NUM_ROWS, "RETRY"))
+
+    print(f"\n--- 재전송 배치 단락 처리 ({NUM_ROWS} rows) ---")
+    print(f"최초 처리 (정규화 + 저장): {first_elapsed:.3f} 초, {NUM_ROWS / first_elapsed:,.0f} rows/sec")
+    print(f"재전송, LRU 적중: {warm_elapsed:.3f} 초, {NUM_ROWS / warm_elapsed:,.0f} rows/sec, 최초 대비 {first_elapsed / warm_elapsed:.1f}x")
+    print(f"재전송, DB 인덱스 조회: {cold_elapsed:.3f} 초, {NUM_ROWS / cold_elapsed:,.0f} rows/sec, 최초 대비 {first_elapsed / cold_elapsed:.1f}x")
+
+    assert first == (NUM_ROWS, 0)
+    assert warm == (0, NUM_ROWS) # 재전송분은 정규화/저장/검증 전달 없이 건너뜀
+    assert cold == (0, NUM_ROWS)
+    assert warm_elapsed * 3 < first_elapsed
+    assert cold_elapsed * 2 < first_elapsed
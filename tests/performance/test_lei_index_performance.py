@@ -0,0 +1,82 @@
+# tests/performance/test_lei_index_performance.py
+
+import gc
+import random
+import time
+import tracemalloc
+
+import pytest
+
+from common.lei import GleifIndex, compile_gleif_index
+from tests.conftest import make_lei
+
+# 성능 테스트 설정
+NUM_LEIS = 1000000 # GLEIF golden copy 규모 (실제 약 250만 건)
+NUM_LOOKUPS = 100000 # End-of-day 배치의 LEI 조회 수 (절반은 미등록)
+RUNS = 3 # best-of-N
+
+
+@pytest.fixture(scope="module")
+def golden_copy(tmp_path_factory):
+    rng = random.Random(17442)
+    leis = [make_lei(rng) for _ in range(NUM_LEIS)]
+    unregistered = [make_lei(rng) for _ in range(NUM_LOOKUPS // 2)]
+    directory = tmp_path_factory.mktemp("gleif")
+    source = directory / "golden_copy.csv"
+    with open(source, "w") as golden_copy_file:
+        golden_copy_file.write('"LEI","Entity.LegalName","Registration.RegistrationStatus"\n')
+        golden_copy_file.writelines(f'"{lei}","Entity, Ltd","ISSUED"\n' for lei in leis)
+    index_path = str(directory / "golden_copy.leiidx")
+    start_time = time.perf_counter()
+    compile_gleif_index(str(source), index_path)
+    compile_elapsed = time.perf_counter() - start_time
+    return leis, unregistered, source, index_path, compile_elapsed
+
+
+def test_index_open_and_lookup(golden_copy):
+    leis, unregistered, source, index_path, compile_elapsed = golden_copy
+    queries = leis[:NUM_LOOKUPS // 2] + unregistered
+
+    # 기존 방식: 워커마다 golden copy 를 읽어 set 으로 유지
+    gc.collect()
+    tracemalloc.start()
+    start_time = time.perf_counter()
+    with open(source) as golden_copy_file:
+        next(golden_copy_file)
+        lei_set = {line[1:21] for line in golden_copy_file}
+    set_load_elapsed = time.perf_counter() - start_time
+    set_bytes, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    gc.collect()
+    tracemalloc.start()
+    start_time = time.perf_counter()
+    index = GleifIndex(index_path)
+    open_elapsed = time.perf_counter() - start_time
+    index_bytes, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    try:
+        best = float("inf")
+        for _ in range(RUNS):
+            start_time = time.perf_counter()
+            found = index.contains_many(queries)
+            best = min(best, time.perf_counter() - start_time)
+        metrics = index.metrics()
+    finally:
+        index.close()
+
+    print(f"\n--- GLEIF 인덱스 ({NUM_LEIS} LEIs, 조회 {NUM_LOOKUPS}건) ---")
+    print(f"인덱스 컴파일 (1회, 오프라인): {compile_elapsed:.3f} 초")
+    print(f"set 적재: {set_load_elapsed:.3f} 초, {set_bytes / 1024 / 1024:.1f} MiB (워커당)")
+    print(f"mmap 인덱스 열기: {open_elapsed * 1000:.2f} ms, {index_bytes / 1024:.1f} KiB (페이지 캐시는 워커 간 공유)")
+    print(f"배치 조회: {best:.3f} 초, {NUM_LOOKUPS / best:,.0f} lookups/sec, Bloom 필터 거절 {metrics['bloom_rejects'] // RUNS}건")
+
+    assert found[:NUM_LOOKUPS // 2].all()
+    assert not found[NUM_LOOKUPS // 2:].any()
+    assert [lei in lei_set for lei in queries] == found.tolist()
+    assert open_elapsed < 0.05
+    assert index_bytes < 1024 * 1024 # 힙에는 헤더/뷰 객체만
+    assert set_bytes > 50 * index_bytes
+    assert metrics["bloom_rejects"] // RUNS > 0.9 * (NUM_LOOKUPS // 2) # 미등록 LEI 대부분은 이진 탐색 없이 거절
+    assert best < 1.0
@@ -0,0 +1,129 @@
+# tests/performance/test_logging_overhead_performance.py
+
+import logging
+import os
+import time
+
+from common.structured_logging import configure_logger, flush_logs, RecordLogSampler
+
+# 성능 테스트 설정
+NUM_RECORDS = 10000 # 로깅 오버헤드는 레코드 10k 당 시간으로 비교
+REPEATS = 3 # best-of-N
+
+
+class SlowStream:
+    """쓰기마다 지연이 있는 출력 (느린 stderr 수집기 / 막힌 파이프 흉내)."""
+
+    def __init__(self, delay: float = 0.00002):
+        self.delay = delay
+        self.writes = 0
+
+    def write(self, text):
+        time.sleep(self.delay)
+        self.writes += 1
+
+    def flush(self):
+        pass
+
+    def close(self):
+        pass
+
+
+def make_logger(name, level, stream=None, **kwargs):
+    stream = stream if stream is not None else open(os.devnull, "w")
+    logger = configure_logger(name, level=level, stream=stream, **kwargs)
+    logger.propagate = False
+    return logger, stream
+
+
+def best_of(fn):
+    best = float("inf")
+    for _ in range(REPEATS):
+        start_time = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start_time)
+    return best
+
+
+def test_logging_overhead_per_10k_records():
+    utis = [f"MVP-TRADE-{i}-0A1B2C3D4E5F" for i in range(NUM_RECORDS)]
+
+    # 기존: 레코드마다 f-string INFO, 호출 스레드에서 동기 StreamHandler 출력
+    sync_logger, sync_stream = make_logger("perf.logging.sync", "INFO", log_format="text", use_queue=False)
+
+    def sync_per_record():
+        for uti in utis:
+            sync_logger.info(f"Validating entry with UTI {uti}")
+
+    # 큐 + JSON: 레코드마다 INFO 이지만 포맷/출력은 리스너 스레드에서
+    queued_logger, queued_stream = make_logger("perf.logging.queued", "INFO")
+
+    def queued_per_record():
+        for uti in utis:
+            queued_logger.info("Validating entry with UTI %s", uti)
+
+    # 샘플링: 기본 INFO 레벨에서는 레벨 확인만
+    sampled_logger, sampled_stream = make_logger("perf.logging.sampled", "INFO")
+    sampler_disabled = RecordLogSampler(sampled_logger, rate=0.01)
+
+    def sampled_info_level():
+        for uti in utis:
+            sampler_disabled.debug("Validating entry with UTI %s", uti)
+        sampled_logger.info("Finished validation for %d entries.", len(utis), extra={"batch_size": len(utis)}) # 배치 요약
+
+    # 샘플링: DEBUG 활성화, 1% 기록
+    debug_logger, debug_stream = make_logger("perf.logging.debug", "DEBUG")
+    sampler_enabled = RecordLogSampler(debug_logger, rate=0.01)
+
+    def sampled_debug_level():
+        for uti in utis:
+            sampler_enabled.debug("Validating entry with UTI %s", uti)
+        debug_logger.info("Finished validation for %d entries.", len(utis), extra={"batch_size": len(utis)})
+
+    # 느린 출력: 동기 경로는 호출 스레드가 쓰기마다 기다림, 큐 경로는 리스너만 기다림
+    slow_sync_logger, slow_sync_stream = make_logger("perf.logging.slow.sync", "INFO", stream=SlowStream(), log_format="text", use_queue=False)
+    slow_queued_logger, slow_queued_stream = make_logger("perf.logging.slow.queued", "INFO", stream=SlowStream())
+
+    def slow_sync_per_record():
+        for uti in utis:
+            slow_sync_logger.info(f"Validating entry with UTI {uti}")
+
+    def slow_queued_per_record():
+        for uti in utis:
+            slow_queued_logger.info("Validating entry with UTI %s", uti)
+
+    try:
+        sync_elapsed = best_of(sync_per_record)
+        queued_elapsed = best_of(queued_per_record)
+        start_time = time.perf_counter()
+        flush_logs()
+        listener_drain = time.perf_counter() - start_time
+        sampled_elapsed = best_of(sampled_info_level)
+        debug_elapsed = best_of(sampled_debug_level)
+        flush_logs()
+        start_time = time.perf_counter()
+        slow_sync_per_record()
+        slow_sync_elapsed = time.perf_counter() - start_time
+        start_time = time.perf_counter()
+        slow_queued_per_record()
+        slow_queued_elapsed = time.perf_counter() - start_time
+        flush_logs()
+    finally:
+        for stream in (sync_stream, queued_stream, sampled_stream, debug_stream, slow_sync_stream, slow_queued_stream):
+            stream.close()
+
+    print(f"\n--- 로깅 오버헤드 (레코드 {NUM_RECORDS} 건당, 호출 스레드 기준) ---")
+    print(f"기존 (f-string INFO, 동기 StreamHandler): {sync_elapsed * 1000:.1f} ms")
+    print(f"QueueHandler + JSON (INFO, 지연 포맷): {queued_elapsed * 1000:.1f} ms, 기존 대비 {sync_elapsed / queued_elapsed:.1f}x "
+          f"(리스너 잔여 처리 {listener_drain * 1000:.1f} ms)")
+    print(f"샘플링 DEBUG, INFO 레벨 (요약 1줄): {sampled_elapsed * 1000:.2f} ms, 기존 대비 {sync_elapsed / sampled_elapsed:.0f}x")
+    print(f"샘플링 DEBUG 1%, DEBUG 레벨: {debug_elapsed * 1000:.2f} ms, 기존 대비 {sync_elapsed / debug_elapsed:.0f}x")
+    print(f"느린 출력 - 동기: {slow_sync_elapsed * 1000:.1f} ms, 큐: {slow_queued_elapsed * 1000:.1f} ms "
+          f"({slow_sync_elapsed / slow_queued_elapsed:.1f}x, 기록 {slow_queued_stream.writes} 줄)")
+
+    # 출력이 빠르면 (단일 코어에서는 리스너와 GIL 을 나눠 씀) 큐 경로도 비슷한 수준이어야 함
+    assert queued_elapsed < sync_elapsed * 1.5
+    assert slow_queued_elapsed * 2 < slow_sync_elapsed # 느린 출력이 호출 스레드를 막지 않음
+    assert slow_queued_stream.writes == NUM_RECORDS
+    assert sampled_elapsed * 20 < sync_elapsed
+    assert debug_elapsed * 5 < sync_elapsed
@@ -0,0 +1,90 @@
+# tests/performance/test_object_store_performance.py
+
+import asyncio
+import gc
+import hashlib
+import os
+import shutil
+import time
+import tracemalloc
+
+from common.object_store import LocalObjectStore
+
+# 성능 테스트 설정
+REPORT_BYTES = 64 * 1024 * 1024 # 대형 일일 보고서
+COPIES = 5 # 같은 내용의 보고서 재생성 횟수 (중복 제거 확인)
+
+
+class SimulatedCloudStorage:
+    """기존 report-generation / report-submission 의 메모리 저장소."""
+
+    def __init__(self):
+        self._storage = {}
+
+    async def upload_file(self, file_content, object_name):
+        self._storage[object_name] = file_content
+
+    async def download_file(self, object_name):
+        return self._storage.get(object_name)
+
+
+def write_report(path):
+    block = os.urandom(1024 * 1024)
+    with open(path, "wb") as report_file:
+        for _ in range(REPORT_BYTES // len(block)):
+            report_file.write(block)
+
+
+async def legacy_round_trip(path, tmp_path):
+    """보고서 파일 전체를 읽어 업로드, 제출 시 전체를 다운로드해 해시."""
+    storage = SimulatedCloudStorage()
+    for copy in range(COPIES):
+        with open(path, "rb") as report_file:
+            await storage.upload_file(report_file.read(), f"reports/daily_{copy}.csv")
+    content = await storage.download_file("reports/daily_0.csv")
+    return hashlib.sha256(content).hexdigest(), sum(len(value) for value in storage._storage.values())
+
+
+async def store_round_trip(path, tmp_path):
+    """스테이징 파일을 저장소로 이동 (rename), 제출 시 mmap 청크 스트리밍."""
+    store = LocalObjectStore(str(tmp_path / "store"), fsync=False)
+    for copy in range(COPIES):
+        staged = store.staging_path(".csv")
+        shutil.copyfile(path, staged) # 보고서 작성 단계 (측정 대상 메모리 아님)
+        await store.put_file(staged, f"reports/daily_{copy}.csv", move=True)
+    digest = hashlib.sha256()
+    async for chunk in (await store.open_source("reports/daily_0.csv")).iter_chunks():
+        digest.update(chunk)
+    stored = sum(os.path.getsize(os.path.join(directory, name)) for directory, _, names in os.walk(os.path.join(store.root, "blobs")) for name in names)
+    return digest.hexdigest(), stored
+
+
+def measure(round_trip, path, tmp_path):
+    gc.collect()
+    tracemalloc.start()
+    start_time = time.perf_counter()
+    digest, stored = asyncio.run(round_trip(path, tmp_path))
+    elapsed = time.perf_counter() - start_time
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak, digest, stored
+
+
+def test_object_store_memory_and_dedupe(tmp_path):
+    path = str(tmp_path / "daily_report.csv")
+    write_report(path)
+    with open(path, "rb") as report_file:
+        expected = hashlib.sha256(report_file.read()).hexdigest()
+
+    legacy_elapsed, legacy_peak, legacy_digest, legacy_stored = measure(legacy_round_trip, path, tmp_path)
+    store_elapsed, store_peak, store_digest, store_stored = measure(store_round_trip, path, tmp_path)
+
+    mib = 1024 * 1024
+    print(f"\n--- 보고서 저장소 ({REPORT_BYTES // mib} MiB 보고서 x {COPIES}) ---")
+    print(f"기존 (메모리 dict): {legacy_elapsed:.3f} 초, 최대 메모리 {legacy_peak / mib:.1f} MiB, 저장 용량 {legacy_stored / mib:.0f} MiB")
+    print(f"객체 저장소 (content-addressed): {store_elapsed:.3f} 초, 최대 메모리 {store_peak / mib:.1f} MiB, 저장 용량 {store_stored / mib:.0f} MiB")
+
+    assert legacy_digest == store_digest == expected
+    assert legacy_peak >= COPIES * REPORT_BYTES
+    assert store_peak < 4 * mib # 보고서 크기와 무관
+    assert store_stored == REPORT_BYTES # 동일 보고서는 한 번만 저장
@@ -0,0 +1,75 @@
+# tests/performance/test_pagination_performance.py
+
+import time
+import uuid
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import create_engine, insert, desc
+from sqlalchemy.orm import sessionmaker
+
+from common.utils import Base, ErrorRecord
+from common.pagination import paginate_keyset, count_rows, count_cache
+
+# 성능 테스트 설정
+NUM_ROWS = 200000
+PAGE_SIZE = 100
+DEEP_OFFSET = 190000 # 깊은 페이지 (마지막 근처)
+REPEATS = 5
+
+
+@pytest.fixture(scope="module")
+def db(tmp_path_factory):
+    engine = create_engine(f"sqlite:///{tmp_path_factory.mktemp('pagination') / 'errors.db'}")
+    Base.metadata.create_all(bind=engine) # ix_error_records_ts_id 포함
+    start = datetime(2024, 1, 1)
+    with engine.begin() as conn:
+        conn.execute(insert(ErrorRecord.__table__), [
+            {"id": str(uuid.uuid4()), "trade_id": f"UTI-{i}", "source_module": "validation",
+             "timestamp": start + timedelta(milliseconds=i), "status": "Open"}
+            for i in range(NUM_ROWS)
+        ])
+    session = sessionmaker(autocommit=False, autoflush=False, bind=engine)()
+    count_cache.clear()
+    yield session
+    session.close()
+    engine.dispose()
+
+
+def best_of(func):
+    best = float("inf")
+    for _ in range(REPEATS):
+        start_time = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - start_time)
+    return best, result
+
+
+def test_keyset_deep_page_is_faster_than_offset(db):
+    def offset_page():
+        query = db.query(ErrorRecord)
+        total = query.count()
+        rows = query.order_by(desc(ErrorRecord.timestamp)).offset(DEEP_OFFSET).limit(PAGE_SIZE).all()
+        return total, rows
+
+    # 같은 위치의 cursor 를 준비 (UI 가 이전 페이지에서 받은 next_cursor 에 해당)
+    _, cursor = paginate_keyset(db.query(ErrorRecord), ErrorRecord.timestamp, ErrorRecord.id, DEEP_OFFSET)
+    count_rows(db, db.query(ErrorRecord), ErrorRecord.__tablename__, {}) # 캐시 워밍
+
+    def keyset_page():
+        query = db.query(ErrorRecord)
+        total, _ = count_rows(db, query, ErrorRecord.__tablename__, {})
+        rows, _ = paginate_keyset(query, ErrorRecord.timestamp, ErrorRecord.id, PAGE_SIZE, cursor=cursor)
+        return total, rows
+
+    offset_elapsed, (offset_total, offset_rows) = best_of(offset_page)
+    keyset_elapsed, (keyset_total, keyset_rows) = best_of(keyset_page)
+
+    print(f"\n--- 목록 페이지네이션 성능 ({NUM_ROWS} rows, page {PAGE_SIZE} at position {DEEP_OFFSET}) ---")
+    print(f"OFFSET + COUNT(*): {offset_elapsed * 1000:.2f} ms")
+    print(f"keyset cursor + cached count: {keyset_elapsed * 1000:.2f} ms")
+    print(f"속도 향상: {offset_elapsed / keyset_elapsed:.1f}x")
+
+    assert offset_total == keyset_total == NUM_ROWS
+    assert [row.id for row in keyset_rows] == [row.id for row in offset_rows]
+    assert keyset_elapsed * 10 < offset_elapsed
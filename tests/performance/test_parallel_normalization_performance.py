@@ -0,0 +1,101 @@
+# tests/performance/test_parallel_normalization_performance.py
+
+import asyncio
+import os
+import sys
+import time
+from datetime import datetime
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "..", "src", "data-processing"))
+
+from transformers import ParallelNormalizer
+
+# 성능 테스트 설정
+NUM_ROWS = 100000 # 대형 /process 배치
+CHUNK_SIZE = 5000
+WORKER_COUNTS = (1, 2, 4, 8)
+HEARTBEAT_INTERVAL = 0.005 # 이벤트 루프 응답성 측정용 주기 (초)
+
+
+def make_raw_rows(count: int):
+    """ingestion 이 processing 큐로 넘기는 원시 행 형태의 샘플 생성."""
+    return [
+        {
+            "id": f"RAW-{i}",
+            "trade_id": f"TRADE-{i}",
+            "action": "newt",
+            "instrument_type": "IRS",
+            "asset_class": "ir",
+            "effective_date": "2024-01-02",
+            "termination_date": "2029-01-02",
+            "notional_amount": 1000000.0 + i,
+            "notional_currency": "usd",
+            "party_a_lei": "5493001KJTIIGC8Y1R12",
+            "party_b_lei": "529900T8BM49AURSDO55",
+            "price": 0.0125,
+            "price_currency": "usd",
+        }
+        for i in range(count)
+    ]
+
+
+async def normalize_with_heartbeat(normalizer, data):
+    """정규화 중 이벤트 루프가 다른 작업을 얼마나 오래 못 돌렸는지 (최대 heartbeat 간격) 함께 측정."""
+    gaps = []
+    done = asyncio.Event()
+
+    async def heartbeat():
+        last = time.perf_counter()
+        while not done.is_set():
+            await asyncio.sleep(HEARTBEAT_INTERVAL)
+            now = time.perf_counter()
+            gaps.append(now - last)
+            last = now
+
+    heartbeat_task = asyncio.create_task(heartbeat())
+    await asyncio.sleep(0) # heartbeat 시작
+    start_time = time.perf_counter()
+    results = await normalizer.normalize(data, datetime(2024, 1, 2))
+    elapsed = time.perf_counter() - start_time
+    done.set()
+    await heartbeat_task
+    return elapsed, max(gaps), results
+
+
+def run(normalizer, data):
+    try:
+        if normalizer.workers:
+            # 프로세스 기동 비용은 서비스 수명 동안 한 번이므로 측정에서 제외 (warm-up)
+            asyncio.run(normalizer.normalize(data[:normalizer.min_batch], datetime(2024, 1, 2)))
+        return asyncio.run(normalize_with_heartbeat(normalizer, data))
+    finally:
+        normalizer.shutdown()
+
+
+def test_parallel_normalization_scaling():
+    data = make_raw_rows(NUM_ROWS)
+
+    inline_elapsed, inline_gap, inline_results = run(ParallelNormalizer(workers=0), data)
+    pooled = {
+        workers: run(ParallelNormalizer(workers=workers, chunk_size=CHUNK_SIZE, min_batch=CHUNK_SIZE), data)
+        for workers in WORKER_COUNTS
+    }
+
+    cpu_count = os.cpu_count() or 1
+    print(f"\n--- 병렬 정규화 스케일링 ({NUM_ROWS} rows, chunk {CHUNK_SIZE}, CPU {cpu_count}) ---")
+    print(f"inline (이벤트 루프): {inline_elapsed:.3f} 초, {NUM_ROWS / inline_elapsed:,.0f} rows/sec, 최대 루프 정지 {inline_gap * 1000:.0f} ms")
+    for workers, (elapsed, gap, _) in pooled.items():
+        print(f"{workers} workers: {elapsed:.3f} 초, {NUM_ROWS / elapsed:,.0f} rows/sec, "
+              f"inline 대비 {inline_elapsed / elapsed:.2f}x, 최대 루프 정지 {gap * 1000:.0f} ms")
+
+    expected_ids = [f"RAW-{i}" for i in range(NUM_ROWS)]
+    assert [result.record.original_raw_data_id for result in inline_results] == expected_ids
+    for workers, (elapsed, gap, results) in pooled.items():
+        assert [result.record.original_raw_data_id for result in results] == expected_ids # 입력 순서 유지
+        assert [result.record.action_type for result in results[:3]] == ["NEWT"] * 3
+        # 코어가 남는 경우에만: 이벤트 루프는 정규화 내내 막히지 않아야 함 (chunk 결과 unpickle 정도만 정지)
+        if cpu_count > workers:
+            assert gap * 2 < inline_gap
+    # 코어가 충분한 러너에서만 처리량 스케일링을 검증 (단일 코어 러너는 결과만 출력)
+    if cpu_count >= 4:
+        assert inline_elapsed / pooled[4][0] >= 1.5
@@ -0,0 +1,144 @@
+# tests/performance/test_record_type_performance.py
+
+import gc
+import time
+import tracemalloc
+from datetime import datetime
+from typing import List
+
+from pydantic import BaseModel
+
+from common.utils import ProcessedSwapDataDB
+from common.records import SwapRecord, records_to_rows, encode_records, decode_records
+
+# 성능 테스트 설정
+NUM_ROWS = 100000 # End-of-day 배치 크기
+RUNS = 2 # best-of-N (두 경로를 번갈아 RUNS x RUNS 회)
+MIN_SPEEDUP = 1.3 # 단독 실행 시 약 2x; 공유 러너의 측정 노이즈를 감안한 회귀 방지 하한
+
+
+class LegacyProcessedSwapData(BaseModel):
+    """이전 단계 간 경로의 Pydantic 모델 (data-processing ProcessedSwapData 와 동일한 필드, 참조용)."""
+    unique_transaction_identifier: str
+    reporting_counterparty_lei: str
+    other_counterparty_lei: str
+    action_type: str
+    event_type: str | None = None
+    asset_class: str
+    effective_date: str
+    termination_date: str
+    notional_amount: float | None = None
+    notional_currency: str | None = None
+    price: float | None = None
+    price_currency: str | None = None
+    processing_status: str = "Processed"
+    processing_errors: List[str] = []
+    original_raw_data_id: str
+    processing_timestamp: datetime
+
+
+def make_payloads(count: int):
+    """validation 큐 페이로드 (processing 이 발행하는 wire dict)."""
+    timestamp = datetime(2024, 1, 2, 3, 4, 5).isoformat()
+    return [
+        {
+            "id": f"REC-{i}",
+            "unique_transaction_identifier": f"MVP-TRADE-{i}-0123456789AB",
+            "reporting_counterparty_lei": "5493001KJTIIGC8Y1R12",
+            "other_counterparty_lei": "529900T8BM49AURSDO55",
+            "action_type": "NEWT",
+            "event_type": None,
+            "asset_class": "IR",
+            "effective_date": "2024-01-02",
+            "termination_date": "2029-01-02",
+            "notional_amount": 1000000.0 + i,
+            "notional_currency": "USD",
+            "price": None,
+            "price_currency": None,
+            "processing_status": "Processed",
+            "processing_errors": [],
+            "original_raw_data_id": f"RAW-{i}",
+            "processing_timestamp": timestamp,
+            "validation_status": "Pending",
+            "report_status": None,
+            "generated_report_id": None,
+        }
+        for i in range(count)
+    ]
+
+
+def legacy_hop(payloads):
+    """이전 경로: 페이로드 -> Pydantic 모델 -> model_dump(mode='json') (다음 단계 발행)."""
+    return [LegacyProcessedSwapData(**payload).model_dump(mode="json") for payload in payloads]
+
+
+def record_hop(payloads):
+    """공용 레코드 경로: 페이로드 -> SwapRecord -> to_dict()."""
+    return [SwapRecord.from_dict(payload).to_dict() for payload in payloads]
+
+
+def best_of(fn, *args):
+    """best-of-N, GC 비활성 (timeit 과 동일): 앞선 테스트가 남긴 힙 크기에 결과가 좌우되지 않도록."""
+    best = float("inf")
+    for _ in range(RUNS):
+        gc.collect()
+        gc.disable()
+        try:
+            start_time = time.perf_counter()
+            fn(*args)
+            best = min(best, time.perf_counter() - start_time)
+        finally:
+            gc.enable()
+    return best
+
+
+def retained_bytes(build):
+    """build() 가 만든 객체들이 유지하는 메모리 (tracemalloc)."""
+    gc.collect()
+    tracemalloc.start()
+    try:
+        objects = build()
+        size, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    del objects
+    return size
+
+
+def test_stage_hop_cpu():
+    payloads = make_payloads(NUM_ROWS)
+    assert record_hop(payloads[:10]) == [dict(payload) for payload in payloads[:10]] # 단계 간 페이로드가 그대로 유지됨
+
+    # 두 경로를 번갈아 측정해 러너 부하 변화가 한쪽에만 실리지 않게 함
+    legacy_elapsed = record_elapsed = float("inf")
+    for _ in range(RUNS):
+        legacy_elapsed = min(legacy_elapsed, best_of(legacy_hop, payloads))
+        record_elapsed = min(record_elapsed, best_of(record_hop, payloads))
+    encode_elapsed = best_of(lambda: decode_records(encode_records([SwapRecord.from_dict(p) for p in payloads])))
+
+    print(f"\n--- 단계 간 레코드 변환 ({NUM_ROWS} rows) ---")
+    print(f"Pydantic (모델 생성 + model_dump): {legacy_elapsed:.3f} 초, {NUM_ROWS / legacy_elapsed:,.0f} rows/sec")
+    print(f"SwapRecord (from_dict + to_dict): {record_elapsed:.3f} 초, {NUM_ROWS / record_elapsed:,.0f} rows/sec, {legacy_elapsed / record_elapsed:.1f}x")
+    print(f"SwapRecord 배치 JSON 인코딩/디코딩: {encode_elapsed:.3f} 초, {NUM_ROWS / encode_elapsed:,.0f} rows/sec")
+
+    assert record_elapsed * MIN_SPEEDUP < legacy_elapsed
+
+
+def test_resident_memory_per_record():
+    payloads = make_payloads(NUM_ROWS)
+    rows = records_to_rows(SwapRecord.from_dict(payload) for payload in payloads)
+
+    sizes = {
+        "dict (Core 행)": retained_bytes(lambda: [dict(row) for row in rows]),
+        "Pydantic 모델": retained_bytes(lambda: [LegacyProcessedSwapData(**payload) for payload in payloads]),
+        "ORM 객체": retained_bytes(lambda: [ProcessedSwapDataDB(**row) for row in rows]),
+        "SwapRecord": retained_bytes(lambda: [SwapRecord.from_dict(payload) for payload in payloads]),
+    }
+
+    print(f"\n--- 레코드 {NUM_ROWS}건 메모리 (필드 값 공유, 컨테이너 오버헤드만 비교) ---")
+    for name, size in sizes.items():
+        print(f"{name}: {size / 1024 / 1024:.1f} MiB, {size / NUM_ROWS:.0f} bytes/record")
+
+    assert sizes["SwapRecord"] < sizes["dict (Core 행)"]
+    assert sizes["SwapRecord"] * 2 < sizes["Pydantic 모델"]
+    assert sizes["SwapRecord"] * 2 < sizes["ORM 객체"]
@@ -0,0 +1,54 @@
+# tests/performance/test_reference_data_performance.py
+
+import json
+import os
+import time
+
+from common.reference_data import reference_data, CURRENCIES
+
+# 성능 테스트 설정
+NUM_ROWS = 200000 # End-of-day 배치의 통화 필드 수
+NAIVE_SAMPLE = 2000 # 행마다 파일을 읽는 방식은 표본으로 측정 후 환산
+RUNS = 3 # best-of-N
+
+
+def make_currencies(count: int):
+    """실제 배치처럼 소수의 통화가 반복되고 일부는 잘못된 코드."""
+    common = ["USD", "EUR", "JPY", "GBP", "KRW", "CHF", "AUD", "CAD"]
+    return [common[i % len(common)] if i % 1000 else "XYZ" for i in range(count)]
+
+
+def naive_lookup(currency: str) -> bool:
+    """기존 방식의 대안: 행마다 코드 파일을 읽어 확인 (DB 조회와 같은 행당 I/O)."""
+    version_directory = os.path.join(reference_data.directory, reference_data.snapshot.version)
+    with open(os.path.join(version_directory, "currencies.json"), encoding="utf-8") as code_file:
+        return currency in json.load(code_file)["codes"]
+
+
+def best_of(fn, *args):
+    best = float("inf")
+    for _ in range(RUNS):
+        start_time = time.perf_counter()
+        result = fn(*args)
+        best = min(best, time.perf_counter() - start_time)
+    return best, result
+
+
+def test_check_many_throughput():
+    values = make_currencies(NUM_ROWS)
+
+    naive_elapsed, naive = best_of(lambda: [naive_lookup(value) for value in values[:NAIVE_SAMPLE]])
+    naive_elapsed *= NUM_ROWS / NAIVE_SAMPLE
+    per_row_elapsed, per_row = best_of(lambda: [reference_data.contains(CURRENCIES, value) for value in values])
+    batch_elapsed, batch = best_of(reference_data.check_many, CURRENCIES, values)
+
+    print(f"\n--- 참조 데이터 코드 검사 ({NUM_ROWS} values) ---")
+    print(f"행마다 파일 조회 (환산): {naive_elapsed:.3f} 초, {NUM_ROWS / naive_elapsed:,.0f} values/sec")
+    print(f"행마다 contains(): {per_row_elapsed:.3f} 초, {NUM_ROWS / per_row_elapsed:,.0f} values/sec")
+    print(f"check_many (고유 값 단위): {batch_elapsed:.3f} 초, {NUM_ROWS / batch_elapsed:,.0f} values/sec, 행 단위 대비 {per_row_elapsed / batch_elapsed:.1f}x")
+
+    assert batch == per_row
+    assert naive == per_row[:NAIVE_SAMPLE]
+    assert batch.count(False) == NUM_ROWS // 1000
+    assert batch_elapsed * 2 < per_row_elapsed
+    assert batch_elapsed * 100 < naive_elapsed
@@ -0,0 +1,82 @@
+# tests/performance/test_report_linking_performance.py
+
+import time
+import uuid
+from datetime import datetime
+
+import pytest
+from sqlalchemy import create_engine, event, insert, select, func
+from sqlalchemy.orm import sessionmaker
+
+from common.utils import Base, ProcessedSwapDataDB, GeneratedReport, ReportRecord
+from common.bulk_db import link_utis_to_report
+
+# 성능 테스트 설정
+REPORT_ROWS = 50000 # 보고서에 포함된 레코드 수
+TABLE_ROWS = 200000 # processed_swap_data 전체 행 수 (COUNT(*) 비용 확인용)
+EXISTING_REPORTS = 50000 # generated_reports 기존 행 수
+
+
+@pytest.fixture
+def engine(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'report_linking.db'}")
+    Base.metadata.create_all(bind=engine)
+    with engine.begin() as conn:
+        conn.execute(insert(ProcessedSwapDataDB.__table__), [
+            {"id": str(uuid.uuid4()), "unique_transaction_identifier": f"MVP-TRADE-{i}", "validation_status": "Valid"}
+            for i in range(TABLE_ROWS)
+        ])
+        conn.execute(insert(GeneratedReport.__table__), [
+            {"id": str(uuid.uuid4()), "report_filename": f"reports/old_{i}.txt", "status": "Submitted"} for i in range(EXISTING_REPORTS)
+        ])
+    yield engine
+    engine.dispose()
+
+
+def link_row_by_row(db, report_id, utis):
+    """기존 경로: 레코드를 ORM 객체로 읽어 Python 루프로 상태 설정, 로그용 전체 COUNT."""
+    records = db.execute(select(ProcessedSwapDataDB).where(ProcessedSwapDataDB.unique_transaction_identifier.in_(utis))).scalars().all()
+    for record in records:
+        record.report_status = "IncludedInReport"
+        record.generated_report_id = report_id
+        db.add(record)
+    db.commit()
+    db.query(GeneratedReport).count()
+
+
+def link_set_based(db, report_id, utis):
+    """집합 기반 경로: INSERT ... SELECT (매핑) + UPDATE ... WHERE uti IN (...) 청크 단위."""
+    link_utis_to_report(db, report_id, utis)
+    db.commit()
+
+
+def measure(engine, link, report_id, utis):
+    statements = []
+    listener = lambda conn, cursor, statement, parameters, context, executemany: statements.append(statement)
+    event.listen(engine, "before_cursor_execute", listener)
+    db = sessionmaker(bind=engine)()
+    start_time = time.perf_counter()
+    link(db, report_id, utis)
+    elapsed = time.perf_counter() - start_time
+    db.close()
+    event.remove(engine, "before_cursor_execute", listener)
+    return elapsed, len(statements)
+
+
+def test_set_based_report_linking(engine):
+    utis = [f"MVP-TRADE-{i}" for i in range(0, 2 * REPORT_ROWS, 2)]
+
+    row_elapsed, row_statements = measure(engine, link_row_by_row, "R-row", utis)
+    set_elapsed, set_statements = measure(engine, link_set_based, "R-set", utis)
+
+    print(f"\n--- 보고서-레코드 연결 ({REPORT_ROWS} 레코드, SQLite) ---")
+    print(f"행 단위 (ORM 루프 + COUNT): {row_elapsed:.3f} 초, SQL {row_statements} 회")
+    print(f"집합 기반 (INSERT ... SELECT + UPDATE): {set_elapsed:.3f} 초, SQL {set_statements} 회 (매핑 {REPORT_ROWS} 행 포함)")
+    print(f"속도 향상: {row_elapsed / set_elapsed:.1f}배")
+
+    with engine.connect() as conn:
+        assert conn.execute(select(func.count()).select_from(ReportRecord).where(ReportRecord.report_id == "R-set")).scalar() == REPORT_ROWS
+        assert conn.execute(select(func.count()).select_from(ProcessedSwapDataDB)
+                            .where(ProcessedSwapDataDB.generated_report_id == "R-set")).scalar() == REPORT_ROWS
+    assert set_statements <= 2 * (REPORT_ROWS // 5000 + 1) # 청크당 2문장
+    assert set_elapsed * 2 < row_elapsed
@@ -0,0 +1,103 @@
+# tests/performance/test_report_writer_performance.py
+
+import io
+import time
+import tracemalloc
+from datetime import datetime
+
+import pytest
+from sqlalchemy import create_engine, insert, select
+from sqlalchemy.orm import sessionmaker
+
+from common.utils import Base, ProcessedSwapDataDB
+from common.report_writer import write_report, iter_row_chunks, REPORT_COLUMNS
+
+# 성능 테스트 설정
+SMALL_REPORT = 25000
+LARGE_REPORT = 100000 # SMALL_REPORT 의 4배 (1M 행 일일 보고서를 축소한 샘플)
+CHUNK_SIZE = 10000
+MAX_PEAK_GROWTH = 1.5 # 행 수가 4배가 되어도 streaming 최대 메모리 증가 허용치
+
+
+@pytest.fixture(scope="module")
+def session_factory(tmp_path_factory):
+    engine = create_engine(f"sqlite:///{tmp_path_factory.mktemp('reports') / 'report.db'}")
+    Base.metadata.create_all(bind=engine)
+    with engine.begin() as conn:
+        conn.execute(insert(ProcessedSwapDataDB.__table__), [
+            {
+                "id": f"{i:08d}",
+                "unique_transaction_identifier": f"UTI-{i}",
+                "action_type": "NEWT",
+                "event_type": "TRAD",
+                "asset_class": "IR",
+                "effective_date": "2024-01-02",
+                "termination_date": "2029-01-02",
+                "notional_amount": 1000000.0 + i,
+                "notional_currency": "USD",
+                "price": 0.0125,
+                "price_currency": "USD",
+                "reporting_counterparty_lei": "5493001KJTIIGC8Y1R12",
+                "other_counterparty_lei": "529900T8BM49AURSDO55",
+                "processing_timestamp": datetime(2024, 1, 2),
+                "validation_status": "Valid",
+            }
+            for i in range(LARGE_REPORT)
+        ])
+    yield sessionmaker(bind=engine)
+    engine.dispose()
+
+
+def report_statement(count):
+    return (select(*[getattr(ProcessedSwapDataDB, column) for column in REPORT_COLUMNS])
+            .order_by(ProcessedSwapDataDB.id).limit(count))
+
+
+def write_buffered(db, count, tmp_path):
+    """기존 경로: 전체 List[Dict] 를 메모리에 올린 뒤 행마다 f-string + write, 마지막에 한 번에 저장."""
+    data = [dict(row) for row in db.execute(report_statement(count)).mappings()]
+    stream = io.StringIO()
+    stream.write(f"## Swap Report Batch - Generated at {datetime.now().isoformat()}\n")
+    for entry in data:
+        stream.write(f"UTI: {entry.get('unique_transaction_identifier')}, Action: {entry.get('action_type')}, Asset Class: {entry.get('asset_class')}, Notional: {entry.get('notional_amount')} {entry.get('notional_currency')}, Effective Date: {entry.get('effective_date')}, Reporting LEI: {entry.get('reporting_counterparty_lei')}\n")
+    content = stream.getvalue().encode("utf-8")
+    (tmp_path / f"buffered_{count}.txt").write_bytes(content)
+    return len(data)
+
+
+def write_streaming(db, count, tmp_path):
+    """streaming 경로: cursor 에서 chunk 단위로 읽어 gzip CFTC CSV 파일로 바로 기록."""
+    result = write_report(tmp_path / f"streaming_{count}.csv.gz", iter_row_chunks(db, report_statement(count), CHUNK_SIZE), "cftc_csv", "gzip")
+    return result.row_count
+
+
+def measure(session_factory, write, count, tmp_path):
+    db = session_factory()
+    tracemalloc.start()
+    start_time = time.perf_counter()
+    written = write(db, count, tmp_path)
+    elapsed = time.perf_counter() - start_time
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    db.close()
+    return elapsed, peak, written
+
+
+def test_streaming_report_memory_is_constant(session_factory, tmp_path):
+    results = {}
+    for label, write in (("buffered", write_buffered), ("streaming", write_streaming)):
+        for count in (SMALL_REPORT, LARGE_REPORT):
+            results[label, count] = measure(session_factory, write, count, tmp_path)
+
+    print(f"\n--- 보고서 작성 최대 메모리 (chunk {CHUNK_SIZE}, SQLite cursor) ---")
+    for (label, count), (elapsed, peak, written) in results.items():
+        print(f"{label:>9} {count:>7} rows: peak {peak / 1024 / 1024:7.2f} MB, {elapsed:.3f} 초, {count / elapsed:,.0f} rows/sec")
+    print(f"gzip CFTC CSV 크기 ({LARGE_REPORT} rows): {(tmp_path / f'streaming_{LARGE_REPORT}.csv.gz').stat().st_size / 1024 / 1024:.2f} MB, "
+          f"text 크기: {(tmp_path / f'buffered_{LARGE_REPORT}.txt').stat().st_size / 1024 / 1024:.2f} MB")
+
+    assert all(written == count for (_, count), (_, _, written) in results.items())
+    streaming_small = results["streaming", SMALL_REPORT][1]
+    streaming_large = results["streaming", LARGE_REPORT][1]
+    # 행 수와 무관하게 최대 메모리가 chunk 크기 수준으로 유지되어야 함
+    assert streaming_large < streaming_small * MAX_PEAK_GROWTH
+    assert streaming_large * 5 < results["buffered", LARGE_REPORT][1]
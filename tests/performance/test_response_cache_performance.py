@@ -0,0 +1,90 @@
+# tests/performance/test_response_cache_performance.py
+
+import asyncio
+import time
+
+import httpx
+from fastapi import FastAPI, Request
+
+from common.response_cache import ResponseCache
+
+# 성능 테스트 설정
+OPERATORS = 20 # 대시보드를 polling 하는 운영자 수
+POLLS = 10 # 운영자당 polling 횟수
+POLL_INTERVAL = 0.05 # 초
+UPSTREAM_LATENCY = 0.03 # 파이프라인 서비스의 목록 조회 지연 (DB 쿼리)
+CACHE_TTL = 0.2
+
+
+def create_upstream_app(counter):
+    """/errors 목록 조회 스텁 (호출마다 DB 쿼리 1회로 간주)."""
+    app = FastAPI()
+
+    @app.get("/errors")
+    async def errors(limit: int = 100):
+        counter["queries"] += 1
+        await asyncio.sleep(UPSTREAM_LATENCY)
+        return {"items": [{"id": f"E-{i}", "status": "New"} for i in range(limit)], "next_cursor": None}
+
+    return app
+
+
+def create_bff_app(upstream_client, cache):
+    """web BFF 의 /api/errors 프록시 (cache=None 이면 기존 경로: 매 요청 upstream 호출)."""
+    app = FastAPI()
+
+    async def fetch(params):
+        response = await upstream_client.get("http://errors.test/errors", params=params)
+        response.raise_for_status()
+        return response.content
+
+    @app.get("/api/errors")
+    async def errors(request: Request, limit: int = 100):
+        params = {"limit": limit}
+        if cache is None:
+            return (await upstream_client.get("http://errors.test/errors", params=params)).json()
+        return cache.to_response(request, await cache.get_or_fetch("errors", params, lambda: fetch(params)))
+
+    return app
+
+
+async def poll_dashboard(cache):
+    counter = {"queries": 0}
+    upstream_client = httpx.AsyncClient(transport=httpx.ASGITransport(app=create_upstream_app(counter)))
+    bff = httpx.AsyncClient(transport=httpx.ASGITransport(app=create_bff_app(upstream_client, cache)), base_url="http://web.test")
+    latencies, not_modified = [], 0
+
+    async def operator():
+        nonlocal not_modified
+        etag = None
+        for _ in range(POLLS):
+            start_time = time.perf_counter()
+            response = await bff.get("/api/errors", headers={"If-None-Match": etag} if etag else {})
+            latencies.append(time.perf_counter() - start_time)
+            if response.status_code == 304:
+                not_modified += 1
+            etag = response.headers.get("etag")
+            await asyncio.sleep(POLL_INTERVAL)
+
+    start_time = time.perf_counter()
+    await asyncio.gather(*(operator() for _ in range(OPERATORS)))
+    elapsed = time.perf_counter() - start_time
+    await bff.aclose()
+    await upstream_client.aclose()
+    latencies.sort()
+    return counter["queries"], latencies[len(latencies) // 2], not_modified, elapsed
+
+
+def test_cache_reduces_upstream_queries():
+    uncached_queries, uncached_p50, _, uncached_elapsed = asyncio.run(poll_dashboard(None))
+    cached_queries, cached_p50, not_modified, cached_elapsed = asyncio.run(poll_dashboard(ResponseCache(ttl=CACHE_TTL)))
+
+    requests = OPERATORS * POLLS
+    print(f"\n--- BFF 응답 캐시 ({OPERATORS} 운영자 x {POLLS} polling, TTL {CACHE_TTL} 초) ---")
+    print(f"캐시 없음: upstream 쿼리 {uncached_queries} 회, p50 {uncached_p50 * 1000:.1f} ms, 총 {uncached_elapsed:.2f} 초")
+    print(f"TTL + single-flight + ETag: upstream 쿼리 {cached_queries} 회, p50 {cached_p50 * 1000:.1f} ms, "
+          f"304 {not_modified}/{requests}, 총 {cached_elapsed:.2f} 초")
+
+    assert uncached_queries == requests
+    assert cached_queries * 10 <= uncached_queries # 동시 polling 은 한 번의 upstream 호출로 합쳐짐
+    assert not_modified >= requests - 2 * OPERATORS # 첫 응답 이후는 대부분 304
@@ -0,0 +1,83 @@
+# tests/performance/test_sdr_dispatch_performance.py
+
+import asyncio
+import random
+import time
+
+import httpx
+
+from common.sdr_dispatch import SubmissionDispatcher, SdrDestination
+from common.sdr_stub import SdrStub, create_sdr_stub_app
+from common.sdr_upload import BytesReportSource, upload_report
+
+# 성능 테스트 설정
+NUM_REPORTS = 20
+DESTINATIONS = ["DTCC", "ICE", "REGIS"]
+LATENCY = 0.02 # 일반 응답 시간 (초)
+SLOW_FRACTION = 0.1 # 꼬리 지연 비율
+SLOW_LATENCY = 0.5 # 꼬리 지연 응답 시간 (초)
+HEDGE_AFTER = 0.1
+REPORT = b"UTI,LEI,NOTIONAL\n" * 5000
+
+
+def make_stubs():
+    return {name: SdrStub(name, latency=LATENCY, slow_fraction=SLOW_FRACTION, slow_latency=SLOW_LATENCY, seed=seed)
+            for seed, name in enumerate(DESTINATIONS)}
+
+
+def make_clients(stubs):
+    return {f"http://{name.lower()}.test/sdr-submit": httpx.AsyncClient(transport=httpx.ASGITransport(app=create_sdr_stub_app(stub)))
+            for name, stub in stubs.items()}
+
+
+def percentile(values, fraction):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+
+async def sequential_submit(clients):
+    """기존 방식: 보고서마다 SDR 하나씩 차례로 전송 (헤지 없음)."""
+    latencies = []
+    for i in range(NUM_REPORTS):
+        filename = f"report_{i}.csv"
+        for url, client in clients.items():
+            start_time = time.perf_counter()
+            await upload_report(client, url, BytesReportSource(REPORT, filename), filename)
+            latencies.append(time.perf_counter() - start_time)
+    return latencies
+
+
+async def dispatched_submit(clients):
+    """디스패처: 모든 보고서 x 모든 SDR 동시 전송, SDR 별 동시성 4, 헤지 0.1 초."""
+    destinations = [SdrDestination(name, f"http://{name.lower()}.test/sdr-submit", max_concurrency=4, rate_per_second=1000, burst=1000,
+                                   hedge_after=HEDGE_AFTER) for name in DESTINATIONS]
+    dispatcher = SubmissionDispatcher(destinations, client_for=clients.__getitem__, rng=random.Random(0))
+    results = await asyncio.gather(*(
+        dispatcher.dispatch(BytesReportSource(REPORT, f"report_{i}.csv"), f"report_{i}.csv") for i in range(NUM_REPORTS)
+    ))
+    assert all(result.success for per_report in results for result in per_report.values())
+    return [result.elapsed for per_report in results for result in per_report.values()], dispatcher.metrics()
+
+
+def test_parallel_dispatch_with_hedging_is_faster():
+    sequential_stubs = make_stubs()
+    start_time = time.perf_counter()
+    sequential_latencies = asyncio.run(sequential_submit(make_clients(sequential_stubs)))
+    sequential_elapsed = time.perf_counter() - start_time
+
+    dispatched_stubs = make_stubs()
+    start_time = time.perf_counter()
+    dispatched_latencies, metrics = asyncio.run(dispatched_submit(make_clients(dispatched_stubs)))
+    dispatched_elapsed = time.perf_counter() - start_time
+
+    hedges = sum(destination["hedges"] for destination in metrics.values())
+    hedge_wins = sum(destination["hedge_wins"] for destination in metrics.values())
+    print(f"\n--- SDR 다중 전송 ({NUM_REPORTS} 보고서 x {len(DESTINATIONS)} SDR, 꼬리 지연 {SLOW_FRACTION:.0%} / {SLOW_LATENCY} 초) ---")
+    print(f"순차 전송: {sequential_elapsed:.3f} 초, p50 {percentile(sequential_latencies, 0.5):.3f} 초, p99 {percentile(sequential_latencies, 0.99):.3f} 초")
+    print(f"병렬 + 헤지: {dispatched_elapsed:.3f} 초, p50 {percentile(dispatched_latencies, 0.5):.3f} 초, p99 {percentile(dispatched_latencies, 0.99):.3f} 초 (헤지 {hedges}, 헤지 승 {hedge_wins})")
+    print(f"속도 향상: {sequential_elapsed / dispatched_elapsed:.1f}배")
+
+    for stubs in (sequential_stubs, dispatched_stubs):
+        assert all(len(stub.submissions) == NUM_REPORTS for stub in stubs.values()) # 헤지 사본은 중복 제거
+    assert dispatched_elapsed * 3 < sequential_elapsed
+    assert percentile(dispatched_latencies, 0.99) < percentile(sequential_latencies, 0.99)
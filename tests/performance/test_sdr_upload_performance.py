@@ -0,0 +1,104 @@
+# tests/performance/test_sdr_upload_performance.py
+
+import asyncio
+import gc
+import hashlib
+import os
+import time
+import tracemalloc
+
+import httpx
+
+from common.sdr_upload import FileReportSource, upload_report, SDR_UPLOAD_CHUNK_BYTES
+
+# 성능 테스트 설정
+REPORT_BYTES = 64 * 1024 * 1024 # 대형 일일 보고서 (실제 수 GB)
+PART_BYTES = 4 * 1024 * 1024 # 멀티파트 파트 크기
+SDR_URL = "http://sdr.test/sdr-submit"
+
+
+class HashingSdr:
+    """본문을 버퍼링하지 않고 해시만 계산하는 SDR (측정 대상이 아닌 쪽의 메모리를 0 에 가깝게)."""
+
+    def __init__(self):
+        self.digest = hashlib.sha256()
+        self.received = 0
+
+    async def handle(self, request: httpx.Request) -> httpx.Response:
+        path = request.url.path
+        if path == "/sdr-submit/uploads":
+            return httpx.Response(201, json={"upload_id": "U-1"})
+        if path.endswith("/complete"):
+            return httpx.Response(200, json={"status": "received", "size": self.received})
+        async for chunk in request.stream:
+            self.digest.update(chunk)
+            self.received += len(chunk)
+        return httpx.Response(200, json={"status": "received", "size": self.received})
+
+
+class StreamingTransport(httpx.AsyncBaseTransport):
+    """httpx.MockTransport 는 핸들러 호출 전에 본문 전체를 읽으므로, 스트림을 그대로 넘기는 전송 계층."""
+
+    def __init__(self, handler):
+        self.handler = handler
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        return await self.handler(request)
+
+
+def write_report(path):
+    block = os.urandom(1024 * 1024)
+    with open(path, "wb") as report_file:
+        for _ in range(REPORT_BYTES // len(block)):
+            report_file.write(block)
+
+
+async def legacy_submit(client, path):
+    """기존 submit_report: 파일 전체를 읽어 content= 로 한 번에 전송."""
+    with open(path, "rb") as report_file:
+        report_content = report_file.read()
+    response = await client.post(SDR_URL, content=report_content)
+    response.raise_for_status()
+    return response.json()
+
+
+def measure(path, submit):
+    sdr = HashingSdr()
+
+    async def scenario():
+        async with httpx.AsyncClient(transport=StreamingTransport(sdr.handle)) as client:
+            return await submit(client, path)
+
+    gc.collect()
+    tracemalloc.start()
+    start_time = time.perf_counter()
+    asyncio.run(scenario())
+    elapsed = time.perf_counter() - start_time
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak, sdr
+
+
+def test_streaming_upload_memory_is_flat(tmp_path):
+    path = str(tmp_path / "daily_report.csv.gz")
+    write_report(path)
+    with open(path, "rb") as report_file:
+        expected = hashlib.sha256(report_file.read()).hexdigest()
+
+    legacy_elapsed, legacy_peak, legacy_sdr = measure(path, legacy_submit)
+    stream_elapsed, stream_peak, stream_sdr = measure(
+        path, lambda client, p: upload_report(client, SDR_URL, FileReportSource(p), "daily_report.csv.gz"))
+    multipart_elapsed, multipart_peak, multipart_sdr = measure(
+        path, lambda client, p: upload_report(client, SDR_URL, FileReportSource(p), "daily_report.csv.gz", multipart_threshold=0, part_size=PART_BYTES))
+
+    mib = 1024 * 1024
+    print(f"\n--- SDR 업로드 ({REPORT_BYTES // mib} MiB 보고서) ---")
+    print(f"기존 (전체 읽기 후 전송): {legacy_elapsed:.3f} 초, 최대 메모리 {legacy_peak / mib:.1f} MiB")
+    print(f"스트리밍 (chunk {SDR_UPLOAD_CHUNK_BYTES // mib} MiB): {stream_elapsed:.3f} 초, 최대 메모리 {stream_peak / mib:.1f} MiB")
+    print(f"멀티파트 (part {PART_BYTES // mib} MiB): {multipart_elapsed:.3f} 초, 최대 메모리 {multipart_peak / mib:.1f} MiB")
+
+    for sdr in (legacy_sdr, stream_sdr, multipart_sdr):
+        assert sdr.received == REPORT_BYTES and sdr.digest.hexdigest() == expected
+    assert legacy_peak >= REPORT_BYTES
+    assert stream_peak < 4 * SDR_UPLOAD_CHUNK_BYTES # 보고서 크기와 무관
+    assert multipart_peak < 3 * PART_BYTES
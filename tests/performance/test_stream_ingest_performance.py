@@ -0,0 +1,112 @@
+# tests/performance/test_stream_ingest_performance.py
+
+import asyncio
+import json
+import time
+import tracemalloc
+
+from sqlalchemy import func
+
+from common.utils import RawIngestedData
+from common.bulk_ingest import build_raw_rows, bulk_insert_raw_rows
+from common.stream_ingest import NDJSONSplitter, iter_stream_records, flush_raw_batch
+
+# 성능 테스트 설정
+SMALL_PUSH = 5000
+LARGE_PUSH = 20000 # SMALL_PUSH 의 4배
+BATCH_SIZE = 1000
+CHUNK_SIZE = 64 * 1024 # ASGI 서버가 넘겨주는 body chunk 크기 수준
+MAX_PEAK_GROWTH = 1.5 # payload 가 4배가 되어도 streaming 최대 메모리 증가 허용치
+
+
+def swap_line(i: int) -> bytes:
+    """FEP 원시 스왑 데이터 한 건 (NDJSON 한 줄)."""
+    return json.dumps({
+        "trade_id": f"TRADE-{i}",
+        "action": "NEWT",
+        "instrument_type": "IRS",
+        "asset_class": "IR",
+        "effective_date": "2024-01-02",
+        "termination_date": "2029-01-02",
+        "notional_amount": 1000000.0 + i,
+        "notional_currency": "USD",
+        "party_a_lei": "5493001KJTIIGC8Y1R12",
+        "party_b_lei": "529900T8BM49AURSDO55",
+        "price": 0.0125,
+        "price_currency": "USD",
+    }).encode() + b"\n"
+
+
+async def ndjson_body(count: int):
+    """요청 body 를 chunk 단위로 흘려보냄 (전체 payload 를 메모리에 만들지 않음)."""
+    chunk = bytearray()
+    for i in range(count):
+        chunk += swap_line(i)
+        if len(chunk) >= CHUNK_SIZE:
+            yield bytes(chunk)
+            chunk = bytearray()
+    if chunk:
+        yield bytes(chunk)
+
+
+async def ingest_buffered(db, count):
+    """기존 경로: body 전체를 모은 뒤 한 번에 파싱/적재 (List[...] body 와 같은 메모리 형태)."""
+    body = b"".join([chunk async for chunk in ndjson_body(count)])
+    data = [json.loads(line) for line in body.splitlines()]
+    rows, rejected = build_raw_rows(data)
+    bulk_insert_raw_rows(db, rows)
+    db.commit()
+    return len(rows)
+
+
+async def ingest_streaming(db, count):
+    """streaming 경로: /ingest/stream 과 같이 줄 단위로 파싱하고 micro-batch 마다 적재/커밋."""
+    ingested = 0
+    batch = []
+    async for number, record, error in iter_stream_records(ndjson_body(count), NDJSONSplitter()):
+        batch.append((number, record))
+        if len(batch) >= BATCH_SIZE:
+            ingested += flush_raw_batch(db, batch)[0]
+            db.commit()
+            batch.clear()
+    if batch:
+        ingested += flush_raw_batch(db, batch)[0]
+        db.commit()
+    return ingested
+
+
+def measure(session_factory, ingest, count):
+    """(경과 시간, tracemalloc 최대 메모리, 적재 건수)"""
+    db = session_factory()
+    tracemalloc.start()
+    start_time = time.perf_counter()
+    ingested = asyncio.run(ingest(db, count))
+    elapsed = time.perf_counter() - start_time
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    db.close()
+    return elapsed, peak, ingested
+
+
+def test_streaming_ingest_memory_is_bounded(session_factory):
+    results = {}
+    for label, ingest in (("buffered", ingest_buffered), ("streaming", ingest_streaming)):
+        for count in (SMALL_PUSH, LARGE_PUSH):
+            results[label, count] = measure(session_factory, ingest, count)
+
+    print(f"\n--- Streaming ingest 최대 메모리 (NDJSON, batch {BATCH_SIZE}, SQLite) ---")
+    for (label, count), (elapsed, peak, ingested) in results.items():
+        print(f"{label:>9} {count:>6} rows: peak {peak / 1024 / 1024:7.2f} MB, {elapsed:.3f} 초, {count / elapsed:,.0f} rows/sec")
+
+    db = session_factory()
+    stored_count = db.query(func.count(RawIngestedData.id)).scalar()
+    db.close()
+
+    assert all(ingested == count for (_, count), (_, _, ingested) in results.items())
+    assert stored_count == 2 * (SMALL_PUSH + LARGE_PUSH)
+    streaming_small = results["streaming", SMALL_PUSH][1]
+    streaming_large = results["streaming", LARGE_PUSH][1]
+    buffered_large = results["buffered", LARGE_PUSH][1]
+    # payload 크기와 무관하게 최대 메모리가 batch 크기 수준으로 유지되어야 함
+    assert streaming_large < streaming_small * MAX_PEAK_GROWTH
+    assert streaming_large * 5 < buffered_large
@@ -0,0 +1,132 @@
+# tests/performance/test_validation_db_performance.py
+
+import time
+import uuid
+from datetime import datetime
+
+import pytest
+from sqlalchemy import create_engine, event, insert, func
+from sqlalchemy.orm import sessionmaker
+
+from common.utils import Base, ProcessedSwapDataDB, ValidationResult
+from common.bulk_db import fetch_processed_ids_by_uti, bulk_update_validation_status, bulk_insert_validation_results
+
+# 성능 테스트 설정
+BATCH_SIZES = [1000, 10000, 100000]
+ROW_BY_ROW_MAX_SIZE = 10000 # 행 단위 경로는 느리므로 이 크기까지만 비교 측정
+
+
+class QueryCounter:
+    """엔진에서 실행된 SQL 문 수를 센다."""
+
+    def __init__(self, engine):
+        self.count = 0
+        event.listen(engine, "before_cursor_execute", self._on_execute)
+
+    def _on_execute(self, conn, cursor, statement, parameters, context, executemany):
+        self.count += 1
+
+
+@pytest.fixture
+def engine(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'validation.db'}")
+    Base.metadata.create_all(bind=engine)
+    yield engine
+    engine.dispose()
+
+
+def seed_processed_rows(engine, count: int):
+    """검증 대상이 될 processed_swap_data 행을 미리 적재하고 UTI 목록을 반환."""
+    utis = [f"MVP-TRADE-{i}" for i in range(count)]
+    with engine.begin() as conn:
+        conn.execute(insert(ProcessedSwapDataDB.__table__), [
+            {"id": str(uuid.uuid4()), "unique_transaction_identifier": uti, "validation_status": "Pending"}
+            for uti in utis
+        ])
+    return utis
+
+
+def make_outcomes(utis):
+    """짝수 번째는 Valid, 홀수 번째는 Invalid 로 검증 결과를 구성."""
+    return {uti: ("Valid" if i % 2 == 0 else "Invalid") for i, uti in enumerate(utis)}
+
+
+def persist_row_by_row(db, status_by_uti):
+    """기존 경로: UTI 마다 SELECT 후 ORM 갱신 및 ValidationResult 추가."""
+    for uti, status in status_by_uti.items():
+        record = db.query(ProcessedSwapDataDB).filter(ProcessedSwapDataDB.unique_transaction_identifier == uti).first()
+        record.validation_status = status
+        db.add(ValidationResult(
+            unique_transaction_identifier=uti,
+            is_valid=(status == "Valid"),
+            errors=[],
+            validation_timestamp=datetime.utcnow(),
+            processed_data_id=record.id,
+        ))
+    db.commit()
+
+
+def persist_set_based(db, status_by_uti):
+    """집합 기반 경로: IN 조회 1회, 상태별 UPDATE, ValidationResult 일괄 INSERT."""
+    ids_by_uti = fetch_processed_ids_by_uti(db, list(status_by_uti.keys()))
+    bulk_update_validation_status(db, status_by_uti)
+    validation_timestamp = datetime.utcnow()
+    bulk_insert_validation_results(db, [
+        {
+            "unique_transaction_identifier": uti,
+            "is_valid": status == "Valid",
+            "errors": [],
+            "validation_timestamp": validation_timestamp,
+            "processed_data_id": ids_by_uti.get(uti),
+        }
+        for uti, status in status_by_uti.items()
+    ])
+    db.commit()
+
+
+def measure(engine, persist, status_by_uti):
+    counter = QueryCounter(engine)
+    db = sessionmaker(bind=engine)()
+    start_time = time.perf_counter()
+    persist(db, status_by_uti)
+    elapsed = time.perf_counter() - start_time
+    db.close()
+    event.remove(engine, "before_cursor_execute", counter._on_execute)
+    return elapsed, counter.count
+
+
+@pytest.mark.parametrize("batch_size", BATCH_SIZES)
+def test_validation_persistence_query_count_and_latency(engine, batch_size):
+    utis = seed_processed_rows(engine, batch_size)
+    status_by_uti = make_outcomes(utis)
+
+    print(f"\n--- Validation DB 반영 성능 ({batch_size} rows, SQLite) ---")
+
+    if batch_size <= ROW_BY_ROW_MAX_SIZE:
+        row_elapsed, row_queries = measure(engine, persist_row_by_row, status_by_uti)
+        print(f"행 단위 경로: {row_elapsed:.3f} 초, SQL {row_queries} 회")
+        # 다음 측정을 위해 상태 초기화
+        with engine.begin() as conn:
+            conn.execute(ProcessedSwapDataDB.__table__.update().values(validation_status="Pending"))
+            conn.execute(ValidationResult.__table__.delete())
+
+    set_elapsed, set_queries = measure(engine, persist_set_based, status_by_uti)
+    print(f"집합 기반 경로: {set_elapsed:.3f} 초, SQL {set_queries} 회")
+
+    with engine.connect() as conn:
+        valid_count = conn.execute(
+            func.count().select().select_from(ProcessedSwapDataDB.__table__)
+            .where(ProcessedSwapDataDB.validation_status == "Valid")
+        ).scalar()
+        linked_count = conn.execute(
+            func.count().select().select_from(ValidationResult.__table__)
+            .where(ValidationResult.processed_data_id.isnot(None))
+        ).scalar()
+
+    assert valid_count == (batch_size + 1) // 2
+    assert linked_count == batch_size
+    # SELECT/UPDATE 는 chunk 수에 비례하고 INSERT 는 executemany 이므로 행 수와 무관하게 작아야 함
+    assert set_queries < batch_size / 100
+    if batch_size <= ROW_BY_ROW_MAX_SIZE:
+        assert set_queries < row_queries
+        assert set_elapsed < row_elapsed
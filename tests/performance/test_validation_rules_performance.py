@@ -0,0 +1,185 @@
+# tests/performance/test_validation_rules_performance.py
+
+import os
+import random
+import sys
+import time
+from datetime import date, datetime, timedelta
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "..", "src", "validation"))
+
+from common.utils import validate_lei
+from common.lei import registered_leis
+from common.reference_data import reference_data, CURRENCIES, ASSET_CLASSES, ACTION_TYPES, EVENT_TYPES
+from rules import CFTC_RULES, evaluate_rules
+from tests.conftest import make_lei
+
+# 성능 테스트 설정
+NUM_ROWS = 100000 # 대형 End-of-day 배치
+MIN_SPEEDUP = 10.0 # 목표는 20x; 공유 러너의 측정 노이즈를 감안한 회귀 방지 하한
+ENGINE_RUNS = 3
+# 실제 End-of-day 배치 수준의 값 다양성 (distinct 값 수)
+NUM_REPORTING_LEIS = 40 # 보고 주체 (자사 법인)
+NUM_OTHER_LEIS = 5000 # 거래 상대방
+NUM_TRADE_DAYS = 250 # 1년치 영업일
+TENOR_YEARS = (1, 2, 3, 5, 7, 10, 15, 20, 30)
+MAJOR_CURRENCIES = ["USD", "EUR", "JPY", "GBP", "CHF", "AUD", "CAD", "KRW", "HKD", "SGD", "SEK", "NOK"]
+ASSET_CLASS_CODES = ["IR", "CR", "EQ", "FX", "CO"]
+
+
+CODE_CHECKS = [
+    ("notional_currency", CURRENCIES, "Notional Currency '{}' is not a valid ISO 4217 code."),
+    ("price_currency", CURRENCIES, "Price Currency '{}' is not a valid ISO 4217 code."),
+    ("asset_class", ASSET_CLASSES, "Asset Class '{}' is not a valid CFTC asset class."),
+    ("action_type", ACTION_TYPES, "Action Type '{}' is not a valid CFTC action type."),
+    ("event_type", EVENT_TYPES, "Event Type '{}' is not a valid CFTC event type."),
+]
+
+
+def validate_row_by_row(entry):
+    """기존 행 단위 검증 로직 (참조용 oracle). validation/main.py 의 이전 루프와 동일."""
+    errors = []
+    is_valid = True
+
+    if entry["processing_errors"]:
+        is_valid = False
+        errors.extend([f"Processing Error: {err}" for err in entry["processing_errors"]])
+
+    if entry["notional_amount"] is None or entry["notional_amount"] <= 0:
+        is_valid = False
+        errors.append("Notional Amount must be a positive value.")
+
+    effective_dt = None
+    termination_dt = None
+    try:
+        effective_dt = datetime.strptime(entry["effective_date"], '%Y-%m-%d')
+    except (ValueError, TypeError):
+        is_valid = False
+        errors.append(f"Effective Date '{entry['effective_date']}' is missing or invalid format (YYYY-MM-DD).")
+    try:
+        termination_dt = datetime.strptime(entry["termination_date"], '%Y-%m-%d')
+    except (ValueError, TypeError):
+        is_valid = False
+        errors.append(f"Termination Date '{entry['termination_date']}' is missing or invalid format (YYYY-MM-DD).")
+
+    if is_valid and effective_dt and termination_dt and effective_dt > termination_dt:
+        is_valid = False
+        errors.append("Effective Date must be before or equal to Termination Date.")
+
+    if not validate_lei(entry["reporting_counterparty_lei"]):
+        is_valid = False
+        errors.append(f"Reporting Counterparty LEI '{entry['reporting_counterparty_lei']}' has invalid format.")
+    if not validate_lei(entry["other_counterparty_lei"]):
+        is_valid = False
+        errors.append(f"Other Counterparty LEI '{entry['other_counterparty_lei']}' has invalid format.")
+    if not registered_leis([entry["reporting_counterparty_lei"]])[0]:
+        is_valid = False
+        errors.append(f"Reporting Counterparty LEI '{entry['reporting_counterparty_lei']}' is not registered in the GLEIF golden copy.")
+    if not registered_leis([entry["other_counterparty_lei"]])[0]:
+        is_valid = False
+        errors.append(f"Other Counterparty LEI '{entry['other_counterparty_lei']}' is not registered in the GLEIF golden copy.")
+
+    if entry["action_type"] == "NEWT":
+        if not entry["reporting_counterparty_lei"]:
+            is_valid = False
+            errors.append("Reporting Counterparty LEI is required for NEWT action.")
+        if not entry["other_counterparty_lei"]:
+            is_valid = False
+            errors.append("Other Counterparty LEI is required for NEWT action.")
+
+    for name, code_list, message in CODE_CHECKS:
+        value = entry.get(name)
+        if value and not reference_data.contains(code_list, value):
+            is_valid = False
+            errors.append(message.format(value))
+
+    return is_valid, errors
+
+
+def make_processed_rows(count: int):
+    """유효/무효 케이스가 섞인 처리 완료 스왑 데이터 샘플 생성 (LEI, 통화, 날짜가 실제 배치처럼 다양)."""
+    rng = random.Random(20)
+    reporting_leis = [make_lei(rng) for _ in range(NUM_REPORTING_LEIS)]
+    other_leis = [make_lei(rng) for _ in range(NUM_OTHER_LEIS)]
+    trade_days = [date(2024, 1, 2) + timedelta(days=day) for day in range(NUM_TRADE_DAYS * 7 // 5)]
+    rows = []
+    for i in range(count):
+        effective = rng.choice(trade_days)
+        termination = effective + timedelta(days=365 * rng.choice(TENOR_YEARS) + rng.randrange(5))
+        row = {
+            "unique_transaction_identifier": f"MVP-TRADE-{i}",
+            "action_type": "NEWT" if i % 3 else "MODI",
+            "effective_date": effective.isoformat(),
+            "termination_date": termination.isoformat(),
+            "notional_amount": 1000000.0 + i,
+            "notional_currency": rng.choice(MAJOR_CURRENCIES),
+            "asset_class": rng.choice(ASSET_CLASS_CODES),
+            "reporting_counterparty_lei": rng.choice(reporting_leis),
+            "other_counterparty_lei": rng.choice(other_leis),
+            "processing_errors": [],
+        }
+        case = i % 500 # 대부분 유효한 배치 (약 1.6% 무효)
+        if case == 1:
+            row["notional_amount"] = -5.0
+        elif case == 2:
+            row["effective_date"] = "2024-02-30"
+        elif case == 3:
+            row["termination_date"] = None
+        elif case == 4:
+            row["effective_date"] = "2060-01-01"
+        elif case == 5:
+            row["reporting_counterparty_lei"] = "BAD-LEI"
+        elif case == 6:
+            row["other_counterparty_lei"] = ""
+            row["action_type"] = "NEWT"
+        elif case == 7:
+            row["processing_errors"] = ["Invalid Price format: abc", "Unknown currency"]
+            row["notional_amount"] = None
+        elif case == 8:
+            row["effective_date"] = "2060-01-01"
+            row["notional_amount"] = 0.0
+        elif case == 9:
+            row["notional_currency"] = "XYZ"
+            row["asset_class"] = "SWAP"
+        rows.append(row)
+    return rows
+
+
+def test_rule_engine_matches_row_by_row_messages():
+    data = make_processed_rows(500)
+
+    result = evaluate_rules(data, CFTC_RULES)
+
+    for row, entry in enumerate(data):
+        assert (bool(result.is_valid[row]), result.errors_for(row)) == validate_row_by_row(entry)
+    # Effective > Termination 은 앞선 규칙이 모두 통과한 경우에만 보고됨
+    assert result.error_codes[4] == ["EFFECTIVE_AFTER_TERMINATION"]
+    assert result.error_codes[8] == ["NOTIONAL_NOT_POSITIVE"]
+    assert 0 not in result.errors # 유효한 행에는 오류 목록을 만들지 않음
+    assert result.failure_counts["PROCESSING_ERROR"] == 1
+
+
+def test_rule_engine_throughput():
+    data = make_processed_rows(NUM_ROWS)
+
+    start_time = time.perf_counter()
+    baseline = [validate_row_by_row(entry) for entry in data]
+    baseline_elapsed = time.perf_counter() - start_time
+
+    # 엔진 경로는 짧아서 측정 노이즈가 크므로 best-of-N 으로 측정
+    engine_elapsed = float("inf")
+    for _ in range(ENGINE_RUNS):
+        start_time = time.perf_counter()
+        result = evaluate_rules(data, CFTC_RULES)
+        engine_elapsed = min(engine_elapsed, time.perf_counter() - start_time)
+
+    print(f"\n--- Validation 규칙 엔진 성능 ({NUM_ROWS} rows) ---")
+    print(f"행 단위 검증: {baseline_elapsed:.3f} 초, {NUM_ROWS / baseline_elapsed:,.0f} rows/sec")
+    print(f"컬럼 기반 엔진: {engine_elapsed:.3f} 초, {NUM_ROWS / engine_elapsed:,.0f} rows/sec")
+    print(f"속도 향상: {baseline_elapsed / engine_elapsed:.1f}x")
+
+    assert result.is_valid.tolist() == [is_valid for is_valid, _ in baseline]
+    assert [result.errors_for(row) for row in range(NUM_ROWS)] == [errors for _, errors in baseline]
+    assert baseline_elapsed / engine_elapsed >= MIN_SPEEDUP
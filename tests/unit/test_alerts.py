@@ -0,0 +1,124 @@
+# tests/unit/test_alerts.py
+
+import asyncio
+import time
+
+from common import utils
+from common.alerts import AlertAggregator, alert_rule
+
+
+class RecordingSink:
+    """디스패치된 알림 배치와 호출 시각을 기록하는 sink."""
+
+    def __init__(self):
+        self.batches = []
+        self.call_times = []
+
+    async def __call__(self, alerts):
+        self.batches.append(list(alerts))
+        self.call_times.append(time.monotonic())
+
+    @property
+    def alerts(self):
+        return [alert for batch in self.batches for alert in batch]
+
+
+def test_rule_masks_variable_parts():
+    assert alert_rule("Invalid Price format for source ID TRADE-17") == alert_rule("Invalid Price format for source ID TRADE-9")
+    assert alert_rule("Reporting Counterparty LEI 'ABC' has invalid format.") == "Reporting Counterparty LEI <v> has invalid format."
+    assert alert_rule("anything", {"rule": "lei_format"}) == "lei_format"
+
+
+def test_repeats_are_coalesced_into_first_alert_and_digest():
+    async def scenario():
+        sink = RecordingSink()
+        aggregator = AlertAggregator(window=0.2, flush_interval=0.02, sink=sink)
+        await aggregator.start()
+        for i in range(1000):
+            utils.send_alert("Warning", f"Invalid Price format for source ID TRADE-{i}", {"module": "data-processing", "field": "price"})
+            if i == 9:
+                await asyncio.sleep(0.05) # 첫 배치 이후 flusher 가 첫 알림을 보냄
+        utils.send_alert("Critical", "Database error storing processed data: boom", {"module": "data-processing"})
+        await asyncio.sleep(0.35)
+        await aggregator.stop()
+        return sink, aggregator
+
+    sink, aggregator = asyncio.run(scenario())
+
+    warnings = [alert for alert in sink.alerts if alert.severity == "WARNING"]
+    assert len(warnings) == 2 # 첫 알림 + 윈도 종료 digest
+    assert warnings[0].message == "Invalid Price format for source ID TRADE-0" # 첫 발생은 원문 그대로
+    assert warnings[0].details["occurrences"] == 10
+    assert warnings[1].details["count"] == 990
+    assert warnings[1].details["sample"]["field"] == "price"
+    assert [alert.severity for alert in sink.alerts].count("CRITICAL") == 1 # 지문이 다르면 별도 알림
+    assert aggregator.metrics()["accepted"] == 1001
+    assert utils._alert_aggregator is None # stop 후 send_alert 는 직접 로깅
+
+
+def test_quiet_fingerprint_sends_no_digest():
+    async def scenario():
+        sink = RecordingSink()
+        aggregator = AlertAggregator(window=0.05, flush_interval=0.01, sink=sink)
+        await aggregator.start()
+        aggregator.accept("Error", "Failed to report to error monitor", {"module": "validation"})
+        await asyncio.sleep(0.2)
+        fingerprints = aggregator.metrics()["fingerprints"]
+        await aggregator.stop()
+        return sink, fingerprints
+
+    sink, fingerprints = asyncio.run(scenario())
+
+    assert [alert.message for alert in sink.alerts] == ["Failed to report to error monitor"]
+    assert fingerprints == 0 # 반복 없는 윈도는 닫히면 제거
+
+
+def test_bounded_queue_drops_instead_of_blocking():
+    async def scenario():
+        release = asyncio.Event()
+
+        started = []
+
+        async def slow_sink(alerts):
+            started.extend(alerts)
+            await release.wait()
+
+        aggregator = AlertAggregator(window=60, flush_interval=0.01, queue_size=3, batch_size=1, sink=slow_sink)
+        await aggregator.start()
+        for i in range(10):
+            aggregator.accept("Warning", f"rule {i}", {"module": "m", "rule": f"rule-{i}"})
+        await asyncio.sleep(0.05)
+        metrics, in_sink = aggregator.metrics(), len(started)
+        release.set()
+        await aggregator.stop()
+        return metrics, in_sink
+
+    metrics, in_sink = asyncio.run(scenario())
+
+    # 한 번의 flush 로 10건이 들어오면 큐(3) 를 넘는 7건은 버려짐; 그중 1건은 이미 sink 에서 처리 중
+    assert metrics["dropped"] == 7
+    assert metrics["queued"] + in_sink == 3
+
+
+def test_dispatch_rate_is_limited():
+    async def scenario():
+        sink = RecordingSink()
+        aggregator = AlertAggregator(window=60, flush_interval=0.01, dispatch_rate=20, dispatch_burst=1, batch_size=1, sink=sink)
+        await aggregator.start()
+        for i in range(5):
+            aggregator.accept("Warning", "x", {"module": "m", "rule": f"rule-{i}"})
+        await asyncio.sleep(0.4)
+        await aggregator.stop()
+        return sink
+
+    sink = asyncio.run(scenario())
+
+    assert len(sink.call_times) == 5
+    assert sink.call_times[-1] - sink.call_times[0] >= 4 / 20 * 0.9 # 초당 20회 이하
+
+
+def test_send_alert_logs_directly_without_aggregator(caplog):
+    utils.set_alert_aggregator(None)
+    with caplog.at_level("WARNING", logger="swap-reporting-mvp"):
+        utils.send_alert("Warning", "Negative Notional Amount for source ID T-1", {"module": "data-processing"})
+    assert "ALERT! WARNING: Negative Notional Amount for source ID T-1" in caplog.text
@@ -0,0 +1,122 @@
+# tests/unit/test_error_groups.py
+
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+import pytest
+from sqlalchemy import select
+from sqlalchemy.orm import sessionmaker
+
+from common.utils import ErrorRecord, ErrorGroup
+from common.error_groups import bulk_record_errors, error_template, error_fingerprint, ERROR_GROUP_SAMPLE_SIZE
+
+NOW = datetime(2024, 1, 1, 12, 0, 0)
+
+
+@pytest.fixture
+def db(db_session):
+    return db_session
+
+
+def lei_error(i: int, module: str = "validation"):
+    """같은 규칙 위반 (LEI 값만 다름) - 체계적 데이터 문제의 전형."""
+    return {
+        "data": {"id": f"P-{i}", "unique_transaction_identifier": f"UTI-{i}", "original_raw_data_id": f"R-{i}", "notional_amount": 100.0 + i},
+        "errors": [f"Reporting Counterparty LEI 'BADLEI{i:06d}' has an invalid format."],
+        "source_module": module,
+    }
+
+
+def test_template_masks_variable_parts():
+    assert error_template(["Reporting Counterparty LEI 'ABC' has an invalid format."]) == \
+        error_template(["Reporting Counterparty LEI 'XYZ123' has an invalid format."])
+    assert error_template(["Notional 100.5 too large", "UTI 'U-1' duplicated"]) == "Notional <n> too large | UTI <v> duplicated"
+    assert error_template([]) == "<no error message>"
+    # 같은 메시지라도 모듈이 다르면 다른 그룹
+    assert error_fingerprint("validation", "x") != error_fingerprint("data-processing", "x")
+
+
+def test_bulk_record_errors_groups_by_fingerprint(db):
+    batch = [lei_error(i) for i in range(20)] + [lei_error(i, module="data-processing") for i in range(3)]
+
+    summary = bulk_record_errors(db, batch, now=NOW)
+    db.commit()
+
+    assert summary["recorded"] == 23
+    assert summary["groups"] == 2 and summary["new_groups"] == 2
+    assert summary["errors_by_module"] == {"validation": 20, "data-processing": 3}
+    groups = {group.source_module: group for group in db.scalars(select(ErrorGroup))}
+    assert groups["validation"].error_count == 20
+    assert groups["validation"].message_template == "Reporting Counterparty LEI <v> has an invalid format."
+    assert len(groups["validation"].sample_error_ids) == ERROR_GROUP_SAMPLE_SIZE
+    assert groups["data-processing"].error_count == 3
+    records = db.scalars(select(ErrorRecord).where(ErrorRecord.group_id == groups["validation"].id)).all()
+    assert len(records) == 20
+    assert {record.trade_id for record in records} == {f"UTI-{i}" for i in range(20)}
+
+
+def test_samples_keep_full_payload_and_others_keep_references(db):
+    summary = bulk_record_errors(db, [lei_error(i) for i in range(10)], now=NOW)
+    db.commit()
+
+    group = db.scalars(select(ErrorGroup)).one()
+    samples = set(group.sample_error_ids)
+    assert summary["slimmed_payloads"] == 10 - ERROR_GROUP_SAMPLE_SIZE
+    for record in db.scalars(select(ErrorRecord)):
+        if record.id in samples:
+            assert "notional_amount" in record.data_payload
+        else:
+            assert record.data_payload == {
+                "id": record.data_payload["id"], "unique_transaction_identifier": record.trade_id,
+                "original_raw_data_id": record.data_payload["original_raw_data_id"],
+            }
+
+
+def test_second_batch_updates_existing_group(db):
+    bulk_record_errors(db, [lei_error(i) for i in range(3)], now=NOW)
+    db.commit()
+    later = datetime(2024, 1, 2)
+    summary = bulk_record_errors(db, [lei_error(i) for i in range(3, 10)], now=later)
+    db.commit()
+
+    assert summary["new_groups"] == 0 and summary["groups"] == 1
+    group = db.scalars(select(ErrorGroup)).one()
+    assert group.error_count == 10
+    assert group.first_seen == NOW and group.last_seen == later
+    assert len(group.sample_error_ids) == ERROR_GROUP_SAMPLE_SIZE
+
+
+def test_malformed_entries_are_counted_not_stored(db):
+    summary = bulk_record_errors(db, ["not a dict", {"data": "oops"}, {"errors": "single message", "source_module": "ingestion"}], now=NOW)
+    db.commit()
+
+    assert summary["invalid"] == 2
+    assert summary["recorded"] == 1
+    record = db.scalars(select(ErrorRecord)).one()
+    assert record.error_messages == ["single message"]
+    assert record.trade_id == "N/A"
+
+
+def test_concurrent_batches_of_a_new_group_are_all_counted(db):
+    """여러 모듈이 같은 신규 fingerprint 를 동시에 보고해도 PK 충돌 없이 모두 집계."""
+    make_session = sessionmaker(autocommit=False, autoflush=False, bind=db.get_bind())
+    barrier = threading.Barrier(4)
+
+    def report(batch_number):
+        session = make_session()
+        try:
+            barrier.wait()
+            bulk_record_errors(session, [lei_error(batch_number * 10 + i) for i in range(10)], now=NOW)
+            session.commit()
+        finally:
+            session.close()
+
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        list(executor.map(report, range(4)))
+
+    group = db.scalars(select(ErrorGroup)).one()
+    assert group.error_count == 40
+    assert len(group.sample_error_ids) == ERROR_GROUP_SAMPLE_SIZE
+    sampled = db.scalars(select(ErrorRecord).where(ErrorRecord.id.in_(group.sample_error_ids))).all()
+    assert all("notional_amount" in record.data_payload for record in sampled) # 샘플은 전체 payload 유지
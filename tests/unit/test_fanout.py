@@ -0,0 +1,54 @@
+# tests/unit/test_fanout.py
+
+import asyncio
+import time
+
+from common.fanout import gather_sections
+
+
+def respond(value, delay=0.0):
+    async def fetch():
+        await asyncio.sleep(delay)
+        return value
+    return fetch
+
+
+def fail(exc):
+    async def fetch():
+        raise exc
+    return fetch
+
+
+def test_all_sections_ok():
+    result = asyncio.run(gather_sections({"errors": respond({"items": [1]}), "reports": respond({"items": []})}, timeout=1))
+    assert result["status"] == "ok"
+    assert result["sections"]["errors"]["data"] == {"items": [1]} and result["sections"]["errors"]["error"] is None
+    assert list(result["sections"]) == ["errors", "reports"]
+
+
+def test_partial_data_with_per_section_flags():
+    start_time = time.perf_counter()
+    result = asyncio.run(gather_sections({
+        "errors": respond({"items": [1]}, 0.05),
+        "processed_data": respond({"items": []}, 5), # 타임아웃
+        "reports": fail(ConnectionError("report-generation down")),
+        "submissions": respond({"items": []}, 0.05),
+    }, timeout=0.2))
+    elapsed = time.perf_counter() - start_time
+
+    sections = result["sections"]
+    assert result["status"] == "partial"
+    assert sections["errors"]["status"] == sections["submissions"]["status"] == "ok"
+    assert sections["processed_data"]["status"] == "timeout" and sections["processed_data"]["data"] is None
+    assert sections["reports"] == {"status": "error", "data": None, "error": "report-generation down", "elapsed_ms": sections["reports"]["elapsed_ms"]}
+    assert elapsed < 1 # 느린 section 은 타임아웃에서 끊김
+
+
+def test_per_section_timeout_override_and_unavailable():
+    result = asyncio.run(gather_sections(
+        {"errors": respond(1, 0.1), "reports": fail(RuntimeError())},
+        timeout=1, timeouts={"errors": 0.01},
+    ))
+    assert result["status"] == "unavailable"
+    assert result["sections"]["errors"]["status"] == "timeout"
+    assert result["sections"]["reports"]["error"] == "RuntimeError"
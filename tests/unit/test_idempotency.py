@@ -0,0 +1,121 @@
+# tests/unit/test_idempotency.py
+
+import pytest
+from sqlalchemy import func, select
+from sqlalchemy.exc import IntegrityError
+
+from common.utils import IdempotencyKey, ProcessedSwapDataDB, generate_uti
+from common.idempotency import IdempotencyIndex, delivery_key
+from common.bulk_db import bulk_upsert_processed_records
+
+TRADE = {
+    "id": "raw-1",
+    "trade_id": "TRADE_001",
+    "action": "NEWT",
+    "instrument_type": "IRS",
+    "asset_class": "IR",
+    "effective_date": "2025-01-01",
+    "termination_date": "2030-01-01",
+    "notional_amount": 1000000.0,
+    "notional_currency": "USD",
+    "party_a_lei": "LEIAAAAAAAAAAAAAAAAA",
+    "party_b_lei": "LEIBBBBBBBBBBBBBBBBB",
+}
+
+
+def test_uti_is_deterministic_per_source_trade():
+    uti = generate_uti(TRADE)
+
+    assert uti == generate_uti(dict(TRADE, id="raw-2", action="AMND", notional_amount=5.0)) # 재전송/라이프사이클 이벤트도 같은 UTI
+    assert uti.startswith("MVP-TRADE-001-") and "_" not in uti
+    assert uti != generate_uti(dict(TRADE, trade_id="TRADE_002"))
+    assert uti != generate_uti(dict(TRADE, party_a_lei="LEICCCCCCCCCCCCCCCCC")) # 다른 보고 기관의 같은 trade_id
+
+
+def test_delivery_key_ignores_transport_fields_and_number_formatting():
+    key = delivery_key(TRADE)
+
+    assert key == delivery_key(dict(TRADE, id="raw-2", raw_payload={"x": 1}))
+    assert key == delivery_key(dict(TRADE, notional_amount="1000000"))
+    assert key != delivery_key(dict(TRADE, action="AMND"))
+    assert key != delivery_key(dict(TRADE, notional_amount=2000000.0))
+
+
+def test_split_new_skips_recorded_and_in_batch_duplicates(session_factory):
+    index = IdempotencyIndex("data-processing")
+    amended = dict(TRADE, action="AMND")
+
+    with session_factory() as db:
+        new_entries, duplicates = index.split_new(db, [TRADE, dict(TRADE, id="raw-2"), amended])
+        assert [entry["action"] for _, entry in new_entries] == ["NEWT", "AMND"]
+        assert [entry["id"] for entry in duplicates] == ["raw-2"]
+
+        index.record(db, [{"idempotency_key": key} for key, _ in new_entries])
+        db.commit()
+
+    # LRU 를 비워도 DB 유니크 인덱스로 중복 판정
+    fresh_index = IdempotencyIndex("data-processing")
+    with session_factory() as db:
+        new_entries, duplicates = fresh_index.split_new(db, [dict(TRADE, id="raw-3"), dict(TRADE, action="TERM")])
+    assert [entry["action"] for _, entry in new_entries] == ["TERM"]
+    assert len(duplicates) == 1
+    assert fresh_index.metrics()["db_hits"] == 1
+
+    # 다른 scope 의 키는 별개
+    with session_factory() as db:
+        new_entries, _ = IdempotencyIndex("validation").split_new(db, [TRADE])
+    assert len(new_entries) == 1
+
+
+def test_replay_processes_recorded_keys_without_recording_them_again(session_factory):
+    index = IdempotencyIndex("data-processing")
+    with session_factory() as db:
+        index.record(db, [{"idempotency_key": delivery_key(TRADE)}])
+        db.commit()
+
+        # error-monitor 재시도: 같은 payload 를 다시 보내므로 처리하되 키는 다시 기록하지 않음
+        new_entries, duplicates = index.split_new(db, [dict(TRADE, id="raw-retry"), dict(TRADE, id="raw-copy"), dict(TRADE, action="AMND")], replay=True)
+    assert [(key, entry["id"]) for key, entry in new_entries] == [(None, "raw-retry"), (delivery_key(dict(TRADE, action="AMND")), TRADE["id"])]
+    assert [entry["id"] for entry in duplicates] == ["raw-copy"] # 배치 내 중복은 그대로 제외
+
+
+def test_memory_hits_skip_the_database(session_factory):
+    index = IdempotencyIndex("data-processing", lru_size=2)
+    keys = [delivery_key(dict(TRADE, trade_id=f"T-{i}")) for i in range(3)]
+    index.remember(keys)
+
+    with session_factory() as db:
+        duplicates = index.find_duplicates(db, keys)
+
+    assert duplicates == set(keys[1:]) # 가장 오래된 키는 LRU 에서 밀려남 (DB 에도 없음)
+    assert index.metrics()["memory_hits"] == 2
+    assert index.metrics()["lru_size"] == 2
+
+
+def test_unique_index_rejects_concurrent_double_insert(session_factory):
+    index = IdempotencyIndex("data-processing")
+    with session_factory() as db:
+        index.record(db, [{"idempotency_key": "k1"}])
+        db.commit()
+        with pytest.raises(IntegrityError):
+            index.record(db, [{"idempotency_key": "k1"}])
+            db.commit()
+
+
+def test_upsert_updates_rows_of_known_utis(session_factory):
+    def record(uti, action, notional):
+        return {"id": f"id-{uti}-{action}", "unique_transaction_identifier": uti, "action_type": action,
+                "notional_amount": notional, "validation_status": "Pending"}
+
+    with session_factory() as db:
+        first_ids = bulk_upsert_processed_records(db, [record("UTI-1", "NEWT", 1.0), record("UTI-2", "NEWT", 2.0)])
+        db.commit()
+        ids = bulk_upsert_processed_records(db, [record("UTI-1", "AMND", 10.0), record("UTI-1", "TERM", 0.0), record("UTI-3", "NEWT", 3.0)])
+        db.commit()
+
+        rows = {row.unique_transaction_identifier: row for row in db.scalars(select(ProcessedSwapDataDB))}
+        assert db.scalar(select(func.count()).select_from(IdempotencyKey)) == 0
+
+    assert ids["UTI-1"] == first_ids["UTI-1"] # 기존 행 id 유지
+    assert (rows["UTI-1"].action_type, rows["UTI-1"].notional_amount) == ("TERM", 0.0) # 배치 내 마지막 이벤트가 반영
+    assert set(rows) == {"UTI-1", "UTI-2", "UTI-3"}
@@ -0,0 +1,86 @@
+# tests/unit/test_lei.py
+
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "..", "src", "validation"))
+
+from common.utils import validate_lei
+from common.lei import GleifIndex, compile_gleif_index, validate_leis, registered_leis, set_gleif_index
+from rules import CFTC_RULES, evaluate_rules
+
+REGISTERED = ["5493001KJTIIGC8Y1R12", "529900T8BM49AURSDO55", "7LTWFZYICNSX8D621K86"]
+UNREGISTERED = "213800WAVVOPS85N2205"
+
+
+@pytest.fixture
+def golden_copy_index(tmp_path):
+    source = tmp_path / "golden_copy.csv"
+    source.write_text('"LEI","Entity.LegalName"\n' + "".join(f'"{lei}","Entity {i}, Ltd"\n' for i, lei in enumerate(REGISTERED)))
+    index_path = str(tmp_path / "golden_copy.leiidx")
+    assert compile_gleif_index(str(source), index_path) == len(REGISTERED)
+    index = GleifIndex(index_path)
+    yield index
+    set_gleif_index(None)
+    index.close()
+
+
+def test_checksum():
+    for lei in REGISTERED + [UNREGISTERED]:
+        assert validate_lei(lei)
+    assert not validate_lei("5493001KJTIIGC8Y1R13") # 검증 숫자 불일치
+    assert not validate_lei("5493001KJTIIGC8Y1R21") # 검증 숫자 자리 바뀜
+    assert not validate_lei("5493001kjtiigc8y1r12") # 소문자
+    assert not validate_lei("A" * 20) # 형식(영숫자 20자)만 맞는 값
+    assert not validate_lei("5493001KJTIIGC8Y1R1")
+    assert not validate_lei(None)
+
+
+def test_validate_leis_batch():
+    assert validate_leis([REGISTERED[0], "A" * 20, None, REGISTERED[0], ""]) == [True, False, False, True, False]
+
+
+def test_index_lookup(golden_copy_index, tmp_path):
+    assert len(golden_copy_index) == len(REGISTERED)
+    assert golden_copy_index.contains_many(REGISTERED + [UNREGISTERED, "", "ÄÖ"]).tolist() == [True, True, True, False, False, False]
+    assert golden_copy_index.contains(REGISTERED[1])
+
+    # 헤더 없는 한 줄 한 LEI 형식도 지원
+    plain = tmp_path / "leis.txt"
+    plain.write_text("\n".join(lei.lower() for lei in REGISTERED) + "\n")
+    compile_gleif_index(str(plain), str(tmp_path / "plain.leiidx"))
+    plain_index = GleifIndex(str(tmp_path / "plain.leiidx"))
+    assert plain_index.contains_many(REGISTERED).all()
+    plain_index.close()
+
+
+def test_not_an_index(tmp_path):
+    path = tmp_path / "golden_copy.csv"
+    path.write_bytes(b'"LEI"\n' + b"0" * 64)
+    with pytest.raises(ValueError):
+        GleifIndex(str(path))
+
+
+def test_registered_leis(golden_copy_index):
+    leis = [REGISTERED[0], UNREGISTERED, "not-an-lei", None]
+    set_gleif_index(None)
+    assert registered_leis(leis) == [True, True, True, True] # 인덱스 미설정: 존재 검사 생략
+
+    set_gleif_index(golden_copy_index)
+    assert registered_leis(leis) == [True, False, True, True] # 형식 오류는 형식 규칙에서만 보고
+
+
+def test_rules_report_unregistered_lei(golden_copy_index):
+    set_gleif_index(golden_copy_index)
+    base = {
+        "unique_transaction_identifier": "UTI-1", "reporting_counterparty_lei": REGISTERED[0],
+        "other_counterparty_lei": REGISTERED[1], "action_type": "NEWT", "effective_date": "2024-01-02",
+        "termination_date": "2029-01-02", "notional_amount": 100.0, "processing_errors": [],
+    }
+    result = evaluate_rules([base, dict(base, other_counterparty_lei=UNREGISTERED), dict(base, other_counterparty_lei="A" * 20)], CFTC_RULES)
+
+    assert result.is_valid.tolist() == [True, False, False]
+    assert result.errors_for(1) == [f"Other Counterparty LEI '{UNREGISTERED}' is not registered in the GLEIF golden copy."]
+    assert result.errors_for(2) == [f"Other Counterparty LEI '{'A' * 20}' has invalid format."]
@@ -0,0 +1,40 @@
+# tests/unit/test_migrations.py
+
+import pytest
+
+from common.utils import Base, include_object_for
+
+
+def test_migrations_match_models(migrated_engine):
+    """alembic upgrade head 결과 스키마가 common/utils.py 모델(create_database_tables)과 일치해야 함."""
+    migration = pytest.importorskip("alembic.migration")
+    autogenerate = pytest.importorskip("alembic.autogenerate")
+
+    with migrated_engine.connect() as connection:
+        context = migration.MigrationContext.configure(connection, opts={"include_object": include_object_for(connection.dialect.name)})
+        differences = autogenerate.compare_metadata(context, Base.metadata)
+
+    assert differences == []
+
+
+def test_trigram_indexes_are_declared_for_postgresql_only(db_url):
+    from sqlalchemy import create_engine, inspect
+    from sqlalchemy.dialects import postgresql
+    from sqlalchemy.schema import CreateIndex
+
+    trigram = {index.name: index for table in Base.metadata.tables.values() for index in table.indexes if index.name.endswith("_trgm")}
+    assert sorted(trigram) == [
+        "ix_error_records_trade_id_trgm", "ix_generated_reports_filename_trgm", "ix_processed_swap_data_uti_trgm",
+        "ix_submission_history_submission_id_trgm", "ix_validation_results_uti_trgm",
+    ] # asset_class 는 등호 비교라 trigram 인덱스 없음
+    ddl = str(CreateIndex(trigram["ix_error_records_trade_id_trgm"]).compile(dialect=postgresql.dialect()))
+    assert "USING gin (trade_id gin_trgm_ops)" in ddl
+
+    # SQLite 에서는 create_all(create_database_tables) 이 건너뛰고, autogenerate 비교에서도 제외
+    engine = create_engine(db_url)
+    inspector = inspect(engine)
+    assert not any(index["name"].endswith("_trgm") for table in inspector.get_table_names() for index in inspector.get_indexes(table))
+    engine.dispose()
+    include_object = include_object_for("sqlite")
+    assert not include_object(trigram["ix_error_records_trade_id_trgm"], "ix_error_records_trade_id_trgm", "index", False, None)
+    assert include_object_for("postgresql")(trigram["ix_error_records_trade_id_trgm"], "ix_error_records_trade_id_trgm", "index", False, None)
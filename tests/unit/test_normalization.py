@@ -0,0 +1,130 @@
+# tests/unit/test_normalization.py
+
+import asyncio
+import os
+import sys
+from datetime import datetime
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "..", "src", "data-processing"))
+
+from transformers import ParallelNormalizer, normalize_entry, normalize_chunk
+
+TIMESTAMP = datetime(2024, 1, 2, 3, 4, 5)
+
+
+def make_raw(i: int) -> dict:
+    return {
+        "id": f"RAW-{i}",
+        "trade_id": f"TRADE_{i}",
+        "action": " newt ",
+        "instrument_type": "IRS",
+        "asset_class": "ir",
+        "effective_date": " 2024-01-02 ",
+        "termination_date": "2029-01-02",
+        "notional_amount": str(1000 + i),
+        "notional_currency": "usd",
+        "party_a_lei": "5493001kjtiigc8y1r12",
+        "party_b_lei": "529900T8BM49AURSDO55",
+        "price": None,
+    }
+
+
+def comparable(result):
+    """UTI/id 는 생성 시마다 달라지므로 비교에서 제외."""
+    if result.record is None:
+        return None, result.error
+    return {k: v for k, v in result.record.to_dict().items() if k not in ("id", "unique_transaction_identifier")}, result.alerts
+
+
+def test_normalize_entry_standardizes_fields():
+    result = normalize_entry(make_raw(1), TIMESTAMP)
+
+    record = result.record
+    assert record.unique_transaction_identifier.startswith("MVP-TRADE-1-")
+    assert record.action_type == "NEWT"
+    assert record.asset_class == "IR"
+    assert record.effective_date == "2024-01-02"
+    assert record.notional_amount == 1001.0
+    assert record.notional_currency == "USD"
+    assert record.price_currency is None
+    assert record.reporting_counterparty_lei == "5493001KJTIIGC8Y1R12"
+    assert record.original_raw_data_id == "RAW-1"
+    assert record.processing_timestamp == TIMESTAMP
+    assert record.processing_status == "Processed"
+    assert result.alerts == [] and result.error is None
+
+
+def test_normalize_entry_collects_errors_and_alerts():
+    raw = make_raw(2)
+    raw["notional_amount"] = "-5"
+    raw["party_b_lei"] = "SHORT"
+    result = normalize_entry(raw, TIMESTAMP)
+
+    assert result.record.processing_status == "ProcessedWithErrors"
+    assert result.record.processing_errors == [
+        "Other Counterparty LEI 'SHORT' has invalid format.",
+        "Negative Notional Amount for source ID TRADE_2",
+    ]
+    assert [severity for severity, _, _ in result.alerts] == ["Warning", "Warning"]
+
+
+def test_missing_leis_are_reported_as_invalid():
+    raw = make_raw(6)
+    del raw["party_a_lei"], raw["party_b_lei"]
+
+    for result in (normalize_entry(raw, TIMESTAMP), normalize_chunk([raw, make_raw(7)], TIMESTAMP)[0]):
+        assert result.error is None
+        assert result.record.reporting_counterparty_lei == result.record.other_counterparty_lei == ""
+        assert result.record.processing_errors == [
+            "Reporting Counterparty LEI '' has invalid format.",
+            "Other Counterparty LEI '' has invalid format.",
+        ]
+
+
+def test_normalize_chunk_checks_reference_codes():
+    raw = make_raw(4)
+    raw["asset_class"] = "swaps"
+    raw["price"], raw["price_currency"] = "1.5", "xyz"
+
+    [result, valid] = normalize_chunk([raw, make_raw(5)], TIMESTAMP)
+
+    assert result.record.processing_errors == [
+        "Asset Class 'SWAPS' is not a valid CFTC asset class.",
+        "Price Currency 'XYZ' is not a valid ISO 4217 code.",
+    ]
+    assert [details["rule"] for _, _, details in result.alerts] == ["asset_class_code", "currency_code"]
+    assert valid.record.processing_errors == []
+
+
+def test_normalize_entry_reports_critical_error():
+    raw = make_raw(3)
+    raw["action"] = 7 # 문자열이 아니면 strip() 실패
+
+    result = normalize_entry(raw, TIMESTAMP)
+
+    assert result.record is None
+    assert result.error == "Critical Processing Error: 'int' object has no attribute 'strip'"
+
+
+def test_parallel_normalizer_keeps_input_order():
+    data = [make_raw(i) for i in range(23)]
+    data[5]["action"] = None # critical error in the middle of a chunk
+    normalizer = ParallelNormalizer(workers=2, chunk_size=4, min_batch=10)
+    try:
+        parallel = asyncio.run(normalizer.normalize(data, TIMESTAMP))
+    finally:
+        normalizer.shutdown()
+    inline = asyncio.run(ParallelNormalizer(workers=0).normalize(data, TIMESTAMP))
+
+    assert [result.record and result.record.original_raw_data_id for result in parallel] == \
+        [None if i == 5 else f"RAW-{i}" for i in range(23)]
+    assert [comparable(result) for result in parallel] == [comparable(result) for result in inline]
+
+
+def test_small_batches_skip_the_pool():
+    normalizer = ParallelNormalizer(workers=4, chunk_size=2, min_batch=100)
+
+    results = asyncio.run(normalizer.normalize([make_raw(i) for i in range(5)], TIMESTAMP))
+
+    assert len(results) == 5
+    assert normalizer._executor is None
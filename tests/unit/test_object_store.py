@@ -0,0 +1,131 @@
+# tests/unit/test_object_store.py
+
+import asyncio
+import hashlib
+import os
+
+import pytest
+
+from common.object_store import LocalObjectStore, MappedReportSource, register_object_store_backend
+from common.sdr_upload import open_report_source
+
+
+@pytest.fixture
+def store(tmp_path):
+    return LocalObjectStore(str(tmp_path / "store"), bucket_name="reports-test", fsync=False)
+
+
+def blobs(store):
+    return [name for _, _, names in os.walk(os.path.join(store.root, "blobs")) for name in names]
+
+
+async def read_all(source):
+    return b"".join([chunk async for chunk in source.iter_chunks(7)])
+
+
+def test_put_and_read_back(store):
+    async def scenario():
+        info = await store.put_stream([b"UTI,LEI\n", b"U1,L1\n"], "reports/batch_1.txt")
+        source = await store.open_source("reports/batch_1.txt")
+        assert isinstance(source, MappedReportSource) and source.size == info.size == 14
+        assert await read_all(source) == b"UTI,LEI\nU1,L1\n"
+        assert b"".join([chunk async for chunk in source.iter_range(4, 6, 4)]) == b"LEI\nU1"
+        assert info.sha256 == hashlib.sha256(b"UTI,LEI\nU1,L1\n").hexdigest()
+        assert await store.download_file("reports/batch_1.txt") == b"UTI,LEI\nU1,L1\n" # SimulatedCloudStorage 호환
+        assert await store.download_file("reports/missing.txt") is None
+        with pytest.raises(FileNotFoundError):
+            await store.open_source("reports/missing.txt")
+        assert store.uri("reports/batch_1.txt") == "local://reports-test/reports/batch_1.txt"
+    asyncio.run(scenario())
+
+
+def test_identical_content_is_stored_once(store, tmp_path):
+    report = tmp_path / "daily.csv"
+    report.write_bytes(b"x" * 100000)
+
+    async def scenario():
+        first = await store.put_file(str(report), "reports/daily_a.csv")
+        second = await store.put_stream(b"x" * 100000, "reports/daily_b.csv")
+        assert not first.deduplicated and second.deduplicated
+        assert len(blobs(store)) == 1
+        assert report.exists() # move=False 는 원본 유지
+
+        staged = store.staging_path(".csv")
+        with open(staged, "wb") as handle:
+            handle.write(b"y" * 10)
+        moved = await store.put_file(staged, "reports/daily_c.csv", move=True)
+        assert not os.path.exists(staged) and moved.size == 10 and len(blobs(store)) == 2
+
+        assert await store.delete_object("reports/daily_a.csv")
+        assert not await store.delete_object("reports/daily_a.csv")
+        assert store.collect_garbage(grace_seconds=0) == 0 # daily_b 가 같은 blob 참조
+        await store.delete_object("reports/daily_b.csv")
+        assert store.collect_garbage(grace_seconds=0) == 1 and len(blobs(store)) == 1
+    asyncio.run(scenario())
+
+
+def test_writes_are_atomic(store):
+    async def failing_chunks():
+        yield b"partial"
+        raise RuntimeError("writer crashed")
+
+    async def scenario():
+        await store.put_stream(b"version 1", "reports/r.txt")
+        with pytest.raises(RuntimeError):
+            await store.put_stream(failing_chunks(), "reports/r.txt")
+        assert await store.download_file("reports/r.txt") == b"version 1" # 이전 객체 유지
+        assert os.listdir(os.path.join(store.root, "tmp")) == [] # 임시 파일 정리
+    asyncio.run(scenario())
+
+
+def test_multipart_upload(store):
+    async def scenario():
+        upload_id = await store.create_multipart_upload("reports/large.csv")
+        await store.upload_part(upload_id, 2, [b"second-"])
+        await store.upload_part(upload_id, 1, b"stale")
+        await store.upload_part(upload_id, 1, b"first-") # 재전송 시 교체
+        assert [(part["part_number"], part["size"]) for part in await store.list_parts(upload_id)] == [(1, 6), (2, 7)]
+        with pytest.raises(ValueError):
+            await store.complete_multipart_upload(upload_id, [1, 2, 3])
+        await store.upload_part(upload_id, 3, b"third")
+        info = await store.complete_multipart_upload(upload_id)
+        assert info.size == 18 and await store.download_file("reports/large.csv") == b"first-second-third"
+        with pytest.raises(KeyError):
+            await store.list_parts(upload_id)
+
+        aborted = await store.create_multipart_upload("reports/aborted.csv")
+        await store.upload_part(aborted, 1, b"data")
+        await store.abort_multipart_upload(aborted)
+        assert os.listdir(os.path.join(store.root, "uploads")) == []
+    asyncio.run(scenario())
+
+
+def test_object_names_cannot_escape_the_store(store):
+    async def scenario():
+        for name in ("../outside.txt", "/etc/passwd", "reports//x", ""):
+            with pytest.raises(ValueError):
+                await store.put_stream(b"x", name)
+    asyncio.run(scenario())
+
+
+def test_report_submission_reads_store_objects(store):
+    async def scenario():
+        await store.put_stream(b"batch report", "reports/batch.txt")
+        source = await open_report_source(store.uri("reports/batch.txt"), "reports/batch.txt", store)
+        assert isinstance(source, MappedReportSource) and await read_all(source) == b"batch report"
+    asyncio.run(scenario())
+
+
+def test_backend_registry(monkeypatch, tmp_path):
+    import common.object_store as object_store
+    monkeypatch.setattr(object_store, "_object_stores", {})
+    monkeypatch.setattr(object_store, "OBJECT_STORE_BACKEND", "test-backend")
+    register_object_store_backend("test-backend", lambda bucket_name: LocalObjectStore(str(tmp_path), bucket_name, fsync=False))
+    try:
+        store = object_store.get_object_store("bucket-a")
+        assert store is object_store.get_object_store("bucket-a") and store.bucket_name == "bucket-a"
+        monkeypatch.setattr(object_store, "OBJECT_STORE_BACKEND", "unknown")
+        with pytest.raises(ValueError):
+            object_store.get_object_store("bucket-b")
+    finally:
+        object_store._OBJECT_STORE_BACKENDS.pop("test-backend")
@@ -0,0 +1,94 @@
+# tests/unit/test_pagination.py
+
+import uuid
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import insert
+
+from common.utils import ErrorRecord
+from common.pagination import (
+    encode_cursor, decode_cursor, paginate_keyset, count_rows, count_cache, InvalidCursorError,
+)
+
+BASE_TIME = datetime(2024, 1, 1, 12, 0, 0)
+
+
+@pytest.fixture
+def db(db_session):
+    count_cache.clear()
+    return db_session
+
+
+def seed_errors(db, count: int):
+    """3건씩 같은 timestamp 를 공유하는 error_records 를 적재 (id tie-breaker 검증용)."""
+    db.execute(insert(ErrorRecord.__table__), [
+        {"id": str(uuid.uuid4()), "trade_id": f"UTI-{i}", "source_module": "validation" if i % 2 else "data-processing",
+         "timestamp": BASE_TIME + timedelta(seconds=i // 3), "status": "Open"}
+        for i in range(count)
+    ])
+    db.commit()
+
+
+def walk_pages(db, limit, **filters):
+    pages, cursor = [], None
+    while True:
+        query = db.query(ErrorRecord)
+        if "source_module" in filters:
+            query = query.filter(ErrorRecord.source_module == filters["source_module"])
+        rows, cursor = paginate_keyset(query, ErrorRecord.timestamp, ErrorRecord.id, limit, cursor=cursor)
+        pages.append(rows)
+        if cursor is None:
+            return pages
+
+
+def test_cursor_round_trip_and_rejects_garbage():
+    cursor = encode_cursor(BASE_TIME, "abc-123")
+    assert decode_cursor(cursor) == (BASE_TIME, "abc-123")
+    for bad in ["not-a-cursor", "e30", encode_cursor(BASE_TIME, "x")[:-3]]:
+        with pytest.raises(InvalidCursorError):
+            decode_cursor(bad)
+
+
+def test_keyset_pages_cover_every_row_once_in_order(db):
+    seed_errors(db, 100)
+
+    pages = walk_pages(db, limit=7)
+    rows = [row for page in pages for row in page]
+
+    assert [len(page) for page in pages] == [7] * 14 + [2]
+    assert len({row.id for row in rows}) == 100
+    assert [(row.timestamp, row.id) for row in rows] == sorted(((row.timestamp, row.id) for row in rows), reverse=True)
+
+
+def test_keyset_respects_filters_and_exact_page_boundary(db):
+    seed_errors(db, 40)
+
+    pages = walk_pages(db, limit=10, source_module="validation")
+
+    assert [len(page) for page in pages] == [10, 10] # 20건: 마지막 페이지에서 next_cursor 없음
+    assert all(row.source_module == "validation" for page in pages for row in page)
+
+
+def test_offset_is_still_supported_without_cursor(db):
+    seed_errors(db, 20)
+    first_page, _ = paginate_keyset(db.query(ErrorRecord), ErrorRecord.timestamp, ErrorRecord.id, 5)
+    offset_page, _ = paginate_keyset(db.query(ErrorRecord), ErrorRecord.timestamp, ErrorRecord.id, 5, offset=5)
+    _, cursor = paginate_keyset(db.query(ErrorRecord), ErrorRecord.timestamp, ErrorRecord.id, 5)
+    cursor_page, _ = paginate_keyset(db.query(ErrorRecord), ErrorRecord.timestamp, ErrorRecord.id, 5, cursor=cursor, offset=5)
+
+    assert [row.id for row in offset_page] == [row.id for row in cursor_page] # cursor 가 있으면 offset 무시
+    assert not {row.id for row in first_page} & {row.id for row in offset_page}
+
+
+def test_counts_are_cached_unless_exact_is_requested(db):
+    seed_errors(db, 10)
+    query = db.query(ErrorRecord).filter(ErrorRecord.status == "Open")
+    filters = {"status": "Open", "trade_id": None}
+
+    assert count_rows(db, query, "error_records", filters) == (10, "exact") # 첫 호출은 계산 후 캐시
+    seed_errors(db, 5)
+    assert count_rows(db, query, "error_records", filters) == (10, "cached")
+    assert count_rows(db, query, "error_records", filters, exact=True) == (15, "exact")
+    # 다른 필터 조합은 별도 캐시 키
+    assert count_rows(db, query, "error_records", {"status": "Open", "trade_id": "UTI"}) == (15, "exact")
@@ -0,0 +1,134 @@
+# tests/unit/test_query_plans.py
+
+from datetime import datetime
+
+import pytest
+from sqlalchemy import select, tuple_
+
+from common.utils import ProcessedSwapDataDB, ValidationResult, ErrorRecord, ErrorGroup, GeneratedReport, SubmissionHistory, StageQueueMessage, IdempotencyKey, ReportRecord
+
+CURSOR = (datetime(2024, 1, 1), "00000000-0000-0000-0000-000000000000")
+
+
+def keyset_page(model, timestamp_column, *filters, cursor=False, limit=100):
+    """common.pagination.paginate_keyset 와 같은 형태: 필터 + (timestamp, id) 역순 + LIMIT."""
+    statement = select(model).where(*filters)
+    if cursor:
+        statement = statement.where(tuple_(timestamp_column, model.id) < tuple_(*CURSOR))
+    return statement.order_by(timestamp_column.desc(), model.id.desc()).limit(limit + 1)
+
+
+# 필터 없는 keyset 첫 페이지: (timestamp, id) 인덱스를 순서대로 읽다가 LIMIT 에서 멈춤
+ORDERED_PAGE_QUERIES = [
+    ("processed-data: unfiltered", keyset_page(ProcessedSwapDataDB, ProcessedSwapDataDB.processing_timestamp)),
+    ("errors: unfiltered", keyset_page(ErrorRecord, ErrorRecord.timestamp)),
+    ("error-groups: unfiltered", keyset_page(ErrorGroup, ErrorGroup.last_seen)),
+    ("reports: unfiltered", keyset_page(GeneratedReport, GeneratedReport.generation_timestamp)),
+    ("submissions: unfiltered", keyset_page(SubmissionHistory, SubmissionHistory.submission_timestamp)),
+]
+
+# 부분 문자열 검색 (ilike '%x%'): PostgreSQL 의 pg_trgm GIN 인덱스로만 풀림 (SQLite 는 항상 전체 스캔)
+SUBSTRING_QUERIES = [
+    ("processed-data: UTI substring", keyset_page(
+        ProcessedSwapDataDB, ProcessedSwapDataDB.processing_timestamp,
+        ProcessedSwapDataDB.unique_transaction_identifier.ilike("%TRADE-42%"),
+    )),
+    ("errors: trade id substring", keyset_page(ErrorRecord, ErrorRecord.timestamp, ErrorRecord.trade_id.ilike("%TRADE-42%"))),
+]
+
+STATUS_ASSET_CLASS_DATES = keyset_page(
+    ProcessedSwapDataDB, ProcessedSwapDataDB.processing_timestamp,
+    ProcessedSwapDataDB.validation_status == "Invalid",
+    ProcessedSwapDataDB.asset_class == "IR",
+    ProcessedSwapDataDB.effective_date >= "2024-01-01",
+    ProcessedSwapDataDB.effective_date <= "2024-12-31",
+)
+
+# (label, statement) - 엔드포인트 및 파이프라인 단계가 실제로 실행하는 쿼리 형태
+ENDPOINT_QUERIES = [
+    # GET /processed-data
+    ("processed-data: next page", keyset_page(ProcessedSwapDataDB, ProcessedSwapDataDB.processing_timestamp, cursor=True)),
+    ("processed-data: status + asset class + effective date range", STATUS_ASSET_CLASS_DATES),
+    # validation: processed_swap_data ids by UTI, Pending backlog
+    ("validation: ids by UTI", select(ProcessedSwapDataDB.id, ProcessedSwapDataDB.unique_transaction_identifier)
+        .where(ProcessedSwapDataDB.unique_transaction_identifier.in_(["UTI-1", "UTI-2"]))),
+    ("validation: pending backlog", select(ProcessedSwapDataDB.id)
+        .where(ProcessedSwapDataDB.validation_status == "Pending")
+        .order_by(ProcessedSwapDataDB.processing_timestamp, ProcessedSwapDataDB.id).limit(500)),
+    # report-generation: daily report rows (POST /generate-daily-report)
+    ("report-generation: daily report rows", select(ProcessedSwapDataDB.unique_transaction_identifier)
+        .where(ProcessedSwapDataDB.validation_status == "Valid",
+               ProcessedSwapDataDB.processing_timestamp >= datetime(2024, 1, 1),
+               ProcessedSwapDataDB.processing_timestamp < datetime(2024, 1, 2))
+        .order_by(ProcessedSwapDataDB.processing_timestamp, ProcessedSwapDataDB.id)),
+    # GET /validation-results
+    ("validation-results: is_valid", select(ValidationResult).where(ValidationResult.is_valid == False) # noqa: E712
+        .order_by(ValidationResult.validation_timestamp.desc()).limit(100)),
+    # GET /errors
+    ("errors: next page", keyset_page(ErrorRecord, ErrorRecord.timestamp, cursor=True)),
+    ("errors: status + source module", keyset_page(
+        ErrorRecord, ErrorRecord.timestamp, ErrorRecord.status == "Open", ErrorRecord.source_module == "validation")),
+    ("errors: status + source module, next page", keyset_page(
+        ErrorRecord, ErrorRecord.timestamp, ErrorRecord.status == "Open", ErrorRecord.source_module == "validation", cursor=True)),
+    ("errors: source module", keyset_page(ErrorRecord, ErrorRecord.timestamp, ErrorRecord.source_module == "validation")),
+    ("errors: status", keyset_page(ErrorRecord, ErrorRecord.timestamp, ErrorRecord.status == "Resolved")),
+    ("errors: group", keyset_page(ErrorRecord, ErrorRecord.timestamp, ErrorRecord.group_id == "0" * 32)),
+    # GET /error-groups
+    ("error-groups: next page", keyset_page(ErrorGroup, ErrorGroup.last_seen, cursor=True)),
+    ("error-groups: status + source module", keyset_page(
+        ErrorGroup, ErrorGroup.last_seen, ErrorGroup.status == "Open", ErrorGroup.source_module == "validation")),
+    # error-monitoring: groups touched by a batch, read back after the upsert
+    ("error-monitoring: groups by fingerprint", select(ErrorGroup.id, ErrorGroup.sample_error_ids, ErrorGroup.error_count).where(ErrorGroup.id.in_(["a", "b"]))),
+    # GET /reports/{report_id}/records, reports containing a trade
+    ("report-records: records of a report", select(ReportRecord).where(
+        ReportRecord.report_id == "R-1", ReportRecord.processed_record_id > "P-1").order_by(ReportRecord.processed_record_id).limit(1001)),
+    ("report-records: reports of a UTI", select(ReportRecord.report_id).where(ReportRecord.unique_transaction_identifier == "UTI-1")),
+    # GET /reports
+    ("reports: status", keyset_page(GeneratedReport, GeneratedReport.generation_timestamp, GeneratedReport.status == "Generated")),
+    # GET /submissions
+    ("submissions: status + report", keyset_page(
+        SubmissionHistory, SubmissionHistory.submission_timestamp, SubmissionHistory.status == "Failed", SubmissionHistory.report_id == "R-1")),
+    ("submissions: report", keyset_page(SubmissionHistory, SubmissionHistory.submission_timestamp, SubmissionHistory.report_id == "R-1")),
+    ("submissions: status", keyset_page(SubmissionHistory, SubmissionHistory.submission_timestamp, SubmissionHistory.status == "Failed")),
+    # stage queue receive
+    ("stage queue: receive", select(StageQueueMessage.id).where(
+        StageQueueMessage.queue_name == "validation", StageQueueMessage.status.in_(("Ready", "InFlight")),
+        StageQueueMessage.visible_at <= datetime(2024, 1, 1),
+    ).order_by(StageQueueMessage.visible_at).limit(500)),
+    # data-processing duplicate-delivery check
+    ("processing: idempotency keys", select(IdempotencyKey.idempotency_key).where(
+        IdempotencyKey.scope == "data-processing", IdempotencyKey.idempotency_key.in_(["k1", "k2"]))),
+]
+
+
+@pytest.mark.parametrize("label, statement", ENDPOINT_QUERIES, ids=[label for label, _ in ENDPOINT_QUERIES])
+def test_endpoint_query_uses_an_index(assert_no_seq_scan, label, statement):
+    assert_no_seq_scan(statement, label)
+
+
+@pytest.mark.parametrize("label, statement", ORDERED_PAGE_QUERIES, ids=[label for label, _ in ORDERED_PAGE_QUERIES])
+def test_first_page_reads_the_keyset_index_in_order(assert_no_seq_scan, label, statement):
+    assert_no_seq_scan(statement, label, ordered_index_scan=True)
+
+
+@pytest.mark.parametrize("label, statement", SUBSTRING_QUERIES, ids=[label for label, _ in SUBSTRING_QUERIES])
+def test_substring_search_uses_a_trigram_index(migrated_engine, assert_no_seq_scan, label, statement):
+    if migrated_engine.dialect.name != "postgresql":
+        pytest.skip("pg_trgm GIN indexes exist on PostgreSQL only (set TEST_DATABASE_URL)")
+    assert_no_seq_scan(statement, label)
+
+
+def test_asset_class_filter_uses_the_composite_index_past_status(assert_no_seq_scan):
+    # /processed-data: asset_class 는 등호 비교라 (validation_status, asset_class, effective_date) 인덱스의 두 번째 컬럼까지 사용
+    plan = assert_no_seq_scan(STATUS_ASSET_CLASS_DATES, "status + asset class")
+    # SQLite: "SEARCH ... USING INDEX ix (validation_status=? AND asset_class=? ...)", PostgreSQL: "Index Cond: (... asset_class = ...)"
+    assert any("asset_class=?" in line or ("Index Cond" in line and "asset_class =" in line) for line in plan), "\n".join(plan)
+
+
+def test_checker_detects_sequential_scan(assert_no_seq_scan):
+    # 인덱스가 없는 컬럼 필터는 순차 스캔으로 떨어져야 하고, 검사 함수가 이를 잡아야 함
+    with pytest.raises(AssertionError, match="sequential scan"):
+        assert_no_seq_scan(select(ErrorRecord).where(ErrorRecord.assigned_to == "ops"), "unindexed filter")
+    # ORDER BY 용 인덱스를 통째로 읽으며 거르는 계획 (SQLite 의 부분 문자열 검색) 도 전체 스캔
+    with pytest.raises(AssertionError, match="sequential scan"):
+        assert_no_seq_scan(SUBSTRING_QUERIES[1][1], "substring on an ordered index scan")
@@ -0,0 +1,112 @@
+# tests/unit/test_records.py
+
+import json
+import os
+import sys
+from datetime import datetime
+
+import pytest
+from sqlalchemy import create_engine, insert
+from sqlalchemy.orm import sessionmaker
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "..", "src", "validation"))
+
+from common.utils import Base, ProcessedSwapDataDB
+from common import records as records_module
+from common.records import (
+    SwapRecord, SWAP_RECORD_FIELDS, records_to_rows, select_swap_records, records_from_rows,
+    encode_records, decode_records,
+)
+from rules.engine import ColumnBatch
+
+TIMESTAMP = datetime(2024, 1, 2, 3, 4, 5)
+
+
+def make_record(i: int = 1, **overrides) -> SwapRecord:
+    values = dict(
+        id=f"REC-{i}",
+        unique_transaction_identifier=f"MVP-TRADE-{i}-ABC",
+        reporting_counterparty_lei="5493001KJTIIGC8Y1R12",
+        other_counterparty_lei="529900T8BM49AURSDO55",
+        action_type="NEWT",
+        asset_class="IR",
+        effective_date="2024-01-02",
+        termination_date="2029-01-02",
+        notional_amount=1000000.0 + i,
+        notional_currency="USD",
+        original_raw_data_id=f"RAW-{i}",
+        processing_timestamp=TIMESTAMP,
+    )
+    values.update(overrides)
+    return SwapRecord(**values)
+
+
+def test_fields_match_processed_swap_data_columns():
+    # 레코드 필드 == 테이블 컬럼 (Core 행 매핑에 변환 계층이 없음)
+    assert set(SWAP_RECORD_FIELDS) == set(ProcessedSwapDataDB.__table__.columns.keys())
+    assert not hasattr(make_record(), "__dict__") # slots: 인스턴스 dict 없음
+
+
+def test_dict_round_trip_is_json_compatible():
+    record = make_record(processing_errors=["Invalid LEI"], processing_status="ProcessedWithErrors")
+    wire = record.to_dict()
+
+    assert wire["processing_timestamp"] == TIMESTAMP.isoformat()
+    assert SwapRecord.from_dict(json.loads(json.dumps(wire))) == record
+
+
+def test_from_dict_fills_defaults():
+    record = SwapRecord.from_dict({"unique_transaction_identifier": "UTI-1", "processing_errors": None})
+
+    assert record.processing_status == "Processed"
+    assert record.processing_errors == []
+    assert record.validation_status == "Pending"
+    assert record.id is None
+
+
+@pytest.mark.parametrize("wire_format", ["json", "msgpack"])
+def test_batch_encode_decode_round_trip(wire_format):
+    if wire_format == "msgpack" and records_module.msgpack is None:
+        with pytest.raises(ValueError):
+            encode_records([make_record()], wire_format)
+        return
+    batch = [make_record(i) for i in range(5)]
+
+    assert decode_records(encode_records(batch, wire_format), wire_format) == batch
+
+
+def test_decode_matches_fields_by_name():
+    # 필드 순서/구성이 다른 배치(구버전 송신자)도 이름으로 해석
+    payload = json.dumps({"fields": ["notional_amount", "unique_transaction_identifier"], "rows": [[5.0, "UTI-1"]]}).encode()
+
+    [record] = decode_records(payload)
+    assert record.unique_transaction_identifier == "UTI-1"
+    assert record.notional_amount == 5.0
+    assert record.processing_status == "Processed"
+
+
+def test_unsupported_wire_format():
+    with pytest.raises(ValueError):
+        encode_records([make_record()], "xml")
+
+
+def test_core_insert_and_select_round_trip(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'records.db'}")
+    Base.metadata.create_all(bind=engine)
+    batch = [make_record(i) for i in range(3)]
+    try:
+        with sessionmaker(bind=engine)() as db:
+            db.execute(insert(ProcessedSwapDataDB.__table__), records_to_rows(batch))
+            db.commit()
+            loaded = records_from_rows(db.execute(select_swap_records().order_by(ProcessedSwapDataDB.id)))
+    finally:
+        engine.dispose()
+
+    assert loaded == batch
+
+
+def test_column_batch_reads_slotted_records():
+    batch = ColumnBatch([make_record(1), make_record(2, notional_amount=None)])
+
+    assert batch.values("unique_transaction_identifier") == ["MVP-TRADE-1-ABC", "MVP-TRADE-2-ABC"]
+    assert batch.values("notional_amount")[1] is None
@@ -0,0 +1,93 @@
+# tests/unit/test_reference_data.py
+
+import json
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "..", "src", "validation"))
+
+from common.reference_data import ReferenceData, reference_data, CURRENCIES, ASSET_CLASSES, ACTION_TYPES, EVENT_TYPES, UPI_PREFIXES
+from rules import CFTC_RULES, evaluate_rules
+
+
+def write_version(directory, version, **code_lists):
+    version_directory = directory / version
+    version_directory.mkdir(parents=True, exist_ok=True)
+    for name, content in code_lists.items():
+        (version_directory / f"{name}.json").write_text(json.dumps(dict({"name": name, "version": version}, **content)))
+
+
+def test_shipped_code_lists():
+    for name in (CURRENCIES, ASSET_CLASSES, ACTION_TYPES, EVENT_TYPES, UPI_PREFIXES):
+        assert reference_data.code_list(name).codes
+    assert reference_data.contains(CURRENCIES, "USD")
+    assert not reference_data.contains(CURRENCIES, "XYZ")
+    assert reference_data.contains(ASSET_CLASSES, "IR")
+    assert reference_data.contains(ACTION_TYPES, "NEWT")
+    assert reference_data.contains(UPI_PREFIXES, "QZ1234567890") # 접두사 매칭
+
+
+def test_check_many():
+    values = ["USD", "XYZ", None, "", "USD", "usd"]
+
+    assert reference_data.check_many(CURRENCIES, values) == [True, False, False, False, True, False]
+    assert reference_data.check_many(CURRENCIES, values, allow_missing=True) == [True, False, True, True, True, False]
+    with pytest.raises(KeyError):
+        reference_data.check_many("colours", ["RED"])
+
+
+def test_newest_version_and_pin(tmp_path):
+    write_version(tmp_path, "2026-01-01", currencies={"codes": ["USD"]})
+    write_version(tmp_path, "2026-07-01", currencies={"codes": ["USD", "EUR"]})
+
+    assert ReferenceData(str(tmp_path)).check_many(CURRENCIES, ["EUR"]) == [True]
+    pinned = ReferenceData(str(tmp_path), version="2026-01-01")
+    assert pinned.check_many(CURRENCIES, ["EUR"]) == [False]
+    assert pinned.metrics()["version"] == "2026-01-01"
+
+
+def test_hot_reload(tmp_path):
+    write_version(tmp_path, "2026-01-01", currencies={"codes": ["USD"]})
+    data = ReferenceData(str(tmp_path), reload_interval=0.0) # 0 = 자동 재적재 없음; reload() 로 직접 확인
+
+    assert data.check_many(CURRENCIES, ["SLE"]) == [False]
+    assert not data.reload() # 변경 없음
+
+    write_version(tmp_path, "2026-02-01", currencies={"codes": ["USD", "SLE"]}) # 새 버전 배포
+    assert data.reload()
+    assert data.check_many(CURRENCIES, ["SLE"]) == [True]
+    assert data.metrics()["version"] == "2026-02-01"
+
+    # 깨진 파일은 현재 스냅샷을 유지
+    (tmp_path / "2026-03-01").mkdir()
+    (tmp_path / "2026-03-01" / "currencies.json").write_text("{not json")
+    assert not data.reload()
+    assert data.check_many(CURRENCIES, ["SLE"]) == [True]
+    assert data.metrics()["reload_errors"] == 1
+
+
+def test_reload_interval_picks_up_changes(tmp_path, monkeypatch):
+    write_version(tmp_path, "2026-01-01", currencies={"codes": ["USD"]})
+    data = ReferenceData(str(tmp_path), reload_interval=30.0)
+    assert data.check_many(CURRENCIES, ["EUR"]) == [False]
+
+    write_version(tmp_path, "2026-02-01", currencies={"codes": ["USD", "EUR"]})
+    assert data.check_many(CURRENCIES, ["EUR"]) == [False] # 다음 확인 시점 전에는 기존 스냅샷
+    monkeypatch.setattr(data, "_next_check", 0.0)
+    assert data.check_many(CURRENCIES, ["EUR"]) == [True]
+
+
+def test_rules_report_unknown_codes():
+    base = {
+        "unique_transaction_identifier": "UTI-1", "reporting_counterparty_lei": "5493001KJTIIGC8Y1R12",
+        "other_counterparty_lei": "529900T8BM49AURSDO55", "action_type": "NEWT", "event_type": None,
+        "asset_class": "IR", "effective_date": "2024-01-02", "termination_date": "2029-01-02",
+        "notional_amount": 100.0, "notional_currency": "USD", "price_currency": None, "processing_errors": [],
+    }
+    result = evaluate_rules([base, dict(base, notional_currency="XYZ", asset_class="ZZ"), dict(base, action_type="NEWX")], CFTC_RULES)
+
+    assert result.is_valid.tolist() == [True, False, False]
+    assert result.error_codes[1] == ["NOTIONAL_CURRENCY_CODE", "ASSET_CLASS_CODE"]
+    assert result.errors_for(2) == ["Action Type 'NEWX' is not a valid CFTC action type."]
@@ -0,0 +1,63 @@
+# tests/unit/test_report_records.py
+
+from datetime import datetime
+
+import pytest
+from sqlalchemy import insert, select, event
+
+from common.bulk_db import link_records_to_report, link_record_ids_to_report, link_utis_to_report
+from common.utils import ProcessedSwapDataDB, ReportRecord
+
+
+@pytest.fixture
+def session(db_session):
+    db_session.execute(insert(ProcessedSwapDataDB.__table__), [
+        {"id": f"P-{i}", "unique_transaction_identifier": f"UTI-{i}", "validation_status": "Valid" if i % 2 == 0 else "Invalid",
+         "processing_timestamp": datetime(2024, 1, 1, i)}
+        for i in range(10)
+    ])
+    db_session.commit()
+    return db_session
+
+
+def test_link_utis_to_report(session):
+    statements = []
+    event.listen(session.get_bind(), "before_cursor_execute", lambda conn, cursor, statement, *args: statements.append(statement))
+
+    linked = link_utis_to_report(session, "R-1", ["UTI-1", "UTI-2", "UTI-2", "UTI-3", "UTI-MISSING"])
+    session.commit()
+
+    assert linked == 3
+    assert len(statements) == 2 # INSERT ... SELECT 1회 + UPDATE 1회 (행 조회 없음)
+    assert all(statement.lstrip().startswith(("INSERT", "UPDATE")) for statement in statements)
+    assert session.execute(select(ReportRecord.processed_record_id, ReportRecord.unique_transaction_identifier)
+                           .where(ReportRecord.report_id == "R-1").order_by(ReportRecord.processed_record_id)).all() == [
+        ("P-1", "UTI-1"), ("P-2", "UTI-2"), ("P-3", "UTI-3")]
+    rows = dict(session.execute(select(ProcessedSwapDataDB.id, ProcessedSwapDataDB.generated_report_id)).all())
+    assert rows["P-1"] == rows["P-3"] == "R-1" and rows["P-4"] is None
+    assert session.get(ProcessedSwapDataDB, "P-2").report_status == "IncludedInReport"
+
+
+def test_link_records_by_criteria_and_multiple_reports(session):
+    link_utis_to_report(session, "R-batch", ["UTI-2"])
+    linked = link_records_to_report(session, "R-daily", (ProcessedSwapDataDB.validation_status == "Valid") & (ProcessedSwapDataDB.processing_timestamp < datetime(2024, 1, 1, 5)))
+    session.commit()
+
+    assert linked == 3 # P-0, P-2, P-4
+    reports_of_uti_2 = session.scalars(select(ReportRecord.report_id).where(ReportRecord.unique_transaction_identifier == "UTI-2")).all()
+    assert sorted(reports_of_uti_2) == ["R-batch", "R-daily"] # 매핑 테이블에 이력 유지
+    assert session.get(ProcessedSwapDataDB, "P-2").generated_report_id == "R-daily" # 최신 보고서
+    assert session.get(ReportRecord, ("R-daily", "P-0")).included_at is not None
+
+
+def test_link_record_ids_links_only_the_written_rows(session):
+    """daily report: 조건을 다시 평가하지 않고 파일에 쓴 행만 연결."""
+    written_ids = ["P-0", "P-2", "P-6"]
+    session.execute(ProcessedSwapDataDB.__table__.update().where(ProcessedSwapDataDB.id == "P-8").values(validation_status="Valid")) # 파일 작성 이후 변경
+
+    linked = link_record_ids_to_report(session, "R-daily", written_ids)
+    session.commit()
+
+    assert linked == 3
+    assert sorted(session.scalars(select(ReportRecord.processed_record_id).where(ReportRecord.report_id == "R-daily"))) == written_ids
+    assert session.get(ProcessedSwapDataDB, "P-4").generated_report_id is None
@@ -0,0 +1,142 @@
+# tests/unit/test_report_writer.py
+
+import csv
+import gzip
+import io
+import os
+from datetime import datetime
+
+import pytest
+from sqlalchemy import create_engine, insert, select
+from sqlalchemy.orm import sessionmaker
+
+from common.utils import Base, ProcessedSwapDataDB
+from common.report_writer import (
+    ReportWriter, ReportFormat, REPORT_COLUMNS, REPORT_FORMATS, write_report, iter_row_chunks,
+    rows_from_dicts, check_report_options, register_report_format, report_object_suffix,
+)
+
+
+def make_entry(i: int) -> dict:
+    return {
+        "unique_transaction_identifier": f"UTI-{i}",
+        "action_type": "NEWT",
+        "event_type": "TRAD",
+        "asset_class": "IR",
+        "effective_date": "2024-01-02",
+        "termination_date": "2029-01-02",
+        "notional_amount": 1000000.0 + i,
+        "notional_currency": "USD",
+        "price": 0.0125,
+        "price_currency": "USD",
+        "reporting_counterparty_lei": "5493001KJTIIGC8Y1R12",
+        "other_counterparty_lei": "529900T8BM49AURSDO55",
+    }
+
+
+def test_text_format_keeps_batch_layout():
+    buffer = io.BytesIO()
+    generated_at = datetime(2024, 1, 2, 3, 4, 5)
+    write_report(buffer, [rows_from_dicts([make_entry(1)])], "text", metadata={"entry_count": 1, "generated_at": generated_at})
+
+    assert buffer.getvalue().decode("utf-8").splitlines() == [
+        "## Swap Report Batch - Generated at 2024-01-02T03:04:05",
+        "## Number of Entries: 1",
+        "----------------------------------------------------",
+        "UTI: UTI-1, Action: NEWT, Asset Class: IR, Notional: 1000001.0 USD, Effective Date: 2024-01-02, Reporting LEI: 5493001KJTIIGC8Y1R12",
+        "----------------------------------------------------",
+    ]
+
+
+def test_text_format_writes_count_in_trailer_when_unknown():
+    buffer = io.BytesIO()
+    write_report(buffer, [rows_from_dicts([make_entry(1)]), rows_from_dicts([make_entry(2)])], "text")
+
+    assert buffer.getvalue().decode("utf-8").splitlines()[-1] == "## Number of Entries: 2"
+
+
+@pytest.mark.parametrize("compression", [None, "gzip"])
+def test_cftc_csv_round_trip_to_path(tmp_path, compression):
+    path = tmp_path / f"report{report_object_suffix('cftc_csv', compression)}"
+    chunks = [rows_from_dicts([make_entry(i) for i in range(start, start + 3)]) for start in (0, 3)]
+
+    result = write_report(path, chunks, "cftc_csv", compression)
+
+    raw = path.read_bytes()
+    text = gzip.decompress(raw).decode("utf-8") if compression else raw.decode("utf-8")
+    rows = list(csv.reader(io.StringIO(text)))
+    assert rows[0][0] == "Unique transaction identifier (UTI)"
+    assert [row[0] for row in rows[1:]] == [f"UTI-{i}" for i in range(6)]
+    assert result.row_count == 6
+    assert result.size_bytes == len(raw)
+    assert not os.path.exists(f"{path}.tmp")
+
+
+def test_failed_chunk_is_retried_row_by_row(tmp_path):
+    class StrictFormat(ReportFormat):
+        name = "strict_test"
+        extension = ".txt"
+
+        def write_rows(self, rows):
+            if any(row[0] is None for row in rows):
+                raise ValueError("missing UTI")
+            self.stream.write("".join(f"{row[0]}\n" for row in rows))
+
+    register_report_format(StrictFormat)
+    try:
+        buffer = io.BytesIO()
+        with ReportWriter(buffer, "strict_test", columns=("uti",)) as writer:
+            failures = writer.write_chunk([("UTI-1",), (None,), ("UTI-3",)])
+    finally:
+        REPORT_FORMATS.pop("strict_test")
+
+    assert buffer.getvalue() == b"UTI-1\nUTI-3\n"
+    assert failures == [((None,), "Error formatting report entry: missing UTI")]
+    assert writer.result.row_count == 2
+
+    # cftc_csv: writerows 가 실패 행 이전 행을 이미 기록한 경우에도 중복 기록 없음
+    class Unprintable:
+        def __str__(self):
+            raise ValueError("bad value")
+
+    buffer = io.BytesIO()
+    with ReportWriter(buffer, "cftc_csv", columns=("unique_transaction_identifier",)) as writer:
+        failures = writer.write_chunk([("U1",), ("U2",), (Unprintable(),), ("U4",)])
+    assert buffer.getvalue().decode("utf-8").splitlines()[1:] == ["U1", "U2", "U4"]
+    assert len(failures) == 1 and failures[0][1] == "Error formatting report entry: bad value"
+    assert writer.result.row_count == 3
+
+
+def test_aborted_write_leaves_no_file(tmp_path):
+    path = tmp_path / "report.csv"
+    with pytest.raises(RuntimeError):
+        with ReportWriter(path, "cftc_csv") as writer:
+            writer.write_chunk(rows_from_dicts([make_entry(1)]))
+            raise RuntimeError("cursor failed")
+
+    assert os.listdir(tmp_path) == []
+
+
+def test_check_report_options_rejects_bad_combinations():
+    with pytest.raises(ValueError, match="Unknown report format"):
+        check_report_options("xml", None)
+    with pytest.raises(ValueError, match="Unknown report compression"):
+        check_report_options("cftc_csv", "bzip2")
+    with pytest.raises(ValueError):
+        check_report_options("parquet", "gzip")
+
+
+def test_iter_row_chunks_streams_in_order(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'report.db'}")
+    Base.metadata.create_all(bind=engine)
+    with engine.begin() as conn:
+        conn.execute(insert(ProcessedSwapDataDB.__table__), [{"id": f"{i:03d}", **make_entry(i)} for i in range(25)])
+    db = sessionmaker(bind=engine)()
+
+    statement = select(*[getattr(ProcessedSwapDataDB, column) for column in REPORT_COLUMNS]).order_by(ProcessedSwapDataDB.id)
+    chunks = list(iter_row_chunks(db, statement, chunk_size=10))
+
+    assert [len(chunk) for chunk in chunks] == [10, 10, 5]
+    assert chunks[2][-1][0] == "UTI-24"
+    db.close()
+    engine.dispose()
@@ -0,0 +1,146 @@
+# tests/unit/test_response_cache.py
+
+import asyncio
+
+import httpx
+import pytest
+from fastapi import FastAPI, Request
+
+from common.response_cache import ResponseCache, etag_matches, normalize_params
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class Upstream:
+    """호출 횟수를 세는 upstream fetch. gate 가 열릴 때까지 응답 보류."""
+
+    def __init__(self):
+        self.calls = 0
+        self.body = b'{"items": [1]}'
+        self.gate = None
+
+    async def fetch(self):
+        self.calls += 1
+        if self.gate is not None:
+            await self.gate.wait()
+        return self.body
+
+
+def test_normalized_params():
+    assert normalize_params({"limit": 100, "status": None, "exact_count": False}) == normalize_params({"exact_count": False, "limit": "100"})
+    assert normalize_params({"exact_count": True}) == (("exact_count", "true"),)
+    assert etag_matches('W/"abc", "def"', '"abc"') and etag_matches("*", '"x"') and not etag_matches('"abc"', '"abd"') and not etag_matches(None, '"a"')
+
+
+def test_ttl_and_invalidation():
+    clock = FakeClock()
+    cache = ResponseCache(ttl=5, clock=clock)
+    upstream = Upstream()
+
+    async def scenario():
+        first = await cache.get_or_fetch("errors", {"limit": 100}, upstream.fetch)
+        assert await cache.get_or_fetch("errors", {"limit": "100"}, upstream.fetch) is first
+        await cache.get_or_fetch("reports", {"limit": 100}, upstream.fetch)
+        assert upstream.calls == 2
+
+        clock.now = 6 # TTL 만료
+        await cache.get_or_fetch("errors", {"limit": 100}, upstream.fetch)
+        await cache.get_or_fetch("reports", {"limit": 100}, upstream.fetch)
+        assert upstream.calls == 4
+
+        assert cache.invalidate("errors") == 1
+        await cache.get_or_fetch("errors", {"limit": 100}, upstream.fetch)
+        await cache.get_or_fetch("reports", {"limit": 100}, upstream.fetch) # 다른 namespace 는 유지
+        assert upstream.calls == 5
+    asyncio.run(scenario())
+
+
+def test_concurrent_requests_share_one_fetch():
+    cache = ResponseCache(ttl=5)
+    upstream = Upstream()
+
+    async def scenario():
+        upstream.gate = asyncio.Event()
+        waiters = [asyncio.create_task(cache.get_or_fetch("errors", {"limit": 100}, upstream.fetch)) for _ in range(20)]
+        await asyncio.sleep(0)
+        upstream.gate.set()
+        results = await asyncio.gather(*waiters)
+        assert upstream.calls == 1 and len({id(result) for result in results}) == 1
+        assert cache.stats["coalesced"] == 19
+    asyncio.run(scenario())
+
+
+def test_errors_are_shared_but_not_cached():
+    cache = ResponseCache(ttl=5)
+    calls = []
+
+    async def failing():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        raise httpx.ConnectError("upstream down")
+
+    async def scenario():
+        results = await asyncio.gather(*(cache.get_or_fetch("errors", {}, failing) for _ in range(5)), return_exceptions=True)
+        assert len(calls) == 1 and all(isinstance(result, httpx.ConnectError) for result in results)
+        with pytest.raises(httpx.ConnectError):
+            await cache.get_or_fetch("errors", {}, failing)
+        assert len(calls) == 2
+    asyncio.run(scenario())
+
+
+def test_invalidation_during_fetch_is_not_cached():
+    cache = ResponseCache(ttl=5)
+    upstream = Upstream()
+
+    async def scenario():
+        upstream.gate = asyncio.Event()
+        pending = asyncio.create_task(cache.get_or_fetch("errors", {}, upstream.fetch))
+        await asyncio.sleep(0.01)
+        assert upstream.calls == 1
+        cache.invalidate("errors") # 쓰기가 진행 중인 조회보다 나중에 반영됨
+        after_write = asyncio.create_task(cache.get_or_fetch("errors", {}, upstream.fetch))
+        await asyncio.sleep(0.01)
+        assert upstream.calls == 2 # 쓰기 이후 요청은 이전 조회에 합류하지 않음
+        upstream.gate.set()
+        await asyncio.gather(pending, after_write)
+        upstream.gate = None
+        await cache.get_or_fetch("errors", {}, upstream.fetch)
+        assert upstream.calls == 2 # 쓰기 이후 조회 결과는 캐시됨
+        assert cache.metrics()["in_flight"] == 0
+    asyncio.run(scenario())
+
+
+def test_etag_and_not_modified():
+    cache = ResponseCache(ttl=5)
+    upstream = Upstream()
+    app = FastAPI()
+
+    @app.get("/api/errors")
+    async def errors(request: Request, limit: int = 100):
+        return cache.to_response(request, await cache.get_or_fetch("errors", {"limit": limit}, upstream.fetch))
+
+    async def scenario():
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://web.test") as client:
+            first = await client.get("/api/errors")
+            assert first.status_code == 200 and first.json() == {"items": [1]}
+            etag = first.headers["etag"]
+
+            revalidated = await client.get("/api/errors", headers={"If-None-Match": etag})
+            assert revalidated.status_code == 304 and revalidated.content == b"" and revalidated.headers["etag"] == etag
+
+            cache.invalidate("errors")
+            again = await client.get("/api/errors", headers={"If-None-Match": etag})
+            assert again.status_code == 304 # 재조회했지만 내용이 같으면 ETag 도 같음
+
+            upstream.body = b'{"items": [1, 2]}'
+            cache.invalidate("errors")
+            changed = await client.get("/api/errors", headers={"If-None-Match": etag})
+            assert changed.status_code == 200 and changed.headers["etag"] != etag
+        assert upstream.calls == 3
+    asyncio.run(scenario())
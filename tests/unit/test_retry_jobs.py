@@ -0,0 +1,185 @@
+# tests/unit/test_retry_jobs.py
+
+import asyncio
+import json
+from datetime import datetime, timedelta
+
+import httpx
+import pytest
+from sqlalchemy import create_engine, insert, select
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
+
+from common.utils import ErrorRecord, RawIngestedData, RetryJob, to_async_database_url
+from common.retry_jobs import retry_payload, run_retry_job, job_progress, INGESTION, PROCESSING
+
+BASE_TIME = datetime(2024, 1, 1, 12, 0, 0)
+TARGET_URLS = {INGESTION: "http://ingestion.test/ingest", PROCESSING: "http://processing.test/process"}
+
+
+def seed(db_url, errors, raw_rows=()):
+    engine = create_engine(db_url)
+    with engine.begin() as connection:
+        if raw_rows:
+            connection.execute(insert(RawIngestedData.__table__), list(raw_rows))
+        connection.execute(insert(ErrorRecord.__table__), errors)
+    engine.dispose()
+
+
+def error_row(i, source_module="validation", **overrides):
+    """원본 raw 행을 참조하는 validation 오류 (error grouping 이 payload 를 참조만 남긴 형태)."""
+    return dict({
+        "id": f"E-{i:05d}", "trade_id": f"UTI-{i}", "source_module": source_module, "error_messages": ["bad"],
+        "data_payload": {"id": f"P-{i}", "unique_transaction_identifier": f"UTI-{i}", "original_raw_data_id": f"R-{i}"},
+        "original_source_data_payload": None, "timestamp": BASE_TIME + timedelta(seconds=i), "status": "Open",
+    }, **overrides)
+
+
+def raw_row(i):
+    return {"id": f"R-{i}", "trade_id": f"T-{i}", "raw_payload": {"trade_id": f"T-{i}", "notional_amount": 100.0}}
+
+
+class RecordingTarget:
+    """요청된 배치 크기와 동시 요청 수를 기록하는 가짜 하위 모듈 (httpx.MockTransport)."""
+
+    def __init__(self, fail_urls=(), latency=0.0, body_for=None):
+        self.fail_urls = set(fail_urls)
+        self.body_for = body_for
+        self.latency = latency
+        self.batches = []
+        self.params = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def handle(self, request: httpx.Request) -> httpx.Response:
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(self.latency)
+            records = json.loads(request.content)
+            url = str(request.url.copy_with(query=None))
+            self.batches.append((url, records))
+            self.params.append(dict(request.url.params))
+            if url in self.fail_urls:
+                return httpx.Response(503, json={"detail": "unavailable"})
+            body = self.body_for(records) if self.body_for else {"status": "success", "count": len(records)}
+            return httpx.Response(200, json=body)
+        finally:
+            self.in_flight -= 1
+
+
+def run_job(db_url, target, filters, batch_size=3, concurrency=2, page_size=4, cancel_after=None):
+    async def scenario():
+        engine = create_async_engine(to_async_database_url(db_url))
+        session_factory = async_sessionmaker(engine, expire_on_commit=False, autoflush=False)
+        client = httpx.AsyncClient(transport=httpx.MockTransport(target.handle))
+        async with session_factory() as db:
+            db.add(RetryJob(id="J-1", status="Pending", filters=filters, batch_size=batch_size, concurrency=concurrency))
+            await db.commit()
+        if cancel_after is not None:
+            original_handle = target.handle
+
+            async def cancelling_handle(request):
+                if len(target.batches) + 1 == cancel_after:
+                    async with session_factory() as db:
+                        job = await db.get(RetryJob, "J-1")
+                        job.status = "Cancelling"
+                        await db.commit()
+                return await original_handle(request)
+            client = httpx.AsyncClient(transport=httpx.MockTransport(cancelling_handle))
+        await run_retry_job("J-1", TARGET_URLS, session_factory, client_for=lambda url: client, page_size=page_size)
+        async with session_factory() as db:
+            job = await db.get(RetryJob, "J-1")
+            statuses = dict((await db.execute(select(ErrorRecord.id, ErrorRecord.status))).all())
+        await client.aclose()
+        await engine.dispose()
+        return job, statuses
+
+    return asyncio.run(scenario())
+
+
+def test_retry_payload_targets():
+    raw = {"trade_id": "T-1"}
+    processed = {"unique_transaction_identifier": "UTI-1"}
+    assert retry_payload("data-ingestion", raw, None) == (INGESTION, raw, "")
+    assert retry_payload("data-processing", processed, raw) == (PROCESSING, raw, "")
+    assert retry_payload("validation", processed, None) == (PROCESSING, processed, "") # 처리된 데이터로 재시도
+    assert retry_payload("data-processing", processed, None)[0] is None
+    target, payload, reason = retry_payload("report-submission", processed, None)
+    assert target is None and reason == "Could not determine retry strategy for this error"
+
+
+def test_job_progress_throughput_and_eta():
+    job = RetryJob(total=1000, processed=250, started_at=BASE_TIME)
+    progress = job_progress(job, now=BASE_TIME + timedelta(seconds=10))
+    assert progress["percent"] == 25.0
+    assert progress["throughput_per_second"] == 25.0
+    assert progress["eta_seconds"] == 30.0
+
+    job.finished_at = BASE_TIME + timedelta(seconds=40)
+    job.processed = 1000
+    assert job_progress(job)["eta_seconds"] == 0.0
+    assert job_progress(RetryJob(total=10, processed=0))["eta_seconds"] is None # 아직 시작 전
+
+
+def test_job_batches_raw_payloads_with_concurrency_cap(db_url):
+    errors = [error_row(i) for i in range(10)]
+    errors.append(error_row(10, source_module="report-submission")) # 재처리 경로 없음 -> skipped
+    errors.append(error_row(11, status="Resolved")) # 필터 밖
+    errors.append(error_row(12, timestamp=BASE_TIME + timedelta(days=2))) # until 이후 (작업 중 새로 들어온 오류)
+    seed(db_url, errors, [raw_row(i) for i in range(13)])
+    target = RecordingTarget(latency=0.01)
+
+    job, statuses = run_job(db_url, target, {"status": "Open", "until": (BASE_TIME + timedelta(days=1)).isoformat()})
+
+    assert job.status == "Completed"
+    assert (job.total, job.processed, job.succeeded, job.failed, job.skipped) == (11, 11, 10, 0, 1)
+    assert all(len(records) <= 3 for _, records in target.batches)
+    assert target.max_in_flight <= 2
+    sent = [record for _, records in target.batches for record in records]
+    assert sorted(record["id"] for record in sent) == sorted(f"R-{i}" for i in range(10)) # raw_ingested_data 에서 복원
+    assert all(url == TARGET_URLS[PROCESSING] for url, _ in target.batches)
+    assert all(params == {"replay": "true"} for params in target.params) # 이미 처리된 payload 재전송이므로 중복 판정 생략
+    assert [statuses[f"E-{i:05d}"] for i in range(10)] == ["Retrying"] * 10
+    assert (statuses["E-00010"], statuses["E-00011"], statuses["E-00012"]) == ("Open", "Resolved", "Open")
+    assert job_progress(job)["percent"] == 100.0
+
+
+def test_failed_batches_mark_errors_retry_failed(db_url):
+    errors = [error_row(i, source_module="data-ingestion", data_payload={"trade_id": f"T-{i}"}) for i in range(3)]
+    errors += [error_row(i) for i in range(3, 6)]
+    seed(db_url, errors, [raw_row(i) for i in range(3, 6)])
+    target = RecordingTarget(fail_urls=[TARGET_URLS[INGESTION]])
+
+    job, statuses = run_job(db_url, target, {"status": "Open"}, batch_size=10, page_size=100)
+
+    assert job.status == "Completed"
+    assert (job.succeeded, job.failed, job.batches) == (3, 3, 2)
+    assert "503" in job.last_error
+    assert [statuses[f"E-{i:05d}"] for i in range(6)] == ["Retry Failed"] * 3 + ["Retrying"] * 3
+
+
+def test_duplicates_and_processing_failures_in_accepted_batches(db_url):
+    seed(db_url, [error_row(i) for i in range(5)], [raw_row(i) for i in range(5)])
+
+    def process_response(records):
+        """/process 응답: 2xx 이지만 일부 항목은 중복으로 건너뛰고 일부는 다시 실패."""
+        ids = [record["id"] for record in records]
+        return {"status": "success", "duplicate_count": 1, "processing_failed_count": 1,
+                "duplicate_indexes": [ids.index("R-1")], "processing_failed_indexes": [ids.index("R-3")]}
+
+    job, statuses = run_job(db_url, RecordingTarget(body_for=process_response), {"status": "Open"}, batch_size=5, page_size=100)
+
+    assert (job.succeeded, job.failed, job.skipped) == (3, 1, 1)
+    assert [statuses[f"E-{i:05d}"] for i in range(5)] == ["Retrying", "Open", "Retrying", "Retry Failed", "Retrying"]
+    assert "failed processing again" in job.last_error
+
+
+def test_cancel_stops_after_current_page(db_url):
+    seed(db_url, [error_row(i) for i in range(12)], [raw_row(i) for i in range(12)])
+    target = RecordingTarget()
+
+    job, statuses = run_job(db_url, target, {"status": "Open"}, batch_size=4, concurrency=1, page_size=4, cancel_after=1)
+
+    assert job.status == "Cancelled"
+    assert job.processed == 4
+    assert list(statuses.values()).count("Retrying") == 4
@@ -0,0 +1,129 @@
+# tests/unit/test_sdr_dispatch.py
+
+import asyncio
+import random
+
+import httpx
+import pytest
+
+from common.sdr_dispatch import SubmissionDispatcher, SdrDestination, TokenBucket, load_sdr_destinations
+from common.sdr_stub import SdrStub, create_sdr_stub_app
+from common.sdr_upload import BytesReportSource
+
+REPORT = b"UTI,LEI,NOTIONAL\n" * 2000
+
+
+def make_dispatcher(stubs, **destination_options):
+    """스텁 SDR 마다 ASGITransport 클라이언트를 두고 디스패처 생성."""
+    clients = {
+        f"http://{name.lower()}.test/sdr-submit": httpx.AsyncClient(transport=httpx.ASGITransport(app=create_sdr_stub_app(stub)))
+        for name, stub in stubs.items()
+    }
+    options = {"backoff_base": 0.01, "backoff_max": 0.05, **destination_options}
+    destinations = [SdrDestination(name, f"http://{name.lower()}.test/sdr-submit", **options) for name in stubs]
+    return SubmissionDispatcher(destinations, client_for=clients.__getitem__, rng=random.Random(7))
+
+
+def run_dispatch(dispatcher, filenames, **kwargs):
+    async def scenario():
+        return await asyncio.gather(*(dispatcher.dispatch(BytesReportSource(REPORT, filename), filename, **kwargs) for filename in filenames))
+    return asyncio.run(scenario())
+
+
+def test_report_fans_out_to_every_destination():
+    stubs = {"DTCC": SdrStub("DTCC", latency=0.05), "ICE": SdrStub("ICE", latency=0.05), "REGIS": SdrStub("REGIS", latency=0.05)}
+    dispatcher = make_dispatcher(stubs)
+
+    [results] = run_dispatch(dispatcher, ["report_1.csv"])
+
+    assert set(results) == set(stubs) and all(result.success for result in results.values())
+    for stub in stubs.values():
+        assert [submission["size"] for submission in stub.submissions] == [len(REPORT)]
+    assert max(result.elapsed for result in results.values()) < 0.14 # 순차 전송이면 0.15 초 이상
+
+    [only_ice] = run_dispatch(dispatcher, ["report_2.csv"], destinations=["ICE"])
+    assert set(only_ice) == {"ICE"} and len(stubs["ICE"].submissions) == 2 and len(stubs["DTCC"].submissions) == 1
+
+
+def test_per_destination_concurrency_cap():
+    stubs = {"DTCC": SdrStub("DTCC", latency=0.02), "ICE": SdrStub("ICE", latency=0.02)}
+    dispatcher = make_dispatcher(stubs, max_concurrency=2, rate_per_second=1000, burst=1000)
+
+    results = run_dispatch(dispatcher, [f"report_{i}.csv" for i in range(10)])
+
+    assert all(result.success for per_report in results for result in per_report.values())
+    assert stubs["DTCC"].max_in_flight == 2 and stubs["ICE"].max_in_flight == 2
+    assert dispatcher.metrics()["DTCC"]["in_flight"] == 0
+
+
+def test_rate_limit_spaces_request_starts():
+    async def scenario():
+        bucket = TokenBucket(rate=20, burst=2)
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        for _ in range(6):
+            await bucket.acquire()
+        return loop.time() - start
+    assert asyncio.run(scenario()) >= 0.19 # 버스트 2 이후 4개는 초당 20개 속도
+
+
+def test_transient_failures_are_retried_with_jitter():
+    stubs = {"DTCC": SdrStub("DTCC", fail_first=2), "ICE": SdrStub("ICE")}
+    dispatcher = make_dispatcher(stubs, max_attempts=4)
+
+    [results] = run_dispatch(dispatcher, ["report_1.csv"])
+
+    assert results["DTCC"].success and results["DTCC"].attempts == 3
+    assert results["ICE"].attempts == 1 # 다른 SDR 의 장애는 영향 없음
+    assert dispatcher.metrics()["DTCC"]["retries"] == 2
+    delays = [dispatcher.backoff_delay(SdrDestination("X", "", backoff_base=1.0, backoff_max=5.0), attempt) for attempt in (1, 2, 3, 4, 5, 6)]
+    assert all(0 <= delay <= min(5.0, 2 ** (attempt - 1)) for attempt, delay in enumerate(delays, start=1))
+    assert len(set(delays)) == len(delays)
+
+
+def test_exhausted_and_client_errors_fail_only_that_destination():
+    stubs = {"DTCC": SdrStub("DTCC", failure_rate=1.0), "ICE": SdrStub("ICE")}
+    dispatcher = make_dispatcher(stubs, max_attempts=3)
+
+    [results] = run_dispatch(dispatcher, ["report_1.csv"])
+
+    assert not results["DTCC"].success and results["DTCC"].attempts == 3 and "503" in results["DTCC"].error
+    assert results["ICE"].success
+
+    dispatcher = make_dispatcher({"DTCC": SdrStub("DTCC")}, max_attempts=3)
+    dispatcher.destinations = [SdrDestination("DTCC", "http://dtcc.test/sdr-submit/missing", max_attempts=3)]
+    [results] = run_dispatch(dispatcher, ["report_1.csv"])
+    assert not results["DTCC"].success and results["DTCC"].attempts == 1 # 404 는 재시도하지 않음
+
+
+def test_hedged_request_cuts_tail_latency_and_is_deduplicated():
+    stub = SdrStub("DTCC", latency=0.01, slow_fraction=0.5, slow_latency=1.0, seed=5) # 고정 시드: 느린 요청의 헤지는 빠름
+    dispatcher = make_dispatcher({"DTCC": stub}, hedge_after=0.1, rate_per_second=1000, burst=1000, max_concurrency=8)
+
+    results = run_dispatch(dispatcher, [f"report_{i}.csv" for i in range(8)])
+
+    metrics = dispatcher.metrics()["DTCC"]
+    assert all(per_report["DTCC"].success for per_report in results)
+    assert metrics["hedges"] >= 1 and metrics["hedge_wins"] >= 1
+    assert max(per_report["DTCC"].elapsed for per_report in results) < 0.5 # 헤지 없이는 1 초
+    assert sorted(submission["filename"] for submission in stub.submissions) == sorted(f"report_{i}.csv" for i in range(8))
+
+
+def test_idempotency_key_deduplicates_resubmission():
+    stub = SdrStub("DTCC")
+    dispatcher = make_dispatcher({"DTCC": stub})
+
+    [first] = run_dispatch(dispatcher, ["report_1.csv"])
+    [second] = run_dispatch(dispatcher, ["report_1.csv"])
+
+    assert len(stub.submissions) == 1
+    assert second["DTCC"].response["duplicate"] is True
+    assert second["DTCC"].response["receipt_id"] == first["DTCC"].response["receipt_id"]
+
+
+def test_load_sdr_destinations():
+    assert load_sdr_destinations("", "http://sdr.test/submit") == [SdrDestination("SDR", "http://sdr.test/submit")]
+    destinations = load_sdr_destinations('[{"name": "DTCC", "url": "http://dtcc.test", "hedge_after": 5}, {"name": "ICE", "url": "http://ice.test"}]')
+    assert [(d.name, d.hedge_after) for d in destinations] == [("DTCC", 5), ("ICE", 0.0)]
+    with pytest.raises(ValueError):
+        load_sdr_destinations('[{"name": "DTCC", "url": "a"}, {"name": "DTCC", "url": "b"}]')
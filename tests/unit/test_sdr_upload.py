@@ -0,0 +1,158 @@
+# tests/unit/test_sdr_upload.py
+
+import asyncio
+import hashlib
+import json
+import os
+import re
+
+import httpx
+import pytest
+
+import common.sdr_upload as sdr_upload
+from common.sdr_upload import FileReportSource, BytesReportSource, open_report_source, upload_report
+
+SDR_URL = "http://sdr.test/sdr-submit"
+
+
+class FakeSdr:
+    """SDR 스트리밍 / 멀티파트 업로드 API 흉내 (httpx.MockTransport 핸들러). fail_parts: {part_number: 실패 횟수}."""
+
+    def __init__(self, fail_parts=None, fail_status=503):
+        self.fail_parts = dict(fail_parts or {})
+        self.fail_status = fail_status
+        self.uploads = {}
+        self.submissions = []
+        self.requests = []
+
+    async def handle(self, request: httpx.Request) -> httpx.Response:
+        path = request.url.path
+        self.requests.append((request.method, path))
+        if request.method == "POST" and path == "/sdr-submit":
+            chunks = [chunk async for chunk in request.stream]
+            self.submissions.append({"body": b"".join(chunks), "chunks": len(chunks), "headers": request.headers})
+            return httpx.Response(200, json={"status": "received", "size": sum(len(chunk) for chunk in chunks)})
+        if request.method == "POST" and path == "/sdr-submit/uploads":
+            upload_id = f"U-{len(self.uploads) + 1}"
+            self.uploads[upload_id] = {}
+            return httpx.Response(201, json={"upload_id": upload_id})
+        match = re.fullmatch(r"/sdr-submit/uploads/([^/]+)(?:/parts/(\d+)|/(complete))?", path)
+        upload_id = match.group(1)
+        if upload_id not in self.uploads:
+            return httpx.Response(404, json={"detail": "upload not found"})
+        parts = self.uploads[upload_id]
+        if match.group(2):
+            part_number = int(match.group(2))
+            if self.fail_parts.get(part_number, 0) > 0:
+                self.fail_parts[part_number] -= 1
+                return httpx.Response(self.fail_status, json={"detail": "temporarily unavailable"})
+            body = await request.aread()
+            assert hashlib.sha256(body).hexdigest() == request.headers["X-Part-Sha256"]
+            parts[part_number] = body
+            return httpx.Response(200, json={"part_number": part_number})
+        if match.group(3):
+            manifest = json.loads(await request.aread())
+            body = b"".join(parts[part["part_number"]] for part in manifest["parts"])
+            self.submissions.append({"body": body, "upload_id": upload_id})
+            return httpx.Response(200, json={"status": "received", "size": len(body)})
+        return httpx.Response(200, json={"parts": [
+            {"part_number": number, "size": len(body), "sha256": hashlib.sha256(body).hexdigest()} for number, body in parts.items()
+        ]})
+
+
+def run_upload(sdr, source, **kwargs):
+    async def scenario():
+        async with httpx.AsyncClient(transport=httpx.MockTransport(sdr.handle)) as client:
+            return await upload_report(client, SDR_URL, source, "report.csv.gz", **kwargs)
+    return asyncio.run(scenario())
+
+
+@pytest.fixture
+def report_file(tmp_path):
+    path = tmp_path / "report.csv.gz"
+    path.write_bytes(os.urandom(100000))
+    return path
+
+
+@pytest.fixture(autouse=True)
+def no_backoff(monkeypatch):
+    monkeypatch.setattr(sdr_upload, "SDR_PART_RETRY_BACKOFF", 0.0)
+
+
+def test_small_report_is_streamed_in_chunks(report_file):
+    sdr = FakeSdr()
+
+    result = run_upload(sdr, FileReportSource(str(report_file)))
+
+    assert result["mode"] == "stream" and result["response"]["size"] == 100000
+    submission = sdr.submissions[0]
+    assert submission["body"] == report_file.read_bytes()
+    assert submission["headers"].get("transfer-encoding") == "chunked" # Content-Length 없이 전송
+    assert "content-length" not in submission["headers"]
+
+
+def test_large_report_uses_multipart_with_part_retry(report_file):
+    sdr = FakeSdr(fail_parts={2: 2}) # 2번 파트는 두 번 실패 후 성공
+
+    result = run_upload(sdr, FileReportSource(str(report_file)), multipart_threshold=50000, part_size=30000)
+
+    assert result["mode"] == "multipart"
+    assert (result["parts"], result["parts_sent"], result["parts_resumed"]) == (4, 4, 0)
+    assert sdr.submissions[0]["body"] == report_file.read_bytes()
+    assert sdr.requests.count(("PUT", f"/sdr-submit/uploads/{result['upload_id']}/parts/2")) == 3
+
+
+def test_failed_upload_is_resumed_by_next_attempt(report_file):
+    sdr = FakeSdr(fail_parts={3: sdr_upload.SDR_PART_RETRIES + 1}) # 3번 파트가 재시도 한도를 넘김
+    source = FileReportSource(str(report_file))
+    upload_ids = []
+
+    async def record(upload_id):
+        upload_ids.append(upload_id)
+
+    with pytest.raises(httpx.HTTPStatusError):
+        run_upload(sdr, source, multipart_threshold=50000, part_size=30000, on_upload_id=record)
+    assert upload_ids == ["U-1"] and sorted(sdr.uploads["U-1"]) == [1, 2]
+
+    result = run_upload(sdr, source, resume_upload_id=upload_ids[0], part_size=30000, on_upload_id=record)
+
+    assert result["upload_id"] == "U-1" and upload_ids == ["U-1", "U-1"]
+    assert (result["parts_sent"], result["parts_resumed"]) == (2, 2) # 3, 4번 파트만 전송
+    assert sdr.submissions[0]["body"] == report_file.read_bytes()
+
+
+def test_expired_upload_starts_over(report_file):
+    sdr = FakeSdr()
+
+    result = run_upload(sdr, FileReportSource(str(report_file)), resume_upload_id="U-gone", part_size=30000)
+
+    assert result["upload_id"] == "U-1" and result["parts_sent"] == 4
+
+
+def test_client_errors_are_not_retried(report_file):
+    sdr = FakeSdr(fail_parts={1: 1}, fail_status=400)
+
+    with pytest.raises(httpx.HTTPStatusError):
+        run_upload(sdr, FileReportSource(str(report_file)), multipart_threshold=0, part_size=30000)
+    assert sdr.requests.count(("PUT", "/sdr-submit/uploads/U-1/parts/1")) == 1
+
+
+def test_open_report_source(report_file):
+    class Storage:
+        async def download_file(self, object_name):
+            return {"reports/batch.txt": b"batch report"}.get(object_name)
+
+    async def scenario():
+        local = await open_report_source(f"file://{report_file}", "ignored", Storage())
+        stored = await open_report_source(None, "reports/batch.txt", Storage())
+        assert isinstance(local, FileReportSource) and local.size == 100000
+        assert isinstance(stored, BytesReportSource)
+        assert b"".join([chunk async for chunk in stored.iter_chunks(5)]) == b"batch report"
+        assert b"".join([chunk async for chunk in local.iter_range(99990, 100)]) == report_file.read_bytes()[99990:]
+        assert await local.sha256_range(0, 100000) == hashlib.sha256(report_file.read_bytes()).hexdigest()
+        with pytest.raises(FileNotFoundError):
+            await open_report_source(None, "reports/missing.txt", Storage())
+        with pytest.raises(FileNotFoundError):
+            await open_report_source(f"file://{report_file}.missing", "ignored", Storage())
+
+    asyncio.run(scenario())
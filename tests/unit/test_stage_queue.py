@@ -0,0 +1,217 @@
+# tests/unit/test_stage_queue.py
+
+import asyncio
+import time
+
+import pytest
+
+from common.utils import StageQueueMessage
+from common.stage_queue import TableStageQueue, StageWorker, QueueFullError, LeaseLostError
+
+
+def make_queue(session_factory, name="validation", **kwargs):
+    return TableStageQueue(name, session_factory=session_factory, **kwargs)
+
+
+def test_publish_receive_ack_in_batches(session_factory):
+    queue = make_queue(session_factory)
+    queue.publish([{"uti": f"UTI-{i}"} for i in range(5)])
+
+    first = queue.receive(max_messages=3)
+    second = queue.receive(max_messages=3)
+
+    assert [message.payload["uti"] for message in first] == ["UTI-0", "UTI-1", "UTI-2"]
+    assert [message.payload["uti"] for message in second] == ["UTI-3", "UTI-4"]
+    assert queue.receive() == [] # 모두 in-flight 상태
+    assert queue.depth() == 5
+
+    assert queue.ack(first + second) == 5
+    assert queue.depth() == 0
+
+
+def test_queues_are_isolated_by_name(session_factory):
+    make_queue(session_factory, "processing").publish([{"trade_id": "T-1"}])
+
+    assert make_queue(session_factory, "validation").receive() == []
+    assert len(make_queue(session_factory, "processing").receive()) == 1
+
+
+def test_unacked_message_is_redelivered_after_visibility_timeout(session_factory):
+    queue = make_queue(session_factory)
+    queue.publish([{"uti": "UTI-1"}])
+
+    first = queue.receive(visibility_timeout=0.5) # 부하가 걸린 CI 에서도 두 번째 receive 전에 만료되지 않을 만큼
+    assert queue.receive(visibility_timeout=0.5) == []
+    time.sleep(0.6)
+    redelivered = queue.receive()
+
+    assert [message.id for message in redelivered] == [first[0].id]
+    assert redelivered[0].attempts == 2
+    # 만료된 lease 로는 ack 할 수 없음 (다른 consumer 가 이미 가져감)
+    assert queue.ack(first) == 0
+    assert queue.ack(redelivered) == 1
+
+
+def test_nack_delays_redelivery_and_dead_letters_after_max_attempts(session_factory):
+    queue = make_queue(session_factory, max_attempts=2)
+    queue.publish([{"uti": "UTI-1"}])
+
+    assert queue.nack(queue.receive(), error="SDR timeout", delay=0.05) == 0
+    assert queue.receive() == [] # 지연 시간 동안은 보이지 않음
+    time.sleep(0.1)
+    assert queue.nack(queue.receive(), error="SDR timeout") == 1
+
+    assert queue.receive() == []
+    assert queue.depth() == 0
+    db = session_factory()
+    dead = db.query(StageQueueMessage).one()
+    assert (dead.status, dead.attempts, dead.last_error) == ("Dead", 2, "SDR timeout")
+    db.close()
+
+
+def test_publish_applies_backpressure(session_factory):
+    queue = make_queue(session_factory, max_depth=3)
+    queue.publish([{"n": 1}, {"n": 2}])
+
+    with pytest.raises(QueueFullError):
+        queue.publish([{"n": 3}, {"n": 4}])
+    assert queue.depth() == 2
+
+
+def test_publish_joins_caller_transaction(session_factory):
+    queue = make_queue(session_factory)
+    db = session_factory()
+    queue.publish([{"uti": "UTI-1"}], db=db)
+    db.rollback()
+    db.close()
+
+    assert queue.depth() == 0
+
+
+def test_worker_acks_on_success_and_nacks_on_failure(session_factory):
+    queue = make_queue(session_factory)
+    queue.publish([{"n": 1}, {"n": 2}])
+    seen = []
+
+    async def failing_handler(payloads, db):
+        raise RuntimeError("downstream unavailable")
+
+    async def handler(payloads, db):
+        seen.extend(payload["n"] for payload in payloads)
+
+    failing_worker = StageWorker(queue, failing_handler, retry_delay=0.0, session_factory=session_factory)
+    assert asyncio.run(failing_worker.run_once()) == 2
+    assert failing_worker.failed_batches == 1
+    assert queue.depth() == 2
+
+    worker = StageWorker(queue, handler, session_factory=session_factory)
+    assert asyncio.run(worker.run_once()) == 2
+    assert seen == [1, 2]
+    assert queue.depth() == 0
+
+
+def test_worker_acks_in_the_handler_transaction(session_factory):
+    queue = make_queue(session_factory)
+    downstream = make_queue(session_factory, "report-generation")
+    queue.publish([{"n": 1}])
+    depth_after_commit = []
+
+    async def handler(payloads, db):
+        downstream.publish(payloads, db=db)
+        db.commit()
+        depth_after_commit.append(queue.depth()) # 이후 crash 해도 재전달되지 않음
+
+    worker = StageWorker(queue, handler, session_factory=session_factory)
+    assert asyncio.run(worker.run_once()) == 1
+    assert depth_after_commit == [0]
+    assert downstream.depth() == 1
+
+
+def test_handler_writes_roll_back_when_the_lease_was_lost(session_factory):
+    queue = make_queue(session_factory)
+    downstream = make_queue(session_factory, "report-generation")
+    queue.publish([{"n": 1}])
+    errors = []
+
+    async def slow_handler(payloads, db):
+        await asyncio.sleep(0.1)
+        assert len(queue.receive()) == 1 # lease 만료 후 다른 consumer 가 가져감
+        downstream.publish(payloads, db=db)
+        try:
+            db.commit()
+        except LeaseLostError as e:
+            errors.append(e)
+            raise
+
+    worker = StageWorker(queue, slow_handler, visibility_timeout=0.05, retry_delay=0.0, session_factory=session_factory)
+    asyncio.run(worker.run_once())
+    assert len(errors) == 1
+    assert downstream.depth() == 0
+    assert queue.depth() == 1 # 새 consumer 의 lease 는 유지
+
+
+def test_poison_message_is_dead_lettered_alone(session_factory):
+    queue = make_queue(session_factory, max_attempts=1)
+    queue.publish([{"n": 1}, {"n": 2}, {"n": 3}])
+    handled = []
+
+    async def handler(payloads, db):
+        if any(payload["n"] == 2 for payload in payloads):
+            raise ValueError("unparseable payload")
+        handled.extend(payload["n"] for payload in payloads)
+
+    worker = StageWorker(queue, handler, retry_delay=0.0, session_factory=session_factory)
+    assert asyncio.run(worker.run_once()) == 3
+    assert sorted(handled) == [1, 3]
+    assert worker.processed_count == 2
+    assert queue.depth() == 0
+    db = session_factory()
+    dead = db.query(StageQueueMessage).one()
+    assert (dead.status, dead.payload) == ("Dead", {"n": 2})
+    db.close()
+
+
+def test_extend_lease_keeps_a_slow_batch_from_being_redelivered(session_factory):
+    queue = make_queue(session_factory, "report-submission")
+    queue.publish([{"report_id": "R-1"}])
+    redelivered = []
+
+    async def slow_submission(payloads, db):
+        for _ in range(4):
+            await asyncio.sleep(0.05) # visibility timeout 보다 오래 걸리는 SDR 호출
+            redelivered.extend(await asyncio.to_thread(queue.receive))
+
+    worker = StageWorker(queue, slow_submission, visibility_timeout=0.06, ack_in_transaction=False, extend_lease=True,
+                         session_factory=session_factory)
+    asyncio.run(worker.run_once())
+
+    assert redelivered == []
+    assert worker.processed_count == 1
+    assert queue.depth() == 0
+
+
+def test_publisher_is_not_blocked_by_slow_downstream_stage(session_factory):
+    """ingest 응답 시간이 느린 submission 단계와 분리되는지 확인."""
+    submission_queue = make_queue(session_factory, "report-submission")
+    submitted = []
+
+    async def slow_submission(payloads, db):
+        await asyncio.sleep(0.5) # 느린 SDR 호출
+        submitted.extend(payloads)
+
+    async def scenario():
+        worker = StageWorker(submission_queue, slow_submission, poll_interval=0.01, session_factory=session_factory)
+        worker.start()
+        start_time = time.perf_counter()
+        submission_queue.publish([{"report_id": "R-1"}])
+        publish_elapsed = time.perf_counter() - start_time
+        while not submitted:
+            await asyncio.sleep(0.01)
+        await worker.stop()
+        return publish_elapsed
+
+    publish_elapsed = asyncio.run(scenario())
+
+    assert publish_elapsed < 0.5
+    assert submitted == [{"report_id": "R-1"}]
+    assert submission_queue.depth() == 0
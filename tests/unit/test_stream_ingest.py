@@ -0,0 +1,92 @@
+# tests/unit/test_stream_ingest.py
+
+import asyncio
+import json
+
+import pytest
+
+from common.stream_ingest import (
+    NDJSONSplitter, JSONArraySplitter, StreamFormatError,
+    make_record_splitter, decode_record, iter_stream_records,
+)
+
+
+def feed_in_chunks(splitter, body: bytes, chunk_size: int):
+    records = []
+    for start in range(0, len(body), chunk_size):
+        records.extend(splitter.feed(body[start:start + chunk_size]))
+    return records + splitter.close()
+
+
+async def async_chunks(body: bytes, chunk_size: int):
+    for start in range(0, len(body), chunk_size):
+        yield body[start:start + chunk_size]
+
+
+@pytest.mark.parametrize("chunk_size", [1, 7, 64, 4096])
+def test_ndjson_lines_split_across_chunks(chunk_size):
+    records = [{"trade_id": f"TRADE-{i}", "note": "a\\nb {[\"x\"]}"} for i in range(20)]
+    body = ("\n".join(json.dumps(record) for record in records) + "\n").encode()
+
+    raw = feed_in_chunks(NDJSONSplitter(), body, chunk_size)
+
+    assert [number for number, _ in raw] == list(range(1, 21))
+    assert [json.loads(line) for _, line in raw] == records
+
+
+def test_ndjson_blank_lines_last_line_and_oversized_line():
+    body = b'{"a": 1}\r\n\n' + b'{"big": "' + b"x" * 100 + b'"}\n' + b'{"a": 2}'
+
+    raw = feed_in_chunks(NDJSONSplitter(max_record_bytes=50), body, 16)
+
+    # 2행은 빈 줄(번호만 증가), 3행은 크기 초과로 None, 마지막 줄은 개행 없이 끝남
+    assert [(number, line is not None) for number, line in raw] == [(1, True), (3, False), (4, True)]
+    assert json.loads(raw[2][1]) == {"a": 2}
+
+
+@pytest.mark.parametrize("chunk_size", [1, 5, 4096])
+def test_json_array_elements_split_across_chunks(chunk_size):
+    records = [
+        {"trade_id": "TRADE-1", "price": 0.5},
+        {"trade_id": "TRADE-2", "nested": {"legs": [{"rate": 1}, {"rate": 2}]}},
+        {"trade_id": "TRADE-\"3\"", "note": "} ] , \\ ["},
+    ]
+    body = json.dumps(records, indent=2).encode()
+
+    raw = feed_in_chunks(JSONArraySplitter(), body, chunk_size)
+
+    assert [number for number, _ in raw] == [1, 2, 3]
+    assert [json.loads(element) for _, element in raw] == records
+
+
+@pytest.mark.parametrize("body", [b'{"a": 1}', b'[{"a": 1} {"b": 2}]', b'[{"a": 1},]', b'[{"a": 1}', b'[{"a": 1}] x'])
+def test_json_array_malformed_body_raises(body):
+    with pytest.raises(StreamFormatError):
+        feed_in_chunks(JSONArraySplitter(), body, 3)
+
+
+def test_json_array_oversized_element_raises():
+    splitter = JSONArraySplitter(max_record_bytes=32)
+    with pytest.raises(StreamFormatError, match="exceeds 32 bytes"):
+        splitter.feed(b'[{"note": "' + b"x" * 64)
+
+
+def test_make_record_splitter_by_content_type():
+    assert isinstance(make_record_splitter("application/x-ndjson"), NDJSONSplitter)
+    assert isinstance(make_record_splitter("application/json; charset=utf-8"), JSONArraySplitter)
+    with pytest.raises(ValueError):
+        make_record_splitter("text/csv")
+
+
+def test_iter_stream_records_reports_invalid_records():
+    body = b'{"trade_id": "TRADE-1"}\n{broken\n[1, 2]\n'
+
+    async def collect():
+        return [item async for item in iter_stream_records(async_chunks(body, 4), NDJSONSplitter())]
+
+    results = asyncio.run(collect())
+
+    assert results[0] == (1, {"trade_id": "TRADE-1"}, None)
+    assert results[1][0] == 2 and results[1][1] is None and results[1][2].startswith("Invalid JSON")
+    assert results[2] == (3, None, "Record must be a JSON object, got list")
+    assert decode_record(None, 10) == (None, "Record exceeds 10 bytes")
@@ -0,0 +1,95 @@
+# tests/unit/test_structured_logging.py
+
+import io
+import json
+import logging
+import queue
+import threading
+
+from common.structured_logging import JsonFormatter, LazyQueueHandler, RecordLogSampler, configure_logger, flush_logs
+
+
+class CountingStr:
+    """str() 호출 횟수를 세는 인자 (메시지가 언제 렌더링되는지 확인용)."""
+
+    def __init__(self):
+        self.calls = 0
+        self.threads = set()
+
+    def __str__(self):
+        self.calls += 1
+        self.threads.add(threading.current_thread().name)
+        return "value"
+
+
+def make_logger(name, **kwargs):
+    stream = io.StringIO()
+    logger = configure_logger(name, level="DEBUG", stream=stream, **kwargs)
+    logger.propagate = False
+    return logger, stream
+
+
+def test_json_lines_carry_extra_fields_and_exception():
+    logger, stream = make_logger("test.structured.json", use_queue=False)
+
+    logger.info("Stored %d rows", 3, extra={"stage": "validation", "batch_size": 3})
+    try:
+        raise ValueError("bad row")
+    except ValueError:
+        logger.error("Failed", exc_info=True)
+
+    first, second = [json.loads(line) for line in stream.getvalue().splitlines()]
+    assert first["message"] == "Stored 3 rows"
+    assert (first["level"], first["stage"], first["batch_size"]) == ("INFO", "validation", 3)
+    assert "ValueError: bad row" in second["exception"]
+
+
+def test_queue_handler_defers_formatting_to_listener():
+    logger, stream = make_logger("test.structured.queue")
+    argument = CountingStr()
+
+    logger.info("Processing entry %s", argument)
+    flush_logs()
+
+    assert json.loads(stream.getvalue())["message"] == "Processing entry value"
+    assert argument.calls == 1
+    assert threading.current_thread().name not in argument.threads # 호출 스레드에서는 렌더링하지 않음
+
+
+def test_full_queue_drops_instead_of_blocking():
+    handler = LazyQueueHandler(queue.Queue(maxsize=2))
+    logger = logging.getLogger("test.structured.full")
+    logger.addHandler(handler)
+    logger.propagate = False
+
+    for i in range(5):
+        logger.warning("message %d", i)
+
+    assert handler.queue.qsize() == 2
+    assert handler.dropped == 3
+
+
+def test_sampler_logs_every_nth_record_only_when_debug_enabled():
+    logger, stream = make_logger("test.structured.sampler", use_queue=False)
+    sampler = RecordLogSampler(logger, rate=0.1)
+
+    for i in range(25):
+        sampler.debug("Validating entry with UTI %s", f"UTI-{i}")
+    logger.setLevel(logging.INFO)
+    for i in range(25):
+        sampler.debug("Validating entry with UTI %s", f"UTI-{i}")
+
+    messages = [json.loads(line)["message"] for line in stream.getvalue().splitlines()]
+    assert messages == ["Validating entry with UTI UTI-0", "Validating entry with UTI UTI-10", "Validating entry with UTI UTI-20"]
+    assert RecordLogSampler(logger, rate=0).every == 0 # 0 이면 비활성화
+
+
+def test_configure_replaces_plain_stream_handler():
+    logger = logging.getLogger("test.structured.replace")
+    logger.addHandler(logging.StreamHandler(io.StringIO()))
+
+    configure_logger("test.structured.replace", stream=io.StringIO(), use_queue=False)
+    configure_logger("test.structured.replace", stream=io.StringIO(), use_queue=False) # 두 번째 호출은 그대로 반환
+
+    assert len(logger.handlers) == 1
+    assert isinstance(logger.handlers[0].formatter, JsonFormatter)